@@ -0,0 +1,137 @@
+"""
+Denormalized index of the courses each user can access in Studio.
+
+Listing the courses of a user on the Studio home page requires resolving their course and
+organization level roles, and expanding each organization role into all of the courses of
+that organization. The result is stored in :class:`~.models.StudioAccessibleCourse` rows,
+so that the listing (including its search, ordering and pagination) is a single SQL query
+on ``CourseOverview``.
+
+The index of a user is built lazily on first use and is kept up to date by signal handlers:
+
+* a change to one of the user's staff or instructor roles, made in the LMS or in Studio,
+  marks their index as stale (see ``common.djangoapps.student.signals.receivers``),
+* publishing a course adds it to the index of its organization's staff and instructors,
+* deleting a course removes it from every index.
+
+An index is also rebuilt when it is older than ``INDEX_BUILT_CACHE_TIMEOUT``, in case a role
+change was missed.
+"""
+import logging
+
+from ccx_keys.locator import CCXLocator
+from django.core.cache import cache
+from django.db import transaction
+from opaque_keys.edx.django.models import CourseKeyField
+
+from common.djangoapps.student.models import CourseAccessRole
+from common.djangoapps.student.roles import STUDIO_ACCESS_ROLES, STUDIO_COURSE_ACCESS_INDEX_CACHE_KEY
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+from .models import StudioAccessibleCourse
+
+log = logging.getLogger(__name__)
+
+# Seconds after which an index is rebuilt even if no signal marked it as stale.
+INDEX_BUILT_CACHE_TIMEOUT = 60 * 60
+
+
+class CourseAccessNotIndexable(Exception):
+    """
+    Raised when a user holds a role which is neither course nor organization specific,
+    which the index can't represent.
+    """
+
+
+def _is_indexable_course(course_key):
+    """
+    CCXs cannot be edited in Studio and are never indexed.
+    """
+    return not isinstance(course_key, CCXLocator)
+
+
+def _accessible_course_keys(user):
+    """
+    Return the set of keys of the courses which `user` can access through their roles.
+    """
+    orgs = set()
+    course_keys = set()
+    roles = CourseAccessRole.objects.filter(user=user, role__in=STUDIO_ACCESS_ROLES).values_list('org', 'course_id')
+    for org, course_id in roles:
+        if course_id is not None:
+            if _is_indexable_course(course_id):
+                course_keys.add(course_id)
+        elif org:
+            orgs.add(org)
+        else:
+            raise CourseAccessNotIndexable
+
+    if orgs:
+        org_course_keys = CourseOverview.get_all_courses(orgs=list(orgs)).values_list('id', flat=True)
+        course_keys.update(course_key for course_key in org_course_keys if _is_indexable_course(course_key))
+    return course_keys
+
+
+def rebuild_course_access_index(user):
+    """
+    Recompute the index of the courses accessible to `user` from their roles.
+
+    Raises:
+        CourseAccessNotIndexable: if the user holds a role the index can't represent.
+    """
+    cache_key = STUDIO_COURSE_ACCESS_INDEX_CACHE_KEY.format(user_id=user.id)
+    cache.delete(cache_key)
+    course_keys = _accessible_course_keys(user)
+
+    with transaction.atomic():
+        indexed = StudioAccessibleCourse.objects.filter(user=user)
+        stale_keys = set(indexed.values_list('course_id', flat=True)) - course_keys
+        if stale_keys:
+            indexed.filter(course_id__in=stale_keys).delete()
+        StudioAccessibleCourse.objects.bulk_create(
+            [StudioAccessibleCourse(user=user, course_id=course_key) for course_key in course_keys],
+            ignore_conflicts=True,
+        )
+    cache.set(cache_key, True, INDEX_BUILT_CACHE_TIMEOUT)
+
+
+def get_accessible_courses(user):
+    """
+    Return a queryset of the ``CourseOverview`` of every course `user` can access in Studio
+    through their roles, building the user's index first if needed.
+
+    Raises:
+        CourseAccessNotIndexable: if the user holds a role the index can't represent.
+    """
+    if not cache.get(STUDIO_COURSE_ACCESS_INDEX_CACHE_KEY.format(user_id=user.id)):
+        rebuild_course_access_index(user)
+
+    return CourseOverview.get_all_courses().filter(
+        id__in=StudioAccessibleCourse.objects.filter(user=user).values('course_id')
+    )
+
+
+def add_course_to_index(course_key):
+    """
+    Add the course identified by `course_key` to the index of every user with a staff or
+    instructor role in its organization.
+    """
+    if not _is_indexable_course(course_key):
+        return
+
+    user_ids = CourseAccessRole.objects.filter(
+        org__iexact=course_key.org,
+        course_id=CourseKeyField.Empty,
+        role__in=STUDIO_ACCESS_ROLES,
+    ).values_list('user_id', flat=True).distinct()
+    StudioAccessibleCourse.objects.bulk_create(
+        [StudioAccessibleCourse(user_id=user_id, course_id=course_key) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+
+
+def remove_course_from_index(course_key):
+    """
+    Remove the course identified by `course_key` from every index.
+    """
+    StudioAccessibleCourse.objects.filter(course_id=course_key).delete()
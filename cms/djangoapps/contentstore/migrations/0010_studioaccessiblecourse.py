@@ -0,0 +1,35 @@
+# Generated by Django 4.2.18 on 2026-10-19 10:12
+
+import django.db.models.deletion
+import opaque_keys.edx.django.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contentstore', '0009_learningcontextlinksstatus_publishableentitylink'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudioAccessibleCourse',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(db_index=True, max_length=255)),
+                (
+                    'user',
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'unique_together': {('user', 'course_id')},
+            },
+        ),
+    ]
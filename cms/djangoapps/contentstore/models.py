@@ -6,6 +6,7 @@ Models for contentstore
 from datetime import datetime, timezone
 
 from config_models.models import ConfigurationModel
+from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.db import models
 from django.db.models import QuerySet
 from django.db.models.fields import IntegerField, TextField
@@ -273,3 +274,23 @@ class LearningContextLinksStatus(models.Model):
         self.status = status
         self.updated = updated or datetime.now(tz=timezone.utc)
         self.save()
+
+
+class StudioAccessibleCourse(models.Model):
+    """
+    Denormalized index of the courses a user can see on the Studio home page through their
+    course or organization level staff and instructor roles.
+
+    Rows are maintained by the role, course publish and course delete signal handlers, see
+    :mod:`cms.djangoapps.contentstore.course_access_index`.
+
+    .. no_pii:
+    """
+    user = models.ForeignKey(User, db_constraint=False, on_delete=models.CASCADE, related_name='+')
+    course_id = CourseKeyField(max_length=255, db_index=True)
+
+    class Meta:
+        unique_together = ('user', 'course_id')
+
+    def __str__(self):
+        return f"{self.user_id}|{self.course_id}"
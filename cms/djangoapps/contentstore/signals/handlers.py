@@ -44,6 +44,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import SignalHandler, modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
+from ..course_access_index import add_course_to_index, remove_course_from_index
 from ..models import PublishableEntityLink
 from ..tasks import (
     create_or_update_upstream_links,
@@ -176,6 +177,9 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
     # Send to a signal for catalog info changes as well, but only once we know the transaction is committed.
     transaction.on_commit(lambda: emit_catalog_info_changed_signal(course_key))
 
+    # Make a newly created course visible to the staff of its organization on the Studio home page.
+    add_course_to_index(course_key)
+
 
 @receiver(SignalHandler.course_deleted)
 def listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
@@ -184,6 +188,7 @@ def listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=u
     and removes its entry from the Course About Search index.
     """
     CourseAboutSearchIndexer.remove_deleted_items(course_key)
+    remove_course_from_index(course_key)
 
 
 @receiver(SignalHandler.library_updated)
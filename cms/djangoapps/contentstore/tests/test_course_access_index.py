@@ -0,0 +1,132 @@
+"""
+Tests for the denormalized index of the courses accessible to each user in Studio.
+"""
+from ccx_keys.locator import CCXLocator
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from edx_toggles.toggles.testutils import override_waffle_flag
+from opaque_keys.edx.locator import CourseLocator
+
+from cms.djangoapps.contentstore.course_access_index import (
+    CourseAccessNotIndexable,
+    add_course_to_index,
+    get_accessible_courses,
+    remove_course_from_index,
+)
+from cms.djangoapps.contentstore.models import StudioAccessibleCourse
+from cms.djangoapps.contentstore.toggles import USE_COURSE_ACCESS_INDEX
+from cms.djangoapps.contentstore.views.course import get_courses_accessible_to_user
+from common.djangoapps.student.models import CourseAccessRole
+from common.djangoapps.student.roles import (
+    CourseBetaTesterRole,
+    CourseInstructorRole,
+    CourseStaffRole,
+    GlobalStaff,
+    OrgStaffRole,
+)
+from common.djangoapps.student.tests.factories import UserFactory
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+
+
+class CourseAccessIndexTestCase(TestCase):
+    """
+    Tests for the course access index.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = UserFactory()
+        self.course_keys = [CourseLocator('Org1', f'Course{index}', 'Run') for index in range(3)]
+        for course_key in self.course_keys:
+            CourseOverviewFactory.create(id=course_key, org=course_key.org)
+        self.other_org_course_key = CourseLocator('Org2', 'Course', 'Run')
+        CourseOverviewFactory.create(id=self.other_org_course_key, org='Org2')
+
+    def _accessible_course_keys(self):
+        """
+        Return the set of keys of the courses accessible to the user.
+        """
+        return set(get_accessible_courses(self.user).values_list('id', flat=True))
+
+    def test_no_roles(self):
+        assert self._accessible_course_keys() == set()
+
+    def test_course_roles(self):
+        CourseStaffRole(self.course_keys[0]).add_users(self.user)
+        CourseInstructorRole(self.course_keys[1]).add_users(self.user)
+        CourseBetaTesterRole(self.course_keys[2]).add_users(self.user)
+        assert self._accessible_course_keys() == {self.course_keys[0], self.course_keys[1]}
+
+    def test_org_roles(self):
+        OrgStaffRole('Org1').add_users(self.user)
+        assert self._accessible_course_keys() == set(self.course_keys)
+
+    def test_ccx_courses_are_not_indexed(self):
+        ccx_key = CCXLocator.from_course_locator(self.course_keys[0], '1')
+        CourseStaffRole(ccx_key).add_users(self.user)
+        assert self._accessible_course_keys() == set()
+
+    def test_role_changes_update_index(self):
+        CourseStaffRole(self.course_keys[0]).add_users(self.user)
+        assert self._accessible_course_keys() == {self.course_keys[0]}
+
+        CourseStaffRole(self.course_keys[0]).remove_users(self.user)
+        CourseStaffRole(self.course_keys[1]).add_users(self.user)
+        assert self._accessible_course_keys() == {self.course_keys[1]}
+
+    def test_index_is_reused(self):
+        CourseStaffRole(self.course_keys[0]).add_users(self.user)
+        self._accessible_course_keys()
+        with self.assertNumQueries(1):
+            assert self._accessible_course_keys() == {self.course_keys[0]}
+
+    def test_published_course_added_for_org_staff(self):
+        OrgStaffRole('Org1').add_users(self.user)
+        self._accessible_course_keys()
+
+        new_course_key = CourseLocator('Org1', 'NewCourse', 'Run')
+        CourseOverviewFactory.create(id=new_course_key, org='Org1')
+        add_course_to_index(new_course_key)
+        assert new_course_key in self._accessible_course_keys()
+
+        remove_course_from_index(new_course_key)
+        assert not StudioAccessibleCourse.objects.filter(course_id=new_course_key).exists()
+
+    def test_role_without_org_or_course(self):
+        CourseAccessRole.objects.create(user=self.user, org='', role=CourseStaffRole.ROLE)
+        with self.assertRaises(CourseAccessNotIndexable):
+            get_accessible_courses(self.user)
+
+
+@override_waffle_flag(USE_COURSE_ACCESS_INDEX, active=True)
+class CourseAccessIndexListingTestCase(CourseAccessIndexTestCase):
+    """
+    Tests for listing the courses of the Studio home page from the course access index.
+    """
+
+    def _list_courses(self, path='/course'):
+        """
+        Return the keys of the courses listed for the user.
+        """
+        request = RequestFactory().get(path)
+        request.user = self.user
+        courses, __ = get_courses_accessible_to_user(request)
+        return [course.id for course in courses]
+
+    def test_listing(self):
+        OrgStaffRole('Org1').add_users(self.user)
+        assert set(self._list_courses()) == set(self.course_keys)
+
+    def test_listing_search_and_order(self):
+        OrgStaffRole('Org1').add_users(self.user)
+        assert self._list_courses('/course?order=-id') == sorted(self.course_keys, key=str, reverse=True)
+        assert self._list_courses('/course?search=Course1') == [self.course_keys[1]]
+
+    def test_listing_global_staff(self):
+        GlobalStaff().add_users(self.user)
+        assert set(self._list_courses()) == set(self.course_keys) | {self.other_org_course_key}
+
+    def test_listing_fallback(self):
+        CourseAccessRole.objects.create(user=self.user, org='', role=CourseStaffRole.ROLE)
+        assert self._list_courses() == []
@@ -12,6 +12,7 @@ from uuid import uuid4
 import ddt
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from django.test.utils import override_settings
 from django.utils import translation
 
@@ -641,6 +642,57 @@ class TestTranscript(unittest.TestCase):
         result = transcripts_utils.Transcript.convert(latin1_sjson_bytes, 'sjson', 'srt')
         assert result == expected_result
 
+    def test_convert_srt_with_positions_to_sjson(self):
+        """
+        Tests that srt transcripts which aren't parsed by `parse_srt`, such as those with
+        positions, are converted by pysrt.
+        """
+        srt_transcript = self.srt_transcript.replace('00:00:13,000', '00:00:13,000 X1:40 X2:600')
+        assert transcripts_utils.parse_srt(srt_transcript) is None
+        actual = transcripts_utils.Transcript.convert(srt_transcript, 'srt', 'sjson')
+        self.assertDictEqual(json.loads(actual), json.loads(self.sjson_transcript))
+
+    def test_parse_srt(self):
+        """
+        Tests that `parse_srt` reads srt transcripts with windows line endings, period
+        separated milliseconds and multi-line captions.
+        """
+        srt_transcript = '1\r\n00:01:10.500 --> 01:00:13,000\r\nFirst line\r\nSecond line\r\n\r\n\r\n'
+        assert transcripts_utils.parse_srt(srt_transcript) == [(70500, 3613000, 'First line\nSecond line')]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestCachedTranscriptConversion(unittest.TestCase):
+    """
+    Tests for `get_cached_transcript_conversion`.
+    """
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(cache.clear)
+
+    def test_conversion_cached_by_content(self):
+        convert = Mock(side_effect=['first', 'second', 'third'])
+
+        for __ in range(2):
+            converted = transcripts_utils.get_cached_transcript_conversion(
+                'video-id', 'en', 'srt', 'sjson', 'content', convert
+            )
+            assert converted == 'first'
+        assert transcripts_utils.get_cached_transcript_conversion(
+            'video-id', 'en', 'srt', 'sjson', 'new content', convert
+        ) == 'second'
+        assert transcripts_utils.get_cached_transcript_conversion(
+            'video-id', 'en', 'srt', 'txt', 'content', convert
+        ) == 'third'
+        assert convert.call_count == 3
+
+    def test_same_format_not_cached(self):
+        convert = Mock(return_value='content')
+
+        for __ in range(2):
+            transcripts_utils.get_cached_transcript_conversion('video-id', 'en', 'srt', 'srt', 'content', convert)
+        assert convert.call_count == 2
+
 
 class TestSubsFilename(unittest.TestCase):
     """
@@ -52,6 +52,27 @@ BYPASS_OLX_FAILURE = WaffleFlag(
 )
 
 
+# .. toggle_name: contentstore.use_course_access_index
+# .. toggle_implementation: WaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Serve the list of courses on the Studio home page from the denormalized index of
+#   the courses accessible to each user, so that it is filtered, ordered and paginated in a single SQL query.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-19
+USE_COURSE_ACCESS_INDEX = WaffleFlag(
+    f'{CONTENTSTORE_NAMESPACE}.use_course_access_index',
+    __name__,
+    CONTENTSTORE_LOG_PREFIX,
+)
+
+
+def use_course_access_index():
+    """
+    Returns a boolean if the Studio home course list should be served from the course access index.
+    """
+    return USE_COURSE_ACCESS_INDEX.is_enabled()
+
+
 def split_library_view_on_dashboard():
     """
     check if data new view for library is enabled on studio dashboard.
@@ -602,29 +602,33 @@ def is_currently_visible_to_students(xblock):
     return True
 
 
-def has_children_visible_to_specific_partition_groups(xblock):
+def has_children_visible_to_specific_partition_groups(xblock, course=None, active_partitions=None):
     """
     Returns True if this xblock has children that are limited to specific user partition groups.
     Note that this method is not recursive (it does not check grandchildren).
+
+    The optional course and active_partitions arguments are passed on to get_user_partition_info.
     """
     if not xblock.has_children:
         return False
 
     for child in xblock.get_children():
-        if is_visible_to_specific_partition_groups(child):
+        if is_visible_to_specific_partition_groups(child, course=course, active_partitions=active_partitions):
             return True
 
     return False
 
 
-def is_visible_to_specific_partition_groups(xblock):
+def is_visible_to_specific_partition_groups(xblock, course=None, active_partitions=None):
     """
     Returns True if this xblock has visibility limited to specific user partition groups.
+
+    The optional course and active_partitions arguments are passed on to get_user_partition_info.
     """
     if not xblock.group_access:
         return False
 
-    for partition in get_user_partition_info(xblock):
+    for partition in get_user_partition_info(xblock, course=course, active_partitions=active_partitions):
         if any(g["selected"] for g in partition["groups"]):
             return True
 
@@ -749,7 +753,17 @@ def get_split_group_display_name(xblock, course):
                 return group['name']
 
 
-def get_user_partition_info(xblock, schemes=None, course=None):
+def get_active_partitions(course):
+    """
+    Returns the active user partitions of the course, including the dynamic ones, sorted by name.
+
+    The result can be passed to get_user_partition_info and get_visibility_partition_info as
+    `active_partitions` when they are called for many xblocks of the same course.
+    """
+    return sorted(get_all_partitions_for_course(course, active_only=True), key=lambda p: p.name)
+
+
+def get_user_partition_info(xblock, schemes=None, course=None, active_partitions=None):
     """
     Retrieve user partition information for an XBlock for display in editors.
 
@@ -769,6 +783,11 @@ def get_user_partition_info(xblock, schemes=None, course=None):
             instead of loading the course.  This is useful if we're calling this function multiple
             times for the same course want to minimize queries to the modulestore.
 
+        active_partitions (list): The active partitions of the course, as returned by
+            get_active_partitions.  If provided, they are used instead of recomputing the
+            partitions of the course, which is useful when calling this function for many
+            xblocks of the same course.
+
     Returns: list
 
     Example Usage:
@@ -809,20 +828,23 @@ def get_user_partition_info(xblock, schemes=None, course=None):
     ]
 
     """
-    course = course or modulestore().get_course(xblock.location.course_key)
+    if active_partitions is None:
+        course = course or modulestore().get_course(xblock.location.course_key)
 
-    if course is None:
-        log.warning(
-            "Could not find course %s to retrieve user partition information",
-            xblock.location.course_key
-        )
-        return []
+        if course is None:
+            log.warning(
+                "Could not find course %s to retrieve user partition information",
+                xblock.location.course_key
+            )
+            return []
+
+        active_partitions = get_active_partitions(course)
 
     if schemes is not None:
         schemes = set(schemes)
 
     partitions = []
-    for p in sorted(get_all_partitions_for_course(course, active_only=True), key=lambda p: p.name):
+    for p in active_partitions:
 
         # Exclude disabled partitions, partitions with no groups defined
         # The exception to this case is when there is a selected group within that partition, which means there is
@@ -866,7 +888,7 @@ def get_user_partition_info(xblock, schemes=None, course=None):
     return partitions
 
 
-def get_visibility_partition_info(xblock, course=None):
+def get_visibility_partition_info(xblock, course=None, active_partitions=None):
     """
     Retrieve user partition information for the component visibility editor.
 
@@ -879,12 +901,20 @@ def get_visibility_partition_info(xblock, course=None):
             instead of loading the course.  This is useful if we're calling this function multiple
             times for the same course want to minimize queries to the modulestore.
 
+        active_partitions (list): The active partitions of the course, as returned by
+            get_active_partitions.  If not provided, they are computed once from the course.
+
     Returns: dict
 
     """
+    if active_partitions is None and course is not None:
+        active_partitions = get_active_partitions(course)
+
     selectable_partitions = []
     # We wish to display enrollment partitions before cohort partitions.
-    enrollment_user_partitions = get_user_partition_info(xblock, schemes=["enrollment_track"], course=course)
+    enrollment_user_partitions = get_user_partition_info(
+        xblock, schemes=["enrollment_track"], course=course, active_partitions=active_partitions
+    )
 
     # For enrollment partitions, we only show them if there is a selected group or
     # or if the number of groups > 1.
@@ -892,16 +922,22 @@ def get_visibility_partition_info(xblock, course=None):
         if len(partition["groups"]) > 1 or any(group["selected"] for group in partition["groups"]):
             selectable_partitions.append(partition)
 
-    team_user_partitions = get_user_partition_info(xblock, schemes=["team"], course=course)
+    team_user_partitions = get_user_partition_info(
+        xblock, schemes=["team"], course=course, active_partitions=active_partitions
+    )
     selectable_partitions += team_user_partitions
 
     course_key = xblock.scope_ids.usage_id.course_key
     is_library = isinstance(course_key, LibraryLocator)
     if not is_library and ContentTypeGatingConfig.current(course_key=course_key).studio_override_enabled:
-        selectable_partitions += get_user_partition_info(xblock, schemes=[CONTENT_TYPE_GATING_SCHEME], course=course)
+        selectable_partitions += get_user_partition_info(
+            xblock, schemes=[CONTENT_TYPE_GATING_SCHEME], course=course, active_partitions=active_partitions
+        )
 
     # Now add the cohort user partitions.
-    selectable_partitions = selectable_partitions + get_user_partition_info(xblock, schemes=["cohort"], course=course)
+    selectable_partitions = selectable_partitions + get_user_partition_info(
+        xblock, schemes=["cohort"], course=course, active_partitions=active_partitions
+    )
 
     # Find the first partition with a selected group. That will be the one initially enabled in the dialog
     # (if the course has only been added in Studio, only one partition should have a selected group).
@@ -77,11 +77,13 @@ from ..course_group_config import (
     GroupConfiguration,
     GroupConfigurationsValidationError
 )
+from ..course_access_index import CourseAccessNotIndexable, get_accessible_courses
 from ..course_info_model import delete_course_update, get_course_updates, update_course_updates
 from ..courseware_index import CoursewareSearchIndexer, SearchIndexingError
 from ..tasks import rerun_course as rerun_course_task
 from ..toggles import (
     default_enable_flexible_peer_openassessments,
+    use_course_access_index,
     use_new_course_outline_page,
     use_new_home_page,
     use_new_updates_page,
@@ -574,6 +576,35 @@ def _accessible_courses_list_from_groups(request):
     return courses_list, []
 
 
+def _accessible_courses_from_index(request):
+    """
+    List all courses available to the logged in user as a queryset, filtered and ordered
+    in SQL, using the denormalized course access index for users who aren't global staff.
+
+    Raises:
+        CourseAccessNotIndexable: if the user holds a role the index can't represent.
+    """
+    if GlobalStaff().has_user(request.user):
+        # Global staff can access every course, except CCXs which can't be edited in Studio.
+        courses = CourseOverview.get_all_courses().exclude(
+            id__startswith=f'{CCXLocator.CANONICAL_NAMESPACE}:'
+        )
+        in_process_course_actions = get_in_process_course_actions(request)
+    else:
+        courses = get_accessible_courses(request.user)
+        in_process_course_actions = []
+
+    search_query, order, active_only, archived_only = get_query_params_if_present(request)
+    courses = get_filtered_and_ordered_courses(
+        courses,
+        active_only,
+        archived_only,
+        search_query,
+        order,
+    )
+    return courses, in_process_course_actions
+
+
 def get_courses_by_status(
     active_only: bool,
     archived_only: bool,
@@ -754,6 +785,14 @@ def get_courses_accessible_to_user(request):
     Arguments:
         request: the request object
     """
+    if use_course_access_index():
+        try:
+            return _accessible_courses_from_index(request)
+        except CourseAccessNotIndexable:
+            # user has a role which is neither course nor org specific,
+            # so fallback to iterating through all courses
+            return _accessible_courses_summary_iter(request)
+
     if GlobalStaff().has_user(request.user):
         # user has global access so no need to get courses from django groups
         courses, in_process_course_actions = _accessible_courses_summary_iter(request)
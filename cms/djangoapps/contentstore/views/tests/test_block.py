@@ -4388,6 +4388,33 @@ class TestXBlockPublishingInfo(ItemTest):
             xblock_info, True, path=self.FIRST_UNIT_PATH
         )
 
+    def test_outline_has_changes(self):
+        """
+        Tests that the outline reports the unpublished changes of each block and of its descendants.
+        """
+        chapter = self._create_child(self.course, "chapter", "Test Chapter")
+        sequential = self._create_child(chapter, "sequential", "Test Sequential")
+        unit = self._create_child(sequential, "vertical", "Unit", publish_item=True)
+        self._create_child(sequential, "vertical", "Other Unit", publish_item=True)
+        self.store.publish(chapter.location, self.user.id)
+
+        xblock_info = self._get_xblock_outline_info(chapter.location)
+        self._verify_xblock_info_state(xblock_info, "has_changes", False)
+        self._verify_xblock_info_state(xblock_info, "has_changes", False, path=self.FIRST_SUBSECTION_PATH)
+
+        self._set_display_name(unit.location, "Updated Unit")
+        xblock_info = self._get_xblock_outline_info(chapter.location)
+        self._verify_xblock_info_state(xblock_info, "has_changes", True)
+        self._verify_xblock_info_state(xblock_info, "has_changes", True, path=self.FIRST_SUBSECTION_PATH)
+        self._verify_xblock_info_state(xblock_info, "has_changes", True, path=self.FIRST_UNIT_PATH)
+        self._verify_xblock_info_state(xblock_info, "has_changes", False, path=self.SECOND_UNIT_PATH)
+
+        self.store.publish(chapter.location, self.user.id)
+        self._set_display_name(chapter.location, "Updated Chapter")
+        xblock_info = self._get_xblock_outline_info(chapter.location)
+        self._verify_xblock_info_state(xblock_info, "has_changes", True)
+        self._verify_xblock_info_state(xblock_info, "has_changes", False, path=self.FIRST_SUBSECTION_PATH)
+
     def test_self_paced_item_visibility_state(self):
         """
         Test that in self-paced course, item has `live` visibility state.
@@ -11,7 +11,7 @@ from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE
 from xmodule.modulestore.tests.factories import BlockFactory
 
 from cms.djangoapps.contentstore.tests.utils import CourseTestCase
-from cms.djangoapps.contentstore.utils import reverse_usage_url
+from cms.djangoapps.contentstore.utils import reverse_course_url, reverse_usage_url
 from openedx.core.lib.gating.api import GATING_NAMESPACE_QUALIFIER
 
 from cms.djangoapps.contentstore.xblock_storage_handlers.view_handlers import VisibilityState
@@ -147,6 +147,44 @@ class TestSubsectionGating(CourseTestCase):
         self.assertEqual(resp['prereq_min_completion'], min_completion)
         self.assertEqual(resp['visibility_state'], VisibilityState.gated)
 
+    @patch('cms.djangoapps.contentstore.xblock_storage_handlers.view_handlers.gating_api.get_prerequisites')
+    @patch('cms.djangoapps.contentstore.xblock_storage_handlers.view_handlers.gating_api.get_required_content')
+    @patch('cms.djangoapps.contentstore.xblock_storage_handlers.view_handlers.gating_api.is_prerequisite')
+    @patch(
+        'cms.djangoapps.contentstore.xblock_storage_handlers.view_handlers.gating_api'
+        '.get_required_content_by_gated_content'
+    )
+    @patch('cms.djangoapps.contentstore.xblock_storage_handlers.view_handlers.gating_api.get_prerequisite_content_keys')
+    def test_course_outline_gating_info(
+            self, mock_get_prereq_keys, mock_get_required_content_by_gated_content,
+            mock_is_prereq, mock_get_required_content, mock_get_prereqs
+    ):
+        """
+        Test the course outline looks up the gating milestones of the whole course at once
+        """
+        mock_get_prereq_keys.return_value = {str(self.seq1.location)}
+        mock_get_required_content_by_gated_content.return_value = {
+            str(self.seq2.location): (str(self.seq1.location), 80, 90),
+        }
+        mock_get_prereqs.return_value = [
+            {'namespace': f'{str(self.seq1.location)}{GATING_NAMESPACE_QUALIFIER}'},
+        ]
+        outline_url = reverse_course_url('course_handler', self.course.id)
+        resp = json.loads(self.client.get_json(outline_url).content.decode('utf-8'))
+
+        seq1_info, seq2_info = resp['child_info']['children'][0]['child_info']['children']
+        self.assertTrue(seq1_info['is_prereq'])
+        self.assertIsNone(seq1_info['prereq'])
+        self.assertFalse(seq2_info['is_prereq'])
+        self.assertEqual(seq2_info['prereq'], str(self.seq1.location))
+        self.assertEqual(seq2_info['prereq_min_score'], 80)
+        self.assertEqual(seq2_info['prereq_min_completion'], 90)
+        self.assertEqual(seq2_info['visibility_state'], VisibilityState.gated)
+        mock_get_prereq_keys.assert_called_once_with(self.course.id)
+        mock_get_required_content_by_gated_content.assert_called_once_with(self.course.id)
+        mock_is_prereq.assert_not_called()
+        mock_get_required_content.assert_not_called()
+
     @patch('cms.djangoapps.contentstore.signals.handlers.gating_api.set_required_content')
     @patch('cms.djangoapps.contentstore.signals.handlers.gating_api.remove_prerequisite')
     def test_delete_item_signal_handler_called(self, mock_remove_prereq, mock_set_required):
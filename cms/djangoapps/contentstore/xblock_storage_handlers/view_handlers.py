@@ -22,6 +22,7 @@ from edx_django_utils.plugins import pluggable_override
 from openedx.core.djangoapps.content_tagging.api import get_object_tag_counts
 from edx_proctoring.api import (
     does_backend_support_onboarding,
+    get_all_exams_for_course,
     get_exam_by_content_id,
     get_exam_configuration_dashboard_url,
 )
@@ -63,6 +64,7 @@ from xmodule.tabs import CourseTabList
 from ..utils import (
     ancestor_has_staff_lock,
     find_release_date_source,
+    get_active_partitions,
     find_staff_lock_source,
     get_split_group_display_name,
     get_user_partition_info,
@@ -884,7 +886,19 @@ def get_block_info(
         return xblock_info
 
 
-def _get_gating_info(course, xblock):
+@request_cached()
+def _get_course_gating_milestones(course_key):
+    """
+    Returns the prerequisite content keys and the required content of every gated content of
+    the course, so that the course outline does not query them for every subsection.
+    """
+    return (
+        gating_api.get_prerequisite_content_keys(course_key),
+        gating_api.get_required_content_by_gated_content(course_key),
+    )
+
+
+def _get_gating_info(course, xblock, course_outline=False):
     """
     Returns a dict containing gating information for the given xblock which
     can be added to xblock info responses.
@@ -892,6 +906,9 @@ def _get_gating_info(course, xblock):
     Arguments:
         course (CourseBlock): The course
         xblock (XBlock): The xblock
+        course_outline (bool): Whether the xblock is being rendered on behalf of the
+            course outline, in which case the gating milestones of the whole course are
+            looked up at once.
 
     Returns:
         dict: Gating information
@@ -902,17 +919,19 @@ def _get_gating_info(course, xblock):
             # Cache gating prerequisites on course block so that we are not
             # hitting the database for every xblock in the course
             course.gating_prerequisites = gating_api.get_prerequisites(course.id)
-        info["is_prereq"] = gating_api.is_prerequisite(course.id, xblock.location)
+        if course_outline:
+            prereq_content_keys, required_content = _get_course_gating_milestones(course.id)
+            info["is_prereq"] = str(xblock.location) in prereq_content_keys
+            gating_requirements = required_content.get(str(xblock.location), (None, None, None))
+        else:
+            info["is_prereq"] = gating_api.is_prerequisite(course.id, xblock.location)
+            gating_requirements = gating_api.get_required_content(course.id, xblock.location)
         info["prereqs"] = [
             p
             for p in course.gating_prerequisites
             if str(xblock.location) not in p["namespace"]
         ]
-        (
-            prereq,
-            prereq_min_score,
-            prereq_min_completion,
-        ) = gating_api.get_required_content(course.id, xblock.location)
+        prereq, prereq_min_score, prereq_min_completion = gating_requirements
         info["prereq"] = prereq
         info["prereq_min_score"] = prereq_min_score
         info["prereq_min_completion"] = prereq_min_completion
@@ -963,10 +982,6 @@ def create_xblock_info(  # lint-amnesty, pylint: disable=too-many-statements
     """
     is_library_block = isinstance(xblock.location, LibraryUsageLocator)
     is_xblock_unit = is_unit(xblock, parent_xblock)
-    # this should not be calculated for Sections and Subsections on Unit page or for library blocks
-    has_changes = None
-    if (is_xblock_unit or course_outline) and not is_library_block:
-        has_changes = modulestore().has_changes(xblock)
 
     if graders is None:
         if not is_library_block:
@@ -1004,6 +1019,11 @@ def create_xblock_info(  # lint-amnesty, pylint: disable=too-many-statements
     else:
         child_info = None
 
+    # this should not be calculated for Sections and Subsections on Unit page or for library blocks
+    has_changes = None
+    if (is_xblock_unit or course_outline) and not is_library_block:
+        has_changes = _has_changes(xblock, child_info)
+
     release_date = _get_release_date(xblock, user)
 
     if xblock.category != "course" and not is_concise:
@@ -1089,7 +1109,10 @@ def create_xblock_info(  # lint-amnesty, pylint: disable=too-many-statements
             group_display_name if group_display_name else xblock_info["display_name"]
         )
     else:
-        user_partitions = get_user_partition_info(xblock, course=course)
+        # The course outline renders every block of the course, so compute the course's
+        # partitions once rather than several times per block.
+        active_partitions = _get_course_active_partitions(course) if course_outline else None
+        user_partitions = get_user_partition_info(xblock, course=course, active_partitions=active_partitions)
         xblock_info.update(
             {
                 "edited_on": get_default_time_display(xblock.subtree_edited_on)
@@ -1206,7 +1229,7 @@ def create_xblock_info(  # lint-amnesty, pylint: disable=too-many-statements
                     {
                         "is_proctored_exam": xblock.is_proctored_exam,
                         "was_exam_ever_linked_with_external": _was_xblock_ever_exam_linked_with_external(
-                            course, xblock
+                            course, xblock, course_outline
                         ),
                         "online_proctoring_rules": rules_url,
                         "is_practice_exam": xblock.is_practice_exam,
@@ -1221,7 +1244,7 @@ def create_xblock_info(  # lint-amnesty, pylint: disable=too-many-statements
                 )
 
         # Update with gating info
-        xblock_info.update(_get_gating_info(course, xblock))
+        xblock_info.update(_get_gating_info(course, xblock, course_outline))
         if is_xblock_unit:
             # if xblock is a Unit we add the discussion_enabled option
             xblock_info["discussion_enabled"] = xblock.discussion_enabled
@@ -1279,11 +1302,11 @@ def create_xblock_info(  # lint-amnesty, pylint: disable=too-many-statements
                 xblock_info["course_tags_count"] = _get_course_tags_count(course.id)
                 xblock_info["tag_counts_by_block"] = _get_course_block_tags(xblock.location.context_key)
 
-            xblock_info[
-                "has_partition_group_components"
-            ] = has_children_visible_to_specific_partition_groups(xblock)
+            xblock_info["has_partition_group_components"] = _has_children_visible_to_specific_partition_groups(
+                xblock, child_info, course, active_partitions
+            )
         xblock_info["user_partition_info"] = get_visibility_partition_info(
-            xblock, course=course
+            xblock, course=course, active_partitions=active_partitions
         )
 
         if course_outline or is_xblock_unit:
@@ -1296,6 +1319,50 @@ def create_xblock_info(  # lint-amnesty, pylint: disable=too-many-statements
     return xblock_info
 
 
+def _get_all_children_info(xblock, child_info, key):
+    """
+    Returns the info of all of the children of the xblock, if it was computed and includes `key`, or None.
+
+    The course outline is built bottom-up, so the values aggregated from the subtree of a block
+    are derived from the info of its children rather than by walking its subtree again.
+    """
+    children = child_info.get("children") if child_info else None
+    if children is None or len(children) != len(xblock.children):
+        return None
+    if any(child.get(key) is None for child in children):
+        return None
+    return children
+
+
+def _has_changes(xblock, child_info):
+    """
+    Returns whether the xblock or any of its descendants has unpublished changes.
+    """
+    children = _get_all_children_info(xblock, child_info, "has_changes")
+    if children is None:
+        return modulestore().has_changes(xblock)
+    return any(child["has_changes"] for child in children) or modulestore().has_changes(
+        xblock, include_children=False
+    )
+
+
+def _has_children_visible_to_specific_partition_groups(xblock, child_info, course, active_partitions):
+    """
+    Returns whether any of the children of the xblock is limited to specific user partition groups.
+    """
+    children = _get_all_children_info(xblock, child_info, "user_partitions")
+    if children is None:
+        return has_children_visible_to_specific_partition_groups(
+            xblock, course=course, active_partitions=active_partitions
+        )
+    return any(
+        group["selected"]
+        for child in children
+        for partition in child["user_partitions"]
+        for group in partition["groups"]
+    )
+
+
 @request_cached()
 def _get_course_tags_count(course_key) -> dict:
     """
@@ -1322,7 +1389,23 @@ def _get_course_block_tags(course_key) -> dict:
     return get_object_tag_counts(catch_all_key_pattern, count_implicit=True)
 
 
-def _was_xblock_ever_exam_linked_with_external(course, xblock):
+@request_cached(arg_map_function=lambda course: str(course.id))
+def _get_course_active_partitions(course):
+    """
+    Get the active user partitions of the course, sorted by name.
+    """
+    return get_active_partitions(course)
+
+
+@request_cached()
+def _get_course_exams_by_content_id(course_key) -> dict:
+    """
+    Get the proctoring exams of the course, including the inactive ones, as a dict: {content_id: exam}
+    """
+    return {exam["content_id"]: exam for exam in get_all_exams_for_course(str(course_key))}
+
+
+def _was_xblock_ever_exam_linked_with_external(course, xblock, course_outline=False):
     """
     Determine whether this XBlock is or was ever configured as an external proctored exam.
 
@@ -1333,12 +1416,18 @@ def _was_xblock_ever_exam_linked_with_external(course, xblock):
     If an exception is not raised, then we know that such a record exists,
     indicating that this *was* once an externally linked proctored exam.
 
+    When rendering the course outline, the exams of the whole course are looked up at once.
+
     Arguments:
         course (CourseBlock)
         xblock (XBlock)
+        course_outline (bool)
 
     Returns: bool
     """
+    if course_outline:
+        exam = _get_course_exams_by_content_id(course.id).get(str(xblock.location))
+        return bool(exam and exam.get("external_id"))
     try:
         exam = get_exam_by_content_id(course.id, xblock.location)
         return bool("external_id" in exam and exam["external_id"])
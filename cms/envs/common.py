@@ -1767,7 +1767,7 @@ INSTALLED_APPS = [
     # other apps that are.  Django 1.8 wants to have imported models supported
     # by installed apps.
     'openedx.core.djangoapps.oauth_dispatch.apps.OAuthDispatchAppConfig',
-    'lms.djangoapps.courseware',
+    'lms.djangoapps.courseware.apps.CoursewareConfig',
     'lms.djangoapps.coursewarehistoryextended',
     'lms.djangoapps.survey.apps.SurveyConfig',
     'lms.djangoapps.verify_student.apps.VerifyStudentConfig',
@@ -1930,8 +1930,7 @@ EVENT_TRACKING_BACKENDS = {
                 }
             },
             'processors': [
-                {'ENGINE': 'common.djangoapps.track.shim.LegacyFieldMappingProcessor'},
-                {'ENGINE': 'common.djangoapps.track.shim.PrefixedEventProcessor'}
+                {'ENGINE': 'common.djangoapps.track.shim.LegacyEventProcessor'}
             ]
         }
     },
@@ -2593,6 +2592,12 @@ BULK_EMAIL_DEFAULT_FROM_EMAIL = 'no-reply@example.com'
 # a bulk email message.
 BULK_EMAIL_LOG_SENT_EMAILS = False
 
+############### Settings for cohorts ##################
+# Seconds the index of the cohort memberships of a course, kept in shards of user ids, and its
+# cohorts are cached for. Shards are also invalidated when memberships of their users change,
+# once the change is committed. 0 disables the cache.
+COHORT_MEMBERSHIP_INDEX_CACHE_TIMEOUT = 60 * 60
+
 ############### Settings for django file storage ##################
 DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
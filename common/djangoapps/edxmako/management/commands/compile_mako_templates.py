@@ -0,0 +1,87 @@
+"""
+Compile the Mako templates of every template lookup namespace ahead of time.
+
+Mako writes the module of each compiled template to MAKO_MODULE_DIR, where every process
+of the host loads it from instead of compiling the template again. Running this command
+after deployment, on each host, spares new workers from compiling templates on their first
+requests. Templates overridden by themes are compiled under the paths the themes resolve
+them to.
+
+Example:
+    ./manage.py lms compile_mako_templates
+    ./manage.py lms compile_mako_templates --namespace main
+"""
+
+
+import logging
+import os
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+from mako.lookup import TemplateLookup
+
+from common.djangoapps.edxmako import LOOKUP
+from openedx.core.djangoapps.theming.helpers import get_themes
+
+LOG = logging.getLogger(__name__)
+
+
+def _template_uris(directory, themes):
+    """
+    Yields the URIs of the templates in the directory of a template lookup.
+
+    Only the templates directories of the themes are searched in a themes directory.
+    """
+    roots = [
+        (os.path.join(directory, theme.template_path), str(theme.template_path))
+        for theme in themes
+        if os.path.normpath(theme.themes_base_dir) == directory
+    ] or [(directory, '')]
+
+    for root, uri_prefix in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(dirname for dirname in dirnames if not dirname.startswith('.'))
+            for filename in sorted(filenames):
+                if not filename.startswith('.'):
+                    yield os.path.join(uri_prefix, os.path.relpath(os.path.join(dirpath, filename), root))
+
+
+class Command(BaseCommand):
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--namespace',
+            action='append',
+            dest='namespaces',
+            help='Template lookup namespace to compile, all of them by default. May be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        namespaces = options['namespaces'] or sorted(LOOKUP)
+        unknown = set(namespaces) - set(LOOKUP)
+        if unknown:
+            raise CommandError(f'Unknown template lookup namespaces: {", ".join(sorted(unknown))}')
+
+        themes = get_themes()
+        for namespace in namespaces:
+            lookup = LOOKUP[namespace]
+            compiled = set()
+            failed = 0
+            for directory in list(lookup.directories):
+                for uri in _template_uris(directory, themes):
+                    if uri in compiled:
+                        # Mako resolves the uri to the template of the first directory
+                        continue
+                    try:
+                        # Skip the theme lookup of the current site, the uri already is the path of the template
+                        TemplateLookup.get_template(lookup, uri)
+                    except Exception:  # pylint: disable=broad-except
+                        # Files in template directories aren't all Mako templates
+                        LOG.debug('Failed to compile %s in the %s template lookup.', uri, namespace, exc_info=True)
+                        failed += 1
+                    else:
+                        compiled.add(uri)
+            self.stdout.write(
+                f'Compiled {len(compiled)} templates of the {namespace} template lookup, failed to compile {failed}.'
+            )
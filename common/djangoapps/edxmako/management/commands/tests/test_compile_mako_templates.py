@@ -0,0 +1,50 @@
+"""
+Tests for the compile_mako_templates management command.
+"""
+
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from common.djangoapps.edxmako import LOOKUP, add_lookup
+
+
+class CompileMakoTemplatesTest(TestCase):
+    """
+    Test the compile_mako_templates management command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.templates_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.templates_dir)
+        module_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, module_dir)
+
+        os.makedirs(os.path.join(self.templates_dir, 'emails'))
+        for name in ('main.html', os.path.join('emails', 'body.txt')):
+            with open(os.path.join(self.templates_dir, name), 'w') as template_file:
+                template_file.write('<%page args="name"/>Hello ${name}')
+
+        patcher = patch.dict('common.djangoapps.edxmako.LOOKUP', clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with override_settings(MAKO_MODULE_DIR=module_dir):
+            add_lookup('test', self.templates_dir)
+
+    def test_compile(self):
+        call_command('compile_mako_templates', '--namespace', 'test')
+
+        module_directory = LOOKUP['test'].template_args['module_directory']
+        assert os.path.exists(os.path.join(module_directory, 'main.html.py'))
+        assert os.path.exists(os.path.join(module_directory, 'emails', 'body.txt.py'))
+
+    def test_unknown_namespace(self):
+        with pytest.raises(CommandError):
+            call_command('compile_mako_templates', '--namespace', 'unknown')
@@ -0,0 +1,54 @@
+"""
+Recompute the maintained enrollment counts of courses from their enrollments.
+"""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from common.djangoapps.student.models import CourseEnrollment, CourseEnrollmentCount
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class Command(BaseCommand):
+    """
+    Management command to recompute the CourseEnrollmentCount rows of courses.
+    """
+    help = """
+    Recompute the maintained enrollment counts of the given courses, or of every course
+    with enrollments, from the enrollments themselves. Run it with --all to backfill the
+    counts once the student.maintain_enrollment_counters switch is on, before turning on
+    student.use_enrollment_counters, and after enrollments were changed with bulk queryset
+    updates, which bypass the counts.
+
+    Example:
+            $ ... reconcile_enrollment_counts course-v1:edX+DemoX+Demo_Course
+            $ ... reconcile_enrollment_counts --all
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'course_ids',
+            nargs='*',
+            help='Course keys of the courses to reconcile.')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reconcile every course with enrollments.')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            course_ids = CourseEnrollment.objects.order_by().values_list('course_id', flat=True).distinct()
+        elif options['course_ids']:
+            try:
+                course_ids = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as error:
+                raise CommandError(f'Invalid course key: {error}') from error
+        else:
+            raise CommandError('Provide course keys or --all.')
+
+        for course_id in course_ids:
+            CourseEnrollmentCount.reconcile(course_id)
+            logger.info('Reconciled the enrollment counts of course %s', course_id)
@@ -12,8 +12,8 @@ from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imp
 from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.core.validators import FileExtensionValidator
-from django.db import models
-from django.db.models import Count, Index, Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Index, Q
 from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -32,9 +32,11 @@ from openedx_filters.learning.filters import CourseEnrollmentStarted, CourseUnen
 from pytz import UTC
 from requests.exceptions import HTTPError, RequestException
 from simple_history.models import HistoricalRecords
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
 
 from common.djangoapps.course_modes.models import CourseMode, get_cosmetic_verified_display_price
 from common.djangoapps.student.signals import ENROLL_STATUS_CHANGE, ENROLLMENT_TRACK_UPDATED, UNENROLL_DONE
+from common.djangoapps.student.toggles import should_maintain_enrollment_counters, should_use_enrollment_counters
 from common.djangoapps.track import contexts, segment
 from common.djangoapps.util.query import use_read_replica_if_available
 from lms.djangoapps.certificates.data import CertificateStatuses
@@ -85,6 +87,9 @@ UNENROLLED_TO_UNENROLLED = 'from unenrolled to unenrolled'
 DEFAULT_TRANSITION_STATE = 'N/A'
 SCORE_RECALCULATION_DELAY_ON_ENROLLMENT_UPDATE = 30
 
+# Number of enrollments written per query by CourseEnrollment.bulk_enroll
+BULK_ENROLLMENT_BATCH_SIZE = 1000
+
 TRANSITION_STATES = (
     (UNENROLLED_TO_ALLOWEDTOENROLL, UNENROLLED_TO_ALLOWEDTOENROLL),
     (ALLOWEDTOENROLL_TO_ENROLLED, ALLOWEDTOENROLL_TO_ENROLLED),
@@ -233,6 +238,16 @@ class CourseEnrollmentManager(models.Manager):
         admins = CourseInstructorRole(course_locator).users_with_role()
         coaches = CourseCcxCoachRole(course_locator).users_with_role()
 
+        if should_use_enrollment_counters():
+            # Only the enrollments of the (few) staff, instructors and CCX coaches need to be counted.
+            total = sum(CourseEnrollmentCount.counts_for_course(course_id).values())
+            excluded = super().get_queryset().filter(
+                Q(user__in=staff) | Q(user__in=admins) | Q(user__in=coaches),
+                course_id=course_id,
+                is_active=1,
+            ).count()
+            return total - excluded
+
         return super().get_queryset().filter(
             course_id=course_id,
             is_active=1,
@@ -275,6 +290,14 @@ class CourseEnrollmentManager(models.Manager):
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
         """
+        if should_use_enrollment_counters():
+            enroll_dict = defaultdict(int)
+            for mode, count in CourseEnrollmentCount.counts_for_course(course_id).items():
+                if count:
+                    enroll_dict[mode] = count
+            enroll_dict['total'] = sum(enroll_dict.values())
+            return enroll_dict
+
         # Unfortunately, Django's "group by"-style queries look super-awkward
         query = use_read_replica_if_available(
             super().get_queryset().filter(course_id=course_id, is_active=True).values(
@@ -359,19 +382,46 @@ class CourseEnrollment(models.Model):
         # When the property .course_overview is accessed for the first time, this variable will be set.
         self._course_overview = None
 
+        # The mode and activation status this enrollment is counted with in CourseEnrollmentCount,
+        # or None if they were not loaded (deferred fields).
+        self._counted_state = None
+        if 'mode' in self.__dict__ and 'is_active' in self.__dict__:
+            self._counted_state = CourseEnrollmentState(self.mode, self.is_active)
+
     def __str__(self):
         return (
             "[CourseEnrollment] {}: {} ({}); active: ({})"
         ).format(self.user, self.course_id, self.created, self.is_active)
 
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
-        super().save(
-            force_insert=force_insert, force_update=force_update, using=using, update_fields=update_fields
-        )
+        state = CourseEnrollmentState(self.mode, self.is_active)
+        if should_maintain_enrollment_counters():
+            with transaction.atomic():
+                # An enrollment which is not saved yet is not counted in CourseEnrollmentCount.
+                counted_state = None
+                if not self._state.adding:
+                    counted_state = self._counted_state or self._stored_state()
+                super().save(
+                    force_insert=force_insert, force_update=force_update, using=using, update_fields=update_fields
+                )
+                if counted_state != state:
+                    CourseEnrollmentCount.apply_change(self.course_id, counted_state, state)
+        else:
+            super().save(
+                force_insert=force_insert, force_update=force_update, using=using, update_fields=update_fields
+            )
+        self._counted_state = state
 
         # Delete the cached status hash, forcing the value to be recalculated the next time it is needed.
         cache.delete(self.enrollment_status_hash_cache_key(self.user))
 
+    def _stored_state(self):
+        """
+        Returns the CourseEnrollmentState of this enrollment in the database, or None if it isn't stored.
+        """
+        stored = CourseEnrollment.objects.filter(pk=self.pk).values_list('mode', 'is_active').first()
+        return CourseEnrollmentState(*stored) if stored else None
+
     @classmethod
     def get_or_create_enrollment(cls, user, course_key):
         """
@@ -493,24 +543,37 @@ class CourseEnrollment(models.Model):
             self.mode = mode
             mode_changed = True
 
+        if activation_changed or mode_changed:
+            self.save()
+            self._update_enrollment_state_in_request_cache(
+                self.user,
+                self.course_id,
+                CourseEnrollmentState(self.mode, self.is_active),
+            )
+
+        self._send_enrollment_change_events(activation_changed, mode_changed, skip_refund, enterprise_uuid)
+
+    def _get_course_data(self):
+        """
+        Returns the CourseData of the course of this enrollment, for openedx events.
+        """
         try:
-            course_data = CourseData(
+            return CourseData(
                 course_key=self.course_id,
                 display_name=self.course.display_name,
             )
         except CourseOverview.DoesNotExist:
-            course_data = CourseData(
+            return CourseData(
                 course_key=self.course_id,
             )
 
-        if activation_changed or mode_changed:
-            self.save()
-            self._update_enrollment_state_in_request_cache(
-                self.user,
-                self.course_id,
-                CourseEnrollmentState(self.mode, self.is_active),
-            )
+    def _send_enrollment_change_events(self, activation_changed, mode_changed, skip_refund=False, enterprise_uuid=None):
+        """
+        Emits the signals and events for a saved change of the activation or mode of this enrollment.
+        """
+        course_data = self._get_course_data()
 
+        if activation_changed or mode_changed:
             # .. event_implemented_name: COURSE_ENROLLMENT_CHANGED
             COURSE_ENROLLMENT_CHANGED.send_event(
                 enrollment=CourseEnrollmentData(
@@ -775,27 +838,148 @@ class CourseEnrollment(models.Model):
         enrollment = cls.get_or_create_enrollment(user, course_key)
         enrollment.update_enrollment(is_active=True, mode=mode, enterprise_uuid=enterprise_uuid)
         enrollment.send_signal(EnrollStatusChange.enroll)
+        enrollment._send_enrollment_created_event(course_data)  # pylint: disable=protected-access
 
+        return enrollment
+
+    def _send_enrollment_created_event(self, course_data):
+        """
+        Emits the COURSE_ENROLLMENT_CREATED event for this enrollment.
+        """
         # .. event_implemented_name: COURSE_ENROLLMENT_CREATED
         COURSE_ENROLLMENT_CREATED.send_event(
             enrollment=CourseEnrollmentData(
                 user=UserData(
                     pii=UserPersonalData(
-                        username=user.username,
-                        email=user.email,
-                        name=user.profile.name,
+                        username=self.user.username,
+                        email=self.user.email,
+                        name=self.user.profile.name,
                     ),
-                    id=user.id,
-                    is_active=user.is_active,
+                    id=self.user.id,
+                    is_active=self.user.is_active,
                 ),
                 course=course_data,
-                mode=enrollment.mode,
-                is_active=enrollment.is_active,
-                creation_date=enrollment.created,
+                mode=self.mode,
+                is_active=self.is_active,
+                creation_date=self.created,
             )
         )
 
-        return enrollment
+    @classmethod
+    def bulk_enroll(cls, course_key, modes_by_user):
+        """
+        Enroll many users in a course at once, with a constant number of queries.
+
+        This is meant for staff enrolling large batches of learners, so unlike `enroll` it
+        does no access checks. It does run the CourseEnrollmentStarted filter for each user.
+        Enrollments are created and updated in bulk, and the signals and events `enroll`
+        would emit, including post_save, are *not* sent: pass the returned changes to
+        `send_bulk_enrollment_events`, typically from a background task.
+
+        Arguments:
+            course_key (CourseKey): The course to enroll the users in.
+            modes_by_user (dict): Maps each User to enroll to the mode to enroll them in,
+                or None for the default mode of the course.
+
+        Returns:
+            tuple: A list of (enrollment, previous_state) for every created or changed
+            enrollment, where previous_state is the CourseEnrollmentState of the
+            enrollment before the change, or None if it was created, and the list of the
+            users the CourseEnrollmentStarted filter prevented from enrolling.
+        """
+        default_mode = _default_course_mode(str(course_key))
+        modes_by_user_id = {}
+        users_by_id = {}
+        not_allowed = []
+        for user, mode in modes_by_user.items():
+            try:
+                # .. filter_implemented_name: CourseEnrollmentStarted
+                # .. filter_type: org.openedx.learning.course.enrollment.started.v1
+                user, __, mode = CourseEnrollmentStarted.run_filter(user=user, course_key=course_key, mode=mode)
+            except CourseEnrollmentStarted.PreventEnrollment:
+                not_allowed.append(user)
+                continue
+            modes_by_user_id[user.id] = mode or default_mode
+            users_by_id[user.id] = user
+
+        existing = {
+            enrollment.user_id: enrollment
+            for enrollment in cls.objects.filter(course_id=course_key, user_id__in=modes_by_user_id)
+        }
+        to_create = []
+        to_update = []
+        changes = []
+        state_changes = []
+        for user_id, mode in modes_by_user_id.items():
+            enrollment = existing.get(user_id)
+            if enrollment is None:
+                to_create.append(cls(user_id=user_id, course_id=course_key, mode=mode, is_active=True))
+                state_changes.append((None, CourseEnrollmentState(mode, True)))
+            elif enrollment.mode != mode or not enrollment.is_active:
+                previous_state = CourseEnrollmentState(enrollment.mode, enrollment.is_active)
+                changes.append((enrollment, previous_state))
+                state_changes.append((previous_state, CourseEnrollmentState(mode, True)))
+                enrollment.mode = mode
+                enrollment.is_active = True
+                to_update.append(enrollment)
+
+        with transaction.atomic():
+            created = bulk_create_with_history(to_create, cls, batch_size=BULK_ENROLLMENT_BATCH_SIZE)
+            if to_update:
+                bulk_update_with_history(to_update, cls, ['mode', 'is_active'], batch_size=BULK_ENROLLMENT_BATCH_SIZE)
+            # As in get_or_create_enrollment, unlinked CourseEnrollmentAllowed become linked to their user.
+            enrolled_users_by_email = {user.email: user for user in users_by_id.values()}
+            for cea in CourseEnrollmentAllowed.objects.filter(
+                course_id=course_key, email__in=enrolled_users_by_email, user__isnull=True,
+            ):
+                cea.user = enrolled_users_by_email[cea.email]
+                cea.save()
+            # Bulk writes bypass save(), which maintains the enrollment counts.
+            CourseEnrollmentCount.apply_changes(course_key, state_changes)
+
+        if not created and to_create:
+            # Some databases don't return the ids of created rows.
+            created = cls.objects.filter(course_id=course_key, user_id__in=[e.user_id for e in to_create])
+        changes.extend((enrollment, None) for enrollment in created)
+
+        RequestCache('get_enrollment').clear()
+        RequestCache(cls.MODE_CACHE_NAMESPACE).clear()
+        cache.delete_many(
+            [cls.cache_key_name(user_id, course_key) for user_id in modes_by_user_id] +
+            [cls.enrollment_status_hash_cache_key(user) for user in users_by_id.values()]
+        )
+        for enrollment, __ in changes:
+            enrollment.user = users_by_id[enrollment.user_id]
+            enrollment._counted_state = CourseEnrollmentState(  # pylint: disable=protected-access
+                enrollment.mode, enrollment.is_active
+            )
+        return changes, not_allowed
+
+    def send_bulk_enrollment_events(self, previous_state):
+        """
+        Emits the signals and events `enroll` emits, for an enrollment `bulk_enroll` changed
+        from `previous_state` (or created, if `previous_state` is None).
+
+        This includes the post_save signal the bulk writes skipped, whose receivers assign the
+        forum role of the learner, create their schedule and invalidate their cached data.
+        """
+        models.signals.post_save.send(
+            sender=CourseEnrollment,
+            instance=self,
+            created=previous_state is None,
+            update_fields=None,
+            raw=False,
+            using=self._state.db,
+        )
+        if previous_state is None:
+            # `enroll` first creates an inactive enrollment in the default mode, then activates it.
+            previous_state = CourseEnrollmentState(CourseMode.DEFAULT_MODE_SLUG, False)
+        self._send_enrollment_change_events(
+            activation_changed=previous_state.is_active != self.is_active,
+            mode_changed=previous_state.mode != self.mode,
+        )
+        self.send_signal(EnrollStatusChange.enroll)
+        self._send_enrollment_created_event(self._get_course_data())
 
     @classmethod
     def enroll_by_email(cls, email, course_id, mode=None, ignore_errors=True):
@@ -1484,6 +1668,118 @@ class FBEEnrollmentExclusion(models.Model):
         return f"[FBEEnrollmentExclusion] {self.enrollment}"
 
 
+class CourseEnrollmentCount(models.Model):
+    """
+    Maintained count of the active enrollments in each mode of a course.
+
+    While the student.maintain_enrollment_counters switch is on, the counts are updated in the
+    same transaction as each saved or deleted CourseEnrollment. Enrollments changed while it is
+    off, or with bulk queryset updates, are not counted; the `reconcile_enrollment_counts`
+    management command recomputes the counts from the enrollments.
+
+    .. no_pii:
+    """
+    course_id = CourseKeyField(max_length=255)
+    mode = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (('course_id', 'mode'),)
+
+    def __str__(self):
+        return f"[CourseEnrollmentCount] {self.course_id} ({self.mode}): {self.count}"
+
+    @classmethod
+    def reconcile(cls, course_id):
+        """
+        Recompute the counts of the course identified by `course_id` from its enrollments.
+
+        Enrollments changed concurrently may be missed, so this is meant to backfill the counts
+        and to repair them, not to be called on every enrollment change.
+        """
+        counts = dict(
+            CourseEnrollment.objects.filter(course_id=course_id, is_active=True)
+            .values_list('mode').order_by().annotate(Count('id'))
+        )
+        with transaction.atomic():
+            cls.objects.filter(course_id=course_id).exclude(mode__in=list(counts)).update(count=0)
+            for mode, count in counts.items():
+                cls.objects.update_or_create(course_id=course_id, mode=mode, defaults={'count': count})
+
+    @classmethod
+    def apply_change(cls, course_id, previous_state, state):
+        """
+        Update the counts of the course identified by `course_id` for an enrollment changing
+        from `previous_state` to `state`, either of which is a CourseEnrollmentState, or None
+        when the enrollment does not exist.
+
+        This is expected to be called after the enrollment has been saved, in the same transaction.
+        """
+        cls.apply_changes(course_id, [(previous_state, state)])
+
+    @classmethod
+    def apply_changes(cls, course_id, state_changes):
+        """
+        Update the counts of the course identified by `course_id` for enrollments changing
+        from a previous state to a new state, given as (previous_state, state) pairs, unless
+        the counts are not maintained.
+        """
+        if not should_maintain_enrollment_counters():
+            return
+
+        deltas = defaultdict(int)
+        for previous_state, state in state_changes:
+            if previous_state is not None and previous_state.is_active:
+                deltas[previous_state.mode] -= 1
+            if state is not None and state.is_active:
+                deltas[state.mode] += 1
+        # Sorted, so that concurrent changes lock the rows of a course in the same order.
+        for mode, delta in sorted(deltas.items()):
+            if delta:
+                cls._add(course_id, mode, delta)
+
+    @classmethod
+    def _add(cls, course_id, mode, delta):
+        """
+        Add `delta` to the count of `mode` in the course identified by `course_id`.
+        """
+        counts = cls.objects.filter(course_id=course_id, mode=mode)
+        if counts.update(count=F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(course_id=course_id, mode=mode, count=delta)
+        except IntegrityError:
+            # Another transaction created the count first.
+            counts.update(count=F('count') + delta)
+
+    @classmethod
+    def counts_for_course(cls, course_id):
+        """
+        Returns a dict of the count of active enrollments in each mode of the course
+        identified by `course_id`.
+        """
+        return dict(cls.objects.filter(course_id=course_id).values_list('mode', 'count'))
+
+
+@receiver(models.signals.pre_delete, sender=CourseEnrollment)
+def load_enrollment_counted_state_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Load the state a deleted enrollment is counted with, when its fields were deferred.
+    """
+    if instance._counted_state is None and should_maintain_enrollment_counters():  # pylint: disable=protected-access
+        instance._counted_state = instance._stored_state()  # pylint: disable=protected-access
+
+
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def update_enrollment_counts_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove a deleted enrollment from the counts of its course.
+    """
+    counted_state = instance._counted_state  # pylint: disable=protected-access
+    CourseEnrollmentCount.apply_change(instance.course_id, counted_state, None)
+
+
 @receiver(models.signals.post_save, sender=CourseEnrollment)
 @receiver(models.signals.post_delete, sender=CourseEnrollment)
 def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
@@ -1542,6 +1838,29 @@ class ManualEnrollmentAudit(models.Model):
             role=role,
         )
 
+    @classmethod
+    def bulk_create_manual_enrollment_audits(cls, user, audits, reason, role=None):
+        """
+        saves the manual enrollment information of many students at once
+
+        `audits` is an iterable of (email, state_transition, enrollment) tuples.
+        """
+        return bulk_create_with_history(
+            [
+                cls(
+                    enrolled_by=user,
+                    enrolled_email=email,
+                    state_transition=state_transition,
+                    reason=reason,
+                    enrollment=enrollment,
+                    role=role,
+                )
+                for email, state_transition, enrollment in audits
+            ],
+            cls,
+            batch_size=BULK_ENROLLMENT_BATCH_SIZE,
+        )
+
     @classmethod
     def get_manual_enrollment_by_email(cls, email):
         """
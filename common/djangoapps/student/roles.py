@@ -10,6 +10,7 @@ from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.core.cache import cache
 from opaque_keys.edx.django.models import CourseKeyField
 
 from openedx.core.lib.cache_utils import get_cache
@@ -546,3 +547,21 @@ class UserBasedRole:
         * role (will be self.role--thus uninteresting)
         """
         return CourseAccessRole.objects.filter(role__in=RoleCache.get_roles(self.role), user=self.user)
+
+
+# Roles which grant access to a course, or to all of the courses of an organization, in Studio.
+STUDIO_ACCESS_ROLES = frozenset(
+    RoleCache.get_roles(CourseInstructorRole.ROLE) | RoleCache.get_roles(CourseStaffRole.ROLE)
+)
+
+# Marks the Studio index of the courses a user can access as built. Roles are granted and revoked
+# from both the LMS and Studio, so the marker is kept here rather than in the contentstore app.
+STUDIO_COURSE_ACCESS_INDEX_CACHE_KEY = 'contentstore.course_access_index.built.{user_id}'
+
+
+def invalidate_studio_course_access_index(user_id):
+    """
+    Mark the Studio accessible course index of the user identified by `user_id` as stale;
+    Studio rebuilds it on next use.
+    """
+    cache.delete(STUDIO_COURSE_ACCESS_INDEX_CACHE_KEY.format(user_id=user_id))
@@ -23,6 +23,7 @@ from common.djangoapps.student.models import (
     is_username_retired
 )
 from common.djangoapps.student.models_api import confirm_name_change
+from common.djangoapps.student.roles import STUDIO_ACCESS_ROLES, invalidate_studio_course_access_index
 from common.djangoapps.student.signals import (
     emit_course_access_role_added,
     emit_course_access_role_removed,
@@ -115,6 +116,17 @@ def listen_for_course_access_role_removed(sender, instance, **kwargs):
     emit_course_access_role_removed(user, instance.course_id, instance.org, instance.role)
 
 
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+def listen_for_course_access_role_change(sender, instance, **kwargs):
+    """
+    Mark the Studio accessible course index of a user as stale when one of their
+    staff or instructor roles changes, whether in the LMS or in Studio.
+    """
+    if instance.role in STUDIO_ACCESS_ROLES:
+        invalidate_studio_course_access_index(instance.user_id)
+
+
 def listen_for_verified_name_approved(sender, user_id, profile_name, **kwargs):
     """
     If the user has a pending name change that corresponds to an approved verified name, confirm it.
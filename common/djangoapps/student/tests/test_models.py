@@ -11,7 +11,7 @@ from django.core.cache import cache
 from django.conf import settings
 from django.db.models.functions import Lower
 from django.test import TestCase, override_settings
-from edx_toggles.toggles.testutils import override_waffle_flag
+from edx_toggles.toggles.testutils import override_waffle_flag, override_waffle_switch
 from freezegun import freeze_time
 from opaque_keys.edx.keys import CourseKey
 from pytz import UTC
@@ -24,15 +24,20 @@ from common.djangoapps.student.models import (
     AccountRecovery,
     CourseEnrollment,
     CourseEnrollmentAllowed,
+    CourseEnrollmentCount,
+    CourseEnrollmentState,
     ManualEnrollmentAudit,
     PendingEmailChange,
     PendingNameChange,
+    UNENROLLED_TO_ENROLLED,
     UserAttribute,
     UserCelebration,
     UserProfile
 )
 from common.djangoapps.student.models_api import confirm_name_change, do_name_change_request, get_name
+from common.djangoapps.student.roles import CourseStaffRole
 from common.djangoapps.student.tests.factories import AccountRecoveryFactory, CourseEnrollmentFactory, UserFactory
+from common.djangoapps.student.toggles import MAINTAIN_ENROLLMENT_COUNTERS, USE_ENROLLMENT_COUNTERS
 from lms.djangoapps.courseware.models import DynamicUpgradeDeadlineConfiguration
 from lms.djangoapps.courseware.toggles import (
     COURSEWARE_MICROFRONTEND_PROGRESS_MILESTONES,
@@ -40,6 +45,7 @@ from lms.djangoapps.courseware.toggles import (
 )
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+from openedx.core.djangoapps.django_comment_common.models import FORUM_ROLE_STUDENT
 from openedx.core.djangoapps.schedules.models import Schedule
 from openedx.core.djangoapps.user_api.preferences.api import set_user_preference
 from openedx.core.djangolib.testing.utils import skip_unless_lms
@@ -678,6 +684,160 @@ class TestManualEnrollmentAudit(SharedModuleStoreTestCase):
         assert not ManualEnrollmentAudit.objects.filter(enrollment=enrollment).exclude(reason='')
 
 
+@override_waffle_switch(MAINTAIN_ENROLLMENT_COUNTERS, active=True)
+@override_waffle_switch(USE_ENROLLMENT_COUNTERS, active=True)
+class TestCourseEnrollmentCount(TestCase):
+    """
+    Tests for the maintained enrollment counts.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseOverviewFactory.create()
+
+    def _counts(self):
+        """
+        Returns the maintained counts of the course, without the modes with no enrollments.
+        """
+        return {
+            mode: count
+            for mode, count in CourseEnrollmentCount.counts_for_course(self.course.id).items()
+            if count
+        }
+
+    def _assert_counts_match_enrollments(self):
+        """
+        Assert the maintained counts match the counts of the enrollments.
+        """
+        counts = CourseEnrollment.objects.enrollment_counts(self.course.id)
+        with override_waffle_switch(USE_ENROLLMENT_COUNTERS, active=False):
+            assert counts == CourseEnrollment.objects.enrollment_counts(self.course.id)
+
+    def test_enroll_unenroll_and_change_mode(self):
+        users = UserFactory.create_batch(3)
+        for user in users:
+            CourseEnrollment.enroll(user, self.course.id, mode=CourseMode.AUDIT)
+        assert self._counts() == {CourseMode.AUDIT: 3}
+
+        CourseEnrollment.unenroll(users[0], self.course.id)
+        CourseEnrollment.enroll(users[1], self.course.id, mode=CourseMode.VERIFIED)
+        assert self._counts() == {CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1}
+        assert CourseEnrollment.objects.enrollment_counts(self.course.id) == {
+            CourseMode.AUDIT: 1, CourseMode.VERIFIED: 1, 'total': 2,
+        }
+        self._assert_counts_match_enrollments()
+
+    def test_counts_not_maintained_when_switched_off(self):
+        with override_waffle_switch(MAINTAIN_ENROLLMENT_COUNTERS, active=False):
+            enrollments = CourseEnrollmentFactory.create_batch(2, course_id=self.course.id, mode=CourseMode.AUDIT)
+            enrollments[0].delete()
+            assert not CourseEnrollmentCount.objects.exists()
+            # The counts aren't read until they are maintained.
+            assert CourseEnrollment.objects.enrollment_counts(self.course.id) == {CourseMode.AUDIT: 1, 'total': 1}
+
+    def test_reconcile(self):
+        with override_waffle_switch(MAINTAIN_ENROLLMENT_COUNTERS, active=False):
+            CourseEnrollmentFactory.create_batch(2, course_id=self.course.id, mode=CourseMode.AUDIT)
+        CourseEnrollmentFactory.create(course_id=self.course.id, mode=CourseMode.VERIFIED)
+        CourseEnrollmentCount.objects.create(course_id=self.course.id, mode=CourseMode.HONOR, count=4)
+
+        CourseEnrollmentCount.reconcile(self.course.id)
+        assert self._counts() == {CourseMode.AUDIT: 2, CourseMode.VERIFIED: 1}
+
+    def test_concurrently_created_count(self):
+        CourseEnrollmentCount.objects.create(course_id=self.course.id, mode=CourseMode.AUDIT, count=1)
+        with mock.patch.object(CourseEnrollmentCount.objects, 'filter') as mock_filter:
+            # The count is created by another transaction between the update and the create.
+            mock_filter.return_value.update.side_effect = [0, 1]
+            CourseEnrollmentCount._add(self.course.id, CourseMode.AUDIT, 1)  # pylint: disable=protected-access
+        assert mock_filter.return_value.update.call_count == 2
+
+    def test_deferred_fields(self):
+        enrollment = CourseEnrollmentFactory.create(course_id=self.course.id, mode=CourseMode.AUDIT)
+        enrollment = CourseEnrollment.objects.only('id', 'course_id').get(id=enrollment.id)
+        enrollment.mode = CourseMode.VERIFIED
+        enrollment.save()
+        assert self._counts() == {CourseMode.VERIFIED: 1}
+
+    def test_delete(self):
+        enrollments = CourseEnrollmentFactory.create_batch(2, course_id=self.course.id, mode=CourseMode.AUDIT)
+        enrollments[0].delete()
+        assert self._counts() == {CourseMode.AUDIT: 1}
+
+    def test_course_capacity(self):
+        self.course.max_student_enrollments_allowed = 2
+        self.course.save()
+        staff = UserFactory()
+        CourseStaffRole(self.course.id).add_users(staff)
+        CourseEnrollmentFactory.create(user=staff, course_id=self.course.id)
+        CourseEnrollmentFactory.create(course_id=self.course.id)
+        assert CourseEnrollment.objects.num_enrolled_in_exclude_admins(self.course.id) == 1
+        assert not CourseEnrollment.objects.is_course_full(self.course)
+
+        CourseEnrollmentFactory.create(course_id=self.course.id)
+        assert CourseEnrollment.objects.is_course_full(self.course)
+
+
+class TestCourseEnrollmentBulkEnroll(TestCase):
+    """
+    Tests for enrolling many users at once.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseOverviewFactory.create()
+
+    def test_bulk_enroll(self):
+        new_user, inactive_user, enrolled_user = UserFactory.create_batch(3)
+        CourseEnrollment.enroll(inactive_user, self.course.id, mode=CourseMode.AUDIT)
+        CourseEnrollment.unenroll(inactive_user, self.course.id)
+        CourseEnrollment.enroll(enrolled_user, self.course.id, mode=CourseMode.VERIFIED)
+
+        with mock.patch('common.djangoapps.student.models.course_enrollment.ENROLL_STATUS_CHANGE') as mock_signal:
+            changes, not_allowed = CourseEnrollment.bulk_enroll(self.course.id, {
+                new_user: None, inactive_user: CourseMode.AUDIT, enrolled_user: CourseMode.VERIFIED,
+            })
+        assert not mock_signal.send.called
+        assert not not_allowed
+        assert {(enrollment.user, previous_state) for enrollment, previous_state in changes} == {
+            (new_user, None), (inactive_user, CourseEnrollmentState(CourseMode.AUDIT, False)),
+        }
+        for user in (new_user, inactive_user, enrolled_user):
+            assert CourseEnrollment.is_enrolled(user, self.course.id)
+        assert CourseEnrollment.objects.enrollment_counts(self.course.id)['total'] == 3
+
+        with mock.patch('common.djangoapps.student.models.course_enrollment.ENROLL_STATUS_CHANGE') as mock_signal:
+            for enrollment, previous_state in changes:
+                enrollment.send_bulk_enrollment_events(previous_state)
+        assert mock_signal.send.call_count == 2
+
+    def test_bulk_enrollment_events_send_post_save(self):
+        user = UserFactory()
+        changes, __ = CourseEnrollment.bulk_enroll(self.course.id, {user: None})
+        assert not Schedule.objects.filter(enrollment__user=user).exists()
+
+        [(enrollment, previous_state)] = changes
+        enrollment.send_bulk_enrollment_events(previous_state)
+        assert Schedule.objects.filter(enrollment=enrollment).exists()
+        assert user.roles.filter(course_id=self.course.id, name=FORUM_ROLE_STUDENT).exists()
+
+    def test_bulk_enroll_links_allowed_enrollments(self):
+        user = UserFactory()
+        CourseEnrollmentAllowed.objects.create(course_id=self.course.id, email=user.email)
+        CourseEnrollment.bulk_enroll(self.course.id, {user: None})
+        assert CourseEnrollmentAllowed.objects.get(course_id=self.course.id, email=user.email).user == user
+
+    def test_bulk_manual_enrollment_audits(self):
+        staff, user = UserFactory.create_batch(2)
+        changes, __ = CourseEnrollment.bulk_enroll(self.course.id, {user: None})
+        ManualEnrollmentAudit.bulk_create_manual_enrollment_audits(
+            staff, [(user.email, UNENROLLED_TO_ENROLLED, changes[0][0])], 'reason',
+        )
+        audit = ManualEnrollmentAudit.get_manual_enrollment_by_email(user.email)
+        assert audit.enrolled_by == staff
+        assert audit.enrollment == changes[0][0]
+
+
 class TestAccountRecovery(TestCase):
     """
     Tests for the AccountRecovery Model
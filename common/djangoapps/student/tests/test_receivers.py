@@ -3,9 +3,17 @@
 from unittest import skipUnless
 from unittest.mock import patch
 
+from django.core.cache import cache
+from django.test.utils import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
+from opaque_keys.edx.locator import CourseLocator
 
 from common.djangoapps.student.models import CourseEnrollmentCelebration, PendingNameChange, UserProfile
+from common.djangoapps.student.roles import (
+    STUDIO_COURSE_ACCESS_INDEX_CACHE_KEY,
+    CourseBetaTesterRole,
+    CourseStaffRole,
+)
 from common.djangoapps.student.signals.signals import USER_EMAIL_CHANGED
 from common.djangoapps.student.tests.factories import CourseEnrollmentFactory, UserFactory, UserProfileFactory
 from lms.djangoapps.courseware.toggles import COURSEWARE_MICROFRONTEND_PROGRESS_MILESTONES
@@ -90,3 +98,21 @@ class ReceiversTest(SharedModuleStoreTestCase):
 
         assert mock_get_braze_client.called
         assert request.session.get('email', None) == user.email
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_course_access_role_change_invalidates_studio_index(self):
+        """ Test that staff role changes, in the LMS as well as in Studio, mark the Studio course index as stale """
+        user = UserFactory()
+        course_key = CourseLocator('Org', 'Course', 'Run')
+        cache_key = STUDIO_COURSE_ACCESS_INDEX_CACHE_KEY.format(user_id=user.id)
+
+        cache.set(cache_key, True)
+        CourseBetaTesterRole(course_key).add_users(user)
+        assert cache.get(cache_key)
+
+        CourseStaffRole(course_key).add_users(user)
+        assert cache.get(cache_key) is None
+
+        cache.set(cache_key, True)
+        CourseStaffRole(course_key).remove_users(user)
+        assert cache.get(cache_key) is None
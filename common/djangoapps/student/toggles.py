@@ -42,3 +42,46 @@ REDIRECT_TO_COURSEWARE_AFTER_ENROLLMENT = WaffleSwitch(
 
 def should_redirect_to_courseware_after_enrollment():
     return REDIRECT_TO_COURSEWARE_AFTER_ENROLLMENT.is_enabled()
+
+
+# Waffle switch to maintain the CourseEnrollmentCount table on every enrollment change.
+# .. toggle_name: student.maintain_enrollment_counters
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: Update the counts of the CourseEnrollmentCount table in the same transaction as every
+#   saved or deleted enrollment. Once it is on, backfill the counts with
+#   `reconcile_enrollment_counts --all` before turning on student.use_enrollment_counters.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-19
+# .. toggle_target_removal_date: None
+# .. toggle_warning: Enrollments changed while it is off, or with bulk queryset updates, are not counted
+#   until the counts are recomputed with the reconcile_enrollment_counts management command.
+MAINTAIN_ENROLLMENT_COUNTERS = WaffleSwitch(
+    f'{WAFFLE_FLAG_NAMESPACE}.maintain_enrollment_counters', __name__
+)
+
+
+def should_maintain_enrollment_counters():
+    return MAINTAIN_ENROLLMENT_COUNTERS.is_enabled()
+
+
+# Waffle switch to read enrollment counts from the maintained CourseEnrollmentCount table.
+# .. toggle_name: student.use_enrollment_counters
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: Serve course capacity checks (CourseEnrollment.objects.is_course_full) and the
+#   enrollment counts of the instructor dashboard from the CourseEnrollmentCount table, instead of counting
+#   the enrollments of the course each time. It has no effect unless student.maintain_enrollment_counters
+#   is on as well.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-19
+# .. toggle_target_removal_date: None
+# .. toggle_warning: Only turn it on once the counts were backfilled with `reconcile_enrollment_counts --all`
+#   after turning on student.maintain_enrollment_counters.
+USE_ENROLLMENT_COUNTERS = WaffleSwitch(
+    f'{WAFFLE_FLAG_NAMESPACE}.use_enrollment_counters', __name__
+)
+
+
+def should_use_enrollment_counters():
+    return USE_ENROLLMENT_COUNTERS.is_enabled() and should_maintain_enrollment_counters()
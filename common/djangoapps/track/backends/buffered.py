@@ -0,0 +1,218 @@
+"""
+Event tracker backend that buffers events in memory and logs them in batches from a background thread.
+
+Events are encoded on the thread that sends them, appended to a bounded per-process buffer
+without taking a lock, and logged by a shipper thread once a batch is full or the flush
+interval has passed. Events sent while the buffer is full are dropped and counted. The
+buffers are flushed when the process exits, including celery worker processes.
+
+It is configured like the logger backend, for instance::
+
+  TRACKING_BACKENDS = {
+      'logger': {
+          'ENGINE': 'common.djangoapps.track.backends.buffered.BufferedLoggerBackend',
+          'OPTIONS': {
+              'name': 'tracking',
+              'capacity': 10000,
+              'batch_size': 500,
+              'flush_interval': 1.0,
+          }
+      }
+  }
+
+"""
+
+
+import atexit
+import logging
+import os
+import threading
+import weakref
+from collections import deque
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+
+from common.djangoapps.track.backends.logger import LoggerBackend, application_log
+from common.djangoapps.track.utils import DateTimeJSONEncoder
+
+log = logging.getLogger(__name__)
+
+# Encodes like json.dumps(event, cls=DateTimeJSONEncoder), without building an encoder for each event.
+_encoder = DateTimeJSONEncoder()
+
+_backends = weakref.WeakSet()
+
+
+class BufferedLoggerBackend(LoggerBackend):
+    """Event tracker backend that logs events in batches from a background thread.
+
+    Events are logged to the INFO level as JSON strings, one log record per event.
+
+    """
+
+    def __init__(self, name, capacity=10000, batch_size=500, flush_interval=1.0, max_event_size=None, **kwargs):
+        """Event tracker backend that buffers events for a python logger.
+
+        :Parameters:
+          - `name`: identifier of the logger, which should have
+            been configured using the default python mechanisms.
+          - `capacity`: number of events buffered by each process, beyond
+            which events are dropped.
+          - `batch_size`: number of buffered events which wakes up the shipper thread.
+          - `flush_interval`: seconds after which buffered events are shipped anyway.
+          - `max_event_size`: length the serialized events are truncated to,
+            TRACK_MAX_EVENT by default.
+
+        """
+        super().__init__(name, **kwargs)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_event_size = max_event_size or settings.TRACK_MAX_EVENT
+
+        # Counters of the current process
+        self.shipped = 0
+        self.dropped = 0
+        self._reported_dropped = 0
+
+        self._pid = None
+        self._reset_locks()
+        self._buffer = None
+        self._wakeup = None
+        _backends.add(self)
+
+    def _reset_locks(self):
+        """
+        Create the locks of the backend.
+
+        A forked process inherits the locks in the state the forking thread saw them, and
+        they are never released if another thread of the parent held them, so forked
+        processes create them again.
+        """
+        self._start_lock = threading.Lock()
+        self._ship_lock = threading.Lock()
+        self._dropped_lock = threading.Lock()
+
+    def _ensure_started(self):
+        """
+        Create the buffer and start the shipper thread of the current process.
+
+        Processes forked after the backend was used start over with an empty buffer, new
+        locks and their own shipper thread, as the events inherited from the parent are
+        shipped by it.
+        """
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                self._ship_lock = threading.Lock()
+                self._dropped_lock = threading.Lock()
+            self._buffer = deque()
+            self._wakeup = threading.Event()
+            self.shipped = self.dropped = self._reported_dropped = 0
+            shipper = threading.Thread(
+                target=self._run, name=f'tracking-shipper-{self.event_logger.name}', daemon=True
+            )
+            shipper.start()
+            self._pid = pid
+
+    def send(self, event):
+        try:
+            event_str = _encoder.encode(event)
+        except UnicodeDecodeError:
+            application_log.exception(
+                "UnicodeDecodeError Event_data: %r", event
+            )
+            raise
+
+        event_str = event_str[:self.max_event_size]
+
+        self._ensure_started()
+        # Appending to a deque is atomic, so concurrent senders may only overshoot
+        # the capacity by one event each.
+        if len(self._buffer) >= self.capacity:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+        self._buffer.append(event_str)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        Log the events buffered by the current process.
+        """
+        if self._pid == os.getpid():
+            self._ship()
+
+    def _run(self):
+        """
+        Ship the buffered events whenever a batch is full or the flush interval has passed.
+        """
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._ship()
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Failed to ship tracking events to logger %s', self.event_logger.name)
+
+    def _ship(self):
+        """
+        Log the buffered events in batches, and report the events dropped since the last report.
+        """
+        with self._ship_lock:
+            buffer = self._buffer
+            while buffer:
+                batch = []
+                try:
+                    while len(batch) < self.batch_size:
+                        batch.append(buffer.popleft())
+                except IndexError:
+                    pass
+                for event_str in batch:
+                    self.event_logger.info(event_str)
+                self.shipped += len(batch)
+
+            dropped = self.dropped
+            if dropped > self._reported_dropped:
+                log.warning(
+                    'Dropped %d tracking events for logger %s as its buffer of %d events was full, %d in total.',
+                    dropped - self._reported_dropped, self.event_logger.name, self.capacity, dropped,
+                )
+                self._reported_dropped = dropped
+
+
+def flush_all():
+    """
+    Log the events buffered by all the buffered backends of the current process.
+    """
+    for backend in list(_backends):
+        try:
+            backend.flush()
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Failed to flush tracking events to logger %s', backend.event_logger.name)
+
+
+def _reset_locks_after_fork():
+    """
+    Create the locks of all the buffered backends of a forked process.
+    """
+    for backend in list(_backends):
+        backend._reset_locks()  # pylint: disable=protected-access
+
+
+atexit.register(flush_all)
+os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+@worker_process_shutdown.connect
+def _flush_on_worker_process_shutdown(**kwargs):  # pylint: disable=unused-argument
+    """
+    Celery pool processes exit without running atexit handlers.
+    """
+    flush_all()
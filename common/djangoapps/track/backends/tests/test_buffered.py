@@ -0,0 +1,103 @@
+"""Tests for the buffered event tracker backend."""
+
+
+import datetime
+import json
+import logging
+import os
+import signal
+import time
+
+from common.djangoapps.track.backends.buffered import BufferedLoggerBackend, flush_all
+
+LOGGER_NAME = 'common.djangoapps.track.backends.buffered.test'
+
+
+def _saved_events(caplog):
+    return [json.loads(e[2]) for e in caplog.record_tuples if e[0] == LOGGER_NAME]
+
+
+def test_buffered_backend(caplog):
+    """
+    Events are only logged once flushed, in the order they were sent, serialized to JSON.
+    """
+    caplog.set_level(logging.INFO)
+    backend = BufferedLoggerBackend(name=LOGGER_NAME, flush_interval=60)
+    events = [
+        {'test': True, 'index': index, 'time': datetime.datetime(2012, 5, 1, 7, 27, 1, 200)}
+        for index in range(3)
+    ]
+
+    for event in events:
+        backend.send(event)
+    assert not _saved_events(caplog)
+
+    flush_all()
+
+    assert _saved_events(caplog) == [
+        {'test': True, 'index': index, 'time': '2012-05-01T07:27:01.000200+00:00'} for index in range(3)
+    ]
+    assert backend.shipped == 3
+    assert backend.dropped == 0
+
+
+def test_full_batch_is_shipped(caplog):
+    """
+    The shipper thread logs the buffered events once a batch is full.
+    """
+    caplog.set_level(logging.INFO)
+    backend = BufferedLoggerBackend(name=LOGGER_NAME, batch_size=2, flush_interval=60)
+
+    backend.send({'index': 0})
+    backend.send({'index': 1})
+
+    deadline = time.monotonic() + 5
+    while backend.shipped < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _saved_events(caplog) == [{'index': 0}, {'index': 1}]
+
+
+def test_full_buffer_drops_events(caplog):
+    """
+    Events sent while the buffer is full are dropped and counted.
+    """
+    caplog.set_level(logging.INFO)
+    backend = BufferedLoggerBackend(name=LOGGER_NAME, capacity=2, flush_interval=60)
+
+    for index in range(5):
+        backend.send({'index': index})
+    backend.flush()
+
+    assert _saved_events(caplog) == [{'index': 0}, {'index': 1}]
+    assert backend.dropped == 3
+    assert 'Dropped 3 tracking events' in caplog.text
+
+
+def test_truncation(caplog):
+    caplog.set_level(logging.INFO)
+    backend = BufferedLoggerBackend(name=LOGGER_NAME, max_event_size=10, flush_interval=60)
+
+    backend.send({'text': 'a long event'})
+    backend.flush()
+
+    assert [e[2] for e in caplog.record_tuples if e[0] == LOGGER_NAME] == ['{"text": "']
+
+
+def test_forked_process_while_shipping():
+    """
+    A process forked while another thread ships events creates its own locks instead of
+    waiting forever for the inherited ones.
+    """
+    backend = BufferedLoggerBackend(name=LOGGER_NAME, flush_interval=60)
+    backend.send({'index': 0})
+
+    with backend._ship_lock:  # pylint: disable=protected-access
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            signal.alarm(5)
+            backend.send({'index': 1})
+            backend.flush()
+            os._exit(0 if backend.shipped == 1 else 1)  # pylint: disable=protected-access
+
+    __, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
@@ -0,0 +1,104 @@
+"""
+Measure how many typical video and problem events per second the tracking log processors handle.
+
+The LegacyFieldMappingProcessor and PrefixedEventProcessor chain is compared with the single
+LegacyEventProcessor. Each processes deep copies of the events, made beforehand, as the routing
+backend copies events before running its processors.
+"""
+
+
+import time
+from copy import deepcopy
+from datetime import datetime
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand
+from pytz import UTC
+
+from common.djangoapps.track.shim import LegacyEventProcessor, LegacyFieldMappingProcessor, PrefixedEventProcessor
+
+_CONTEXT = {
+    'accept_language': 'en-US,en;q=0.9',
+    'agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'client_id': '1033501218.1368477899',
+    'course_id': 'course-v1:edX+DemoX+Demo_Course',
+    'enterprise_uuid': '',
+    'host': 'courses.example.com',
+    'ip': '10.0.0.1',
+    'org_id': 'edX',
+    'path': '/event',
+    'referer': 'https://courses.example.com/courses/course-v1:edX+DemoX+Demo_Course/courseware/',
+    'session': 'b4103566fc80d20da1970cbb4380bccd',
+    'user_id': 42,
+    'username': 'learner',
+}
+
+EVENTS = {
+    'video': {
+        'name': 'edx.video.position.changed',
+        'timestamp': datetime(2026, 10, 19, 12, 0, tzinfo=UTC),
+        'data': {
+            'module_id': 'block-v1:edX+DemoX+Demo_Course+type@video+block@0b9e39477cf34507a7a48f74be381fdd',
+            'current_time': 132.5,
+            'new_time': 162.5,
+            'old_time': 132.5,
+            'seek_type': 'skip',
+            'requested_skip_interval': 30,
+            'code': 'mobile',
+        },
+        'context': dict(_CONTEXT, event_source='browser', page='https://courses.example.com/xblock/video'),
+    },
+    'problem': {
+        'name': 'problem_check',
+        'timestamp': datetime(2026, 10, 19, 12, 0, tzinfo=UTC),
+        'data': {
+            'problem_id': 'block-v1:edX+DemoX+Demo_Course+type@problem+block@75f9562c77bc4858b61f907bb810d974',
+            'answers': {'75f9562c77bc4858b61f907bb810d974_2_1': 'choice_2'},
+            'attempts': 1,
+            'correct_map': {
+                '75f9562c77bc4858b61f907bb810d974_2_1': {
+                    'correctness': 'correct', 'npoints': None, 'msg': '', 'hint': '', 'hintmode': None,
+                    'queuestate': None, 'answervariable': None,
+                },
+            },
+            'grade': 1,
+            'max_grade': 1,
+            'success': 'correct',
+            'state': {'seed': 1, 'done': None, 'student_answers': {}, 'correct_map': {}, 'input_state': {}},
+        },
+        'context': dict(_CONTEXT, module={'display_name': 'Multiple Choice', 'usage_key': 'block-v1:edX'}),
+    },
+}
+
+
+class Command(BaseCommand):
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--events',
+            type=int,
+            default=20000,
+            help='Number of events of each kind processed by each processor chain.',
+        )
+
+    def _events_per_second(self, processors, event, count):
+        """
+        Returns how many copies of the event the processors handle per second.
+        """
+        events = [deepcopy(event) for __ in range(count)]
+        start = time.perf_counter()
+        for processed_event in events:
+            for processor in processors:
+                processed_event = processor(processed_event) or processed_event
+        return count / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        chains = {
+            'legacy field mapping + prefixed': [LegacyFieldMappingProcessor(), PrefixedEventProcessor()],
+            'single pass': [LegacyEventProcessor()],
+        }
+        for kind, event in EVENTS.items():
+            for chain_name, processors in chains.items():
+                rate = self._events_per_second(processors, event, options['events'])
+                self.stdout.write(f'{kind} events, {chain_name}: {rate:,.0f} events/sec')
@@ -11,6 +11,7 @@ import json
 import logging
 import re
 import sys
+from collections.abc import Mapping
 
 import six  # lint-amnesty, pylint: disable=unused-import
 from django.conf import settings
@@ -34,6 +35,41 @@ META_KEY_TO_CONTEXT_KEY = {
 }
 
 
+class LazyContext(Mapping):
+    """
+    A tracking context whose values are computed the first time they are read.
+
+    Arguments:
+        build (callable): Returns the dict of the context.
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._context = None
+
+    def _get_context(self):
+        """
+        Returns the dict of the context, building it on first use.
+        """
+        if self._context is None:
+            try:
+                self._context = self._build()
+            except Exception:  # pylint: disable=broad-except
+                # Like failures when entering the context, these leave events without it.
+                log.exception('Failed to build the tracking context')
+                self._context = {}
+        return self._context
+
+    def __getitem__(self, key):
+        return self._get_context()[key]
+
+    def __iter__(self):
+        return iter(self._get_context())
+
+    def __len__(self):
+        return len(self._get_context())
+
+
 class TrackMiddleware(MiddlewareMixin):
     """
     Tracks all requests made, as well as setting up context for other server
@@ -131,35 +167,47 @@ class TrackMiddleware(MiddlewareMixin):
         * agent - The client browser identification string.
         * path - The path part of the requested URL.
         * client_id - The unique key used by Google Analytics to identify a user
-        """
-        context = {
-            'session': self.get_session_key(request),
-            'user_id': self.get_user_primary_key(request),
-            'username': self.get_username(request),
-            'ip': self.get_request_ip_address(request),
-        }
-        for header_name, context_key in META_KEY_TO_CONTEXT_KEY.items():
-            # HTTP headers may contain Latin1 characters. Decoding using Latin1 encoding here
-            # avoids encountering UnicodeDecodeError exceptions when these header strings are
-            # output to tracking logs.
-            context_value = request.META.get(header_name, '')
-            if isinstance(context_value, bytes):
-                context_value = context_value.decode('latin1')
-            context[context_key] = context_value
-
-        # Google Analytics uses the clientId to keep track of unique visitors. A GA cookie looks like
-        # this: _ga=GA1.2.1033501218.1368477899. The clientId is this part: 1033501218.1368477899.
-        google_analytics_cookie = request.COOKIES.get('_ga')
-        if google_analytics_cookie is None:
-            context['client_id'] = request.META.get('HTTP_X_EDX_GA_CLIENT_ID')
-        else:
-            context['client_id'] = '.'.join(google_analytics_cookie.split('.')[2:])
 
-        context.update(contexts.course_context_from_url(request.build_absolute_uri()))
+        The session and user are read when entering the context, while the other fields are
+        only computed once an event is emitted during the request.
+        """
+        session_key = self.get_session_key_unsubstituted(request)
+        user_id = self.get_user_primary_key(request)
+        username = self.get_username(request)
+
+        def build_context():
+            """
+            Returns the tracking context of the request.
+            """
+            context = {
+                'session': self.substitute_session_key(session_key),
+                'user_id': user_id,
+                'username': username,
+                'ip': self.get_request_ip_address(request),
+            }
+            for header_name, context_key in META_KEY_TO_CONTEXT_KEY.items():
+                # HTTP headers may contain Latin1 characters. Decoding using Latin1 encoding here
+                # avoids encountering UnicodeDecodeError exceptions when these header strings are
+                # output to tracking logs.
+                context_value = request.META.get(header_name, '')
+                if isinstance(context_value, bytes):
+                    context_value = context_value.decode('latin1')
+                context[context_key] = context_value
+
+            # Google Analytics uses the clientId to keep track of unique visitors. A GA cookie looks like
+            # this: _ga=GA1.2.1033501218.1368477899. The clientId is this part: 1033501218.1368477899.
+            google_analytics_cookie = request.COOKIES.get('_ga')
+            if google_analytics_cookie is None:
+                context['client_id'] = request.META.get('HTTP_X_EDX_GA_CLIENT_ID')
+            else:
+                context['client_id'] = '.'.join(google_analytics_cookie.split('.')[2:])
+
+            context.update(contexts.course_context_from_url(request.build_absolute_uri()))
+            return context
 
         tracker.get_tracker().enter_context(
             CONTEXT_NAME,
-            context
+            LazyContext(build_context)
         )
 
     def get_session_key(self, request):
@@ -168,11 +216,16 @@ class TrackMiddleware(MiddlewareMixin):
 
         Returns an empty string if there is no active session.
         """
+        return self.substitute_session_key(self.get_session_key_unsubstituted(request))
+
+    def get_session_key_unsubstituted(self, request):
+        """
+        Gets the Django session key of the request, or None if there is no active session.
+        """
         try:
-            return self.substitute_session_key(request.session.session_key)
+            return request.session.session_key
         except AttributeError:
-            # NB: This can hide a missing SECRET_KEY
-            return ''
+            return None
 
     def substitute_session_key(self, session_key):
         """
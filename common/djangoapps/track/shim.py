@@ -120,3 +120,50 @@ class PrefixedEventProcessor:
             return
         event.transform()
         return event
+
+
+class LegacyEventProcessor:
+    """
+    Applies LegacyFieldMappingProcessor and then PrefixedEventProcessor in a single step.
+
+    The event is rewritten in place, without going through the context twice, and the payload
+    of browser events is serialized to JSON once, after its EventTransformer has modified it,
+    instead of being serialized for the transformer to parse it again.
+    """
+
+    def __call__(self, event):
+        context = event.get('context', {})
+        if 'context' in event:
+            for field in CONTEXT_FIELDS_TO_INCLUDE:
+                event[field] = context.pop(field, '')
+            # This field is only used for Segment web analytics and does not concern researchers
+            context.pop('client_id', None)
+
+        serialize_payload = False
+        if 'data' in event:
+            payload = event.pop('data')
+            serialize_payload = context.get('event_source', '') == 'browser' and isinstance(payload, dict)
+            event['event'] = payload
+        else:
+            event['event'] = {}
+
+        if 'timestamp' in context:
+            event['time'] = context.pop('timestamp')
+        elif 'timestamp' in event:
+            event['time'] = event['timestamp']
+        event.pop('timestamp', None)
+
+        event['event_type'] = context.pop('event_type', event.get('name', ''))
+        event['event_source'] = context.pop('event_source', 'server')
+        event['page'] = context.pop('page', None)
+
+        try:
+            event = EventTransformerRegistry.create_transformer(event)
+        except KeyError:
+            pass
+        else:
+            event.transform()
+
+        if serialize_payload:
+            event['event'] = json.dumps(event['event'])
+        return event
@@ -154,6 +154,23 @@ class TrackMiddlewareTestCase(TestCase):
             'username': username,
         })
 
+    def test_context_is_built_when_read(self):
+        request = self.request_factory.get('/heartbeat')
+        request.user = User(pk=1, username='before')
+        with patch('common.djangoapps.track.contexts.course_context_from_url', return_value={}) as mock_context:
+            self.track_middleware.process_request(request)
+            assert not mock_context.called
+
+            # The user is the one the request started with
+            request.user = User(pk=2, username='after')
+            try:
+                context = tracker.get_tracker().resolve_context()
+            finally:
+                self.track_middleware.process_response(request, None)
+
+        assert mock_context.called
+        self.assert_dict_subset(context, {'user_id': 1, 'username': 'before'})
+
     def test_request_with_session(self):
         request = self.request_factory.get('/courses/')
         SessionMiddleware(get_response=lambda request: None).process_request(request)
@@ -2,6 +2,7 @@
 
 
 from collections import namedtuple
+from copy import deepcopy
 from unittest.mock import sentinel
 import pytest
 import ddt
@@ -11,7 +12,7 @@ from openedx.core.lib.tests.assertions.events import assert_events_equal
 from opaque_keys.edx.locator import CourseLocator  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .. import transformers
-from ..shim import PrefixedEventProcessor
+from ..shim import LegacyEventProcessor, LegacyFieldMappingProcessor, PrefixedEventProcessor
 from . import FROZEN_TIME, EventTrackingTestCase
 
 
@@ -348,3 +349,56 @@ class PrefixedEventProcessorTestCase(EventTrackingTestCase):
         assert result['event_type'] == 'seq_goto'
         assert result['event']['old'] == 2
         assert result['event']['new'] == 5
+
+
+@ddt.ddt
+class LegacyEventProcessorTestCase(EventTrackingTestCase):
+    """
+    Test that LegacyEventProcessor processes events like LegacyFieldMappingProcessor followed by
+    PrefixedEventProcessor.
+    """
+
+    CONTEXT = {
+        'accept_language': 'en',
+        'agent': 'agent',
+        'client_id': '1033501218.1368477899',
+        'course_id': 'course-v1:edX+DemoX+Demo_Course',
+        'host': 'testserver',
+        'ip': '127.0.0.1',
+        'org_id': 'edX',
+        'path': '/event',
+        'referer': '',
+        'session': '',
+        'user_id': 1,
+        'username': 'learner',
+    }
+
+    @ddt.data(
+        {'name': 'problem_check', 'timestamp': FROZEN_TIME, 'data': {'problem_id': 'block-v1:abc'}},
+        {
+            'name': 'edx.video.position.changed',
+            'data': {'module_id': 'i4x://edX/DemoX/video/intro', 'current_time': 10, 'seek_type': 'skip'},
+            'context': {'event_source': 'browser', 'page': 'https://testserver/video', 'timestamp': FROZEN_TIME},
+        },
+        {
+            'name': 'edx.video.seeked',
+            'data': {'current_time': 10, 'seek_type': 'slide'},
+            'context': {'event_source': 'mobile', 'open_in_browser_url': 'https://testserver/courses/video'},
+        },
+        {
+            'name': 'edx.ui.lms.sequence.tab_selected',
+            'data': {'current_tab': 2, 'target_tab': 5, 'tab_count': 9},
+            'context': {'event_source': 'browser'},
+        },
+        {'name': 'edx.video.played', 'data': '{"code": "html5"}', 'context': {'event_source': 'browser'}},
+        {'name': 'no_context'},
+    )
+    def test_same_as_processor_chain(self, event):
+        if event['name'] != 'no_context':
+            event = dict(event, context=dict(self.CONTEXT, **event.get('context', {})))
+
+        expected_event = deepcopy(event)
+        for processor in [LegacyFieldMappingProcessor(), PrefixedEventProcessor()]:
+            expected_event = processor(expected_event) or expected_event
+
+        assert LegacyEventProcessor()(deepcopy(event)) == expected_event
@@ -36,6 +36,8 @@ class DottedPathMapping:
     def __init__(self, registry=None):
         self._match_registry = {}
         self._prefix_registry = {}
+        # The prefixes from the longest to the shortest match, kept up to date on changes
+        self._sorted_prefixes = []
         self.update(registry or {})
 
     def __contains__(self, key):
@@ -49,8 +51,7 @@ class DottedPathMapping:
         if key in self._match_registry:
             return self._match_registry[key]
         if isinstance(key, str):
-            # Reverse-sort the keys to find the longest matching prefix.
-            for prefix in sorted(self._prefix_registry, reverse=True):
+            for prefix in self._sorted_prefixes:
                 if key.startswith(prefix):
                     return self._prefix_registry[prefix]
         raise KeyError(f'Key {key} not found in {type(self)}')
@@ -58,15 +59,23 @@ class DottedPathMapping:
     def __setitem__(self, key, value):
         if key.endswith('.'):
             self._prefix_registry[key] = value
+            self._sort_prefixes()
         else:
             self._match_registry[key] = value
 
     def __delitem__(self, key):
         if key.endswith('.'):
             del self._prefix_registry[key]
+            self._sort_prefixes()
         else:
             del self._match_registry[key]
 
+    def _sort_prefixes(self):
+        """
+        Reverse-sort the prefixes, so that the first matching prefix is the longest.
+        """
+        self._sorted_prefixes = sorted(self._prefix_registry, reverse=True)
+
     def get(self, key, default=None):
         """
         Return `self[key]` if it exists, otherwise, return `None` or `default`
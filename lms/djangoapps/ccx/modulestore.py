@@ -281,10 +281,10 @@ class CCXModulestoreWrapper:
                 self._modulestore.convert_to_draft(location, user_id)
             )
 
-    def has_changes(self, xblock):
+    def has_changes(self, xblock, include_children=True):
         """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
         with remove_ccx(xblock) as (xblock, restore):  # lint-amnesty, pylint: disable=redefined-argument-from-local
-            return restore(self._modulestore.has_changes(xblock))
+            return restore(self._modulestore.has_changes(xblock, include_children=include_children))
 
     def check_supports(self, course_key, method):
         """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
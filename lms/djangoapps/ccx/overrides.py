@@ -24,6 +24,8 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     :class:`~courseware.field_overrides.FieldOverrideProvider` which allows for
     overrides to be made on a per user basis.
     """
+    supports_preloading = True
+
     def get(self, block, name, default):
         """
         Just call the get_override_for_ccx method if there is a ccx
@@ -48,6 +50,26 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    def preload_overrides(self, course_key):
+        """
+        Return the overrides of the ccx that is active for this course, all of
+        which are loaded with a single query, or None if there is no such ccx.
+        """
+        ccx = get_current_ccx(course_key)
+        if ccx:
+            return _get_overrides_for_ccx(ccx)
+        return None
+
+    def override_key(self, block):
+        return _clean_ccx_key(block.location)
+
+    def get_preloaded(self, overrides, block, name, default):
+        # The LMS never links back to Studio for CCX courses, see
+        # get_override_for_ccx.
+        if name == 'course_edit_method':
+            return None
+        return super().get_preloaded(overrides, block, name, default)
+
     @classmethod
     def enabled_for(cls, block):  # lint-amnesty, pylint: disable=arguments-differ
         """
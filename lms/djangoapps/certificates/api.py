@@ -26,6 +26,9 @@ from lms.djangoapps.branding import api as branding_api
 from lms.djangoapps.certificates.config import AUTO_CERTIFICATE_GENERATION as _AUTO_CERTIFICATE_GENERATION
 from lms.djangoapps.certificates.data import CertificateStatuses
 from lms.djangoapps.certificates.generation_handler import generate_certificate_task as _generate_certificate_task
+from lms.djangoapps.certificates.generation_handler import (
+    generate_certificates_in_bulk as _generate_certificates_in_bulk
+)
 from lms.djangoapps.certificates.generation_handler import is_on_certificate_allowlist as _is_on_certificate_allowlist
 from lms.djangoapps.certificates.models import (
     CertificateAllowlist,
@@ -177,7 +180,8 @@ def get_certificates_for_user_by_course_keys(user, course_keys):
 def get_recently_modified_certificates(course_keys=None, start_date=None, end_date=None, user_ids=None):
     """
     Returns a QuerySet of GeneratedCertificate objects filtered by the input
-    parameters and ordered by modified_date.
+    parameters and ordered by modified_date. The QuerySet can be filtered further,
+    e.g. to page through it by primary key.
     """
     cert_filter_args = {}
 
@@ -198,8 +202,9 @@ def get_recently_modified_certificates(course_keys=None, start_date=None, end_da
     if start_date or end_date:
         certs_with_modified_overrides = get_certs_with_modified_overrides(course_keys, start_date, end_date, user_ids)
         return (
-            GeneratedCertificate.objects.filter(**cert_filter_args)
-            .union(certs_with_modified_overrides)
+            GeneratedCertificate.objects.filter(
+                Q(**cert_filter_args) | Q(pk__in=certs_with_modified_overrides.values("pk"))
+            )
             .order_by("modified_date")
         )
 
@@ -255,6 +260,21 @@ def generate_certificate_task(user, course_key, generation_mode=None):
     return _generate_certificate_task(user, course_key, generation_mode)
 
 
+def generate_certificates_in_bulk(users, course_key):
+    """
+    Generate the certificates of many users in this course run at once, in this process, rather than create a task for
+    each user. Each certificate changes as it would through `generate_certificate_task`.
+
+    Args:
+        users: users for whom to generate certificates, typically a few hundred at a time
+        course_key: course run key for which to generate certificates
+
+    Returns:
+        dict with the number of certificates `generated` and `revoked`, and the number of users `skipped`
+    """
+    return _generate_certificates_in_bulk(users, course_key)
+
+
 def certificate_downloadable_status(student, course_key):
     """
     Check the student existing certificates against a given course.
@@ -8,14 +8,25 @@ These methods should be called from tasks.
 """
 
 import logging
+import time
 from uuid import uuid4
 
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+from common.djangoapps.student.models import UserProfile
 from lms.djangoapps.certificates.data import CertificateStatuses
 from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.certificates.utils import emit_certificate_event, get_preferred_certificate_name
+from openedx.core.djangoapps.content.course_overviews.api import get_course_overview_or_none
+from openedx.features.name_affirmation_api.utils import get_name_affirmation_service
 
 log = logging.getLogger(__name__)
 
+BULK_GENERATION_BATCH_SIZE = 500
+
 
 def generate_course_certificate(user, course_key, status, enrollment_mode, course_grade, generation_mode):
     """
@@ -98,3 +109,180 @@ def _generate_certificate(user, course_key, status, enrollment_mode, course_grad
     log.info(f'Generated certificate with status {cert.status}, mode {cert.mode} and grade {cert.grade} for {user.id} '
              f': {course_key}. {created_msg}')
     return cert
+
+
+def generate_course_certificates_in_bulk(course_key, certificates, revocations):
+    """
+    Generate and revoke the course certificates of many users in this course run at once.
+
+    The certificates are written with a few queries, as `generate_course_certificate` and
+    `GeneratedCertificate._revoke_certificate` would write them. Their signals and events are then sent at most
+    CERTIFICATES_BULK_GENERATION_EVENTS_PER_SECOND times a second, as some of their receivers queue tasks.
+
+    Args:
+        course_key: course run key for which to generate certificates
+        certificates: list of dicts with the `user`, `status`, `enrollment_mode`, `course_grade` and
+            `generation_mode` of each certificate to generate, as for `generate_course_certificate`
+        revocations: list of dicts with the existing `cert`, and the `status`, `enrollment_mode` and `course_grade`
+            to revoke it with
+
+    Returns:
+        The list of generated certificates and the list of revoked certificates
+    """
+    generated, revoked = _write_certificates_in_bulk(course_key, certificates, revocations)
+
+    course_overview = get_course_overview_or_none(course_key)
+    generation_modes = {certificate['user'].id: certificate['generation_mode'] for certificate in certificates}
+    send_events = []
+    for cert in generated:
+        send_events.append(_generated_certificate_events(cert, course_overview, generation_modes[cert.user_id]))
+    for cert, previous_status in revoked:
+        send_events.append(_revoked_certificate_events(cert, previous_status))
+    _send_throttled(send_events)
+
+    return generated, [cert for cert, __ in revoked]
+
+
+def _write_certificates_in_bulk(course_key, certificates, revocations):
+    """
+    Create and update the certificates of `generate_course_certificates_in_bulk`, without sending their signals.
+
+    Returns the list of generated certificates, and a list of (cert, previous_status) for the revoked ones.
+    """
+    users = [certificate['user'] for certificate in certificates]
+    users += [revocation['cert'].user for revocation in revocations]
+    names = _get_preferred_certificate_names(users)
+    existing_certificates = {
+        cert.user_id: cert
+        for cert in GeneratedCertificate.objects.filter(
+            course_id=course_key, user_id__in=[certificate['user'].id for certificate in certificates]
+        )
+    }
+
+    to_create, to_update, generated, revoked = [], [], [], []
+    for certificate in certificates:
+        user = certificate['user']
+        cert = existing_certificates.get(user.id)
+        if cert is None:
+            cert = GeneratedCertificate(user=user, course_id=course_key)
+            to_create.append(cert)
+        else:
+            to_update.append(cert)
+        # Retain the `verify_uuid` of an existing certificate, so that the learner keeps the URL to their certificate
+        cert.verify_uuid = cert.verify_uuid or uuid4().hex
+        cert.user = user
+        cert.mode = certificate['enrollment_mode']
+        cert.name = names[user.id]
+        cert.status = certificate['status']
+        cert.grade = certificate['course_grade']
+        cert.download_url = ''
+        cert.key = ''
+        cert.error_reason = ''
+        generated.append(cert)
+
+    for revocation in revocations:
+        cert = revocation['cert']
+        revoked.append((cert, cert.status))
+        cert.error_reason = ''
+        cert.download_uuid = ''
+        cert.download_url = ''
+        cert.grade = str(revocation['course_grade']) if revocation['course_grade'] else ''
+        cert.status = revocation['status']
+        cert.mode = revocation['enrollment_mode'] or cert.mode
+        cert.name = names[cert.user_id]
+        to_update.append(cert)
+
+    # Bulk updates skip the auto_now of modified_date
+    modified_date = timezone.now()
+    for cert in to_update:
+        cert.modified_date = modified_date
+
+    with transaction.atomic():
+        bulk_create_with_history(to_create, GeneratedCertificate, batch_size=BULK_GENERATION_BATCH_SIZE)
+        if to_update:
+            bulk_update_with_history(
+                to_update,
+                GeneratedCertificate,
+                [
+                    'mode', 'name', 'status', 'grade', 'download_url', 'download_uuid', 'key', 'verify_uuid',
+                    'error_reason', 'modified_date',
+                ],
+                batch_size=BULK_GENERATION_BATCH_SIZE,
+            )
+
+    for cert in generated:
+        log.info(f'Generated certificate with status {cert.status}, mode {cert.mode} and grade {cert.grade} for '
+                 f'{cert.user_id} : {course_key} in bulk.')
+    for cert, previous_status in revoked:
+        log.info(f'Marking certificate as {cert.status} for {cert.user_id} : {course_key} with mode {cert.mode} in '
+                 f'bulk. Its previous status was {previous_status}.')
+    return generated, revoked
+
+
+def _generated_certificate_events(cert, course_overview, generation_mode):
+    """
+    Returns a function sending the signals and events of `generate_course_certificate` for the certificate.
+    """
+    def send():
+        cert.send_changed_signals()
+        if CertificateStatuses.is_passing_status(cert.status):
+            event_data = {
+                'user_id': cert.user.id,
+                'course_id': str(cert.course_id),
+                'certificate_id': cert.verify_uuid,
+                'enrollment_mode': cert.mode,
+                'generation_mode': generation_mode
+            }
+            emit_certificate_event(
+                event_name='created', user=cert.user, course_id=cert.course_id, course_overview=course_overview,
+                event_data=event_data,
+            )
+        elif cert.status == CertificateStatuses.unverified:
+            # generate_course_certificate marks new unverified certificates as unverified again
+            cert.send_revoked_signals(CertificateStatuses.unverified, source='certificate_generation')
+    return send
+
+
+def _revoked_certificate_events(cert, previous_status):
+    """
+    Returns a function sending the signals and events of `GeneratedCertificate._revoke_certificate` for the
+    certificate.
+    """
+    def send():
+        cert.send_changed_signals()
+        cert.send_revoked_signals(previous_status, source='certificate_generation')
+    return send
+
+
+def _send_throttled(send_events):
+    """
+    Call the functions sending the events of each certificate, at most CERTIFICATES_BULK_GENERATION_EVENTS_PER_SECOND
+    times a second.
+    """
+    events_per_second = settings.CERTIFICATES_BULK_GENERATION_EVENTS_PER_SECOND
+    start = time.monotonic()
+    for index, send in enumerate(send_events):
+        if events_per_second:
+            ahead = index / events_per_second - (time.monotonic() - start)
+            if ahead > 0:
+                time.sleep(ahead)
+        send()
+
+
+def _get_preferred_certificate_names(users):
+    """
+    Return the names `get_preferred_certificate_name` would return for the users, by user id, reading their profiles
+    with one query.
+    """
+    profile_names = dict(UserProfile.objects.filter(user__in=users).values_list('user_id', 'name'))
+    name_affirmation_service = get_name_affirmation_service()
+
+    names = {}
+    for user in users:
+        name_to_use = profile_names.get(user.id)
+        if name_affirmation_service and name_affirmation_service.should_use_verified_name_for_certs(user):
+            verified_name_obj = name_affirmation_service.get_verified_name(user, is_verified=True)
+            if verified_name_obj:
+                name_to_use = verified_name_obj.verified_name
+        names[user.id] = name_to_use or ''
+    return names
@@ -19,10 +19,11 @@ from lms.djangoapps.certificates.models import (
     CertificateInvalidation,
     GeneratedCertificate
 )
+from lms.djangoapps.certificates.generation import generate_course_certificates_in_bulk
 from lms.djangoapps.certificates.tasks import CERTIFICATE_DELAY_SECONDS, generate_certificate
 from lms.djangoapps.certificates.utils import has_html_certificates_enabled
-from lms.djangoapps.grades.api import CourseGradeFactory
-from lms.djangoapps.instructor.access import is_beta_tester
+from lms.djangoapps.grades.api import CourseGradeFactory, clear_prefetched_course_grades, prefetch_course_grades
+from lms.djangoapps.instructor.access import is_beta_tester, list_with_level
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.course_overviews.api import get_course_overview_or_none
 
@@ -56,6 +57,204 @@ def generate_certificate_task(user, course_key, generation_mode=None, delay_seco
                                               delay_seconds=delay_seconds)
 
 
+def generate_certificates_in_bulk(users, course_key, generation_mode='batch'):
+    """
+    Generate the certificates of many users in this course run at once, rather than create a task for each user.
+
+    The certificate of each user changes as it would through `generate_certificate_task`, but the data the eligibility
+    checks need is read for all the users at once, and the certificates are then written in bulk, in this process. This
+    is meant for chunks of a few hundred users, such as when generating the certificates of a whole course.
+
+    Returns:
+        dict with the number of certificates `generated` and `revoked`, and the number of users `skipped`
+    """
+    users = list(users)
+    counts = {'generated': 0, 'revoked': 0, 'skipped': len(users)}
+
+    # These common checks are the same for every user
+    course_overview = get_course_overview_or_none(course_key)
+    if not course_overview:
+        log.info(f'{course_key} does not a course overview. Certificates cannot be generated.')
+        return counts
+    if not has_html_certificates_enabled(course_overview):
+        log.info(f'{course_key} does not have HTML certificates enabled. Certificates cannot be generated.')
+        return counts
+
+    eligibility_data = _BulkEligibilityData(users, course_key, course_overview)
+    certificates, revocations = [], []
+    for user in users:
+        if user.id not in eligibility_data.course_grades:
+            # The grade of the user could not be read, which CourseGradeFactory logged
+            continue
+        enrollment_mode = eligibility_data.enrollment_modes.get(user.id)
+        course_grade = eligibility_data.course_grades[user.id]
+        action, status = _get_bulk_certificate_action(user, course_key, eligibility_data)
+        if action == _GENERATE:
+            try:
+                # Certificates are generated in bulk for this course run only
+                user, __, enrollment_mode, status, course_grade, user_generation_mode = (
+                    CertificateCreationRequested.run_filter(
+                        user=user,
+                        course_key=course_key,
+                        mode=enrollment_mode,
+                        status=status,
+                        grade=course_grade,
+                        generation_mode=generation_mode,
+                    )
+                )
+            except CertificateCreationRequested.PreventCertificateCreation:
+                log.error("Certificate generation not allowed for user %s in course %s", user.id, course_key)
+                continue
+            certificates.append({
+                'user': user,
+                'status': status or CertificateStatuses.downloadable,
+                'enrollment_mode': str(enrollment_mode),
+                'course_grade': str(_get_grade_value(course_grade)),
+                'generation_mode': user_generation_mode,
+            })
+        elif action == _REVOKE:
+            cert = eligibility_data.certificates[user.id]
+            cert.user = user
+            revocations.append({
+                'cert': cert,
+                'status': status,
+                'enrollment_mode': enrollment_mode,
+                'course_grade': _get_grade_value(course_grade) if status == CertificateStatuses.notpassing else '',
+            })
+
+    if certificates or revocations:
+        generate_course_certificates_in_bulk(course_key, certificates, revocations)
+    counts['generated'] = len(certificates)
+    counts['revoked'] = len(revocations)
+    counts['skipped'] = len(users) - len(certificates) - len(revocations)
+    log.info(f'Generated {counts["generated"]} and revoked {counts["revoked"]} certificates in bulk in {course_key}, '
+             f'skipping {counts["skipped"]} users.')
+    return counts
+
+
+# The ways `_get_bulk_certificate_action` can decide a certificate should change
+_GENERATE = 'generate'
+_REVOKE = 'revoke'
+
+
+class _EligibilityData:
+    """
+    The data the certificate eligibility checks read about a user in a course run, read for each user when it is needed.
+    """
+
+    def __init__(self, course_key):
+        self.course_key = course_key
+
+    def course_overview(self):
+        return get_course_overview_or_none(self.course_key)
+
+    def is_allowlisted(self, user):
+        return is_on_certificate_allowlist(user, self.course_key)
+
+    def is_invalidated(self, user):
+        return CertificateInvalidation.has_certificate_invalidation(user, self.course_key)
+
+    def is_beta_tester(self, user):
+        return is_beta_tester(user, self.course_key)
+
+    def id_verification_missing(self, user):
+        return _id_verification_enforced_and_missing(user)
+
+    def certificate(self, user):
+        return GeneratedCertificate.certificate_for_student(user, self.course_key)
+
+
+class _BulkEligibilityData(_EligibilityData):
+    """
+    The data the certificate eligibility checks read about each user, read for many users in a course run at once.
+    """
+
+    def __init__(self, users, course_key, course_overview):
+        super().__init__(course_key)
+        self._course_overview = course_overview
+        user_ids = [user.id for user in users]
+        self.enrollment_modes = dict(
+            CourseEnrollment.objects.filter(course_id=course_key, user_id__in=user_ids).values_list('user_id', 'mode')
+        )
+        self.allowlisted_user_ids = set(
+            CertificateAllowlist.objects.filter(
+                course_id=course_key, user_id__in=user_ids, allowlist=True
+            ).values_list('user_id', flat=True)
+        )
+        self.invalidated_user_ids = set(
+            CertificateInvalidation.objects.filter(
+                generated_certificate__course_id=course_key, generated_certificate__user_id__in=user_ids, active=True
+            ).values_list('generated_certificate__user_id', flat=True)
+        )
+        self.certificates = {
+            cert.user_id: cert
+            for cert in GeneratedCertificate.objects.filter(course_id=course_key, user_id__in=user_ids)
+        }
+        self.beta_tester_user_ids = set(
+            list_with_level(course_key, 'beta').filter(id__in=user_ids).values_list('id', flat=True)
+        )
+        self.idv_missing_user_ids = set()
+        if settings.FEATURES.get('ENABLE_CERTIFICATES_IDV_REQUIREMENT'):
+            self.idv_missing_user_ids = set(user_ids) - IDVerificationService.get_unexpired_verified_user_ids(users)
+
+        self.course_grades = {}
+        prefetch_course_grades(course_key, users)
+        try:
+            for user, course_grade, error in CourseGradeFactory().iter(users, course_key=course_key):
+                if error is None:
+                    self.course_grades[user.id] = course_grade
+        finally:
+            clear_prefetched_course_grades(course_key)
+
+    def course_overview(self):
+        return self._course_overview
+
+    def is_allowlisted(self, user):
+        return user.id in self.allowlisted_user_ids
+
+    def is_invalidated(self, user):
+        return user.id in self.invalidated_user_ids
+
+    def is_beta_tester(self, user):
+        return user.id in self.beta_tester_user_ids
+
+    def id_verification_missing(self, user):
+        return user.id in self.idv_missing_user_ids
+
+    def certificate(self, user):
+        return self.certificates.get(user.id)
+
+
+def _get_bulk_certificate_action(user, course_key, eligibility_data):
+    """
+    Decide how the certificate of this user should change, through the same checks as `generate_certificate_task` but
+    from the prefetched eligibility data.
+
+    Returns:
+        (_GENERATE, status) if a certificate with this status should be generated, (_REVOKE, status) if the existing
+        certificate should be revoked with this status, or (None, status) if the certificate should not change
+    """
+    enrollment_mode = eligibility_data.enrollment_modes.get(user.id)
+    course_grade = eligibility_data.course_grades[user.id]
+    cert = eligibility_data.certificate(user)
+
+    if eligibility_data.is_allowlisted(user):
+        if _can_generate_allowlist_certificate(user, course_key, enrollment_mode, eligibility_data):
+            return _GENERATE, None
+        if not _can_set_allowlist_cert_status(user, course_key, enrollment_mode, eligibility_data):
+            return None, None
+        return _get_cert_status_action_common(user, course_key, course_grade, cert, eligibility_data)
+
+    if _can_generate_regular_certificate(user, course_key, enrollment_mode, course_grade, eligibility_data):
+        return _GENERATE, None
+    if not _can_set_regular_cert_status(user, course_key, enrollment_mode, eligibility_data):
+        return None, None
+    action, status = _get_cert_status_action_common(user, course_key, course_grade, cert, eligibility_data)
+    if status is not None:
+        return action, status
+    return _get_regular_cert_status_action(user, course_grade, cert, eligibility_data)
+
+
 def generate_allowlist_certificate_task(user, course_key, generation_mode=None,
                                         delay_seconds=CERTIFICATE_DELAY_SECONDS):
     """
@@ -142,19 +341,20 @@ def _generate_certificate_task(user, course_key, enrollment_mode, course_grade,
     return True
 
 
-def _can_generate_allowlist_certificate(user, course_key, enrollment_mode):
+def _can_generate_allowlist_certificate(user, course_key, enrollment_mode, eligibility_data=None):
     """
     Check if an allowlist certificate can be generated (created if it doesn't already exist, or updated if it does
     exist) for this user, in this course run.
     """
-    if not is_on_certificate_allowlist(user, course_key):
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
+    if not eligibility_data.is_allowlisted(user):
         log.info(f'{user.id} : {course_key} is not on the certificate allowlist. Allowlist certificate cannot be '
                  f'generated.')
         return False
 
     log.info(f'{user.id} : {course_key} is on the certificate allowlist')
 
-    if not _can_generate_certificate_common(user, course_key, enrollment_mode):
+    if not _can_generate_certificate_common(user, course_key, enrollment_mode, eligibility_data):
         log.info(f'One of the common checks failed. Allowlist certificate cannot be generated for {user.id} : '
                  f'{course_key}.')
         return False
@@ -163,16 +363,17 @@ def _can_generate_allowlist_certificate(user, course_key, enrollment_mode):
     return True
 
 
-def _can_generate_regular_certificate(user, course_key, enrollment_mode, course_grade):
+def _can_generate_regular_certificate(user, course_key, enrollment_mode, course_grade, eligibility_data=None):
     """
     Check if a regular (non-allowlist) course certificate can be generated (created if it doesn't already exist, or
     updated if it does exist) for this user, in this course run.
     """
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
     if _is_ccx_course(course_key):
         log.info(f'{course_key} is a CCX course. Certificate cannot be generated for {user.id}.')
         return False
 
-    if is_beta_tester(user, course_key):
+    if eligibility_data.is_beta_tester(user):
         log.info(f'{user.id} is a beta tester in {course_key}. Certificate cannot be generated.')
         return False
 
@@ -180,7 +381,7 @@ def _can_generate_regular_certificate(user, course_key, enrollment_mode, course_
         log.info(f'{user.id} does not have a passing grade in {course_key}. Certificate cannot be generated.')
         return False
 
-    if not _can_generate_certificate_common(user, course_key, enrollment_mode):
+    if not _can_generate_certificate_common(user, course_key, enrollment_mode, eligibility_data):
         log.info(f'One of the common checks failed. Certificate cannot be generated for {user.id} : {course_key}.')
         return False
 
@@ -188,14 +389,15 @@ def _can_generate_regular_certificate(user, course_key, enrollment_mode, course_
     return True
 
 
-def _can_generate_certificate_common(user, course_key, enrollment_mode):
+def _can_generate_certificate_common(user, course_key, enrollment_mode, eligibility_data=None):
     """
     Check if a course certificate can be generated (created if it doesn't already exist, or updated if it does
     exist) for this user, in this course run.
 
     This method contains checks that are common to both allowlist and regular course certificates.
     """
-    if CertificateInvalidation.has_certificate_invalidation(user, course_key):
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
+    if eligibility_data.is_invalidated(user):
         # The invalidation list prevents certificate generation
         log.info(f'{user.id} : {course_key} is on the certificate invalidation list. Certificate cannot be generated.')
         return False
@@ -212,7 +414,7 @@ def _can_generate_certificate_common(user, course_key, enrollment_mode):
 
     # If the IDV check fails we then check if the course-run requires ID verification. Honor and Professional-No-ID
     # modes do not require IDV for certificate generation.
-    if _id_verification_enforced_and_missing(user):
+    if eligibility_data.id_verification_missing(user):
         if enrollment_mode not in CourseMode.NON_VERIFIED_MODES:
             log.info(f'{user.id} does not have a verified id. Certificate cannot be generated for {course_key}.')
             return False
@@ -220,10 +422,10 @@ def _can_generate_certificate_common(user, course_key, enrollment_mode):
         log.info(f'{user.id} : {course_key} is eligible for a certificate without requiring a verified ID. '
                  'Skipping results of the ID verification check.')
 
-    if not _can_generate_certificate_for_status(user, course_key, enrollment_mode):
+    if not _can_generate_certificate_for_status(user, course_key, enrollment_mode, eligibility_data):
         return False
 
-    course_overview = get_course_overview_or_none(course_key)
+    course_overview = eligibility_data.course_overview()
     if not course_overview:
         log.info(f'{course_key} does not a course overview. Certificate cannot be generated for {user.id}.')
         return False
@@ -265,71 +467,114 @@ def _set_regular_cert_status(user, course_key, enrollment_mode, course_grade):
     if status is not None:
         return status
 
-    if not _id_verification_enforced_and_missing(user) \
+    action, status = _get_regular_cert_status_action(user, course_grade, cert, _EligibilityData(course_key))
+    if action == _REVOKE:
+        _revoke_certificate(cert, status, enrollment_mode, course_grade)
+    return status
+
+
+def _get_regular_cert_status_action(user, course_grade, cert, eligibility_data):
+    """
+    Determine the regular (non-allowlist) certificate status for this user, when `_get_cert_status_action_common`
+    does not determine one, and how the certificate should change for it.
+    """
+    if not eligibility_data.id_verification_missing(user) \
             and not _is_passing_grade(course_grade) \
             and cert is not None:
         if cert.status != CertificateStatuses.notpassing:
-            course_grade_val = _get_grade_value(course_grade)
-            cert.mark_notpassing(mode=enrollment_mode, grade=course_grade_val, source='certificate_generation')
-        return CertificateStatuses.notpassing
+            return _REVOKE, CertificateStatuses.notpassing
+        return None, CertificateStatuses.notpassing
 
-    return None
+    return None, None
 
 
 def _get_cert_status_common(user, course_key, enrollment_mode, course_grade, cert):
     """
-    Determine the certificate status for this user, in this course run.
+    Determine the certificate status for this user, in this course run, and update the cert.
 
     This is used when a downloadable cert cannot be generated, but we want to provide more info about why it cannot
     be generated.
     """
-    if CertificateInvalidation.has_certificate_invalidation(user, course_key) and cert is not None:
+    action, status = _get_cert_status_action_common(user, course_key, course_grade, cert)
+    if action == _GENERATE:
+        _generate_certificate_task(user=user, course_key=course_key, enrollment_mode=enrollment_mode,
+                                   course_grade=course_grade, status=status, generation_mode='batch')
+    elif action == _REVOKE:
+        _revoke_certificate(cert, status, enrollment_mode, course_grade)
+    return status
+
+
+def _get_cert_status_action_common(user, course_key, course_grade, cert, eligibility_data=None):
+    """
+    Determine the certificate status for this user, in this course run, and how the certificate should change for it.
+
+    Returns:
+        (_GENERATE, status) if a certificate with this status should be generated, (_REVOKE, status) if the existing
+        certificate should be revoked with this status, or (None, status) if the certificate already has this status.
+        The status is None if it cannot be determined by the checks common to allowlist and regular certificates.
+    """
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
+    if eligibility_data.is_invalidated(user) and cert is not None:
         if cert.status != CertificateStatuses.unavailable:
-            cert.invalidate(mode=enrollment_mode, source='certificate_generation')
-        return CertificateStatuses.unavailable
+            return _REVOKE, CertificateStatuses.unavailable
+        return None, CertificateStatuses.unavailable
 
-    if _id_verification_enforced_and_missing(user) and _has_passing_grade_or_is_allowlisted(
-        user, course_key, course_grade
+    if eligibility_data.id_verification_missing(user) and _has_passing_grade_or_is_allowlisted(
+        user, course_key, course_grade, eligibility_data
     ):
         if cert is None:
-            _generate_certificate_task(user=user, course_key=course_key, enrollment_mode=enrollment_mode,
-                                       course_grade=course_grade, status=CertificateStatuses.unverified,
-                                       generation_mode='batch')
-        elif cert.status != CertificateStatuses.unverified:
-            cert.mark_unverified(mode=enrollment_mode, source='certificate_generation')
-        return CertificateStatuses.unverified
+            return _GENERATE, CertificateStatuses.unverified
+        if cert.status != CertificateStatuses.unverified:
+            return _REVOKE, CertificateStatuses.unverified
+        return None, CertificateStatuses.unverified
+
+    return None, None
+
 
-    return None
+def _revoke_certificate(cert, status, enrollment_mode, course_grade):
+    """
+    Update the existing cert to the given status, which is not downloadable
+    """
+    if status == CertificateStatuses.unavailable:
+        cert.invalidate(mode=enrollment_mode, source='certificate_generation')
+    elif status == CertificateStatuses.unverified:
+        cert.mark_unverified(mode=enrollment_mode, source='certificate_generation')
+    else:
+        course_grade_val = _get_grade_value(course_grade)
+        cert.mark_notpassing(mode=enrollment_mode, grade=course_grade_val, source='certificate_generation')
 
 
-def _can_set_allowlist_cert_status(user, course_key, enrollment_mode):
+def _can_set_allowlist_cert_status(user, course_key, enrollment_mode, eligibility_data=None):
     """
     Determine whether we can set a custom (non-downloadable) cert status for an allowlist certificate
     """
-    if not is_on_certificate_allowlist(user, course_key):
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
+    if not eligibility_data.is_allowlisted(user):
         return False
 
-    return _can_set_cert_status_common(user, course_key, enrollment_mode)
+    return _can_set_cert_status_common(user, course_key, enrollment_mode, eligibility_data)
 
 
-def _can_set_regular_cert_status(user, course_key, enrollment_mode):
+def _can_set_regular_cert_status(user, course_key, enrollment_mode, eligibility_data=None):
     """
     Determine whether we can set a custom (non-downloadable) cert status for a regular (non-allowlist) certificate
     """
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
     if _is_ccx_course(course_key):
         return False
 
-    if is_beta_tester(user, course_key):
+    if eligibility_data.is_beta_tester(user):
         return False
 
-    return _can_set_cert_status_common(user, course_key, enrollment_mode)
+    return _can_set_cert_status_common(user, course_key, enrollment_mode, eligibility_data)
 
 
-def _can_set_cert_status_common(user, course_key, enrollment_mode):
+def _can_set_cert_status_common(user, course_key, enrollment_mode, eligibility_data=None):
     """
     Determine whether we can set a custom (non-downloadable) cert status
     """
-    if _is_cert_downloadable(user, course_key):
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
+    if _is_cert_downloadable(user, course_key, eligibility_data):
         return False
 
     if enrollment_mode is None:
@@ -338,7 +583,7 @@ def _can_set_cert_status_common(user, course_key, enrollment_mode):
     if not modes_api.is_eligible_for_certificate(enrollment_mode):
         return False
 
-    course_overview = get_course_overview_or_none(course_key)
+    course_overview = eligibility_data.course_overview()
     if not course_overview:
         return False
 
@@ -355,11 +600,12 @@ def is_on_certificate_allowlist(user, course_key):
     return CertificateAllowlist.objects.filter(user=user, course_id=course_key, allowlist=True).exists()
 
 
-def _can_generate_certificate_for_status(user, course_key, enrollment_mode):
+def _can_generate_certificate_for_status(user, course_key, enrollment_mode, eligibility_data=None):
     """
     Check if the user's certificate status can handle regular (non-allowlist) certificate generation
     """
-    cert = GeneratedCertificate.certificate_for_student(user, course_key)
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
+    cert = eligibility_data.certificate(user)
     if cert is None:
         return True
 
@@ -382,12 +628,13 @@ def _is_ccx_course(course_key):
     return hasattr(course_key, 'ccx')
 
 
-def _has_passing_grade_or_is_allowlisted(user, course_key, course_grade):
+def _has_passing_grade_or_is_allowlisted(user, course_key, course_grade, eligibility_data=None):
     """
     Check if the user has a passing grade in this course run, or is on the allowlist and so is exempt from needing
     a passing grade.
     """
-    if is_on_certificate_allowlist(user, course_key):
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
+    if eligibility_data.is_allowlisted(user):
         return True
 
     return _is_passing_grade(course_grade)
@@ -426,16 +673,17 @@ def _get_enrollment_mode(user, course_key):
     return enrollment_mode
 
 
-def _is_cert_downloadable(user, course_key):
+def _is_cert_downloadable(user, course_key, eligibility_data=None):
     """
     Check if cert already exists, has a downloadable status, and has not been invalidated
     """
-    cert = GeneratedCertificate.certificate_for_student(user, course_key)
+    eligibility_data = eligibility_data or _EligibilityData(course_key)
+    cert = eligibility_data.certificate(user)
     if cert is None:
         return False
     if cert.status != CertificateStatuses.downloadable:
         return False
-    if CertificateInvalidation.has_certificate_invalidation(user, course_key):
+    if eligibility_data.is_invalidated(user):
         return False
 
     return True
@@ -394,6 +394,17 @@ class GeneratedCertificate(models.Model):
         self.name = preferred_name
         self.save()
 
+        self.send_revoked_signals(previous_certificate_status, source=source)
+
+    def send_revoked_signals(self, previous_status, source=None):
+        """
+        Fire the COURSE_CERT_REVOKED signal and CERTIFICATE_REVOKED event for a certificate which was revoked from
+        `previous_status`, and emit an `edx.certificate.revoked` event if it was downloadable.
+
+        Args:
+            previous_status (CertificateStatus) - status of the certificate before it was revoked
+            source (String) - source requesting invalidation of the certificate for tracking purposes
+        """
         COURSE_CERT_REVOKED.send_robust(
             sender=self.__class__,
             user=self.user,
@@ -426,7 +437,7 @@ class GeneratedCertificate(models.Model):
             )
         )
 
-        if previous_certificate_status == CertificateStatuses.downloadable:
+        if previous_status == CertificateStatuses.downloadable:
             # imported here to avoid a circular import issue
             from lms.djangoapps.certificates.utils import emit_certificate_event
 
@@ -475,7 +486,12 @@ class GeneratedCertificate(models.Model):
         Credentials IDA.
         """
         super().save(*args, **kwargs)
+        self.send_changed_signals()
 
+    def send_changed_signals(self):
+        """
+        Fire the signals and events `save()` fires, for a certificate written without it (e.g. in bulk).
+        """
         timestamp = self.modified_date.astimezone(timezone.utc)
 
         COURSE_CERT_CHANGED.send_robust(
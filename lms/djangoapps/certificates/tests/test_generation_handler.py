@@ -2,11 +2,13 @@
 Tests for certificate generation handler
 """
 import logging
+from datetime import timedelta
 from unittest import mock
 
 import ddt
 from django.conf import settings
 from django.test import override_settings
+from django.utils.timezone import now
 
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.tests.factories import CourseEnrollmentFactory, UserFactory
@@ -20,6 +22,7 @@ from lms.djangoapps.certificates.generation_handler import (
     _set_regular_cert_status,
     generate_allowlist_certificate_task,
     generate_certificate_task,
+    generate_certificates_in_bulk,
     is_on_certificate_allowlist
 )
 from lms.djangoapps.certificates.models import GeneratedCertificate
@@ -29,6 +32,7 @@ from lms.djangoapps.certificates.tests.factories import (
     GeneratedCertificateFactory
 )
 from lms.djangoapps.grades.api import CourseGradeFactory
+from lms.djangoapps.verify_student.models import VerificationAttempt
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
 
@@ -36,6 +40,7 @@ log = logging.getLogger(__name__)
 
 BETA_TESTER_METHOD = 'lms.djangoapps.certificates.generation_handler.is_beta_tester'
 COURSE_OVERVIEW_METHOD = 'lms.djangoapps.certificates.generation_handler.get_course_overview_or_none'
+COURSE_GRADE_FACTORY = 'lms.djangoapps.certificates.generation_handler.CourseGradeFactory'
 CCX_COURSE_METHOD = 'lms.djangoapps.certificates.generation_handler._is_ccx_course'
 GET_GRADE_METHOD = 'lms.djangoapps.certificates.generation_handler._get_course_grade'
 ID_VERIFIED_METHOD = 'lms.djangoapps.verify_student.services.IDVerificationService.user_is_verified'
@@ -800,3 +805,128 @@ class CertificateTests(ModuleStoreTestCase):
                 mock.patch(PASSING_GRADE_METHOD, return_value=True), \
                 override_settings(FEATURES={**settings.FEATURES, 'DISABLE_HONOR_CERTIFICATES': True}):
             assert not _can_generate_regular_certificate(self.user, course_run_key, enrollment_mode, grade)
+
+
+@mock.patch(WEB_CERTS_METHOD, mock.Mock(return_value=True))
+@override_settings(CERTIFICATES_BULK_GENERATION_EVENTS_PER_SECOND=0)
+class BulkCertificateTests(ModuleStoreTestCase):
+    """
+    Tests for generating the certificates of many users at once
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        self.course_run = CourseFactory()
+        self.course_run_key = self.course_run.id  # pylint: disable=no-member
+        self.passing_users = set()
+
+    def _create_user(self, mode=CourseMode.VERIFIED, passing=True, cert_status=None):
+        """
+        Create a user enrolled in the course run with the given mode, grade and certificate status
+        """
+        user = UserFactory()
+        CourseEnrollmentFactory(user=user, course_id=self.course_run_key, is_active=True, mode=mode)
+        if passing:
+            self.passing_users.add(user.id)
+        if cert_status:
+            GeneratedCertificateFactory(
+                user=user, course_id=self.course_run_key, mode=GeneratedCertificate.MODES.verified, status=cert_status
+            )
+        return user
+
+    def _generate(self, users):
+        """
+        Generate the certificates of the users in bulk, with passing grades for the users in `self.passing_users`
+        """
+        def iter_grades(users, course_key):  # pylint: disable=unused-argument
+            for user in users:
+                yield CourseGradeFactory.GradeResult(
+                    user, mock.Mock(passed=user.id in self.passing_users, percent=0.9), None
+                )
+
+        with mock.patch(COURSE_GRADE_FACTORY) as mock_grade_factory:
+            mock_grade_factory.return_value.iter.side_effect = iter_grades
+            return generate_certificates_in_bulk(users, self.course_run_key)
+
+    def _status(self, user):
+        return GeneratedCertificate.certificate_for_student(user, self.course_run_key).status
+
+    def test_generate_in_bulk(self):
+        passing = self._create_user()
+        passing_with_cert = self._create_user(cert_status=CertificateStatuses.notpassing)
+        not_passing = self._create_user(passing=False, cert_status=CertificateStatuses.downloadable)
+        not_passing_no_cert = self._create_user(passing=False)
+        audit = self._create_user(mode=CourseMode.AUDIT)
+        invalidated = self._create_user(cert_status=CertificateStatuses.downloadable)
+        CertificateInvalidationFactory.create(
+            generated_certificate=GeneratedCertificate.certificate_for_student(invalidated, self.course_run_key),
+            invalidated_by=invalidated,
+        )
+        previous_verify_uuid = GeneratedCertificate.certificate_for_student(
+            passing_with_cert, self.course_run_key
+        ).verify_uuid
+
+        with mock.patch('lms.djangoapps.certificates.generation.emit_certificate_event') as mock_created_event, \
+                mock.patch('lms.djangoapps.certificates.utils.emit_certificate_event') as mock_revoked_event:
+            counts = self._generate([passing, passing_with_cert, not_passing, not_passing_no_cert, audit, invalidated])
+
+        assert counts == {'generated': 2, 'revoked': 2, 'skipped': 2}
+        assert self._status(passing) == CertificateStatuses.downloadable
+        assert self._status(passing_with_cert) == CertificateStatuses.downloadable
+        assert GeneratedCertificate.certificate_for_student(
+            passing_with_cert, self.course_run_key
+        ).verify_uuid == previous_verify_uuid
+        assert self._status(not_passing) == CertificateStatuses.notpassing
+        assert GeneratedCertificate.certificate_for_student(not_passing, self.course_run_key).grade == '0.9'
+        assert GeneratedCertificate.certificate_for_student(not_passing_no_cert, self.course_run_key) is None
+        assert GeneratedCertificate.certificate_for_student(audit, self.course_run_key) is None
+        assert self._status(invalidated) == CertificateStatuses.unavailable
+
+        # A created event for each generated certificate, and a revoked event for each downloadable one revoked
+        assert [call.kwargs['event_name'] for call in mock_created_event.call_args_list] == ['created', 'created']
+        assert [call.args[0] for call in mock_revoked_event.call_args_list] == ['revoked', 'revoked']
+
+    def test_allowlisted(self):
+        allowlisted = self._create_user(passing=False)
+        CertificateAllowlistFactory.create(course_id=self.course_run_key, user=allowlisted)
+
+        assert self._generate([allowlisted])['generated'] == 1
+        assert self._status(allowlisted) == CertificateStatuses.downloadable
+
+    def test_id_verification_missing(self):
+        not_verified = self._create_user()
+
+        with override_settings(FEATURES={**settings.FEATURES, 'ENABLE_CERTIFICATES_IDV_REQUIREMENT': True}):
+            assert self._generate([not_verified])['generated'] == 1
+
+        assert self._status(not_verified) == CertificateStatuses.unverified
+
+    def test_id_verification_expired(self):
+        verified = self._create_user()
+        VerificationAttempt.objects.create(user=verified, status='approved', expiration_datetime=now() + timedelta(1))
+        expired = self._create_user()
+        VerificationAttempt.objects.create(user=expired, status='approved', expiration_datetime=now() - timedelta(1))
+
+        with override_settings(FEATURES={**settings.FEATURES, 'ENABLE_CERTIFICATES_IDV_REQUIREMENT': True}):
+            assert self._generate([verified, expired])['generated'] == 2
+
+        assert self._status(verified) == CertificateStatuses.downloadable
+        assert self._status(expired) == CertificateStatuses.unverified
+
+    def test_no_overview(self):
+        user = self._create_user()
+
+        with mock.patch(COURSE_OVERVIEW_METHOD, return_value=None):
+            assert self._generate([user]) == {'generated': 0, 'revoked': 0, 'skipped': 1}
+
+        assert GeneratedCertificate.certificate_for_student(user, self.course_run_key) is None
+
+    @override_settings(CERTIFICATES_BULK_GENERATION_EVENTS_PER_SECOND=10)
+    def test_events_throttled(self):
+        users = [self._create_user() for __ in range(3)]
+
+        with mock.patch('lms.djangoapps.certificates.generation.time.sleep') as mock_sleep:
+            self._generate(users)
+
+        assert mock_sleep.call_count == 2
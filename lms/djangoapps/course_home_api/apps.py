@@ -7,3 +7,7 @@ from django.apps import AppConfig
 
 class CourseHomeApiConfig(AppConfig):
     name = 'lms.djangoapps.course_home_api'
+
+    def ready(self):
+        # Import signals to wire up the signal handlers contained within
+        from lms.djangoapps.course_home_api import signals  # pylint: disable=unused-import
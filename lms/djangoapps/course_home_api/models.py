@@ -2,8 +2,11 @@
 Course home api models file
 """
 
+from django.contrib.auth import get_user_model
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+from opaque_keys.edx.django.models import CourseKeyField
 
 from openedx.core.djangoapps.config_model_utils.models import StackedConfigurationModel
 
@@ -25,3 +28,44 @@ class DisableProgressPageStackedConfig(StackedConfigurationModel):
         return "DisableProgressPageStackedConfig(disabled={!r})".format(
             self.disabled
         )
+
+
+class ProgressSnapshot(TimeStampedModel):
+    """
+    The grades, completion and scheduled content a user sees on the progress tab of a course,
+    as computed for viewers with or without staff access.
+
+    Snapshots are marked stale by signals when the grades, completions, dates or enrollment
+    of the user change, and recomputed the next time they are read.
+
+    .. no_pii:
+    """
+    user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    has_staff_access = models.BooleanField(default=False)
+    # The published version of the course the snapshot was computed from
+    course_version = models.CharField(max_length=255, blank=True)
+    # When the release of content or a due date changes what the snapshot shows
+    valid_until = models.DateTimeField(null=True, blank=True)
+    is_stale = models.BooleanField(default=False)
+    document = models.JSONField()
+
+    class Meta:
+        unique_together = ('user', 'course_id', 'has_staff_access')
+
+    def __str__(self):
+        return f"ProgressSnapshot(user={self.user_id}, course_id={self.course_id}, stale={self.is_stale})"
+
+    @classmethod
+    def invalidate(cls, user_id, course_key):
+        """
+        Mark the snapshots of the user in the course as stale.
+        """
+        cls.objects.filter(user_id=user_id, course_id=course_key, is_stale=False).update(is_stale=True)
+
+    @classmethod
+    def invalidate_many(cls, user_ids, course_key):
+        """
+        Mark the snapshots of the users in the course as stale.
+        """
+        cls.objects.filter(user_id__in=user_ids, course_id=course_key, is_stale=False).update(is_stale=True)
@@ -79,8 +79,7 @@ class SubsectionScoresSerializer(ReadOnlySerializer):
         return subsection.show_grades(self.context['staff_access'])
 
     def get_learner_has_access(self, subsection):
-        course_blocks = self.context['course_blocks']
-        return not course_blocks.get_xblock_field(subsection.location, 'contains_gated_content', False)
+        return not subsection.contains_gated_content
 
 
 class SectionScoresSerializer(ReadOnlySerializer):
@@ -0,0 +1,249 @@
+"""
+Snapshots of the grades, completion and scheduled content shown on the progress tab.
+
+Computing them reads the grades of the learner and walks the course blocks. When progress
+snapshots are enabled for the course, the result is stored per user and course as a compact
+JSON document, and served until signals mark it stale, the course is published, or the release
+of content or a due date changes what it shows.
+"""
+
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+
+from dateutil.parser import parse as parse_date
+from django.conf import settings
+from opaque_keys.edx.keys import UsageKey
+from pytz import UTC
+
+from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.course_blocks.transformers.start_date import StartDateTransformer
+from lms.djangoapps.course_home_api.models import ProgressSnapshot
+from lms.djangoapps.course_home_api.toggles import progress_snapshots_are_enabled
+from lms.djangoapps.courseware.courses import get_course_blocks_completion_summary
+from lms.djangoapps.courseware.masquerade import get_course_masquerade
+from lms.djangoapps.grades.api import CourseGradeFactory
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+from openedx.features.content_type_gating.block_transformers import ContentTypeGateTransformer
+from xmodule.graders import ShowCorrectness
+
+# The course grade of a snapshot, with the fields of a CourseGrade the progress tab reads.
+SnapshotCourseGrade = namedtuple('SnapshotCourseGrade', ['letter_grade', 'percent', 'passed'])
+_Score = namedtuple('_Score', ['earned', 'possible'])
+_Override = namedtuple('_Override', ['system', 'override_reason'])
+
+
+def _format_datetime(value):
+    """Returns the ISO 8601 string of a datetime, or None"""
+    return value.isoformat() if value else None
+
+
+def _parse_datetime(value):
+    """Returns the datetime of an ISO 8601 string, or None"""
+    return parse_date(value) if value else None
+
+
+class SnapshotSubsectionGrade:
+    """
+    The grade of a subsection in a snapshot, with the fields of a SubsectionGrade the progress tab reads.
+
+    Its problem scores are keyed by the string of the problem block keys.
+    """
+
+    def __init__(self, data):
+        self.location = UsageKey.from_string(data['location'])
+        self.display_name = data['display_name']
+        self.format = data['format']
+        self.graded = data['graded']
+        self.due = _parse_datetime(data['due'])
+        self.end = _parse_datetime(data['end'])
+        self.self_paced = data['self_paced']
+        self.hide_after_due = data['hide_after_due']
+        self.show_correctness = data['show_correctness']
+        self.override = _Override(*data['override']) if data['override'] else None
+        self.graded_total = _Score(*data['graded_total'])
+        self.percent_graded = data['percent_graded']
+        self.problem_scores = OrderedDict(
+            (block_key, _Score(earned, possible)) for block_key, earned, possible in data['problem_scores']
+        )
+        self.contains_gated_content = data['contains_gated_content']
+
+    def show_grades(self, has_staff_access):
+        """
+        Returns whether subsection scores are currently available to users with or without staff access.
+        """
+        return ShowCorrectness.correctness_available(self.show_correctness, self.due, has_staff_access)
+
+
+class ProgressData:
+    """
+    The grades, completion and scheduled content of a user in a course, read from a snapshot document.
+    """
+
+    def __init__(self, document):
+        self.course_grade = SnapshotCourseGrade(**document['course_grade'])
+        self.completion_summary = document['completion_summary']
+        self.has_scheduled_content = document['has_scheduled_content']
+        self.section_scores = [
+            {
+                'display_name': section['display_name'],
+                'sections': [SnapshotSubsectionGrade(subsection) for subsection in section['subsections']],
+            }
+            for section in document['section_scores']
+        ]
+
+
+def _subsection_document(subsection, course_blocks):
+    """
+    Returns the snapshot document of a SubsectionGrade.
+    """
+    override = subsection.override
+    return {
+        'location': str(subsection.location),
+        'display_name': subsection.display_name,
+        'format': subsection.format,
+        'graded': subsection.graded,
+        'due': _format_datetime(subsection.due),
+        'end': _format_datetime(subsection.end),
+        'self_paced': subsection.self_paced,
+        'hide_after_due': subsection.hide_after_due,
+        'show_correctness': subsection.show_correctness,
+        'override': [override.system, override.override_reason] if override else None,
+        'graded_total': [subsection.graded_total.earned, subsection.graded_total.possible],
+        'percent_graded': subsection.percent_graded,
+        'problem_scores': [
+            [str(block_key), score.earned, score.possible] for block_key, score in subsection.problem_scores.items()
+        ],
+        'contains_gated_content': course_blocks.get_xblock_field(
+            subsection.location, 'contains_gated_content', False
+        ),
+    }
+
+
+def _get_valid_until(collected_block_structure, course_grade):
+    """
+    Returns the earliest future time at which the release of content or the due date of a
+    subsection may change the progress of the user, bounded by COURSE_HOME_PROGRESS_SNAPSHOT_MAX_AGE.
+
+    Start dates are moved earlier by the days beta testers see the content early.
+    """
+    now = datetime.now(UTC)
+    dates = [now + timedelta(seconds=settings.COURSE_HOME_PROGRESS_SNAPSHOT_MAX_AGE)]
+    for block_key in collected_block_structure.topological_traversal():
+        start = collected_block_structure.get_transformer_block_field(
+            block_key, StartDateTransformer, StartDateTransformer.MERGED_START_DATE, None
+        )
+        if start:
+            days_early_for_beta = collected_block_structure.get_xblock_field(block_key, 'days_early_for_beta')
+            dates.append(start - timedelta(days=days_early_for_beta or 0))
+    for chapter in course_grade.chapter_grades.values():
+        dates.extend(subsection.due for subsection in chapter['sections'] if subsection.due)
+    return min(date for date in dates if date > now)
+
+
+def _build_document(student, course_key, is_staff):
+    """
+    Computes the snapshot document of the progress of the student, and the time until which it is valid.
+    """
+    # The block structure is used for both the course_grade and has_scheduled content fields
+    # So it is called upfront and reused for optimization purposes
+    collected_block_structure = get_block_structure_manager(course_key).get_collected()
+    course_grade = CourseGradeFactory().read(student, collected_block_structure=collected_block_structure)
+
+    # recalculate course grade from visible grades (stored grade was calculated over all grades, visible or not)
+    course_grade.update(visible_grades_only=True, has_staff_access=is_staff)
+
+    # Get has_scheduled_content data
+    transformers = BlockStructureTransformers()
+    transformers += [StartDateTransformer(), ContentTypeGateTransformer()]
+    usage_key = collected_block_structure.root_block_usage_key
+    course_blocks = get_course_blocks(
+        student,
+        usage_key,
+        transformers=transformers,
+        collected_block_structure=collected_block_structure,
+        include_has_scheduled_content=True
+    )
+
+    document = {
+        'course_grade': {
+            'letter_grade': course_grade.letter_grade,
+            'percent': course_grade.percent,
+            'passed': course_grade.passed,
+        },
+        'completion_summary': get_course_blocks_completion_summary(course_key, student),
+        'has_scheduled_content': course_blocks.get_xblock_field(usage_key, 'has_scheduled_content'),
+        'section_scores': [
+            {
+                'display_name': chapter['display_name'],
+                'subsections': [
+                    _subsection_document(subsection, course_blocks) for subsection in chapter['sections']
+                ],
+            }
+            for chapter in course_grade.chapter_grades.values()
+        ],
+    }
+    return document, _get_valid_until(collected_block_structure, course_grade)
+
+
+def _claim_snapshot(student, course_key, is_staff, snapshot):
+    """
+    Marks the snapshot of the student as being recomputed, creating it if needed, and returns
+    the time it was claimed at.
+
+    The claimed snapshot is not stale but already expired, so it is not served until it is
+    written by `_store_snapshot`. Signals marking it stale in the meantime prevent that write.
+    """
+    claimed_at = datetime.now(UTC)
+    fields = {'is_stale': False, 'valid_until': claimed_at, 'modified': claimed_at}
+    if snapshot is None:
+        snapshot, created = ProgressSnapshot.objects.get_or_create(
+            user=student, course_id=course_key, has_staff_access=is_staff, defaults=dict(fields, document={}),
+        )
+        if created:
+            return snapshot.modified
+    ProgressSnapshot.objects.filter(user=student, course_id=course_key, has_staff_access=is_staff).update(**fields)
+    return claimed_at
+
+
+def _store_snapshot(student, course_key, is_staff, claimed_at, course_version, document, valid_until):
+    """
+    Stores the recomputed snapshot of the student, unless it was marked stale or claimed by
+    another request since it was claimed at `claimed_at`.
+    """
+    ProgressSnapshot.objects.filter(
+        user=student, course_id=course_key, has_staff_access=is_staff, is_stale=False, modified=claimed_at,
+    ).update(
+        course_version=course_version,
+        valid_until=valid_until,
+        document=document,
+        modified=datetime.now(UTC),
+    )
+
+
+def get_progress_data(student, course, is_staff):
+    """
+    Returns the ProgressData of the student in the course, as seen by a viewer with or without
+    staff access.
+
+    When progress snapshots are enabled for the course, it is read from the snapshot of the
+    student if it is still valid, and the snapshot is recomputed otherwise. Masquerading
+    viewers always get freshly computed data.
+    """
+    course_version = str(getattr(course, 'course_version', None) or '')
+    use_snapshot = progress_snapshots_are_enabled(course.id) and not get_course_masquerade(student, course.id)
+    if use_snapshot:
+        snapshot = ProgressSnapshot.objects.filter(
+            user=student, course_id=course.id, has_staff_access=is_staff
+        ).first()
+        if (
+            snapshot and not snapshot.is_stale and snapshot.course_version == course_version
+            and (snapshot.valid_until is None or snapshot.valid_until > datetime.now(UTC))
+        ):
+            return ProgressData(snapshot.document)
+        claimed_at = _claim_snapshot(student, course.id, is_staff, snapshot)
+
+    document, valid_until = _build_document(student, course.id, is_staff)
+    if use_snapshot:
+        _store_snapshot(student, course.id, is_staff, claimed_at, course_version, document, valid_until)
+    return ProgressData(document)
@@ -10,6 +10,7 @@ import ddt
 from django.urls import reverse
 from django.utils.timezone import now
 from edx_toggles.toggles.testutils import override_waffle_flag
+from freezegun import freeze_time
 from pytz import UTC
 from xmodule.modulestore.tests.factories import BlockFactory
 
@@ -17,8 +18,12 @@ from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.tests.factories import UserFactory
 from lms.djangoapps.course_home_api.tests.utils import BaseCourseHomeTests
-from lms.djangoapps.course_home_api.models import DisableProgressPageStackedConfig
-from lms.djangoapps.course_home_api.toggles import COURSE_HOME_MICROFRONTEND_PROGRESS_TAB
+from lms.djangoapps.course_home_api.models import DisableProgressPageStackedConfig, ProgressSnapshot
+from lms.djangoapps.course_home_api.progress import snapshots
+from lms.djangoapps.course_home_api.toggles import (
+    COURSE_HOME_MICROFRONTEND_PROGRESS_TAB,
+    COURSE_HOME_PROGRESS_SNAPSHOTS,
+)
 from lms.djangoapps.grades.api import CourseGradeFactory
 from lms.djangoapps.grades.constants import GradeOverrideFeatureEnum
 from lms.djangoapps.grades.models import (
@@ -29,6 +34,8 @@ from lms.djangoapps.grades.models import (
 from lms.djangoapps.grades.tests.utils import answer_problem
 from lms.djangoapps.verify_student.models import ManualVerification
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 from openedx.core.djangoapps.course_date_signals.utils import MIN_DURATION
 from openedx.core.djangolib.testing.utils import get_mock_request
 from openedx.features.content_type_gating.helpers import CONTENT_GATING_PARTITION_ID, CONTENT_TYPE_GATE_GROUP_IDS
@@ -314,3 +321,93 @@ class ProgressTabTestViews(BaseCourseHomeTests):
         assert response.status_code == 200
         assert response.data['course_grade']['percent'] == expected_percent
         assert response.data['course_grade']['is_passing'] == (expected_percent >= 0.5)
+
+
+@override_waffle_flag(COURSE_HOME_MICROFRONTEND_PROGRESS_TAB, active=True)
+@override_waffle_flag(COURSE_HOME_PROGRESS_SNAPSHOTS, active=True)
+class ProgressSnapshotTestViews(BaseCourseHomeTests):
+    """
+    Tests for serving the Progress Tab API from progress snapshots
+    """
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('course-home:progress-tab', args=[self.course.id])
+        with self.store.bulk_operations(self.course.id):
+            chapter = BlockFactory(parent=self.course, category='chapter')
+            self.subsection = BlockFactory(
+                parent=chapter, category='sequential', graded=True, format='Homework',
+                due=now().replace(microsecond=0) + timedelta(days=2), show_correctness='past_due',
+            )
+            vertical = BlockFactory(parent=self.subsection, category='vertical')
+            self.problem = BlockFactory(parent=vertical, category='problem', graded=True)
+        CourseEnrollment.enroll(self.user, self.course.id)
+
+    def test_snapshot_is_served(self):
+        response = self.client.get(self.url)
+        assert response.status_code == 200
+        snapshot = ProgressSnapshot.objects.get(user=self.user, course_id=self.course.id)
+        assert not snapshot.has_staff_access
+        assert snapshot.valid_until == self.subsection.due
+
+        with patch('lms.djangoapps.course_home_api.progress.snapshots.CourseGradeFactory') as mock_factory:
+            snapshot_response = self.client.get(self.url)
+        mock_factory.assert_not_called()
+        assert snapshot_response.data['section_scores'] == response.data['section_scores']
+        assert snapshot_response.data['course_grade'] == response.data['course_grade']
+        assert snapshot_response.data['completion_summary'] == response.data['completion_summary']
+
+    def test_snapshot_is_recomputed_when_scores_change(self):
+        self.client.get(self.url)
+        answer_problem(self.course, get_mock_request(self.user), self.problem)
+        assert ProgressSnapshot.objects.get(user=self.user, course_id=self.course.id).is_stale
+
+        response = self.client.get(self.url)
+        subsection = response.data['section_scores'][1]['subsections'][0]
+        assert subsection['num_points_earned'] == 1
+        assert not ProgressSnapshot.objects.get(user=self.user, course_id=self.course.id).is_stale
+
+    def test_snapshot_is_recomputed_when_cohort_changes(self):
+        self.client.get(self.url)
+        add_user_to_cohort(CohortFactory(course_id=self.course.id), self.user)
+        assert ProgressSnapshot.objects.get(user=self.user, course_id=self.course.id).is_stale
+
+    def test_snapshot_invalidated_while_recomputed_stays_stale(self):
+        build_document = snapshots._build_document  # pylint: disable=protected-access
+
+        def build_document_and_invalidate(student, course_key, is_staff):
+            document = build_document(student, course_key, is_staff)
+            ProgressSnapshot.invalidate(student.id, course_key)
+            return document
+
+        with patch.object(snapshots, '_build_document', side_effect=build_document_and_invalidate):
+            assert self.client.get(self.url).status_code == 200
+        assert ProgressSnapshot.objects.get(user=self.user, course_id=self.course.id).is_stale
+
+        self.client.get(self.url)
+        assert not ProgressSnapshot.objects.get(user=self.user, course_id=self.course.id).is_stale
+
+    def test_snapshot_is_recomputed_after_due_date(self):
+        answer_problem(self.course, get_mock_request(self.user), self.problem)
+        assert self.client.get(self.url).data['course_grade']['percent'] == 0
+
+        with freeze_time(self.subsection.due + timedelta(hours=1)):
+            response = self.client.get(self.url)
+        assert response.data['course_grade']['percent'] > 0
+
+    def test_snapshot_is_recomputed_when_course_is_published(self):
+        self.client.get(self.url)
+        self.subsection.display_name = 'Renamed'
+        self.store.update_item(self.subsection, self.user.id)
+        self.store.publish(self.subsection.location, self.user.id)
+
+        response = self.client.get(self.url)
+        assert response.data['section_scores'][1]['subsections'][0]['display_name'] == 'Renamed'
+
+    def test_masquerade_does_not_use_snapshots(self):
+        self.switch_to_staff()
+        CourseEnrollment.enroll(self.user, self.course.id)
+        self.update_masquerade()
+
+        response = self.client.get(self.url)
+        assert response.status_code == 200
+        assert not ProgressSnapshot.objects.filter(course_id=self.course.id).exists()
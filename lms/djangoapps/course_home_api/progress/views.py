@@ -15,26 +15,19 @@ from rest_framework.response import Response
 from xmodule.modulestore.django import modulestore
 from common.djangoapps.student.models import CourseEnrollment
 from lms.djangoapps.course_home_api.progress.serializers import ProgressTabSerializer
+from lms.djangoapps.course_home_api.progress.snapshots import get_progress_data
 from lms.djangoapps.course_home_api.toggles import course_home_mfe_progress_tab_is_active
 from lms.djangoapps.courseware.access import has_access, has_ccx_coach_role
-from lms.djangoapps.course_blocks.api import get_course_blocks
-from lms.djangoapps.course_blocks.transformers import start_date
 
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.course_home_api.utils import get_course_or_403
-from lms.djangoapps.courseware.courses import (
-    get_course_blocks_completion_summary, get_studio_url,
-)
+from lms.djangoapps.courseware.courses import get_studio_url
 from lms.djangoapps.courseware.masquerade import setup_masquerade
 from lms.djangoapps.courseware.views.views import credit_course_requirements, get_cert_data
 
-from lms.djangoapps.grades.api import CourseGradeFactory
 from lms.djangoapps.verify_student.services import IDVerificationService
-from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
-from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.lib.api.authentication import BearerAuthenticationAllowInactiveUser
-from openedx.features.content_type_gating.block_transformers import ContentTypeGateTransformer
 from openedx.features.course_duration_limits.access import get_access_expiration_data
 from openedx.features.enterprise_support.utils import get_enterprise_learner_generic_name
 
@@ -201,26 +194,8 @@ class ProgressTabView(RetrieveAPIView):
         if not (enrollment and enrollment.is_active) and not is_staff:
             return Response('User not enrolled.', status=401)
 
-        # The block structure is used for both the course_grade and has_scheduled content fields
-        # So it is called upfront and reused for optimization purposes
-        collected_block_structure = get_block_structure_manager(course_key).get_collected()
-        course_grade = CourseGradeFactory().read(student, collected_block_structure=collected_block_structure)
-
-        # recalculate course grade from visible grades (stored grade was calculated over all grades, visible or not)
-        course_grade.update(visible_grades_only=True, has_staff_access=is_staff)
-
-        # Get has_scheduled_content data
-        transformers = BlockStructureTransformers()
-        transformers += [start_date.StartDateTransformer(), ContentTypeGateTransformer()]
-        usage_key = collected_block_structure.root_block_usage_key
-        course_blocks = get_course_blocks(
-            student,
-            usage_key,
-            transformers=transformers,
-            collected_block_structure=collected_block_structure,
-            include_has_scheduled_content=True
-        )
-        has_scheduled_content = course_blocks.get_xblock_field(usage_key, 'has_scheduled_content')
+        progress = get_progress_data(student, course, is_staff)
+        course_grade = progress.course_grade
 
         # Get user_has_passing_grade data
         user_has_passing_grade = False
@@ -248,14 +223,14 @@ class ProgressTabView(RetrieveAPIView):
         data = {
             'access_expiration': access_expiration,
             'certificate_data': get_cert_data(student, course, enrollment_mode, course_grade),
-            'completion_summary': get_course_blocks_completion_summary(course_key, student),
+            'completion_summary': progress.completion_summary,
             'course_grade': course_grade,
             'credit_course_requirements': credit_course_requirements(course_key, student),
             'end': course.end,
             'enrollment_mode': enrollment_mode,
             'grading_policy': grading_policy,
-            'has_scheduled_content': has_scheduled_content,
-            'section_scores': list(course_grade.chapter_grades.values()),
+            'has_scheduled_content': progress.has_scheduled_content,
+            'section_scores': progress.section_scores,
             'studio_url': get_studio_url(course, 'settings/grading'),
             'username': username,
             'user_has_passing_grade': user_has_passing_grade,
@@ -264,7 +239,6 @@ class ProgressTabView(RetrieveAPIView):
         }
         context = self.get_serializer_context()
         context['staff_access'] = is_staff
-        context['course_blocks'] = course_blocks
         context['course_key'] = course_key
         # course_overview and enrollment will be used by VerifiedModeSerializer
         context['course_overview'] = course_overview
@@ -0,0 +1,95 @@
+"""
+Signal handlers marking the progress snapshots of learners stale
+"""
+from completion.models import BlockCompletion
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_when.models import UserDate
+
+from common.djangoapps.student.models import CourseEnrollment
+from lms.djangoapps.course_home_api.models import ProgressSnapshot
+from lms.djangoapps.teams.models import CourseTeamMembership
+from openedx.core.djangoapps.course_groups.models import CohortMembership, CourseUserGroupPartitionGroup
+from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
+from openedx.core.djangoapps.schedules.models import Schedule
+from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
+
+
+@receiver(COURSE_GRADE_CHANGED)
+def invalidate_progress_snapshots_on_course_grade_change(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of a user stale when their course grade is recomputed, which
+    happens after the subsection grades of a changed score or subsection override are updated
+    """
+    ProgressSnapshot.invalidate(kwargs['user'].id, kwargs['course_key'])
+
+
+@receiver(post_save, sender=BlockCompletion)
+@receiver(post_delete, sender=BlockCompletion)
+def invalidate_progress_snapshots_on_completion(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of a user stale when they complete one of their blocks
+    """
+    ProgressSnapshot.invalidate(instance.user_id, instance.context_key)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def invalidate_progress_snapshots_on_enrollment_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of a user stale when their enrollment mode, which gates content, changes
+    """
+    ProgressSnapshot.invalidate(instance.user_id, instance.course_id)
+
+
+@receiver(post_save, sender=Schedule)
+def invalidate_progress_snapshots_on_schedule_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of a user stale when their schedule, which relative due dates are based on, changes
+    """
+    ProgressSnapshot.invalidate(instance.enrollment.user_id, instance.enrollment.course_id)
+
+
+@receiver(post_save, sender=UserDate)
+@receiver(post_delete, sender=UserDate)
+def invalidate_progress_snapshots_on_date_override(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of a user stale when one of their personal due dates changes
+    """
+    ProgressSnapshot.invalidate(instance.user_id, instance.content_date.course_id)
+
+
+@receiver(COHORT_MEMBERSHIP_UPDATED)
+def invalidate_progress_snapshots_on_cohort(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of a user stale when they are added to or removed from a cohort
+    """
+    ProgressSnapshot.invalidate(user.id, course_key)
+
+
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+def invalidate_progress_snapshots_on_cohort_membership(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of a user stale when their cohort membership is changed outside of the cohorts API
+    """
+    ProgressSnapshot.invalidate(instance.user_id, instance.course_id)
+
+
+@receiver(post_save, sender=CourseUserGroupPartitionGroup)
+@receiver(post_delete, sender=CourseUserGroupPartitionGroup)
+def invalidate_progress_snapshots_on_cohort_group(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of the members of a cohort stale when the partition group it is linked to changes
+    """
+    cohort = instance.course_user_group
+    for user_id in cohort.users.values_list('id', flat=True):
+        ProgressSnapshot.invalidate(user_id, cohort.course_id)
+
+
+@receiver(post_save, sender=CourseTeamMembership)
+@receiver(post_delete, sender=CourseTeamMembership)
+def invalidate_progress_snapshots_on_team_membership(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Mark the progress snapshots of a user stale when they join or leave a team, which team partition groups are based on
+    """
+    ProgressSnapshot.invalidate(instance.user_id, instance.team.course_id)
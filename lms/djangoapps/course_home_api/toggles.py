@@ -35,6 +35,20 @@ COURSE_HOME_NEW_DISCUSSION_SIDEBAR_VIEW = CourseWaffleFlag(
     f'{WAFFLE_FLAG_NAMESPACE}.new_discussion_sidebar_view', __name__
 )
 
+# .. toggle_name: course_home.progress_snapshots
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, the progress tab API serves the grades, completion and scheduled
+#   content of learners from a stored snapshot, which is only recomputed once signals mark it stale or the
+#   release of content or a due date changes it, instead of recomputing them on each request.
+# .. toggle_use_cases: open_edx, temporary
+# .. toggle_creation_date: 2026-10-19
+# .. toggle_target_removal_date: None
+# .. toggle_tickets: None
+COURSE_HOME_PROGRESS_SNAPSHOTS = CourseWaffleFlag(
+    f'{WAFFLE_FLAG_NAMESPACE}.progress_snapshots', __name__
+)
+
 
 def course_home_mfe_progress_tab_is_active(course_key):
     # Avoiding a circular dependency
@@ -51,3 +65,10 @@ def new_discussion_sidebar_view_is_enabled(course_key):
     Returns True if the new discussion sidebar view is enabled for the given course.
     """
     return COURSE_HOME_NEW_DISCUSSION_SIDEBAR_VIEW.is_enabled(course_key)
+
+
+def progress_snapshots_are_enabled(course_key):
+    """
+    Returns True if the progress tab data of learners in the given course is served from snapshots.
+    """
+    return COURSE_HOME_PROGRESS_SNAPSHOTS.is_enabled(course_key)
@@ -44,7 +44,7 @@ from lms.djangoapps.courseware.toggles import course_is_invitation_only
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.features.course_duration_limits.access import check_course_expired
 from common.djangoapps.student import auth
-from common.djangoapps.student.models import CourseEnrollmentAllowed
+from common.djangoapps.student.models import CourseEnrollment, CourseEnrollmentAllowed
 from common.djangoapps.student.roles import (
     CourseBetaTesterRole,
     CourseCcxCoachRole,
@@ -193,6 +193,50 @@ def has_access(user, action, obj, course_key=None):
                     .format(type(obj)))
 
 
+class _UserCoursesFacts:
+    """
+    The facts about a user which course access checks look up for each course, fetched
+    once for all courses.
+
+    Attributes:
+        enrolled_course_keys (set): The keys of the courses the user has an enrollment in, active or not.
+        enrollments_allowed (dict): Maps course keys to the CourseEnrollmentAllowed of the email of the user.
+    """
+
+    def __init__(self, user):
+        self.enrolled_course_keys = set()
+        self.enrollments_allowed = {}
+        if user.is_authenticated:
+            self.enrolled_course_keys = set(
+                CourseEnrollment.objects.filter(user=user).values_list('course_id', flat=True)
+            )
+            self.enrollments_allowed = {
+                cea.course_id: cea
+                for cea in CourseEnrollmentAllowed.objects.filter(email=user.email).select_related('user')
+            }
+
+
+def has_access_to_courses(user, permissions, courses):
+    """
+    Yields the courses on which the user has all the given permissions.
+
+    This is equivalent to keeping the courses for which `has_access(user, permission, course)`
+    is granted for every permission, but the enrollments and enrollment allowances of the user
+    are fetched once for all courses, instead of for each course.
+
+    Arguments:
+        user (User): The user whose access is checked. May be anonymous or None.
+        permissions (iterable of str): The actions to check, as for `has_access` on courses.
+        courses (iterable of CourseBlock or CourseOverview): The courses to check.
+    """
+    if not user:
+        user = AnonymousUser()
+    user_facts = _UserCoursesFacts(user)
+    for course in courses:
+        if all(_has_access_course(user, permission, course, user_facts) for permission in permissions):
+            yield course
+
+
 def has_staff_access_to_preview_mode(user, course_key):
     """
     Checks if given user can access course in preview mode.
@@ -258,7 +302,7 @@ def _can_load_course_on_mobile(user, course):
     )
 
 
-def _can_enroll_courselike(user, courselike):
+def _can_enroll_courselike(user, courselike, user_facts=None):
     """
     Ascertain if the user can enroll in the given courselike object.
 
@@ -266,6 +310,8 @@ def _can_enroll_courselike(user, courselike):
         user (User): The user attempting to enroll.
         courselike (CourseBlock or CourseOverview): The object representing the
             course in which the user is trying to enroll.
+        user_facts (_UserCoursesFacts): The prefetched enrollment allowances of the
+            user, if any. They are looked up for the course otherwise.
 
     Returns:
         AccessResponse, indicating whether the user can enroll.
@@ -283,7 +329,10 @@ def _can_enroll_courselike(user, courselike):
     # Note that as dictated by the legacy database schema, the filter call includes
     # a `course_id` kwarg which requires a CourseKey.
     if user is not None and user.is_authenticated:
-        cea = CourseEnrollmentAllowed.objects.filter(email=user.email, course_id=course_key).first()
+        if user_facts is not None:
+            cea = user_facts.enrollments_allowed.get(course_key)
+        else:
+            cea = CourseEnrollmentAllowed.objects.filter(email=user.email, course_id=course_key).first()
         if cea:
             # DISABLE_ALLOWED_ENROLLMENT_IF_ENROLLMENT_CLOSED flag is used to disable enrollment for user invited
             # to a course if user is registering when the course enrollment is closed
@@ -318,7 +367,7 @@ def _can_enroll_courselike(user, courselike):
 
 
 @function_trace('_has_access_course')
-def _has_access_course(user, action, courselike):
+def _has_access_course(user, action, courselike, user_facts=None):
     """
     Check if user has access to a course.
 
@@ -327,6 +376,8 @@ def _has_access_course(user, action, courselike):
         action (string): The action that is being checked.
         courselike (CourseBlock or CourseOverview): The object
             representing the course that the user wants to access.
+        user_facts (_UserCoursesFacts): The prefetched enrollments and enrollment
+            allowances of the user when checking access to many courses, if any.
 
     Valid actions:
 
@@ -386,7 +437,11 @@ def _has_access_course(user, action, courselike):
             else:
                 return view_with_prereqs
 
-        has_not_expired = check_course_expired(user, courselike)
+        if user_facts is not None and courselike.id not in user_facts.enrolled_course_keys:
+            # Access only expires for enrolled learners
+            has_not_expired = ACCESS_GRANTED
+        else:
+            has_not_expired = check_course_expired(user, courselike)
         if not has_not_expired:
             staff_access = _has_staff_access_to_block(user, courselike, courselike.id)
             if staff_access:
@@ -401,7 +456,7 @@ def _has_access_course(user, action, courselike):
         """
         Returns whether the user can enroll in the course.
         """
-        return _can_enroll_courselike(user, courselike)
+        return _can_enroll_courselike(user, courselike, user_facts)
 
     @function_trace('see_exists')
     def see_exists():
@@ -409,6 +464,9 @@ def _has_access_course(user, action, courselike):
         Can see if can enroll, but also if can load it: if user enrolled in a course and now
         it's past the enrollment period, they should still see it.
         """
+        if user_facts is not None:
+            # With prefetched facts, enrollment is the cheaper check
+            return ACCESS_GRANTED if (can_enroll() or can_load()) else ACCESS_DENIED
         return ACCESS_GRANTED if (can_load() or can_enroll()) else ACCESS_DENIED
 
     @function_trace('can_see_in_catalog')
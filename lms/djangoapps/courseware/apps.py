@@ -0,0 +1,18 @@
+"""
+Django AppConfig module for the courseware app
+"""
+
+
+from django.apps import AppConfig
+
+
+class CoursewareConfig(AppConfig):
+    """
+    Django AppConfig class for the courseware app
+    """
+    name = 'lms.djangoapps.courseware'
+    label = 'courseware'
+
+    def ready(self):
+        # Import signals to wire up the signal handlers contained within
+        from lms.djangoapps.courseware import signals  # pylint: disable=unused-import
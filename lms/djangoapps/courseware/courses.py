@@ -4,6 +4,7 @@ courseware.
 """
 
 import logging
+import uuid
 from collections import defaultdict, namedtuple
 from datetime import datetime
 
@@ -15,6 +16,7 @@ from django.conf import settings
 from django.core.cache import cache
 from django.http import Http404, QueryDict
 from django.urls import reverse
+from django.utils.translation import get_language
 from django.utils.translation import gettext as _
 from edx_django_utils.monitoring import function_trace
 from fs.errors import ResourceNotFound
@@ -26,7 +28,7 @@ from common.djangoapps.static_replace import replace_static_urls
 from common.djangoapps.util.date_utils import strftime_localized
 from lms.djangoapps import branding
 from lms.djangoapps.course_blocks.api import get_course_blocks
-from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.access import has_access, has_access_to_courses
 from lms.djangoapps.courseware.access_response import (
     AuthenticationRequiredAccessError,
     EnrollmentRequiredAccessError,
@@ -49,7 +51,7 @@ from lms.djangoapps.courseware.date_summary import (
     VerifiedUpgradeDeadlineDate
 )
 from lms.djangoapps.courseware.exceptions import CourseAccessRedirect, CourseRunNotFound
-from lms.djangoapps.courseware.masquerade import check_content_start_date_for_masquerade_user
+from lms.djangoapps.courseware.masquerade import check_content_start_date_for_masquerade_user, get_course_masquerade
 from lms.djangoapps.courseware.model_data import FieldDataCache
 from lms.djangoapps.courseware.block_render import get_block
 from lms.djangoapps.grades.api import CourseGradeFactory
@@ -77,6 +79,18 @@ _Assignment = namedtuple(
                    'assignment_type', 'extra_info', 'first_component_block_id']
 )
 
+# How get_course_assignments caches an assignment: the values of the _Assignment `fields`, as of
+# after its `release`, and the url and completion of the assignment until then. past_due is
+# computed when the assignment is read.
+_CachedAssignment = namedtuple(
+    '_CachedAssignment', ['fields', 'release', 'unreleased_url', 'unreleased_complete']
+)
+
+COURSE_ASSIGNMENTS_CACHE_KEY_TPL = (
+    'course_assignments.{user_id}.{course_id}.{course_version}.{user_version}.{variant}'
+)
+COURSE_ASSIGNMENTS_USER_VERSION_CACHE_KEY_TPL = 'course_assignments.user_version.{user_id}.{course_id}'
+
 
 def get_course(course_id, depth=0):
     """
@@ -590,24 +604,92 @@ def get_course_blocks_completion_summary(course_key, user):
     }
 
 
+def invalidate_course_assignments(user_id, course_key):
+    """
+    Invalidate the cached assignments of the user in the course.
+    """
+    cache.delete(COURSE_ASSIGNMENTS_USER_VERSION_CACHE_KEY_TPL.format(user_id=user_id, course_id=course_key))
+
+
+def _get_course_assignments_cache_key(course_key, user, include_access, include_without_due):
+    """
+    Returns the key the assignments of the user in the course are cached under, or None if
+    they should not be cached.
+
+    The key contains the published version of the course, and a version of the data of the
+    user in the course which is reset by signals when their schedule, date overrides,
+    enrollment mode, cohort, team memberships or completions change.
+    """
+    timeout = settings.COURSE_ASSIGNMENTS_CACHE_TIMEOUT
+    if not timeout or get_course_masquerade(user, course_key):
+        return None
+    course_version = getattr(modulestore().get_course(course_key), 'course_version', None)
+    if course_version is None:
+        return None
+
+    user_version_key = COURSE_ASSIGNMENTS_USER_VERSION_CACHE_KEY_TPL.format(user_id=user.id, course_id=course_key)
+    user_version = cache.get(user_version_key)
+    if user_version is None:
+        user_version = uuid.uuid4().hex
+        cache.set(user_version_key, user_version, timeout)
+    return COURSE_ASSIGNMENTS_CACHE_KEY_TPL.format(
+        user_id=user.id,
+        course_id=course_key,
+        course_version=course_version,
+        user_version=user_version,
+        variant=f'{int(bool(include_access))}{int(include_without_due)}.{get_language()}',
+    )
+
+
+def _assignment_as_of(cached_assignment, now):
+    """
+    Returns the assignment of a _CachedAssignment, as it is at the time `now`.
+    """
+    assignment = _Assignment(*cached_assignment.fields)
+    if cached_assignment.release and cached_assignment.release >= now:
+        assignment = assignment._replace(
+            url=cached_assignment.unreleased_url,
+            complete=cached_assignment.unreleased_complete,
+        )
+    past_due = bool(assignment.date) and not assignment.complete and assignment.date < now
+    return assignment._replace(past_due=past_due)
+
+
 @request_cached()
-def get_course_assignments(course_key, user, include_access=False, include_without_due=False,):  # lint-amnesty, pylint: disable=too-many-statements
+def get_course_assignments(course_key, user, include_access=False, include_without_due=False,):
     """
     Returns a list of assignment (at the subsection/sequential level) due dates for the given course.
 
     Each returned object is a namedtuple with fields: title, url, date, contains_gated_content, complete, past_due,
     assignment_type
+
+    The assignments are cached for COURSE_ASSIGNMENTS_CACHE_TIMEOUT seconds, without the
+    fields which depend on the current time.
     """
     if not user.id:
         return []
 
+    cache_key = _get_course_assignments_cache_key(course_key, user, include_access, include_without_due)
+    cached_assignments = cache.get(cache_key) if cache_key else None
+    if cached_assignments is None:
+        cached_assignments = _collect_course_assignments(course_key, user, include_access, include_without_due)
+        if cache_key:
+            cache.set(cache_key, cached_assignments, settings.COURSE_ASSIGNMENTS_CACHE_TIMEOUT)
+
+    now = datetime.now(pytz.UTC)
+    return [_assignment_as_of(cached_assignment, now) for cached_assignment in cached_assignments]
+
+
+def _collect_course_assignments(course_key, user, include_access, include_without_due):
+    """
+    Returns the _CachedAssignments of the course for the user, from the blocks of the course.
+    """
     store = modulestore()
     course_usage_key = store.make_course_usage_key(course_key)
     block_data = get_course_blocks(user, course_usage_key, allow_start_dates_in_future=True, include_completion=True)
 
-    now = datetime.now(pytz.UTC)
     assignments = []
-    for section_key in block_data.get_children(course_usage_key):  # lint-amnesty, pylint: disable=too-many-nested-blocks
+    for section_key in block_data.get_children(course_usage_key):
         for subsection_key in block_data.get_children(section_key):
             due = block_data.get_xblock_field(subsection_key, 'due')
             graded = block_data.get_xblock_field(subsection_key, 'graded', False)
@@ -620,23 +702,19 @@ def get_course_assignments(course_key, user, include_access=False, include_witho
 
                 assignment_type = block_data.get_xblock_field(subsection_key, 'format', None)
 
-                url = None
+                # Unreleased assignments have no URL and are not complete
                 start = block_data.get_xblock_field(subsection_key, 'start')
-                assignment_released = not start or start < now
-                if assignment_released:
-                    url = reverse('jump_to', args=[course_key, subsection_key])
-                    complete = is_block_structure_complete_for_assignments(block_data, subsection_key)
-                else:
-                    complete = False
-
-                if due:
-                    past_due = not complete and due < now
-                else:
-                    past_due = False
-                    due = None
-                assignments.append(_Assignment(
-                    subsection_key, title, url, due, contains_gated_content,
-                    complete, past_due, assignment_type, None, first_component_block_id
+                url = reverse('jump_to', args=[course_key, subsection_key])
+                complete = is_block_structure_complete_for_assignments(block_data, subsection_key)
+
+                assignments.append(_CachedAssignment(
+                    (
+                        subsection_key, title, url, due or None, contains_gated_content,
+                        complete, None, assignment_type, None, first_component_block_id
+                    ),
+                    start,
+                    None,
+                    False,
                 ))
             assignments.extend(get_ora_blocks_as_assignments(block_data, subsection_key))
     return assignments
@@ -645,7 +723,7 @@ def get_course_assignments(course_key, user, include_access=False, include_witho
 def get_ora_blocks_as_assignments(block_data, subsection_key):
     """
     Given a subsection key, navigate through descendents and find open response assessments.
-    For each graded ORA, return a list of "Assignment" tuples that map to the individual steps
+    For each graded ORA, return a list of _CachedAssignment tuples that map to the individual steps
     of the ORA
     """
     ora_assignments = []
@@ -660,7 +738,7 @@ def get_ora_blocks_as_assignments(block_data, subsection_key):
 
 def get_ora_as_assignments(block_data, ora_block):
     """
-    Given an individual ORA, return the list of individual ORA steps as Assignment tuples
+    Given an individual ORA, return the list of individual ORA steps as _CachedAssignment tuples
     """
     graded = block_data.get_xblock_field(ora_block, 'graded', False)
     has_score = block_data.get_xblock_field(ora_block, 'has_score', False)
@@ -703,7 +781,7 @@ def _ora_assessment_to_assignment(
     assessment
 ):
     """
-    Create an assignment from an ORA assessment dict
+    Create a _CachedAssignment from an ORA assessment dict
     """
     date_config_type = block_data.get_xblock_field(ora_block, 'date_config_type', 'manual')
     assignment_type = block_data.get_xblock_field(ora_block, 'format', None)
@@ -751,25 +829,25 @@ def _ora_assessment_to_assignment(
     else:
         assessment_type = assessment_name
     title = f"{block_title} ({assessment_type})"
-    url = ''
-    now = datetime.now(pytz.UTC)
-    assignment_released = not assessment_start or assessment_start < now
-    if assignment_released:
-        url = reverse('jump_to', args=[block_key.course_key, ora_block])
-
-    past_due = not complete and assessment_due and assessment_due < now
+    # Unreleased steps have an empty URL
+    url = reverse('jump_to', args=[block_key.course_key, ora_block])
     first_component_block_id = str(ora_block)
-    return _Assignment(
-        ora_block,
-        title,
-        url,
-        assessment_due,
-        False,
+    return _CachedAssignment(
+        (
+            ora_block,
+            title,
+            url,
+            assessment_due,
+            False,
+            complete,
+            None,
+            assignment_type,
+            extra_info,
+            first_component_block_id,
+        ),
+        assessment_start,
+        '',
         complete,
-        past_due,
-        assignment_type,
-        extra_info,
-        first_component_block_id,
     )
 
 
@@ -884,7 +962,7 @@ def get_courses(user, org=None, filter_=None, permissions=None, active_only=Fals
     permissions.add(permission_name)
 
     return LazySequence(
-        (c for c in courses if all(has_access(user, p, c) for p in permissions)),
+        has_access_to_courses(user, permissions, courses),
         est_len=courses.count()
     )
 
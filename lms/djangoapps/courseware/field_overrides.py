@@ -30,6 +30,7 @@ NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = 'lms.djangoapps.courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = 'lms.djangoapps.courseware.modulestore_field_overrides.\
     enabled_providers.{course_id}'
+PRELOADED_OVERRIDES_KEY = 'lms.djangoapps.courseware.field_overrides.preloaded.{provider}.{user_id}.{course_id}'
 
 
 def resolve_dotted(name):
@@ -62,6 +63,55 @@ def _lineage(block):
         parent = parent.get_parent()
 
 
+def _course_key_for(block):
+    """
+    Returns the course key of the given block, or None if the block does not
+    expose a location (e.g. when a bare identifier is passed in).
+    """
+    location = getattr(block, 'location', None)
+    return getattr(location, 'course_key', None)
+
+
+def _preloaded_overrides_cache_key(provider_class, user, course_key):
+    """
+    Returns the request cache key under which the preloaded overrides of
+    `provider_class` for `user` in `course_key` are stored.
+    """
+    return PRELOADED_OVERRIDES_KEY.format(
+        provider=f'{provider_class.__module__}.{provider_class.__name__}',
+        user_id=getattr(user, 'id', None),
+        course_id=str(course_key),
+    )
+
+
+def get_preloaded_overrides(provider, course_key):
+    """
+    Returns the map of overrides held by `provider` in the course identified by
+    `course_key`, loading it with a single call to
+    :meth:`FieldOverrideProvider.preload_overrides` the first time it is needed
+    in a request.  Returns None if the provider does not support preloading.
+    """
+    if not provider.supports_preloading:
+        return None
+
+    request_cache = DEFAULT_REQUEST_CACHE
+    cache_key = _preloaded_overrides_cache_key(type(provider), provider.user, course_key)
+    overrides = request_cache.data.get(cache_key, NOTSET)
+    if overrides is NOTSET:
+        overrides = provider.preload_overrides(course_key)
+        request_cache.data[cache_key] = overrides
+    return overrides
+
+
+def clear_preloaded_overrides(provider_class, user, course_key):
+    """
+    Drops the preloaded overrides of `provider_class` for `user` in
+    `course_key` from the request cache, so that they are reloaded on next use.
+    Should be called whenever an override is set or cleared.
+    """
+    DEFAULT_REQUEST_CACHE.data.pop(_preloaded_overrides_cache_key(provider_class, user, course_key), None)
+
+
 class _OverridesDisabled(threading.local):
     """
     A thread local used to manage state of overrides being disabled or not.
@@ -104,12 +154,50 @@ class FieldOverrideProvider(metaclass=ABCMeta):
     A `FieldOverrideProvider` implementation is only responsible for looking up
     field overrides. To set overrides, there will be a domain specific API for
     the concrete override implementation being used.
+
+    Providers which store their overrides per course may set
+    `supports_preloading` and implement `preload_overrides`, so that all of
+    the overrides for a user and course are fetched at once and every further
+    lookup in the request is a dictionary access.
     """
+    supports_preloading = False
 
     def __init__(self, user, fallback_field_data):
         self.user = user
         self.fallback_field_data = fallback_field_data
 
+    def preload_overrides(self, course_key):  # pragma no cover
+        """
+        Load every override this provider holds for `self.user` in the course
+        identified by `course_key`, using as few queries as possible.
+
+        Returns a dictionary mapping the key returned by `override_key` for a
+        block to a dictionary of JSON field values keyed by field name, or None
+        if the overrides can't be preloaded, in which case `get` is used.
+        """
+        return None
+
+    def override_key(self, block):
+        """
+        Returns the key under which the overrides for `block` are found in the
+        dictionary returned by `preload_overrides`.
+        """
+        return block.location
+
+    def get_preloaded(self, overrides, block, name, default):
+        """
+        Look for an override value for the field named `name` in `block` in
+        the `overrides` returned by `preload_overrides`.  Returns the
+        overridden value or `default` if no override is found.
+        """
+        block_overrides = overrides.get(self.override_key(block))
+        if not block_overrides or name not in block_overrides:
+            return default
+        try:
+            return block.fields[name].from_json(block_overrides[name])
+        except KeyError:
+            return block_overrides[name]
+
     @abstractmethod
     def get(self, block, name, default):  # pragma no cover
         """
@@ -207,8 +295,15 @@ class OverrideFieldData(FieldData):
         Returns the overridden value or `NOTSET` if no override is found.
         """
         if not overrides_disabled():
+            course_key = _course_key_for(block)
             for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
+                overrides = None
+                if course_key is not None:
+                    overrides = get_preloaded_overrides(provider, course_key)
+                if overrides is None:
+                    value = provider.get(block, name, NOTSET)
+                else:
+                    value = provider.get_preloaded(overrides, block, name, NOTSET)
                 if value is not NOTSET:
                     return value
         return NOTSET
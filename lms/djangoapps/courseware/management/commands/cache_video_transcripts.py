@@ -0,0 +1,75 @@
+"""
+Convert the transcripts of the videos of courses to every downloadable format ahead of time.
+
+The conversions are cached the way they are when learners download or view the transcripts,
+so the first learners after a course is published don't wait for them.
+"""
+
+
+import logging
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from xmodule.exceptions import NotFoundError
+from xmodule.modulestore.django import modulestore
+from xmodule.video_block.transcripts_utils import (
+    Transcript,
+    TranscriptsGenerationException,
+    get_transcript,
+    youtube_speed_dict
+)
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):  # lint-amnesty, pylint: disable=missing-class-docstring
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_keys', nargs='+', help='ids of the courses whose transcripts are converted')
+
+    def handle(self, *args, **options):
+        try:
+            course_keys = [CourseKey.from_string(course_id) for course_id in options['course_keys']]
+        except InvalidKeyError:
+            raise CommandError("Invalid course_id")  # lint-amnesty, pylint: disable=raise-missing-from
+
+        store = modulestore()
+        for course_key in course_keys:
+            converted = failed = 0
+            for video in store.get_items(course_key, qualifiers={'category': 'video'}):
+                try:
+                    converted += self._convert_transcripts(video)
+                except (TranscriptsGenerationException, UnicodeDecodeError):
+                    log.exception('Failed to convert the transcripts of video %s', video.location)
+                    failed += 1
+            self.stdout.write(f'{course_key}: {converted} transcripts converted, {failed} videos failed')
+
+    def _convert_transcripts(self, video):
+        """
+        Convert the transcripts of the video to every downloadable format, and return the number of conversions.
+        """
+        converted = 0
+        languages = video.available_translations(video.get_transcripts_info(), verify_assets=False)
+        for language in languages:
+            found = 0
+            for output_format in (Transcript.SRT, Transcript.SJSON, Transcript.TXT):
+                try:
+                    get_transcript(video, language, output_format)
+                except NotFoundError:
+                    continue
+                found += 1
+            # Transcripts are stored as SRT or SJSON, and reading them in the format they are
+            # stored in is not a conversion, so it is not cached.
+            converted += max(found - 1, 0)
+        # Transcripts at the speeds of the other youtube videos are generated from the 1.0 speed one.
+        for youtube_id in youtube_speed_dict(video):
+            try:
+                get_transcript(video, output_format=Transcript.SJSON, youtube_id=youtube_id)
+            except NotFoundError:
+                continue
+            converted += 1
+        return converted
@@ -0,0 +1,85 @@
+"""
+Signal handlers invalidating the cached assignments of learners
+"""
+from completion.models import BlockCompletion
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_when.models import UserDate
+
+from common.djangoapps.student.models import CourseEnrollment
+from lms.djangoapps.courseware.courses import invalidate_course_assignments
+from lms.djangoapps.teams.models import CourseTeamMembership
+from openedx.core.djangoapps.course_groups.models import CohortMembership, CourseUserGroupPartitionGroup
+from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
+from openedx.core.djangoapps.schedules.models import Schedule
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def invalidate_course_assignments_on_enrollment_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the assignments of a user when their enrollment mode or status changes
+    """
+    invalidate_course_assignments(instance.user_id, instance.course_id)
+
+
+@receiver(post_save, sender=Schedule)
+def invalidate_course_assignments_on_schedule_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the assignments of a user when their schedule, which relative dates are based on, changes
+    """
+    invalidate_course_assignments(instance.enrollment.user_id, instance.enrollment.course_id)
+
+
+@receiver(post_save, sender=UserDate)
+@receiver(post_delete, sender=UserDate)
+def invalidate_course_assignments_on_date_override(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the assignments of a user when one of their personal due dates changes
+    """
+    invalidate_course_assignments(instance.user_id, instance.content_date.course_id)
+
+
+@receiver(post_save, sender=BlockCompletion)
+@receiver(post_delete, sender=BlockCompletion)
+def invalidate_course_assignments_on_completion(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the assignments of a user when they complete one of their blocks
+    """
+    invalidate_course_assignments(instance.user_id, instance.context_key)
+
+
+@receiver(COHORT_MEMBERSHIP_UPDATED)
+def invalidate_course_assignments_on_cohort(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the assignments of a user when they are added to or removed from a cohort
+    """
+    invalidate_course_assignments(user.id, course_key)
+
+
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+def invalidate_course_assignments_on_cohort_membership(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the assignments of a user when their cohort membership is changed outside of the cohorts API
+    """
+    invalidate_course_assignments(instance.user_id, instance.course_id)
+
+
+@receiver(post_save, sender=CourseUserGroupPartitionGroup)
+@receiver(post_delete, sender=CourseUserGroupPartitionGroup)
+def invalidate_course_assignments_on_cohort_group(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the assignments of the members of a cohort when the partition group it is linked to changes
+    """
+    cohort = instance.course_user_group
+    for user_id in cohort.users.values_list('id', flat=True):
+        invalidate_course_assignments(user_id, cohort.course_id)
+
+
+@receiver(post_save, sender=CourseTeamMembership)
+@receiver(post_delete, sender=CourseTeamMembership)
+def invalidate_course_assignments_on_team_membership(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the assignments of a user when they join or leave a team, which team partition groups are based on
+    """
+    invalidate_course_assignments(instance.user_id, instance.team.course_id)
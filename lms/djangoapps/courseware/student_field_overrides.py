@@ -9,7 +9,7 @@ import json
 from lms.djangoapps.courseware.models import StudentFieldOverride
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_preloaded_overrides
 
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
@@ -18,9 +18,17 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     :class:`~courseware.field_overrides.FieldOverrideProvider` which allows for
     overrides to be made on a per user basis.
     """
+    supports_preloading = True
+
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    def preload_overrides(self, course_key):
+        return get_overrides_for_user_in_course(self.user, course_key)
+
+    def override_key(self, block):
+        return _override_location(block)
+
     @classmethod
     def enabled_for(cls, course):  # pylint: disable=arguments-differ
         """This simple override provider is always enabled"""
@@ -42,23 +50,47 @@ def get_override_for_user(user, block, name, default=None):
     return overrides.get(name, default)
 
 
-def _get_overrides_for_user(user, block):
+def get_overrides_for_user_in_course(user, course_key):
     """
-    Gets all of the individual student overrides for given user and block.
-    Returns a dictionary of field override values keyed by field name.
+    Gets all of the individual student overrides for the given user in the
+    course identified by `course_key` with a single query.  Returns a
+    dictionary mapping block locations to dictionaries of JSON field override
+    values keyed by field name.
+    """
+    overrides = {}
+    if user is None or user.id is None:
+        return overrides
+
+    query = StudentFieldOverride.objects.filter(
+        course_id=course_key,
+        student_id=user.id,
+    ).values_list('location', 'field', 'value')
+    for location, field, value in query:
+        overrides.setdefault(location, {})[field] = json.loads(value)
+    return overrides
+
+
+def _override_location(block):
+    """
+    Returns the location under which the overrides for `block` are stored.
     """
     if (
         hasattr(block, "scope_ids") and
         hasattr(block.scope_ids, "usage_id") and
         is_xblock_aside(block.scope_ids.usage_id)
     ):
-        location = block.scope_ids.usage_id.usage_key
-    else:
-        location = block.location
+        return block.scope_ids.usage_id.usage_key
+    return block.location
 
+
+def _get_overrides_for_user(user, block):
+    """
+    Gets all of the individual student overrides for given user and block.
+    Returns a dictionary of field override values keyed by field name.
+    """
     query = StudentFieldOverride.objects.filter(
         course_id=block.scope_ids.usage_id.context_key,
-        location=location,
+        location=_override_location(block),
         student_id=user.id,
     )
     overrides = {}
@@ -83,6 +115,9 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_preloaded_overrides(
+        IndividualStudentOverrideProvider, user, block.scope_ids.usage_id.context_key
+    )
 
 
 def clear_override_for_user(user, block, name):
@@ -100,3 +135,6 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    clear_preloaded_overrides(
+        IndividualStudentOverrideProvider, user, block.scope_ids.usage_id.context_key
+    )
@@ -13,8 +13,10 @@ import pytz
 from ccx_keys.locator import CCXLocator
 from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.db import connection
 from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.test.utils import override_settings
 from django.urls import reverse
 from milestones.tests.utils import MilestonesTestCaseMixin
@@ -837,6 +839,52 @@ class CourseOverviewAccessTestCase(ModuleStoreTestCase):
         assert bool(access.has_access(user, action, course, course_key=course.id)) ==\
                bool(access.has_access(user, action, course_overview, course_key=course.id))
 
+    @ddt.data(
+        *itertools.product(
+            ['user_normal', 'user_enrolled', 'user_allowed', 'user_staff', 'user_anonymous'],
+            [['see_exists'], ['load'], ['enroll'], ['see_in_catalog', 'see_about_page']],
+        )
+    )
+    @ddt.unpack
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_has_access_to_courses(self, user_attr_name, permissions):
+        """
+        Check that bulk access checks keep the same courses as checking each course on its own.
+        """
+        self.user_enrolled = UserFactory.create()
+        CourseEnrollmentFactory(user=self.user_enrolled, course_id=self.course_not_started.id)
+        self.user_allowed = UserFactory.create()
+        CourseEnrollmentAllowedFactory(email=self.user_allowed.email, course_id=self.course_staff_only.id)
+
+        user = getattr(self, user_attr_name)
+        courses = [
+            CourseOverview.get_from_id(course.id)
+            for course in [self.course_default, self.course_started, self.course_not_started, self.course_staff_only]
+        ]
+
+        expected = [
+            course for course in courses if all(access.has_access(user, action, course) for action in permissions)
+        ]
+        assert list(access.has_access_to_courses(user, permissions, courses)) == expected
+
+    def test_has_access_to_courses_num_queries(self):
+        """
+        Check that the enrollments of the user are fetched once for all courses.
+        """
+        courses = [
+            CourseOverview.get_from_id(course.id)
+            for course in [self.course_default, self.course_not_started, self.course_staff_only]
+        ]
+
+        num_queries = []
+        for some_courses in (courses[:1], courses):
+            # get a fresh user object that won't have any cached role information
+            user = User.objects.get(id=self.user_normal.id)
+            with CaptureQueriesContext(connection) as queries:
+                list(access.has_access_to_courses(user, ['see_exists'], some_courses))
+            num_queries.append(len(queries))
+        assert num_queries[0] == num_queries[1]
+
     def test_course_overview_unsupported_action(self):
         """
         Check that calling has_access with an unsupported action raises a
@@ -14,9 +14,11 @@ from completion.models import BlockCompletion
 from completion.test_utils import CompletionWaffleTestMixin
 from crum import set_current_request
 from django.conf import settings
+from django.core.cache import cache
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from django.urls import reverse
+from edx_django_utils.cache import RequestCache
 from freezegun import freeze_time
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore import ModuleStoreEnum
@@ -26,6 +28,7 @@ from xmodule.modulestore.tests.factories import CourseFactory, ToyCourseFactory,
 from xmodule.tests.xml import XModuleXmlImportTest
 from xmodule.tests.xml import factories as xml
 
+from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.courseware.courses import (
     course_open_for_self_enrollment,
     get_cms_block_link,
@@ -42,6 +45,8 @@ from lms.djangoapps.courseware.courses import (
 from lms.djangoapps.courseware.model_data import FieldDataCache
 from lms.djangoapps.courseware.block_render import get_block_for_descriptor
 from lms.djangoapps.courseware.courseware_access_exception import CoursewareAccessException
+from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 from openedx.core.djangolib.testing.utils import get_mock_request
 from openedx.core.lib.courses import course_image_url
 from common.djangoapps.student.tests.factories import UserFactory
@@ -483,6 +488,104 @@ class TestGetCourseAssignments(CompletionWaffleTestMixin, ModuleStoreTestCase):
         assert not assignments[0].complete
 
 
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestGetCourseAssignmentsCache(CompletionWaffleTestMixin, ModuleStoreTestCase):
+    """
+    Tests for the caching of the assignments of `get_course_assignments`.
+    """
+    ENABLED_SIGNALS = ['course_published']
+    TODAY = datetime.datetime(2023, 8, 2, 12, 23, 45, tzinfo=pytz.UTC)
+
+    def setUp(self):
+        super().setUp()
+        self.freezer = freeze_time(self.TODAY)
+        self.freezer.start()
+        self.addCleanup(self.freezer.stop)
+        self.addCleanup(cache.clear)
+
+        self.course = CourseFactory()
+        chapter = BlockFactory(parent=self.course, category='chapter')
+        self.sequential = BlockFactory(
+            parent=chapter,
+            category='sequential',
+            graded=True,
+            start=self.TODAY + datetime.timedelta(days=1),
+            due=self.TODAY + datetime.timedelta(days=2),
+        )
+        self.problem = BlockFactory(parent=self.sequential, category='problem', has_score=True)
+        self.override_waffle_switch(True)
+
+    def _get_assignments(self):
+        """
+        Returns the assignments of the user in a new request.
+        """
+        RequestCache.clear_all_namespaces()
+        return get_course_assignments(self.course.id, self.user)
+
+    def test_cached(self):
+        assignments = self._get_assignments()
+        with mock.patch('lms.djangoapps.courseware.courses.get_course_blocks') as mock_get_course_blocks:
+            assert self._get_assignments() == assignments
+        mock_get_course_blocks.assert_not_called()
+
+    def test_time_dependent_fields(self):
+        BlockCompletion.objects.submit_completion(self.user, self.problem.location, 1)
+        [assignment] = self._get_assignments()
+        assert assignment.url is None
+        assert not assignment.complete
+        assert not assignment.past_due
+
+        with freeze_time(self.TODAY + datetime.timedelta(days=3)):
+            [assignment] = self._get_assignments()
+        assert assignment.url == reverse('jump_to', args=[self.course.id, self.sequential.location])
+        assert assignment.complete
+        assert not assignment.past_due
+
+    def test_past_due(self):
+        self._get_assignments()
+        with freeze_time(self.TODAY + datetime.timedelta(days=3)):
+            [assignment] = self._get_assignments()
+        assert not assignment.complete
+        assert assignment.past_due
+
+    def test_invalidated_on_completion(self):
+        with freeze_time(self.TODAY + datetime.timedelta(days=1, hours=1)):
+            [assignment] = self._get_assignments()
+            assert not assignment.complete
+
+            BlockCompletion.objects.submit_completion(self.user, self.problem.location, 1)
+            [assignment] = self._get_assignments()
+            assert assignment.complete
+
+    def test_invalidated_on_publish(self):
+        self._get_assignments()
+        self.sequential.display_name = 'Renamed'
+        self.store.update_item(self.sequential, self.user.id)
+        self.store.publish(self.sequential.location, self.user.id)
+
+        [assignment] = self._get_assignments()
+        assert assignment.title == 'Renamed'
+
+    def test_invalidated_on_cohort_change(self):
+        self._get_assignments()
+        add_user_to_cohort(CohortFactory(course_id=self.course.id), self.user)
+
+        with mock.patch(
+            'lms.djangoapps.courseware.courses.get_course_blocks', wraps=get_course_blocks
+        ) as mock_get_course_blocks:
+            self._get_assignments()
+        mock_get_course_blocks.assert_called_once()
+
+    @override_settings(COURSE_ASSIGNMENTS_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self._get_assignments()
+        with mock.patch(
+            'lms.djangoapps.courseware.courses.get_course_blocks', wraps=get_course_blocks
+        ) as mock_get_course_blocks:
+            self._get_assignments()
+        mock_get_course_blocks.assert_called_once()
+
+
 @ddt.ddt
 class TestGetCourseAssignmentsORA(CompletionWaffleTestMixin, ModuleStoreTestCase):
     """ Tests for ora-related behavior in get_course_assignments """
@@ -2,8 +2,11 @@
 Tests for `field_overrides` module.
 """
 import unittest
+from unittest.mock import Mock
+
 import pytest
 from django.test.utils import override_settings
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 from xblock.field_data import DictFieldData
 
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
@@ -13,6 +16,7 @@ from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    clear_preloaded_overrides,
     disable_overrides,
     resolve_dotted
 )
@@ -43,6 +47,41 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class TestPreloadingOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` which preloads its overrides for a whole course.
+    """
+    supports_preloading = True
+    preload_calls = 0
+
+    def get(self, block, name, default):
+        raise AssertionError('get should not be called once overrides are preloaded')
+
+    def preload_overrides(self, course_key):
+        type(self).preload_calls += 1
+        return {
+            'block-one': {'foo': 'fu'},
+            'block-two': {'oh': 'man'},
+        }
+
+    def override_key(self, block):
+        return block.location.block_id
+
+    @classmethod
+    def enabled_for(cls, course):  # pylint: disable=arguments-differ
+        return True
+
+
+class _StubBlock:
+    """
+    A minimal block exposing a location and no field definitions.
+    """
+    fields = {}
+
+    def __init__(self, block_id, course_key='course-v1:edX+Test+Run'):
+        self.location = Mock(block_id=block_id, course_key=course_key)
+
+
 class OverrideFieldBase(SharedModuleStoreTestCase):
     """
     Base class for field data override tests.  Using override_settings and
@@ -145,6 +184,58 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         assert isinstance(data, DictFieldData)
 
 
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'lms.djangoapps.courseware.tests.test_field_overrides.TestPreloadingOverrideProvider',))
+class PreloadedOverrideFieldDataTests(OverrideFieldBase):
+    """
+    Tests for `OverrideFieldData` with providers which preload their overrides.
+    """
+
+    def setUp(self):
+        super().setUp()
+        OverrideFieldData.provider_classes = None
+        TestPreloadingOverrideProvider.preload_calls = 0
+        DEFAULT_REQUEST_CACHE.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def make_one(self):
+        """
+        Factory method.
+        """
+        return OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({
+            'foo': 'bar',
+            'oh': 'no',
+        }))
+
+    def test_get_preloaded(self):
+        data = self.make_one()
+        assert data.get(_StubBlock('block-one'), 'foo') == 'fu'
+        assert data.get(_StubBlock('block-one'), 'oh') == 'no'
+        assert data.get(_StubBlock('block-two'), 'oh') == 'man'
+        assert data.get(_StubBlock('block-three'), 'foo') == 'bar'
+        with disable_overrides():
+            assert data.get(_StubBlock('block-one'), 'foo') == 'bar'
+        assert TestPreloadingOverrideProvider.preload_calls == 1
+
+    def test_preloaded_overrides_shared_across_instances(self):
+        self.make_one().get(_StubBlock('block-one'), 'foo')
+        self.make_one().get(_StubBlock('block-two'), 'oh')
+        assert TestPreloadingOverrideProvider.preload_calls == 1
+
+        self.make_one().get(_StubBlock('block-one', course_key='course-v1:edX+Other+Run'), 'foo')
+        assert TestPreloadingOverrideProvider.preload_calls == 2
+
+    def test_clear_preloaded_overrides(self):
+        data = self.make_one()
+        data.get(_StubBlock('block-one'), 'foo')
+        clear_preloaded_overrides(TestPreloadingOverrideProvider, TESTUSER, 'course-v1:edX+Test+Run')
+        data.get(_StubBlock('block-one'), 'foo')
+        assert TestPreloadingOverrideProvider.preload_calls == 2
+
+
 class ResolveDottedTests(unittest.TestCase):
     """
     Tests for `resolve_dotted`.
@@ -3,19 +3,26 @@ Black-box tests of the DjangoUserStateClient against the semantics
 defined in edx_user_state_client.
 """
 
+import pytest
 import pytz
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 from xblock.fields import Scope
 from datetime import datetime
 from unittest import TestCase
+from unittest.mock import Mock, patch
 from collections import defaultdict
-from django.db import connections
+from django.db import DatabaseError, connections
+from django.test.utils import override_settings
 
 from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.user_state_client import (
     DjangoXBlockUserStateClient,
+    LazyUserState,
     XBlockUserStateClient,
-    XBlockUserState
+    XBlockUserState,
+    _flush_deferred_user_state_on_request_boundary,
+    flush_deferred_user_state
 )
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 
@@ -757,3 +764,180 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
             2. Update the test in the other repo to align with the new functionality
             3. Remove this override to re-enable the working test
         """
+
+
+@override_settings(USER_STATE_BATCH_SIZE=2)
+class TestDjangoUserStateClientStreaming(_UserStateClientTestIterAll, ModuleStoreTestCase):
+    """
+    Tests of the streaming iteration of the DjangoUserStateClient backend,
+    with batches small enough for the tests to span several of them.
+    """
+    __test__ = True
+    databases = set(connections)
+
+    def _user(self, user_idx):  # lint-amnesty, pylint: disable=arguments-differ
+        return self.users[user_idx].username
+
+    def setUp(self):
+        super().setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.users = defaultdict(UserFactory.create)
+
+    def iter_all_for_block(self, block):
+        return self.client.iter_all_for_block(
+            block_key=self._block(block),
+            scope=self.scope,
+            stream=True,
+        )
+
+    def iter_all_for_course(self, course, block_type=None):
+        return self.client.iter_all_for_course(
+            course_key=self._course(course),
+            block_type=block_type,
+            scope=self.scope,
+            stream=True,
+        )
+
+    def test_iter_course_fields(self):
+        for user in range(3):
+            self.set_many(user, {0: {'a': user, 'b': 'c'}, 1: {'c': user}})
+
+        self.assertCountEqual(
+            ((item.username, dict(item.state)) for item in self.client.iter_all_for_course(
+                course_key=self._course(0), fields=['a'], stream=True,
+            )),
+            [
+                (self._user(0), {'a': 0}),
+                (self._user(1), {'a': 1}),
+                (self._user(2), {'a': 2}),
+                (self._user(0), {}),
+                (self._user(1), {}),
+                (self._user(2), {}),
+            ]
+        )
+
+    def test_iter_course_query_count(self):
+        for user in range(3):
+            self.set_many(user, {0: {'a': user}, 1: {'c': user}})
+
+        # Three full batches of two rows, and one empty batch.
+        with self.assertNumQueries(4):
+            assert len(list(self.iter_all_for_course(course=0))) == 6
+
+
+class LazyUserStateTestCase(TestCase):
+    """
+    Tests of :class:`~LazyUserState`.
+    """
+
+    def test_decoded_on_access(self):
+        state = LazyUserState('{"a": 1, "b": [2]}')
+        assert state._state is None  # pylint: disable=protected-access
+        assert state['a'] == 1
+        assert state == {'a': 1, 'b': [2]}
+        assert 'b' in state
+        assert state.get('c') is None
+
+    def test_fields(self):
+        state = LazyUserState('{"a": 1, "b": 2}', fields=['b', 'c'])
+        assert dict(state) == {'b': 2}
+        assert len(state) == 1
+
+
+@override_settings(USER_STATE_WRITE_BEHIND_BLOCK_TYPES=('video',), USER_STATE_WRITE_BEHIND_MAX_PENDING=100)
+class TestDjangoUserStateClientWriteBehind(_UserStateClientTestCRUD,
+                                           _UserStateClientTestIterAll,
+                                           ModuleStoreTestCase):
+    """
+    Tests of the DjangoUserStateClient backend with deferred writes.
+    Reads must always see the deferred writes.
+    """
+    __test__ = True
+    databases = set(connections)
+
+    def _user(self, user_idx):  # lint-amnesty, pylint: disable=arguments-differ
+        return self.users[user_idx].username
+
+    def _block_type(self, block):  # pylint: disable=arguments-differ
+        return 'video'
+
+    def setUp(self):
+        super().setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.users = defaultdict(UserFactory.create)
+        patcher = patch(
+            'lms.djangoapps.courseware.user_state_client.get_current_request', return_value=Mock(),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(flush_deferred_user_state)
+
+    def _stored_state(self, user, block):
+        """
+        Return the state stored in the database for the specified user and block.
+        """
+        return StudentModule.objects.get(
+            student=self.users[user], module_state_key=self._block(block)
+        ).state
+
+    def test_writes_are_deferred_and_coalesced(self):
+        self.set(user=0, block=0, state={'a': 'b'})
+        self.set(user=0, block=0, state={'c': 'd'})
+        assert not StudentModule.objects.filter(student=self.users[0]).exists()
+
+        flush_deferred_user_state()
+        assert self._stored_state(user=0, block=0) == '{"a": "b", "c": "d"}'
+
+    def test_flush_updates_existing_rows(self):
+        self.set(user=0, block=0, state={'a': 'b'})
+        flush_deferred_user_state()
+        self.set(user=0, block=0, state={'a': 'c'})
+        self.set(user=0, block=1, state={'x': 'y'})
+        flush_deferred_user_state()
+        assert self._stored_state(user=0, block=0) == '{"a": "c"}'
+        assert self._stored_state(user=0, block=1) == '{"x": "y"}'
+
+    @override_settings(USER_STATE_WRITE_BEHIND_MAX_PENDING=2)
+    def test_flush_when_full(self):
+        self.set(user=0, block=0, state={'a': 'b'})
+        assert not StudentModule.objects.filter(student=self.users[0]).exists()
+        self.set(user=0, block=1, state={'a': 'b'})
+        assert StudentModule.objects.filter(student=self.users[0]).count() == 2
+
+    def test_failed_flush_falls_back_to_writing_blocks_one_at_a_time(self):
+        self.set(user=0, block=0, state={'a': 'b'})
+        with patch.object(DjangoXBlockUserStateClient, 'bulk_upsert', side_effect=DatabaseError):
+            flush_deferred_user_state()
+        assert self._stored_state(user=0, block=0) == '{"a": "b"}'
+
+    def test_failed_flush_is_raised(self):
+        self.set(user=0, block=0, state={'a': 'b'})
+        self.set(user=1, block=0, state={'c': 'd'})
+        with patch.object(DjangoXBlockUserStateClient, 'bulk_upsert', side_effect=DatabaseError):
+            with patch.object(
+                DjangoXBlockUserStateClient, '_write_many', side_effect=[DatabaseError, None],
+            ) as mock_write_many:
+                with pytest.raises(DatabaseError):
+                    flush_deferred_user_state()
+        assert mock_write_many.call_count == 2
+
+    def test_failed_flush_at_end_of_request_is_counted(self):
+        self.set(user=0, block=0, state={'a': 'b'})
+        with patch.object(DjangoXBlockUserStateClient, 'bulk_upsert', side_effect=DatabaseError):
+            with patch.object(DjangoXBlockUserStateClient, '_write_many', side_effect=DatabaseError):
+                with patch(
+                    'lms.djangoapps.courseware.user_state_client.monitoring_utils.set_custom_attribute'
+                ) as mock_set_custom_attribute:
+                    _flush_deferred_user_state_on_request_boundary(sender=None)
+        mock_set_custom_attribute.assert_called_once_with('deferred_user_state_lost_writes', 1)
+
+    def test_graded_block_types_are_never_deferred(self):
+        with override_settings(USER_STATE_WRITE_BEHIND_BLOCK_TYPES=('video', 'problem')):
+            with patch.object(self, '_block_type', return_value='problem'):
+                self.set(user=0, block=0, state={'a': 'b'})
+        assert self._stored_state(user=0, block=0) == '{"a": "b"}'
+
+    def test_no_deferral_outside_of_requests(self):
+        with patch('lms.djangoapps.courseware.user_state_client.get_current_request', return_value=None):
+            self.set(user=0, block=0, state={'a': 'b'})
+        assert self._stored_state(user=0, block=0) == '{"a": "b"}'
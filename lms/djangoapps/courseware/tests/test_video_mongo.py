@@ -1769,6 +1769,52 @@ class TestVideoBlockStudentViewJson(BaseTestVideoXBlock, CacheIsolationTestCase)
         student_view_response = self.get_result()
         self.assertCountEqual(list(student_view_response['transcripts'].keys()), expected_transcripts)
 
+    @patch('xmodule.video_block.transcripts_utils.edxval_api.get_available_transcript_languages')
+    def test_val_transcript_languages_read_with_course_data(self, mock_get_transcript_languages):
+        """
+        Tests that the edx-val transcript languages of a video associated with the course are read
+        along with the VAL data of the course, and not verified one by one.
+        """
+        self.video.edx_video_id = self.TEST_EDX_VIDEO_ID
+        self.setup_val_video(associate_course_in_val=True)
+        create_video_transcript(
+            video_id=self.TEST_EDX_VIDEO_ID,
+            language_code='fr',
+            file_format=Transcript.SRT,
+            content=ContentFile(TRANSCRIPT_FILE_SRT_DATA)
+        )
+
+        with patch('xmodule.video_block.transcripts_utils.get_transcript_from_val') as mock_get_transcript_from_val:
+            result = self.get_result()
+
+        mock_get_transcript_languages.assert_not_called()
+        assert all(call.args[1] != 'fr' for call in mock_get_transcript_from_val.call_args_list)
+        self.assertCountEqual(list(result['transcripts']), [self.TEST_LANGUAGE, 'fr'])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_val_course_data_cached_for_course_version(self):
+        """
+        Tests that the VAL data of the course is cached for each version of the course.
+        """
+        self.setup_val_video(associate_course_in_val=True)
+        course_key = self.video.location.course_key
+        val_course_data = self.video.get_cached_val_data_for_course(None, [self.TEST_PROFILE], course_key, 'v1')
+
+        with self.assertNumQueries(0):
+            assert self.video.get_cached_val_data_for_course(
+                None, [self.TEST_PROFILE], course_key, 'v1'
+            ) == val_course_data
+        assert val_course_data[self.TEST_EDX_VIDEO_ID]['transcript_languages'] == []
+
+        create_video_transcript(
+            video_id=self.TEST_EDX_VIDEO_ID,
+            language_code='fr',
+            file_format=Transcript.SRT,
+            content=ContentFile(TRANSCRIPT_FILE_SRT_DATA)
+        )
+        val_course_data = self.video.get_cached_val_data_for_course(None, [self.TEST_PROFILE], course_key, 'v2')
+        assert val_course_data[self.TEST_EDX_VIDEO_ID]['transcript_languages'] == ['fr']
+
 
 @ddt.ddt
 class VideoBlockTest(TestCase, VideoBlockTestBase):
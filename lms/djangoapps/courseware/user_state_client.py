@@ -6,17 +6,23 @@ data in a Django ORM model.
 
 import itertools
 import logging
+import threading
+from collections.abc import Mapping
 from operator import attrgetter
 from time import time
 
 from abc import abstractmethod
 from collections import namedtuple
 
+from crum import get_current_request
 from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.core.paginator import Paginator
+from django.core.signals import request_finished, request_started
 from django.db import transaction
 from django.db.utils import IntegrityError
+from django.dispatch import receiver
+from django.utils import timezone
 from edx_django_utils import monitoring as monitoring_utils
 from xblock.fields import Scope
 
@@ -60,6 +66,48 @@ class XBlockUserState(namedtuple('_XBlockUserState', ['username', 'block_key', '
         )
 
 
+class LazyUserState(Mapping):
+    """
+    A read-only mapping of the fields of a serialized XBlock state, which is
+    only decoded from JSON the first time it is accessed.
+
+    Arguments:
+        serialized_state (str): The JSON-serialized state.
+        fields: A list of field names to restrict the state to. If None, all fields are kept.
+    """
+    __slots__ = ('_serialized_state', '_fields', '_state')
+
+    def __init__(self, serialized_state, fields=None):
+        self._serialized_state = serialized_state
+        self._fields = fields
+        self._state = None
+
+    @property
+    def _decoded(self):
+        """
+        The decoded state dict.
+        """
+        if self._state is None:
+            state = json.loads(self._serialized_state)
+            if self._fields is not None:
+                state = {field: state[field] for field in self._fields if field in state}
+            self._state = state
+            self._serialized_state = None
+        return self._state
+
+    def __getitem__(self, key):
+        return self._decoded[key]
+
+    def __iter__(self):
+        return iter(self._decoded)
+
+    def __len__(self):
+        return len(self._decoded)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._decoded!r})"
+
+
 class XBlockUserStateClient():
     """
     First stab at an interface for accessing XBlock User State. This will have
@@ -220,6 +268,147 @@ class XBlockUserStateClient():
         raise NotImplementedError()
 
 
+class _WriteBehindBuffer(threading.local):
+    """
+    A thread local holding the Scope.user_state writes which
+    :class:`DjangoXBlockUserStateClient` deferred during the current request.
+
+    Writes are coalesced per (user, block): a later write for the same block
+    is overlaid on the pending state, exactly as it would be on the stored one.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # {username: (user, {usage_key: state})}
+        self.pending = {}
+        self.pending_count = 0
+        self.oldest = None
+
+    def add(self, user, usage_key, state):
+        """
+        Defer writing `state` for `user` in the block identified by `usage_key`.
+        """
+        _, block_keys_to_state = self.pending.setdefault(user.username, (user, {}))
+        if usage_key in block_keys_to_state:
+            block_keys_to_state[usage_key].update(state)
+        else:
+            block_keys_to_state[usage_key] = dict(state)
+            self.pending_count += 1
+        if self.oldest is None:
+            self.oldest = time()
+
+    def is_full(self):
+        """
+        Return True if the pending writes should be flushed without waiting
+        for the end of the request.
+        """
+        return (
+            self.pending_count >= settings.USER_STATE_WRITE_BEHIND_MAX_PENDING or
+            (self.oldest is not None and time() - self.oldest >= settings.USER_STATE_WRITE_BEHIND_WINDOW)
+        )
+
+    def pop(self, username=None):
+        """
+        Remove and return the pending writes as a list of (user, block_keys_to_state)
+        tuples, either for every user or only for `username`.
+        """
+        if username is None:
+            pending = list(self.pending.values())
+            self.pending = {}
+        elif username in self.pending:
+            pending = [self.pending.pop(username)]
+        else:
+            return []
+
+        self.pending_count -= sum(len(block_keys_to_state) for _, block_keys_to_state in pending)
+        if not self.pending:
+            self.pending_count = 0
+            self.oldest = None
+        return pending
+
+
+_WRITE_BEHIND = _WriteBehindBuffer()
+
+
+def _is_write_behind_block_type(block_type):
+    """
+    Return True if Scope.user_state writes for blocks of `block_type` may be deferred.
+
+    Block types which save StudentModule history are graded, and their state
+    is always written synchronously.
+    """
+    return (
+        block_type in settings.USER_STATE_WRITE_BEHIND_BLOCK_TYPES and
+        block_type not in BaseStudentModuleHistory.HISTORY_SAVING_TYPES
+    )
+
+
+def flush_deferred_user_state(username=None):
+    """
+    Write the Scope.user_state writes deferred in this thread to the database,
+    either for every user or only for `username`.
+
+    Deferred writes follow these durability rules:
+
+        * Only blocks of the types listed in ``USER_STATE_WRITE_BEHIND_BLOCK_TYPES``
+          are deferred, and never graded (history saving) block types.
+        * Writes are only deferred while serving a request. Celery tasks and
+          management commands always write synchronously.
+        * Writes are flushed at the end of the request, as soon as too many are
+          pending or the oldest is too old, and before any read, delete or
+          history lookup of the same user's state, so reads always see them.
+        * If the bulk write of a user's state fails, it is written one block
+          at a time. If that fails as well, the other users' writes are still
+          flushed, then the first error is raised. At the end of a request, the
+          lost writes are only logged and counted in a custom monitoring attribute.
+    """
+    lost, error = _flush_deferred_user_state(username)
+    if lost:
+        raise error
+
+
+def _flush_deferred_user_state(username=None):
+    """
+    Flush the deferred user state writes like `flush_deferred_user_state`, and return the
+    number of writes lost along with the first error, instead of raising it.
+    """
+    lost, error = 0, None
+    for user, block_keys_to_state in _WRITE_BEHIND.pop(username):
+        client = DjangoXBlockUserStateClient(user)
+        try:
+            client.bulk_upsert(user, block_keys_to_state)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(
+                "Failed to flush %d deferred user state writes for user %s, writing them one at a time",
+                len(block_keys_to_state), user.id,
+            )
+            try:
+                client._write_many(user, block_keys_to_state)  # pylint: disable=protected-access
+            except Exception as exc:  # pylint: disable=broad-except
+                log.exception(
+                    "Lost %d deferred user state writes for user %s", len(block_keys_to_state), user.id,
+                )
+                lost += len(block_keys_to_state)
+                error = error or exc
+    return lost, error
+
+
+@receiver(request_started)
+@receiver(request_finished)
+def _flush_deferred_user_state_on_request_boundary(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Flush the deferred user state writes at the end of every request. Flushing
+    at the start of a request as well guarantees that nothing deferred by a
+    request whose end was never signalled leaks into the next one.
+
+    The response has already been sent by then, and raising would stop the other
+    receivers of the signal, so lost writes are logged and counted instead.
+    """
+    lost, __ = _flush_deferred_user_state()
+    if lost:
+        monitoring_utils.set_custom_attribute('deferred_user_state_lost_writes', lost)
+
+
 class DjangoXBlockUserStateClient(XBlockUserStateClient):
     """
     An interface that uses the Django ORM StudentModule as a backend.
@@ -355,6 +544,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError(f"Only Scope.user_state is supported, not {scope}")
 
+        flush_deferred_user_state(username)
+
         total_block_count = 0
         evt_time = time()
 
@@ -428,6 +619,15 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # what we have.
             return
 
+        block_keys_to_state = self._defer_writes(user, block_keys_to_state)
+        if block_keys_to_state:
+            self._write_many(user, block_keys_to_state)
+
+    def _write_many(self, user, block_keys_to_state):
+        """
+        Synchronously overlay the given states on the stored state of `user`,
+        one block at a time.
+        """
         evt_time = time()
 
         for usage_key, state in block_keys_to_state.items():
@@ -498,6 +698,81 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         duration = (finish_time - evt_time) * 1000  # milliseconds
         self._nr_stat_accumulate('set_many', 'duration', duration)
 
+    def _defer_writes(self, user, block_keys_to_state):
+        """
+        Defer the writes for the blocks configured for write-behind until the
+        end of the current request, see :func:`flush_deferred_user_state`.
+
+        Returns the dict of the writes which must be done synchronously.
+        """
+        if not settings.USER_STATE_WRITE_BEHIND_BLOCK_TYPES or get_current_request() is None:
+            return block_keys_to_state
+
+        immediate = {}
+        for usage_key, state in block_keys_to_state.items():
+            if _is_write_behind_block_type(usage_key.block_type):
+                _WRITE_BEHIND.add(user, usage_key, state)
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_deferred')
+            else:
+                immediate[usage_key] = state
+
+        if _WRITE_BEHIND.is_full():
+            flush_deferred_user_state()
+        return immediate
+
+    def bulk_upsert(self, user, block_keys_to_state):
+        """
+        Overlay the given states on the stored state of `user` with one query to
+        load the existing rows, then bulk updates and inserts.
+
+        StudentModule ``post_save`` signals are not sent, so this must only be
+        used for block types which don't save history. If another process
+        created one of the rows concurrently, falls back to writing the blocks
+        one at a time.
+
+        Arguments:
+            user (:class:`~User`): The user whose state should be stored.
+            block_keys_to_state (dict): A dict mapping UsageKeys to state dicts.
+        """
+        evt_time = time()
+        remaining = dict(block_keys_to_state)
+        now = timezone.now()
+
+        to_update = []
+        for student_module, usage_key in self._get_student_modules(user.username, list(remaining)):
+            state = remaining.pop(usage_key, None)
+            if state is None:
+                continue
+            current_state = json.loads(student_module.state) if student_module.state else {}
+            current_state.update(state)
+            student_module.state = json.dumps(current_state)
+            student_module.modified = now
+            to_update.append(student_module)
+
+        to_create = [
+            StudentModule(
+                student=user,
+                course_id=usage_key.context_key,
+                module_state_key=usage_key,
+                module_type=usage_key.block_type,
+                state=json.dumps(state),
+            )
+            for usage_key, state in remaining.items()
+        ]
+
+        try:
+            with transaction.atomic():
+                StudentModule.objects.bulk_update(to_update, ['state', 'modified'], batch_size=500)
+                StudentModule.objects.bulk_create(to_create, batch_size=500)
+        except IntegrityError:
+            log.warning("bulk_upsert: IntegrityError for student {} - writing blocks one at a time".format(user))
+            self._write_many(user, block_keys_to_state)
+            return
+
+        self._nr_stat_accumulate('bulk_upsert', 'blocks_updated', len(to_update))
+        self._nr_stat_accumulate('bulk_upsert', 'blocks_created', len(to_create))
+        self._nr_stat_accumulate('bulk_upsert', 'duration', (time() - evt_time) * 1000)
+
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Delete the stored XBlock state for a many xblock usages.
@@ -511,6 +786,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        flush_deferred_user_state(username)
+
         evt_time = time()  # lint-amnesty, pylint: disable=unused-variable
         student_modules = self._get_student_modules(username, block_keys)
         for student_module, _ in student_modules:
@@ -549,6 +826,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
+        flush_deferred_user_state(username)
         student_modules = list(
             student_module
             for student_module, usage_id
@@ -582,7 +860,39 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
             yield XBlockUserState(username, block_key, state, history_entry.created, scope)
 
-    def iter_all_for_block(self, block_key, scope=Scope.user_state):
+    def _iter_all_streaming(self, student_modules, scope, fields=None):
+        """
+        Yield an :class:`~XBlockUserState` for every non-empty state in the
+        ``student_modules`` queryset, with constant memory.
+
+        Rows are fetched ``USER_STATE_BATCH_SIZE`` at a time using keyset pagination on the
+        primary key (MySQL can't stream results from a server-side cursor, and OFFSET
+        pagination gets slower with every page), only the columns needed are selected,
+        the username comes from a join rather than a query per row, and each state is
+        decoded lazily as a :class:`~LazyUserState`.
+        """
+        student_modules = student_modules.order_by('id').values_list(
+            'id', 'student__username', 'module_state_key', 'state', 'modified',
+        )
+        batch_size = settings.USER_STATE_BATCH_SIZE
+        last_id = None
+        while True:
+            page = student_modules if last_id is None else student_modules.filter(id__gt=last_id)
+            rows = list(page[:batch_size])
+            if not rows:
+                return
+
+            for _, username, block_key, state, modified in rows:
+                # A state of None means the user never stored state, and "{}" that it was deleted.
+                if state is None or state == '{}':
+                    continue
+                yield XBlockUserState(username, block_key, LazyUserState(state, fields), modified, scope)
+
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+    def iter_all_for_block(self, block_key, scope=Scope.user_state, fields=None, stream=False):
         """
         Return an iterator over the data stored in the block (e.g. a problem block).
 
@@ -592,6 +902,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         Arguments:
             block_key: an XBlock's locator (e.g. :class:`~BlockUsageLocator`)
             scope (Scope): must be `Scope.user_state`
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+            stream (bool): If True, iterate with constant memory and decode each state
+                lazily, see :meth:`_iter_all_streaming`.
 
         Returns:
             an iterator over all data. Each invocation returns the next :class:`~XBlockUserState`
@@ -600,6 +913,14 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        flush_deferred_user_state()
+
+        if stream:
+            yield from self._iter_all_streaming(
+                StudentModule.objects.filter(module_state_key=block_key), scope, fields,
+            )
+            return
+
         results = StudentModule.objects.order_by('id').filter(module_state_key=block_key).select_related('student')
         p = Paginator(results, settings.USER_STATE_BATCH_SIZE)
 
@@ -612,9 +933,12 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 if state == {}:
                     continue
 
+                if fields is not None:
+                    state = {field: state[field] for field in fields if field in state}
+
                 yield XBlockUserState(sm.student.username, sm.module_state_key, state, sm.modified, scope)
 
-    def iter_all_for_course(self, course_key, block_type=None, scope=Scope.user_state):
+    def iter_all_for_course(self, course_key, block_type=None, scope=Scope.user_state, fields=None, stream=False):
         """
         Return an iterator over all data stored in a course's blocks.
 
@@ -624,6 +948,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         Arguments:
             course_key: a course locator
             scope (Scope): must be `Scope.user_state`
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+            stream (bool): If True, iterate with constant memory and decode each state
+                lazily, see :meth:`_iter_all_streaming`.
 
         Returns:
             an iterator over all data. Each invocation returns the next :class:`~XBlockUserState`
@@ -632,10 +959,16 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        flush_deferred_user_state()
+
         results = StudentModule.objects.order_by('id').filter(course_id=course_key)
         if block_type:
             results = results.filter(module_type=block_type)
 
+        if stream:
+            yield from self._iter_all_streaming(results, scope, fields)
+            return
+
         p = Paginator(results, settings.USER_STATE_BATCH_SIZE)
 
         for page_number in p.page_range:
@@ -647,4 +980,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 if state == {}:
                     continue
 
+                if fields is not None:
+                    state = {field: state[field] for field in fields if field in state}
+
                 yield XBlockUserState(sm.student.username, sm.module_state_key, state, sm.modified, scope)
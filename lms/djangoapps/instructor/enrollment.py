@@ -12,6 +12,9 @@ from datetime import datetime
 import pytz
 from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db.models import Q
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils.translation import override as override_language
@@ -20,6 +23,7 @@ from edx_ace.recipient import Recipient
 from eventtracking import tracker
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from submissions.models import score_set, score_reset
+from user_util import user_util
 
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import (  # lint-amnesty, pylint: disable=line-too-long
@@ -50,7 +54,7 @@ from lms.djangoapps.instructor.message_types import (
 )
 from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
-from openedx.core.djangoapps.user_api.models import UserPreference
+from openedx.core.djangoapps.user_api.models import UserPreference, UserRetirementRequest
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.exceptions import ItemNotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
 
@@ -199,6 +203,135 @@ def enroll_email(
     return previous_state, after_state, enrollment_obj
 
 
+def _retired_emails(emails):
+    """
+    Returns the subset of `emails` which were previously retired, with a single query.
+    """
+    emails_by_retired_email = {}
+    for email in emails:
+        for retired_email in user_util.get_all_retired_emails(
+            email, settings.RETIRED_USER_SALTS, settings.RETIRED_EMAIL_FMT
+        ):
+            emails_by_retired_email[retired_email] = email
+    return {
+        emails_by_retired_email[retired_email]
+        for retired_email in User.objects.filter(email__in=list(emails_by_retired_email)).values_list(
+            'email', flat=True
+        )
+    }
+
+
+def bulk_enroll_email(course_id, identifiers, auto_enroll=False):
+    """
+    Enroll many students by email or username, like `enroll_email` does for each of them
+    without sending any messages, but with a constant number of queries.
+
+    The enrollments are written in bulk by `CourseEnrollment.bulk_enroll`, which does not
+    emit their signals and events: they should be sent from a background task with
+    `CourseEnrollment.send_bulk_enrollment_events`.
+
+    `identifiers` is a list of emails and/or usernames.
+    `auto_enroll` determines what is put in CourseEnrollmentAllowed.auto_enroll.
+
+    returns a list of dicts for each identifier, with either an `invalidIdentifier` or an
+        `error` key, or the `email`, the `before` and `after` states (as returned by
+        EmailEnrollmentState.to_dict) and the `enrollment`, and the list of
+        (enrollment, previous_state) changes returned by `CourseEnrollment.bulk_enroll`.
+    """
+    users = User.objects.filter(
+        Q(email__in=identifiers) | Q(username__in=identifiers)
+    ).select_related('profile')
+    retiring_user_ids = set(
+        UserRetirementRequest.objects.filter(user__in=users).values_list('user_id', flat=True)
+    )
+    users_by_identifier = {}
+    for user in users:
+        if user.id not in retiring_user_ids:
+            users_by_identifier.setdefault(user.username, set()).add(user)
+        users_by_identifier.setdefault(user.email, set()).add(user)
+
+    results = []
+    for identifier in identifiers:
+        matching_users = users_by_identifier.get(identifier, set())
+        if len(matching_users) > 1:
+            # One user's email is another user's username: the identifier is ambiguous.
+            results.append({'identifier': identifier, 'error': True})
+            continue
+        user = next(iter(matching_users), None)
+        email = user.email if user else identifier
+        try:
+            validate_email(email)
+        except ValidationError:
+            results.append({'identifier': identifier, 'invalidIdentifier': True})
+            continue
+        results.append({'identifier': identifier, 'email': email, 'user': user})
+
+    valid_results = [result for result in results if 'email' in result]
+    emails = {result['email'] for result in valid_results}
+    enrollments_by_user_id = {
+        enrollment.user_id: enrollment
+        for enrollment in CourseEnrollment.objects.filter(
+            course_id=course_id, user__email__in=emails
+        )
+    }
+    ceas_by_email = {}
+    for cea in CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=emails):
+        ceas_by_email.setdefault(cea.email, []).append(cea)
+
+    default_mode = CourseMode.HONOR if CourseMode.is_white_label(course_id) else None
+    modes_by_user = {}
+    allowed_emails = []
+    for result in valid_results:
+        user = result['user']
+        enrollment = enrollments_by_user_id.get(user.id) if user else None
+        is_enrolled = bool(enrollment and enrollment.is_active)
+        ceas = [cea for cea in ceas_by_email.get(result['email'], []) if not user or cea.valid_for_user(user)]
+        result['before'] = {
+            'user': bool(user),
+            'enrollment': is_enrolled,
+            'allowed': bool(ceas),
+            'auto_enroll': bool(ceas and ceas[0].auto_enroll),
+        }
+        if user and user.is_active:
+            # if the student is currently unenrolled, don't enroll them in their previous mode
+            modes_by_user[user] = enrollment.mode if is_enrolled else default_mode
+        else:
+            allowed_emails.append(result['email'])
+
+    changes, not_allowed_users = CourseEnrollment.bulk_enroll(course_id, modes_by_user)
+    enrollments_by_user_id.update((enrollment.user_id, enrollment) for enrollment, __ in changes)
+
+    allowed_emails = set(allowed_emails) - _retired_emails(allowed_emails)
+    existing_ceas = list(CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=allowed_emails))
+    for cea in existing_ceas:
+        cea.auto_enroll = auto_enroll
+    CourseEnrollmentAllowed.objects.bulk_update(existing_ceas, ['auto_enroll'])
+    CourseEnrollmentAllowed.objects.bulk_create([
+        CourseEnrollmentAllowed(course_id=course_id, email=email, auto_enroll=auto_enroll)
+        for email in allowed_emails - {cea.email for cea in existing_ceas}
+    ])
+
+    for result in valid_results:
+        user = result.pop('user')
+        if user in not_allowed_users:
+            # The enrollment was prevented by a CourseEnrollmentStarted filter
+            identifier = result['identifier']
+            result.clear()
+            result.update({'identifier': identifier, 'error': True})
+            continue
+        result['after'] = dict(result['before'])
+        if user in modes_by_user:
+            result['after']['enrollment'] = True
+            result['enrollment'] = enrollments_by_user_id[user.id]
+        else:
+            result['enrollment'] = None
+            if result['email'] in allowed_emails:
+                result['after']['allowed'] = True
+                result['after']['auto_enroll'] = bool(auto_enroll)
+
+    return results, changes
+
+
 def unenroll_email(course_id, student_email, message_students=False, message_params=None, language=None):
     """
     Unenroll a student by email.
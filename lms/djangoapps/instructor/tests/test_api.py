@@ -20,7 +20,7 @@ from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imp
 from django.core import mail
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import HttpRequest, HttpResponse
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.test.client import MULTIPART_CONTENT
 from django.urls import reverse as django_reverse
 from django.utils.translation import gettext as _
@@ -1205,6 +1205,35 @@ class TestInstructorAPIEnrollment(SharedModuleStoreTestCase, LoginEnrollmentTest
         # Check the outbox
         assert len(mail.outbox) == 0
 
+    @override_settings(INSTRUCTOR_BULK_ENROLLMENT_THRESHOLD=2)
+    @patch('lms.djangoapps.instructor_task.api.submit_bulk_enrollment_events')
+    def test_bulk_enroll_without_email(self, mock_submit_events):
+        url = reverse('students_update_enrollment', kwargs={'course_id': str(self.course.id)})
+        identifiers = [
+            self.notenrolled_student.username, self.enrolled_student.email, self.notregistered_email, 'invalid',
+        ]
+        response = self.client.post(url, {'identifiers': ','.join(identifiers), 'action': 'enroll',
+                                          'email_students': False, 'reason': 'testing'})
+        assert response.status_code == 200
+
+        assert CourseEnrollment.is_enrolled(self.notenrolled_student, self.course.id)
+        assert CourseEnrollmentAllowed.objects.filter(
+            course_id=self.course.id, email=self.notregistered_email
+        ).exists()
+        res_json = json.loads(response.content.decode('utf-8'))
+        assert res_json['action'] == 'enroll'
+        assert [result['after'].get('enrollment') for result in res_json['results'][:3]] == [True, True, False]
+        assert res_json['results'][2]['after']['allowed']
+        assert res_json['results'][3] == {'identifier': 'invalid', 'invalidIdentifier': True}
+
+        assert sorted(ManualEnrollmentAudit.objects.values_list('state_transition', flat=True)) == sorted([
+            UNENROLLED_TO_ENROLLED, ENROLLED_TO_ENROLLED, UNENROLLED_TO_ALLOWEDTOENROLL,
+        ])
+        # Only the new enrollment has signals and events to send.
+        changes = mock_submit_events.call_args[0][2]
+        assert [enrollment.user for enrollment, __ in changes] == [self.notenrolled_student]
+        assert len(mail.outbox) == 0
+
     @ddt.data('http', 'https')
     def test_enroll_with_email(self, protocol):
         url = reverse('students_update_enrollment', kwargs={'course_id': str(self.course.id)})
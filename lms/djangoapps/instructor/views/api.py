@@ -90,6 +90,7 @@ from lms.djangoapps.instructor import enrollment
 from lms.djangoapps.instructor.access import ROLES, allow_access, list_with_level, revoke_access, update_forum_role
 from lms.djangoapps.instructor.constants import INVOICE_KEY
 from lms.djangoapps.instructor.enrollment import (
+    bulk_enroll_email,
     enroll_email,
     get_email_params,
     get_user_email_language,
@@ -811,6 +812,12 @@ def students_update_enrollment(request, course_id):  # lint-amnesty, pylint: dis
     enrollment_obj = None
     state_transition = DEFAULT_TRANSITION_STATE
 
+    if (
+        action == 'enroll' and not email_students and
+        len(identifiers) >= settings.INSTRUCTOR_BULK_ENROLLMENT_THRESHOLD
+    ):
+        return _bulk_enroll_students(request, course_id, identifiers, auto_enroll, reason)
+
     email_params = {}
     if email_students:
         course = get_course_by_id(course_id)
@@ -915,6 +922,45 @@ def students_update_enrollment(request, course_id):  # lint-amnesty, pylint: dis
     return JsonResponse(response_payload)
 
 
+def _bulk_enroll_students(request, course_id, identifiers, auto_enroll, reason):
+    """
+    Enroll many students without notifying them, with a constant number of queries.
+
+    The enrollments are written in bulk, and their signals and events are sent by a background
+    task. Returns the same response as `students_update_enrollment`.
+    """
+    results, changes = bulk_enroll_email(course_id, identifiers, auto_enroll)
+
+    audits = []
+    for result in results:
+        if 'before' not in result:
+            continue
+        before, after = result['before'], result['after']
+        state_transition = DEFAULT_TRANSITION_STATE
+        if before['user']:
+            if after['enrollment']:
+                if before['enrollment']:
+                    state_transition = ENROLLED_TO_ENROLLED
+                elif before['allowed']:
+                    state_transition = ALLOWEDTOENROLL_TO_ENROLLED
+                else:
+                    state_transition = UNENROLLED_TO_ENROLLED
+        elif after['allowed']:
+            state_transition = UNENROLLED_TO_ALLOWEDTOENROLL
+        audits.append((result.pop('email'), state_transition, result.pop('enrollment')))
+    ManualEnrollmentAudit.bulk_create_manual_enrollment_audits(request.user, audits, reason)
+
+    if changes:
+        task_api.submit_bulk_enrollment_events(request, course_id, changes)
+
+    response_payload = {
+        'action': 'enroll',
+        'results': results,
+        'auto_enroll': auto_enroll,
+    }
+    return JsonResponse(response_payload)
+
+
 @method_decorator(cache_control(no_cache=True, no_store=True, must_revalidate=True), name='dispatch')
 class BulkBetaModifyAccess(DeveloperErrorViewMixin, APIView):
     """
@@ -13,12 +13,13 @@ from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models import Count  # lint-amnesty, pylint: disable=unused-import
+from django.db.models import Count, Q  # lint-amnesty, pylint: disable=unused-import
 from django.urls import reverse
 from edx_proctoring.api import get_exam_violation_report
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 import xmodule.graders as xmgraders
+from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import CourseEnrollment, CourseEnrollmentAllowed
 from lms.djangoapps.certificates.data import CertificateStatuses
 from lms.djangoapps.certificates.models import GeneratedCertificate
@@ -56,6 +57,9 @@ CERTIFICATE_FEATURES = ('course_id', 'mode', 'status', 'grade', 'created_date',
 
 UNAVAILABLE = "[unavailable]"
 
+# Number of enrollments read at once by iter_enrolled_students_features
+ENROLLED_STUDENTS_BATCH_SIZE = 1000
+
 
 def issued_certificates(course_key, features):
     """
@@ -84,16 +88,28 @@ def issued_certificates(course_key, features):
     return generated_certificates
 
 
-def enrolled_students_features(course_key, features):
+def _json_ready(value):
+    """Returns the value if it is ready for JSON serialization, and its string otherwise"""
+    try:
+        DjangoJSONEncoder().default(value)
+        return value
+    except TypeError:
+        return str(value)
+
+
+def iter_enrolled_students_features(course_key, features, batch_size=ENROLLED_STUDENTS_BATCH_SIZE):
     """
-    Return list of student features as dictionaries.
+    Yield the features of the students enrolled in the course as dictionaries, ordered by username.
 
-    enrolled_students_features(course_key, ['username', 'first_name'])
-    would return [
+    The enrollments are read in pages of `batch_size` users with only the fields of the requested
+    features, and the cohorts, teams, ID verifications and external user keys of each page are
+    looked up together, so that memory use doesn't grow with the number of students.
+
+    iter_enrolled_students_features(course_key, ['username', 'first_name'])
+    would yield
         {'username': 'username1', 'first_name': 'firstname1'}
         {'username': 'username2', 'first_name': 'firstname2'}
         {'username': 'username3', 'first_name': 'firstname3'}
-    ]
     """
     include_cohort_column = 'cohort' in features
     include_team_column = 'team' in features
@@ -101,97 +117,132 @@ def enrolled_students_features(course_key, features):
     include_enrollment_mode = 'enrollment_mode' in features
     include_verification_status = 'verification_status' in features
     include_program_enrollments = 'external_user_key' in features
-    external_user_key_dict = {}
 
-    students = User.objects.filter(
-        courseenrollment__course_id=course_key,
-        courseenrollment__is_active=1,
-    ).order_by('username').select_related('profile')
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+
+    # For data extractions on the 'meta' field
+    # the feature name should be in the format of 'meta.foo' where
+    # 'foo' is the keyname in the meta dictionary
+    meta_features = []
+    for feature in features:
+        if 'meta.' in feature:
+            meta_key = feature.split('.')[1]
+            meta_features.append((feature, meta_key))
+    decode_meta = bool(meta_features) or include_city_column
+
+    # The pages are keyed on the username the students are ordered by
+    fields = ['user_id', 'user__profile__id']
+    fields += [f'user__{feature}' for feature in student_features]
+    if 'username' not in student_features:
+        fields.append('user__username')
+    fields += [f'user__profile__{feature}' for feature in profile_features]
+    if decode_meta and 'meta' not in profile_features:
+        fields.append('user__profile__meta')
+    if include_enrollment_mode or include_verification_status:
+        fields.append('mode')
+    enrollments = CourseEnrollment.objects.filter(
+        course_id=course_key,
+        is_active=True,
+    ).order_by('user__username', 'user_id').values(*fields)
 
-    if include_cohort_column:
-        students = students.prefetch_related('course_groups')
+    page = list(enrollments[:batch_size])
+    while page:
+        user_ids = [enrollment['user_id'] for enrollment in page]
 
-    if include_team_column:
-        students = students.prefetch_related('teams')
+        cohort_names = {}
+        if include_cohort_column:
+            for user_id, cohort_name in User.objects.filter(
+                id__in=user_ids, course_groups__course_id=course_key,
+            ).values_list('id', 'course_groups__name'):
+                cohort_names.setdefault(user_id, cohort_name)
 
-    if include_program_enrollments and len(students) > 0:
-        program_enrollments = fetch_program_enrollments_by_students(users=students, realized_only=True)
-        for program_enrollment in program_enrollments:
-            external_user_key_dict[program_enrollment.user_id] = program_enrollment.external_user_key
+        team_names = {}
+        if include_team_column:
+            for user_id, team_name in User.objects.filter(
+                id__in=user_ids, teams__course_id=course_key,
+            ).values_list('id', 'teams__name'):
+                team_names.setdefault(user_id, team_name)
+
+        verified_user_ids = set()
+        if include_verification_status:
+            verified_mode_user_ids = [
+                enrollment['user_id'] for enrollment in page if enrollment['mode'] in CourseMode.VERIFIED_MODES
+            ]
+            if verified_mode_user_ids:
+                verified_user_ids = set(IDVerificationService.get_verified_user_ids(verified_mode_user_ids))
+
+        external_user_keys = {}
+        if include_program_enrollments:
+            external_user_keys = dict(
+                fetch_program_enrollments_by_students(
+                    users=user_ids, realized_only=True,
+                ).values_list('user_id', 'external_user_key')
+            )
 
-    def extract_attr(student, feature):
-        """Evaluate a student attribute that is ready for JSON serialization"""
-        attr = getattr(student, feature)
-        try:
-            DjangoJSONEncoder().default(attr)
-            return attr
-        except TypeError:
-            return str(attr)
+        for enrollment in page:
+            user_id = enrollment['user_id']
+            student_dict = {feature: _json_ready(enrollment[f'user__{feature}']) for feature in student_features}
+            if enrollment['user__profile__id'] is not None:
+                student_dict.update(
+                    (feature, _json_ready(enrollment[f'user__profile__{feature}'])) for feature in profile_features
+                )
 
-    def extract_student(student, features):
-        """ convert student to dictionary """
-        student_features = [x for x in STUDENT_FEATURES if x in features]
-        profile_features = [x for x in PROFILE_FEATURES if x in features]
-
-        # For data extractions on the 'meta' field
-        # the feature name should be in the format of 'meta.foo' where
-        # 'foo' is the keyname in the meta dictionary
-        meta_features = []
-        for feature in features:
-            if 'meta.' in feature:
-                meta_key = feature.split('.')[1]
-                meta_features.append((feature, meta_key))
-
-        student_dict = {feature: extract_attr(student, feature) for feature in student_features}
-        profile = student.profile
-        if profile is not None:
-            profile_dict = {feature: extract_attr(profile, feature) for feature in profile_features}
-            student_dict.update(profile_dict)
-
-            # now fetch the requested meta fields
-            meta_dict = json.loads(profile.meta) if profile.meta else {}
-            for meta_feature, meta_key in meta_features:
-                student_dict[meta_feature] = meta_dict.get(meta_key)
-
-            # There are two separate places where the city value can be stored,
-            # one used by account settings and the other used by the registration form.
-            # If the account settings value (meta.city) is set, it takes precedence.
-            meta_city = meta_dict.get('city')
-            if include_city_column and meta_city:
-                student_dict['city'] = meta_city
+                if decode_meta:
+                    # now fetch the requested meta fields
+                    meta = enrollment['user__profile__meta']
+                    meta_dict = json.loads(meta) if meta else {}
+                    for meta_feature, meta_key in meta_features:
+                        student_dict[meta_feature] = meta_dict.get(meta_key)
 
-        if include_cohort_column:
-            # Note that we use student.course_groups.all() here instead of
-            # student.course_groups.filter(). The latter creates a fresh query,
-            # therefore negating the performance gain from prefetch_related().
-            student_dict['cohort'] = next(
-                (cohort.name for cohort in student.course_groups.all() if cohort.course_id == course_key),
-                "[unassigned]"
-            )
+                    # There are two separate places where the city value can be stored,
+                    # one used by account settings and the other used by the registration form.
+                    # If the account settings value (meta.city) is set, it takes precedence.
+                    meta_city = meta_dict.get('city')
+                    if include_city_column and meta_city:
+                        student_dict['city'] = meta_city
 
-        if include_team_column:
-            student_dict['team'] = next(
-                (team.name for team in student.teams.all() if team.course_id == course_key),
-                UNAVAILABLE
-            )
+            if include_cohort_column:
+                student_dict['cohort'] = cohort_names.get(user_id, "[unassigned]")
+
+            if include_team_column:
+                student_dict['team'] = team_names.get(user_id, UNAVAILABLE)
 
-        if include_enrollment_mode or include_verification_status:
-            enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_key)[0]
             if include_verification_status:
                 student_dict['verification_status'] = IDVerificationService.verification_status_for_user(
-                    student,
-                    enrollment_mode
+                    None,
+                    enrollment['mode'],
+                    user_is_verified=user_id in verified_user_ids,
                 )
             if include_enrollment_mode:
-                student_dict['enrollment_mode'] = enrollment_mode
+                student_dict['enrollment_mode'] = enrollment['mode']
+
+            if include_program_enrollments:
+                # extra external_user_key
+                student_dict['external_user_key'] = external_user_keys.get(user_id, '')
+
+            yield student_dict
+
+        if len(page) < batch_size:
+            return
+        last_username, last_user_id = page[-1]['user__username'], page[-1]['user_id']
+        page = list(enrollments.filter(
+            Q(user__username__gt=last_username) | Q(user__username=last_username, user_id__gt=last_user_id)
+        )[:batch_size])
 
-        if include_program_enrollments:
-            # extra external_user_key
-            student_dict['external_user_key'] = external_user_key_dict.get(student.id, '')
 
-        return student_dict
+def enrolled_students_features(course_key, features):
+    """
+    Return list of student features as dictionaries, ordered by username.
 
-    return [extract_student(student, features) for student in students]
+    enrolled_students_features(course_key, ['username', 'first_name'])
+    would return [
+        {'username': 'username1', 'first_name': 'firstname1'}
+        {'username': 'username2', 'first_name': 'firstname2'}
+        {'username': 'username3', 'first_name': 'firstname3'}
+    ]
+    """
+    return list(iter_enrolled_students_features(course_key, features))
 
 
 def list_may_enroll(course_key, features):
@@ -19,6 +19,7 @@ from lms.djangoapps.instructor_analytics.basic import (  # lint-amnesty, pylint:
     enrolled_students_features,
     get_proctored_exam_results,
     get_response_state,
+    iter_enrolled_students_features,
     list_may_enroll,
     list_problem_responses
 )
@@ -182,19 +183,17 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             assert userreport['verification_status'] in ['N/A']
         # make sure that the user report respects whatever value
         # is returned by verification and enrollment code
-        MODE_MTHD_NAME = "common.djangoapps.student.models.course_enrollment.CourseEnrollment.enrollment_mode_for_user"
-        with patch(MODE_MTHD_NAME) as enrollment_patch:
-            with patch(
-                "lms.djangoapps.verify_student.services.IDVerificationService.verification_status_for_user"
-            ) as verify_patch:
-                enrollment_patch.return_value = ["verified"]
-                verify_patch.return_value = "dummy verification status"
-                userreports = enrolled_students_features(self.course_key, query_features)
-                assert len(userreports) == len(self.users)
-                for userreport in userreports:
-                    assert set(userreport.keys()) == set(query_features)
-                    assert userreport['enrollment_mode'] in ['verified']
-                    assert userreport['verification_status'] in ['dummy verification status']
+        CourseEnrollment.objects.filter(course_id=self.course_key).update(mode="verified")
+        with patch(
+            "lms.djangoapps.verify_student.services.IDVerificationService.verification_status_for_user"
+        ) as verify_patch:
+            verify_patch.return_value = "dummy verification status"
+            userreports = enrolled_students_features(self.course_key, query_features)
+            assert len(userreports) == len(self.users)
+            for userreport in userreports:
+                assert set(userreport.keys()) == set(query_features)
+                assert userreport['enrollment_mode'] in ['verified']
+                assert userreport['verification_status'] in ['dummy verification status']
 
     def test_enrolled_students_features_keys_cohorted(self):
         course = CourseFactory.create(org="test", course="course1", display_name="run1")
@@ -249,6 +248,17 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             else:
                 assert '' == report['external_user_key']
 
+    def test_iter_enrolled_students_features_pages(self):
+        """
+        Assert that the students are read in pages, with the same queries for each page
+        """
+        query_features = ('username', 'meta.position', 'external_user_key')
+        with self.assertNumQueries(7):  # 2 for each of the 3 pages, 1 finding no more students
+            userreports = list(iter_enrolled_students_features(self.course_key, query_features, batch_size=10))
+        users = sorted(self.users, key=lambda user: user.username)
+        assert [userreport['username'] for userreport in userreports] == [user.username for user in users]
+        assert userreports[0]['meta.position'] == f"edX expert {users[0].id}"
+
     def test_available_features(self):
         assert len(AVAILABLE_FEATURES) == len(STUDENT_FEATURES + PROFILE_FEATURES + PROGRAM_ENROLLMENT_FEATURES)
         assert set(AVAILABLE_FEATURES) == set(STUDENT_FEATURES + PROFILE_FEATURES + PROGRAM_ENROLLMENT_FEATURES)
@@ -8,11 +8,15 @@ arguments.
 """
 import datetime
 import hashlib
+import json
 import logging
+import uuid
 from collections import Counter
 
 import pytz
 from celery.states import READY_STATES
+from django.core.files.base import ContentFile
+from django.core.files.storage import DefaultStorage
 
 from common.djangoapps.util import milestones_helpers
 from lms.djangoapps.bulk_email.api import get_course_email
@@ -48,6 +52,7 @@ from lms.djangoapps.instructor_task.tasks import (
     rescore_problem,
     reset_problem_attempts,
     send_bulk_course_email,
+    send_bulk_enrollment_events,
     generate_anonymous_ids_for_course
 )
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
@@ -451,6 +456,34 @@ def submit_cohort_students(request, course_key, file_name):
     return submit_task(request, task_type, task_class, course_key, task_input, task_key)
 
 
+def submit_bulk_enrollment_events(request, course_key, changes):
+    """
+    Request to have the signals and events of enrollments written in bulk sent as a background task.
+
+    `changes` is the list of (enrollment, previous_state) returned by `CourseEnrollment.bulk_enroll`.
+    task_input has a limit to the size it can store, so the changes are stored in a file.
+    """
+    file_name = DefaultStorage().save(
+        f'bulk_enrollment_events/{course_key}/{uuid.uuid4().hex}.json',
+        ContentFile(json.dumps([
+            [
+                enrollment.id,
+                previous_state.mode if previous_state else None,
+                previous_state.is_active if previous_state else None,
+            ]
+            for enrollment, previous_state in changes
+        ])),
+    )
+
+    task_type = InstructorTaskTypes.BULK_ENROLLMENT_EVENTS
+    task_class = send_bulk_enrollment_events
+    task_input = {'file_name': file_name, 'count': len(changes)}
+    # create the key value by using MD5 hash:
+    task_key = hashlib.md5(file_name.encode('utf-8')).hexdigest()
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
 def submit_export_ora2_data(request, course_key):
     """
     AlreadyRunningError is raised if an ora2 report is already being generated.
@@ -9,6 +9,7 @@ class InstructorTaskTypes(str, Enum):
     Enum describing the assortment of instructor tasks supported by edx-platform.
     """
     BULK_COURSE_EMAIL = "bulk_course_email"
+    BULK_ENROLLMENT_EVENTS = "bulk_enrollment_events"
     COHORT_STUDENTS = "cohort_students"
     COURSE_SURVEY_REPORT = "course_survey_report"
     DELETE_PROBLEM_STATE = "delete_problem_state"
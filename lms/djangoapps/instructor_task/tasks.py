@@ -30,7 +30,11 @@ from edx_django_utils.monitoring import set_code_owner_attribute
 from lms.djangoapps.bulk_email.tasks import perform_delegate_email_batches
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
-from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
+from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
+    send_bulk_enrollment_events_for_course,
+    upload_may_enroll_csv,
+    upload_students_csv
+)
 from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
@@ -297,6 +301,19 @@ def cohort_students(entry_id, xblock_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@shared_task(base=BaseInstructorTask)
+@set_code_owner_attribute
+def send_bulk_enrollment_events(entry_id, xblock_instance_args):
+    """
+    Emit the signals and events of enrollments written in bulk.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    # An example of such a message is: "Progress: {action} {succeeded} of {attempted} so far"
+    action_name = gettext_noop('notified')
+    task_fn = partial(send_bulk_enrollment_events_for_course, xblock_instance_args)
+    return run_main_task(entry_id, task_fn, action_name)
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def generate_anonymous_ids_for_course(entry_id, xblock_instance_args):
@@ -7,12 +7,14 @@ import logging
 
 from time import time
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db.models import Q
 
 from common.djangoapps.student.models import CourseEnrollment
 from lms.djangoapps.certificates.api import (
     generate_certificate_task,
+    generate_certificates_in_bulk,
     get_enrolled_allowlisted_users,
     get_enrolled_allowlisted_not_passing_users
 )
@@ -69,6 +71,18 @@ def generate_students_certificates(
     current_step = {'step': 'Generating Certificates'}
     task_progress.update_task_state(extra_meta=current_step)
 
+    if len(students_require_certs) >= settings.CERTIFICATES_BULK_GENERATION_THRESHOLD:
+        # Evaluate and write the certificates in chunks here, rather than queue a task for each student
+        students_require_certs = list(students_require_certs)
+        chunk_size = settings.CERTIFICATES_BULK_GENERATION_CHUNK_SIZE
+        for index in range(0, len(students_require_certs), chunk_size):
+            chunk = students_require_certs[index:index + chunk_size]
+            task_progress.attempted += len(chunk)
+            counts = generate_certificates_in_bulk(chunk, course_id)
+            task_progress.succeeded += counts['generated'] + counts['revoked']
+            task_progress.update_task_state(extra_meta=current_step)
+        return task_progress.update_task_state(extra_meta=current_step)
+
     # Generate certificate for each student
     for student in students_require_certs:
         task_progress.attempted += 1
@@ -3,19 +3,26 @@ Instructor tasks related to enrollments.
 """
 
 
+import csv
+import json
 import logging
 from datetime import datetime
+from tempfile import TemporaryFile
 from time import time
+
+from django.core.files.storage import DefaultStorage
 from pytz import UTC
-from lms.djangoapps.instructor_analytics.basic import enrolled_students_features, list_may_enroll
+from lms.djangoapps.instructor_analytics.basic import iter_enrolled_students_features, list_may_enroll
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
-from common.djangoapps.student.models import CourseEnrollment  # lint-amnesty, pylint: disable=unused-import
+from common.djangoapps.student.models import CourseEnrollment, CourseEnrollmentState
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store  # lint-amnesty, pylint: disable=unused-import
+from .utils import upload_csv_file_to_report_store, upload_csv_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 FILTERED_OUT_ROLES = ['staff', 'instructor', 'finance_admin', 'sales_admin']
+# Number of enrollments loaded at once, and between task progress updates, when sending bulk enrollment events
+BULK_ENROLLMENT_EVENTS_BATCH_SIZE = 500
 
 
 def upload_may_enroll_csv(_xblock_instance_args, _entry_id, course_id, task_input, action_name):
@@ -64,22 +71,69 @@ def upload_students_csv(_xblock_instance_args, _entry_id, course_id, task_input,
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # compute the student features table and write it to a temporary file as it is computed
     query_features = task_input.get('features')
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
+    with TemporaryFile('r+') as csv_file:
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow([str(feature) for feature in query_features])
+        for student in iter_enrolled_students_features(course_id, query_features):
+            __, rows = format_dictlist([student], query_features)
+            csv_writer.writerow([str(item) for item in rows[0]])
+            task_progress.attempted += 1
+
+        task_progress.succeeded = task_progress.attempted
+        task_progress.skipped = task_progress.total - task_progress.attempted
+
+        current_step = {'step': 'Uploading CSV'}
+        task_progress.update_task_state(extra_meta=current_step)
+
+        # Perform the upload
+        upload_parent_dir = task_input.get('upload_parent_dir', '')
+        upload_filename = task_input.get('filename', 'student_profile_info')
+        csv_file.seek(0)
+        upload_csv_file_to_report_store(csv_file, upload_filename, course_id, start_date, parent_dir=upload_parent_dir)
 
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
+    return task_progress.update_task_state(extra_meta=current_step)
 
-    rows.insert(0, header)
 
-    current_step = {'step': 'Uploading CSV'}
-    task_progress.update_task_state(extra_meta=current_step)
+def send_bulk_enrollment_events_for_course(_xblock_instance_args, _entry_id, course_id, task_input, action_name):
+    """
+    For a given `course_id`, emit the signals and events of the enrollments written by
+    `CourseEnrollment.bulk_enroll`, which are listed in the JSON file `task_input['file_name']`
+    as [enrollment id, previous mode, previous activation] lists.
+    """
+    start_time = time()
+    storage = DefaultStorage()
+    with storage.open(task_input['file_name']) as changes_file:
+        changes = json.load(changes_file)
 
-    # Perform the upload
-    upload_parent_dir = task_input.get('upload_parent_dir', '')
-    upload_filename = task_input.get('filename', 'student_profile_info')
-    upload_csv_to_report_store(rows, upload_filename, course_id, start_date, parent_dir=upload_parent_dir)
+    task_progress = TaskProgress(action_name, len(changes), start_time)
+    current_step = {'step': 'Sending enrollment events'}
+    task_progress.update_task_state(extra_meta=current_step)
 
+    for index in range(0, len(changes), BULK_ENROLLMENT_EVENTS_BATCH_SIZE):
+        batch = changes[index:index + BULK_ENROLLMENT_EVENTS_BATCH_SIZE]
+        enrollments = CourseEnrollment.objects.filter(
+            course_id=course_id,
+            id__in=[enrollment_id for enrollment_id, __, __ in batch],
+        ).select_related('user', 'user__profile').in_bulk()
+        for enrollment_id, previous_mode, previous_is_active in batch:
+            task_progress.attempted += 1
+            enrollment = enrollments.get(enrollment_id)
+            if enrollment is None:
+                task_progress.skipped += 1
+                continue
+            previous_state = None
+            if previous_mode is not None:
+                previous_state = CourseEnrollmentState(previous_mode, previous_is_active)
+            try:
+                enrollment.send_bulk_enrollment_events(previous_state)
+            except Exception:  # pylint: disable=broad-except
+                TASK_LOG.exception('Failed to send the events of enrollment %s in course %s', enrollment_id, course_id)
+                task_progress.failed += 1
+            else:
+                task_progress.succeeded += 1
+        task_progress.update_task_state(extra_meta=current_step)
+
+    storage.delete(task_input['file_name'])
     return task_progress.update_task_state(extra_meta=current_step)
@@ -905,7 +905,7 @@ class ProblemResponses:
                     # human-readable formatting for user state.
                     if hasattr(block, 'generate_report_data'):
                         try:
-                            user_state_iterator = user_state_client.iter_all_for_block(block_key)
+                            user_state_iterator = user_state_client.iter_all_for_block(block_key, stream=True)
                             for username, state in block.generate_report_data(user_state_iterator, max_count):
                                 generated_report_data[username].append(state)
                         except NotImplementedError:
@@ -1303,14 +1303,16 @@ class TestStudentReport(TestReportMixin, InstructorTaskCourseTestCase):
         self.create_student('student', 'student@example.com')
         directory_name = 'test_dir'
         task_input = {'features': [], 'upload_parent_dir': directory_name}
-        patched_upload = patch('lms.djangoapps.instructor_task.tasks_helper.enrollments.upload_csv_to_report_store')
+        patched_upload = patch(
+            'lms.djangoapps.instructor_task.tasks_helper.enrollments.upload_csv_file_to_report_store'
+        )
 
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
             with patched_upload as mock_upload_report:
                 upload_students_csv(None, None, self.course.id, task_input, 'calculated')
 
         mock_upload_report.assert_called_once_with(
-            [[], []],
+            ANY,
             'student_profile_info',
             self.course.id,
             ANY,
@@ -1321,13 +1323,15 @@ class TestStudentReport(TestReportMixin, InstructorTaskCourseTestCase):
         self.create_student('student', 'student@example.com')
         filename = "test_filename"
         task_input = {'features': [], 'filename': filename}
-        patched_upload = patch('lms.djangoapps.instructor_task.tasks_helper.enrollments.upload_csv_to_report_store')
+        patched_upload = patch(
+            'lms.djangoapps.instructor_task.tasks_helper.enrollments.upload_csv_file_to_report_store'
+        )
 
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
             with patched_upload as mock_upload_report:
                 upload_students_csv(None, None, self.course.id, task_input, 'calculated')
 
-        mock_upload_report.assert_called_once_with([[], []], filename, self.course.id, ANY, parent_dir='')
+        mock_upload_report.assert_called_once_with(ANY, filename, self.course.id, ANY, parent_dir='')
 
     @ddt.data(['student', 'student\xec'])
     def test_unicode_usernames(self, students):
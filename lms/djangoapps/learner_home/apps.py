@@ -0,0 +1,17 @@
+"""
+Django AppConfig module for the Learner Home app
+"""
+
+
+from django.apps import AppConfig
+
+
+class LearnerHomeConfig(AppConfig):
+    """
+    Django AppConfig class for the learner home app
+    """
+    name = 'lms.djangoapps.learner_home'
+
+    def ready(self):
+        # Import signals to wire up the signal handlers contained within
+        from lms.djangoapps.learner_home import signals  # pylint: disable=unused-import
@@ -0,0 +1,146 @@
+"""
+Collectors gather the independent pieces of data the learner home is built from.
+
+A collector is a named function of the results of the collectors it depends on. Collectors
+whose dependencies are met run concurrently on a bounded, process-wide thread pool when
+LEARNER_HOME_COLLECTOR_WORKERS is set, and in sequence otherwise.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from crum import get_current_request, set_current_request
+from django.conf import settings
+from django.db import connections
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class Collector:
+    """
+    A named step of the learner home data gathering.
+
+    Arguments:
+        name (str): The name the result of the collector is stored under.
+        func (callable): Called with the dict of the results collected so far, in which the
+            results of the collectors in `depends_on` are guaranteed to be present.
+        depends_on (tuple of str): The names of the collectors which must run first.
+    """
+
+    def __init__(self, name, func, depends_on=()):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+    def __repr__(self):
+        return f"Collector({self.name!r}, depends_on={self.depends_on!r})"
+
+
+def _get_executor():
+    """
+    Returns the thread pool collectors run on, creating it on first use.
+    """
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.LEARNER_HOME_COLLECTOR_WORKERS,
+                thread_name_prefix="learner-home-collector",
+            )
+        return _executor
+
+
+def _check_dependencies(collectors):
+    """
+    Raises a ValueError if collectors have duplicate names, unknown or circular dependencies.
+    """
+    names = [collector.name for collector in collectors]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate collector names in {names}")
+    by_name = {collector.name: collector for collector in collectors}
+    for collector in collectors:
+        unknown = set(collector.depends_on) - set(by_name)
+        if unknown:
+            raise ValueError(f"{collector} depends on unknown collectors {sorted(unknown)}")
+
+    resolved = set()
+    remaining = list(collectors)
+    while remaining:
+        ready = [collector for collector in remaining if resolved.issuperset(collector.depends_on)]
+        if not ready:
+            raise ValueError(f"Circular dependencies between collectors {remaining}")
+        resolved.update(collector.name for collector in ready)
+        remaining = [collector for collector in remaining if collector.name not in resolved]
+
+
+def _timed_call(collector, results):
+    """
+    Runs the collector, returning its result and how long it took in milliseconds.
+    """
+    start = time.perf_counter()
+    result = collector.func(results)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _timed_call_in_worker(collector, results, request):
+    """
+    Runs the collector on a pool thread, as if it ran in the thread handling `request`.
+
+    Pool threads are reused across requests, so the request cache they filled and the
+    database connections they opened are dropped once the collector is done.
+    """
+    set_current_request(request)
+    try:
+        return _timed_call(collector, results)
+    finally:
+        set_current_request(None)
+        RequestCache.clear_all_namespaces()
+        connections.close_all()
+
+
+def run_collectors(collectors):
+    """
+    Runs the collectors once their dependencies are collected, and returns their results by name.
+
+    The duration of each collector is recorded as a `learner_home.collector.<name>_ms`
+    custom monitoring attribute. The first exception raised by a collector is re-raised.
+    """
+    _check_dependencies(collectors)
+    results = {}
+    durations = {}
+    pending = list(collectors)
+
+    if not settings.LEARNER_HOME_COLLECTOR_WORKERS:
+        while pending:
+            collector = next(collector for collector in pending if results.keys() >= set(collector.depends_on))
+            pending.remove(collector)
+            results[collector.name], durations[collector.name] = _timed_call(collector, results)
+    else:
+        executor = _get_executor()
+        request = get_current_request()
+        running = {}
+        try:
+            while pending or running:
+                for collector in [collector for collector in pending if results.keys() >= set(collector.depends_on)]:
+                    pending.remove(collector)
+                    # Give each collector its own copy, as results are added while it runs.
+                    future = executor.submit(_timed_call_in_worker, collector, dict(results), request)
+                    running[future] = collector.name
+                done, __ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name], durations[name] = future.result()
+        finally:
+            for future in running:
+                future.cancel()
+
+    for name, duration in durations.items():
+        monitoring_utils.set_custom_attribute(f"learner_home.collector.{name}_ms", round(duration))
+    return results
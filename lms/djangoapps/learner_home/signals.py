@@ -0,0 +1,39 @@
+"""
+Signal handlers invalidating the cached results of learner home collectors
+"""
+from completion.models import BlockCompletion
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.djangoapps.entitlements.models import CourseEntitlement
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.signals import ENROLL_STATUS_CHANGE
+from lms.djangoapps.learner_home.utils import PROGRAM_UUIDS_CACHE_KEY_TPL, RESUME_URL_CACHE_KEY_TPL
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+@receiver(post_save, sender=CourseEntitlement)
+@receiver(post_delete, sender=CourseEntitlement)
+def invalidate_program_uuids(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the programs of a user when their enrollments or entitlements change
+    """
+    cache.delete(PROGRAM_UUIDS_CACHE_KEY_TPL.format(user_id=instance.user_id))
+
+
+@receiver(ENROLL_STATUS_CHANGE)
+def invalidate_program_uuids_on_enroll_status_change(sender, user, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the programs of a user when their enrollments change without being saved one by one
+    """
+    cache.delete(PROGRAM_UUIDS_CACHE_KEY_TPL.format(user_id=user.id))
+
+
+@receiver(post_save, sender=BlockCompletion)
+def invalidate_resume_url(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the resume URL of a course when the user completes one of its blocks
+    """
+    cache.delete(RESUME_URL_CACHE_KEY_TPL.format(user_id=instance.user_id, course_id=instance.context_key))
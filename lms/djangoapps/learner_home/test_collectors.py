@@ -0,0 +1,82 @@
+"""
+Tests for the Learner Home collectors
+"""
+
+import threading
+from unittest.mock import patch
+
+import ddt
+from django.test import TestCase, override_settings
+
+from lms.djangoapps.learner_home.collectors import Collector, run_collectors
+
+
+@ddt.ddt
+class TestRunCollectors(TestCase):
+    """Tests for run_collectors"""
+
+    def _collectors(self):
+        """A diamond of collectors: enrollments depends on orgs, and home on both"""
+        return [
+            Collector(
+                "home",
+                lambda results: (results["orgs"], results["enrollments"]),
+                depends_on=("orgs", "enrollments"),
+            ),
+            Collector(
+                "enrollments",
+                lambda results: [f"{org}-course" for org in results["orgs"]],
+                depends_on=("orgs",),
+            ),
+            Collector("orgs", lambda results: ["edX"]),
+        ]
+
+    @ddt.data(0, 2)
+    def test_results(self, workers):
+        with override_settings(LEARNER_HOME_COLLECTOR_WORKERS=workers):
+            results = run_collectors(self._collectors())
+
+        assert results == {
+            "orgs": ["edX"],
+            "enrollments": ["edX-course"],
+            "home": (["edX"], ["edX-course"]),
+        }
+
+    @override_settings(LEARNER_HOME_COLLECTOR_WORKERS=2)
+    def test_independent_collectors_run_concurrently(self):
+        # Each collector waits for the other to start, which only works if they run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+        collectors = [
+            Collector("first", lambda results: barrier.wait() is not None),
+            Collector("second", lambda results: barrier.wait() is not None),
+        ]
+
+        assert run_collectors(collectors) == {"first": True, "second": True}
+
+    @ddt.data(0, 2)
+    def test_exception(self, workers):
+        def fail(results):
+            raise ValueError("collector failed")
+
+        with override_settings(LEARNER_HOME_COLLECTOR_WORKERS=workers):
+            with self.assertRaisesRegex(ValueError, "collector failed"):
+                run_collectors([Collector("failing", fail), Collector("dependent", dict, depends_on=("failing",))])
+
+    @ddt.data(
+        [Collector("a", dict), Collector("a", dict)],
+        [Collector("a", dict, depends_on=("b",))],
+        [Collector("a", dict, depends_on=("b",)), Collector("b", dict, depends_on=("a",))],
+    )
+    def test_invalid_dependencies(self, collectors):
+        with self.assertRaises(ValueError):
+            run_collectors(collectors)
+
+    @patch("lms.djangoapps.learner_home.collectors.monitoring_utils.set_custom_attribute")
+    def test_timing(self, mock_set_custom_attribute):
+        run_collectors(self._collectors())
+
+        assert sorted(call.args[0] for call in mock_set_custom_attribute.call_args_list) == [
+            "learner_home.collector.enrollments_ms",
+            "learner_home.collector.home_ms",
+            "learner_home.collector.orgs_ms",
+        ]
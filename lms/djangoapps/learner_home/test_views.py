@@ -9,6 +9,8 @@ from urllib.parse import urlencode
 from uuid import uuid4
 
 import ddt
+from completion.models import BlockCompletion
+from completion.test_utils import CompletionWaffleTestMixin
 from django.conf import settings
 from django.urls import reverse
 from django.utils import timezone
@@ -41,6 +43,7 @@ from lms.djangoapps.learner_home.views import (
     get_entitlements,
     get_social_share_settings,
     get_course_share_urls,
+    get_resume_urls_for_course_enrollments,
 )
 from openedx.core.djangoapps.catalog.tests.factories import (
     CourseFactory as CatalogCourseFactory,
@@ -183,6 +186,35 @@ class TestGetEnrollments(SharedModuleStoreTestCase):
         self.assertEqual(course_mode_info, {})
 
 
+class TestGetResumeUrls(CompletionWaffleTestMixin, SharedModuleStoreTestCase):
+    """Tests for get_resume_urls_for_course_enrollments"""
+
+    def setUp(self):
+        super().setUp()
+        self.override_waffle_switch(True)
+        self.user = UserFactory()
+        self.enrollment = create_test_enrollment(self.user)
+
+    def test_cached_until_completion(self):
+        # Given a course the user hasn't started
+        assert get_resume_urls_for_course_enrollments(self.user, [self.enrollment]) == {
+            self.enrollment.course_id: None
+        }
+
+        # When the user completes a block
+        block_key = self.enrollment.course_id.make_usage_key("html", "resume_here")
+        BlockCompletion.objects.submit_completion(self.user, block_key, 1.0)
+
+        # Then the cached resume URL is replaced by a URL to the block
+        resume_urls = get_resume_urls_for_course_enrollments(self.user, [self.enrollment])
+        assert str(block_key) in resume_urls[self.enrollment.course_id]
+
+        # ... which is cached
+        with patch("lms.djangoapps.learner_home.views.get_key_to_last_completed_block") as mock_get_key:
+            assert get_resume_urls_for_course_enrollments(self.user, [self.enrollment]) == resume_urls
+        mock_get_key.assert_not_called()
+
+
 class TestGetEntitlements(SharedModuleStoreTestCase):
     """Tests for get_entitlements"""
 
@@ -18,6 +18,11 @@ from openedx.features.course_experience.url_helpers import get_learning_mfe_home
 log = logging.getLogger(__name__)
 User = get_user_model()
 
+# Cache keys of the per-user results of expensive learner home collectors, which are
+# invalidated by the signal handlers in lms.djangoapps.learner_home.signals
+PROGRAM_UUIDS_CACHE_KEY_TPL = "learner_home.program_uuids.{user_id}"
+RESUME_URL_CACHE_KEY_TPL = "learner_home.resume_url.{user_id}.{course_id}"
+
 
 def get_masquerade_user(request):
     """
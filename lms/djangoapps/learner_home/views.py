@@ -8,6 +8,7 @@ from collections import OrderedDict
 from completion.exceptions import UnavailableCompletionData
 from completion.utilities import get_key_to_last_completed_block
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 from edx_django_utils import monitoring as monitoring_utils
 from edx_django_utils.monitoring import function_trace
@@ -46,14 +47,18 @@ from lms.djangoapps.bulk_email.models_api import is_bulk_email_feature_enabled
 from lms.djangoapps.commerce.utils import EcommerceService
 from lms.djangoapps.courseware.access import administrative_accesses_to_course_for_user
 from lms.djangoapps.courseware.access_utils import check_course_open_for_learner
+from lms.djangoapps.learner_home.collectors import Collector, run_collectors
 from lms.djangoapps.learner_home.serializers import (
     LearnerDashboardSerializer,
 )
 from lms.djangoapps.learner_home.utils import (
+    PROGRAM_UUIDS_CACHE_KEY_TPL,
+    RESUME_URL_CACHE_KEY_TPL,
     get_masquerade_user,
 )
+from openedx.core.djangoapps.catalog.utils import get_programs
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
-from openedx.core.djangoapps.programs.utils import ProgramProgressMeter
+from openedx.core.djangoapps.programs.utils import ProgramProgressMeter, attach_program_detail_url
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.lib.api.authentication import BearerAuthenticationAllowInactiveUser
 from openedx.features.course_duration_limits.access import (
@@ -262,9 +267,22 @@ def get_resume_urls_for_course_enrollments(user, course_enrollments):
     """
     Modeled off of get_resume_urls_for_enrollments but removes check for actual presence of block
     in course structure for better performance.
+
+    URLs are cached per user and course until the user completes a block of the course.
     """
+    cache_keys = {
+        enrollment.course_id: RESUME_URL_CACHE_KEY_TPL.format(user_id=user.id, course_id=enrollment.course_id)
+        for enrollment in course_enrollments
+    }
+    cached_urls = cache.get_many(list(cache_keys.values()))
+    urls_to_cache = {}
     resume_course_urls = OrderedDict()
     for enrollment in course_enrollments:
+        cache_key = cache_keys[enrollment.course_id]
+        if cache_key in cached_urls:
+            # An empty URL is cached for courses the user hasn't started
+            resume_course_urls[enrollment.course_id] = cached_urls[cache_key] or None
+            continue
         url_to_block = None
         try:
             block_key = get_key_to_last_completed_block(user, enrollment.course_id)
@@ -277,6 +295,9 @@ def get_resume_urls_for_course_enrollments(user, course_enrollments):
             # This is acceptable, the user hasn't started the course so jump URL will be None
             pass
         resume_course_urls[enrollment.course_id] = url_to_block
+        urls_to_cache[cache_key] = url_to_block or ""
+    if urls_to_cache:
+        cache.set_many(urls_to_cache, settings.LEARNER_HOME_CACHE_TIMEOUT)
     return resume_course_urls
 
 
@@ -342,16 +363,40 @@ def get_course_programs(user, course_enrollments, site):
     """
     Get programs related to the courses the user is enrolled in.
 
+    The UUIDs of the programs are cached per user and site until the enrollments or
+    entitlements of the user change, and the programs are read from the catalog cache.
+
     Returns: {
         str(<course_id>): {
             "programs": [list of programs]
         }
     }
     """
-    meter = ProgramProgressMeter(
-        site, user, enrollments=course_enrollments, include_course_entitlements=True
-    )
-    return meter.invert_programs()
+    cache_key = PROGRAM_UUIDS_CACHE_KEY_TPL.format(user_id=user.id)
+    program_uuids_by_site = cache.get(cache_key) or {}
+    program_uuids = program_uuids_by_site.get(site.id)
+
+    if program_uuids is None:
+        meter = ProgramProgressMeter(
+            site, user, enrollments=course_enrollments, include_course_entitlements=True
+        )
+        inverted_programs = meter.invert_programs()
+        program_uuids_by_site[site.id] = {
+            key: [program["uuid"] for program in programs]
+            for key, programs in inverted_programs.items()
+        }
+        cache.set(cache_key, program_uuids_by_site, settings.LEARNER_HOME_CACHE_TIMEOUT)
+        return inverted_programs
+
+    uuids = {uuid for uuids in program_uuids.values() for uuid in uuids}
+    programs_by_uuid = {
+        program["uuid"]: program
+        for program in attach_program_detail_url(get_programs(uuids=list(uuids)) if uuids else [])
+    }
+    return {
+        key: [programs_by_uuid[uuid] for uuid in uuids if uuid in programs_by_uuid]
+        for key, uuids in program_uuids.items()
+    }
 
 
 @function_trace("get_suggested_courses")
@@ -470,77 +515,135 @@ class InitializeView(APIView):  # pylint: disable=unused-argument
         else:
             return self._initialize(request.user)
 
-    def _initialize(self, user, is_masquerade=False):
+    def _get_collectors(self, user, is_masquerade):
         """
-        Load information required for displaying the learner home
+        Collectors for the information required for displaying the learner home
         """
-        # Determine if user needs to confirm email account
-        email_confirmation = get_user_account_confirmation_info(user)
-
-        # Gather info for enterprise dashboard
-        enterprise_customer = get_enterprise_customer(user, self.request, is_masquerade)
 
-        # Get site-wide social sharing config
-        social_share_settings = get_social_share_settings()
-
-        # Get platform-level settings
-        platform_settings = get_platform_settings()
+        def enrollments(results):
+            """The course enrollments, without their course mode info"""
+            return results["enrollments"][0]
+
+        return [
+            # Determine if user needs to confirm email account
+            Collector("email_confirmation", lambda results: get_user_account_confirmation_info(user)),
+            # Gather info for enterprise dashboard
+            Collector(
+                "enterprise_customer",
+                lambda results: get_enterprise_customer(user, self.request, is_masquerade),
+            ),
+            # Get site-wide social sharing config
+            Collector("social_share_settings", lambda results: get_social_share_settings()),
+            # Get platform-level settings
+            Collector("platform_settings", lambda results: get_platform_settings()),
+            # Get the org whitelist or the org blacklist for the current site
+            Collector("org_lists", lambda results: get_org_block_and_allow_lists()),
+            # Get entitlements and course overviews for serializing
+            Collector(
+                "entitlements",
+                lambda results: get_entitlements(user, *results["org_lists"]),
+                depends_on=("org_lists",),
+            ),
+            Collector(
+                "pseudo_session_course_overviews",
+                lambda results: get_course_overviews_for_pseudo_sessions(results["entitlements"][3]),
+                depends_on=("entitlements",),
+            ),
+            # Get enrollments
+            Collector(
+                "enrollments",
+                lambda results: get_enrollments(user, *results["org_lists"]),
+                depends_on=("org_lists",),
+            ),
+            # Get audit access deadlines
+            Collector(
+                "audit_access_deadlines",
+                lambda results: get_audit_access_deadlines(user, enrollments(results)),
+                depends_on=("enrollments",),
+            ),
+            # Get email opt-outs for student
+            Collector(
+                "email_settings",
+                lambda results: get_email_settings_info(user, enrollments(results)),
+                depends_on=("enrollments",),
+            ),
+            # Get grade passing status by course
+            Collector(
+                "grade_statuses",
+                lambda results: get_user_grade_passing_statuses(enrollments(results)),
+                depends_on=("enrollments",),
+            ),
+            # Get cert status by course
+            Collector(
+                "cert_statuses",
+                lambda results: get_cert_statuses(user, enrollments(results)),
+                depends_on=("enrollments",),
+            ),
+            # Determine view access for course, (for showing courseware link)
+            Collector(
+                "course_access_checks",
+                lambda results: check_course_access(user, enrollments(results)),
+                depends_on=("enrollments",),
+            ),
+            # Get programs related to the courses the user is enrolled in
+            Collector(
+                "programs",
+                lambda results: get_course_programs(user, enrollments(results), self.request.site),
+                depends_on=("enrollments",),
+            ),
+            # e-commerce info
+            Collector("ecommerce_payment_page", lambda results: get_ecommerce_payment_page(user)),
+            # Gather urls for course card resume buttons.
+            Collector(
+                "resume_button_urls",
+                lambda results: get_resume_urls_for_course_enrollments(user, enrollments(results)),
+                depends_on=("enrollments",),
+            ),
+            # Get suggested courses
+            Collector("suggested_courses", lambda results: get_suggested_courses().get("courses", [])),
+            # Get social media sharing config
+            Collector(
+                "course_share_urls",
+                lambda results: get_course_share_urls(enrollments(results)),
+                depends_on=("enrollments",),
+            ),
+            # Get credit availability
+            Collector(
+                "credit_statuses",
+                lambda results: get_credit_statuses(user, enrollments(results)),
+                depends_on=("enrollments",),
+            ),
+        ]
 
-        # Get the org whitelist or the org blacklist for the current site
-        site_org_whitelist, site_org_blacklist = get_org_block_and_allow_lists()
+    def _initialize(self, user, is_masquerade=False):
+        """
+        Load information required for displaying the learner home
+        """
+        results = run_collectors(self._get_collectors(user, is_masquerade))
 
-        # Get entitlements and course overviews for serializing
+        email_confirmation = results["email_confirmation"]
+        enterprise_customer = results["enterprise_customer"]
+        social_share_settings = results["social_share_settings"]
+        platform_settings = results["platform_settings"]
         (
             fulfilled_entitlements_by_course_key,
             unfulfilled_entitlements,
             course_entitlement_available_sessions,
             unfulfilled_entitlement_pseudo_sessions,
-        ) = get_entitlements(user, site_org_whitelist, site_org_blacklist)
-        pseudo_session_course_overviews = get_course_overviews_for_pseudo_sessions(
-            unfulfilled_entitlement_pseudo_sessions
-        )
-
-        # Get enrollments
-        course_enrollments, course_mode_info = get_enrollments(
-            user, site_org_whitelist, site_org_blacklist
-        )
-
-        # Get audit access deadlines
-        audit_access_deadlines = get_audit_access_deadlines(user, course_enrollments)
-
-        # Get email opt-outs for student
-        show_email_settings_for, course_optouts = get_email_settings_info(
-            user, course_enrollments
-        )
-
-        # Get grade passing status by course
-        grade_statuses = get_user_grade_passing_statuses(course_enrollments)
-
-        # Get cert status by course
-        cert_statuses = get_cert_statuses(user, course_enrollments)
-
-        # Determine view access for course, (for showing courseware link) involves:
-        course_access_checks = check_course_access(user, course_enrollments)
-
-        # Get programs related to the courses the user is enrolled in
-        programs = get_course_programs(user, course_enrollments, self.request.site)
-
-        # e-commerce info
-        ecommerce_payment_page = get_ecommerce_payment_page(user)
-
-        # Gather urls for course card resume buttons.
-        resume_button_urls = get_resume_urls_for_course_enrollments(
-            user, course_enrollments
-        )
-
-        # Get suggested courses
-        suggested_courses = get_suggested_courses().get("courses", [])
-
-        # Get social media sharing config
-        course_share_urls = get_course_share_urls(course_enrollments)
-
-        # Get credit availability
-        user_credit_statuses = get_credit_statuses(user, course_enrollments)
+        ) = results["entitlements"]
+        pseudo_session_course_overviews = results["pseudo_session_course_overviews"]
+        course_enrollments, course_mode_info = results["enrollments"]
+        audit_access_deadlines = results["audit_access_deadlines"]
+        show_email_settings_for, course_optouts = results["email_settings"]
+        grade_statuses = results["grade_statuses"]
+        cert_statuses = results["cert_statuses"]
+        course_access_checks = results["course_access_checks"]
+        programs = results["programs"]
+        ecommerce_payment_page = results["ecommerce_payment_page"]
+        resume_button_urls = results["resume_button_urls"]
+        suggested_courses = results["suggested_courses"]
+        course_share_urls = results["course_share_urls"]
+        user_credit_statuses = results["credit_statuses"]
 
         learner_dash_data = {
             "emailConfirmation": email_confirmation,
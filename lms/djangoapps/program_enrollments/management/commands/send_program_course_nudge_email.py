@@ -22,7 +22,7 @@ from common.djangoapps.track import segment
 from lms.djangoapps.grades.models import PersistentCourseGrade
 from openedx.core.constants import COURSE_PUBLISHED
 from openedx.core.djangoapps.catalog.utils import get_programs
-from openedx.core.djangoapps.programs.utils import ProgramProgressMeter
+from openedx.core.djangoapps.programs.utils import BatchProgramProgressMeter
 from openedx.features.enterprise_support.api import get_enterprise_learner_data_from_db
 
 User = get_user_model()
@@ -112,7 +112,7 @@ class Command(BaseCommand):
 
     def get_course_run_to_suggest(self, candidate_programs, completed_course_id, user):
         """
-        Finds out enrollable course run from programs Generated by ProgramProgressMeter.
+        Finds out enrollable course run from programs Generated by BatchProgramProgressMeter.
 
         Returns: Suggested program and course_run dicts
         """
@@ -242,9 +242,11 @@ class Command(BaseCommand):
             course_linked_programs = get_programs(course=completed_course_id)
             course_linked_programs = self.sort_programs(course_linked_programs)
             if course_linked_programs:
+                progress_by_user = BatchProgramProgressMeter(site, users, include_course_entitlements=False).progress(
+                    programs=course_linked_programs, count_only=False
+                )
                 for user in users:
-                    meter = ProgramProgressMeter(site=site, user=user, include_course_entitlements=False)
-                    programs_progress = meter.progress(programs=course_linked_programs, count_only=False)
+                    programs_progress = progress_by_user[user.id]
                     candidate_programs = self.get_candidate_programs(course_linked_programs, programs_progress)
                     suggested_program_progress, suggested_course_run, suggested_course = self.get_course_run_to_suggest(
                         candidate_programs, completed_course_id, user
@@ -15,7 +15,7 @@ from common.djangoapps.student.models import CourseEnrollment, anonymous_id_for_
 from common.djangoapps.student.roles import CourseInstructorRole, CourseStaffRole
 from lms.djangoapps.courseware.courses import has_access
 from lms.djangoapps.discussion.django_comment_client.utils import has_discussion_privileges
-from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership, TopicTeamCount
 from openedx.core.lib.teams_config import TeamsetType
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 
@@ -299,19 +299,32 @@ def get_teams_accessible_by_user(user, topic_id_set, course_id, organization_pro
 def add_team_count(user, topics, course_id, organization_protection_status):
     """
     Helper method to add team_count for a list of topics.
-    This allows for a more efficient single query.
+
+    The counts are read from the TopicTeamCount table in a single query. Only the teams of
+    private teamsets are counted from the teams, as they are hidden from learners who are
+    not on them.
     """
     topic_ids = [topic['id'] for topic in topics]
-    teams_query_set = get_teams_accessible_by_user(
-        user,
-        topic_ids,
-        course_id,
-        organization_protection_status
-    )
-
-    teams_per_topic = teams_query_set.values('topic_id').annotate(team_count=Count('topic_id'))
+    organization_protected = None
+    if organization_protection_status != OrganizationProtectionStatus.protection_exempt:
+        organization_protected = organization_protection_status == OrganizationProtectionStatus.protected
+    topics_to_team_count = TopicTeamCount.get_team_counts(course_id, topic_ids, organization_protected)
+
+    # Private teams should be hidden unless the student is a member, staff sees all of them
+    if not has_access(user, 'staff', course_id):
+        course_block = modulestore().get_course(course_id)
+        private_teamset_ids = [
+            ts.teamset_id for ts in course_block.teamsets if ts.is_private_managed and ts.teamset_id in topic_ids
+        ]
+        if private_teamset_ids:
+            filter_query = _get_team_filter_query(private_teamset_ids, course_id, organization_protection_status)
+            teams_per_topic = CourseTeam.objects.filter(
+                membership__user=user, **filter_query
+            ).values('topic_id').annotate(team_count=Count('topic_id'))
+            user_team_counts = {d['topic_id']: d['team_count'] for d in teams_per_topic}
+            for topic_id in private_teamset_ids:
+                topics_to_team_count[topic_id] = user_team_counts.get(topic_id, 0)
 
-    topics_to_team_count = {d['topic_id']: d['team_count'] for d in teams_per_topic}
     for topic in topics:
         topic['team_count'] = topics_to_team_count.get(topic['id'], 0)
 
@@ -6,20 +6,35 @@ import csv
 from collections import Counter
 
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
-from django.db.models import Prefetch
+from django.db import transaction
+from django.db.models import Count, Prefetch
 
-from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
+from common.djangoapps.student.roles import CourseInstructorRole, CourseStaffRole, RoleCache
+from lms.djangoapps.course_home_api.models import ProgressSnapshot
+from lms.djangoapps.courseware.courses import invalidate_course_assignments
 from lms.djangoapps.program_enrollments.models import ProgramCourseEnrollment
 from lms.djangoapps.teams.api import (
     ORGANIZATION_PROTECTED_MODES,
-    OrganizationProtectionStatus,
-    user_organization_protection_status,
-    user_protection_status_matches_team
+    OrganizationProtectionStatus
 )
-from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership, TopicTeamCount, utc_now
 
+from .errors import ElasticSearchConnectionError
+from .search_indexes import CourseTeamIndexer
 from .utils import emit_team_event
 
+# Number of rows looked up, inserted or deleted by each query of a team membership import
+IMPORT_BATCH_SIZE = 1000
+
+
+def _batches(items):
+    """
+    Yields the items of a list in batches of IMPORT_BATCH_SIZE.
+    """
+    for start in range(0, len(items), IMPORT_BATCH_SIZE):
+        yield items[start:start + IMPORT_BATCH_SIZE]
+
 
 def load_team_membership_csv(course, response):
     """
@@ -148,6 +163,10 @@ class TeamMembershipImportManager:
     """
     A manager class that is responsible the import process of csv file including validation and creation of
     team_courseteam and teams_courseteammembership objects.
+
+    The users of the file, their enrollments and the existing teams and memberships are loaded
+    upfront in a few queries, so that the whole file is validated in memory. The memberships are
+    then changed with bulk deletes and inserts.
     """
 
     def __init__(self, course):
@@ -156,7 +175,11 @@ class TeamMembershipImportManager:
         self.course = course
         self.max_errors = 0
         self.existing_course_team_memberships = {}
+        self.existing_course_team_membership_ids = {}
         self.existing_course_teams = {}
+        self.users_by_username = {}
+        self.user_enrollments = {}
+        self.course_staff_user_ids = set()
         self.user_count_by_team = Counter()
         self.user_enrollment_by_team = {}
         self.number_of_learners_assigned = 0
@@ -188,15 +211,17 @@ class TeamMembershipImportManager:
             return False
 
         self.teamset_ids = self.get_teamset_ids_from_reader(csv_reader)
+        rows = list(csv_reader)
         row_dictionaries = []
         csv_usernames = set()
 
-        # Get existing team membership data
+        # Get existing team membership data, and the users of the file
         self.load_course_team_memberships()
         self.load_course_teams()
+        self.load_users({row['username'] for row in rows if row['username']})
 
         # process student rows:
-        for row in csv_reader:
+        for row in rows:
             if not self.validate_teams_have_matching_teamsets(row):
                 return False
             username = row['username']
@@ -220,9 +245,7 @@ class TeamMembershipImportManager:
             return False
 
         if not self.validation_errors:
-            for row in row_dictionaries:
-                self.remove_user_from_team_for_reassignment(row)
-                self.add_user_to_team(row)
+            self.apply_team_memberships(row_dictionaries)
             self.number_of_learners_assigned = len(row_dictionaries)
             return True
         else:
@@ -232,10 +255,11 @@ class TeamMembershipImportManager:
         """
         Caches existing team memberships by (user_id, teamset_id)
         """
-        for membership in CourseTeamMembership.get_memberships(course_ids=[self.course.id]):
+        for membership in CourseTeamMembership.get_memberships(course_ids=[self.course.id]).select_related('team'):
             user_id = membership.user_id
             teamset_id = membership.team.topic_id
             self.existing_course_team_memberships[(user_id, teamset_id)] = membership.team
+            self.existing_course_team_membership_ids[(user_id, teamset_id)] = membership.id
 
     def load_course_teams(self):
         """
@@ -246,6 +270,31 @@ class TeamMembershipImportManager:
             self.existing_course_teams[(team.name, team.topic_id)] = team
             self.user_count_by_team[(team.topic_id, team.name)] = team.users.count()
 
+    def load_users(self, usernames):
+        """
+        Caches the users with the given usernames by lowercase username, their enrollments in the
+        course by user id, and the ids of the course staff
+        """
+        for usernames_batch in _batches(list(usernames)):
+            for user in User.objects.filter(username__in=usernames_batch):
+                self.users_by_username[user.username.lower()] = user
+
+        user_ids = [user.id for user in self.users_by_username.values()]
+        for user_ids_batch in _batches(user_ids):
+            enrollments = CourseEnrollment.objects.filter(
+                course_id=self.course.id, user_id__in=user_ids_batch,
+            ).values_list('user_id', 'mode', 'is_active')
+            for user_id, mode, is_active in enrollments:
+                self.user_enrollments[user_id] = (mode, is_active)
+
+        # Like has_course_staff_privileges, for all the users at once
+        staff_roles = RoleCache.get_roles(CourseStaffRole.ROLE) | RoleCache.get_roles(CourseInstructorRole.ROLE)
+        self.course_staff_user_ids = set(
+            CourseAccessRole.objects.filter(
+                course_id=self.course.id, org=self.course.id.org, role__in=staff_roles, user__is_active=True,
+            ).values_list('user_id', flat=True)
+        )
+
     def validate_header(self, csv_reader):
         """
         Validates header row to ensure that it contains at a minimum columns called 'username', 'mode'.
@@ -294,7 +343,7 @@ class TeamMembershipImportManager:
             user not enrolled in course
             enrollment mode from csv doesn't match actual user enrollment
         """
-        actual_enrollment_mode, user_enrolled = CourseEnrollment.enrollment_mode_for_user(user, self.course.id)
+        actual_enrollment_mode, user_enrolled = self.user_enrollments.get(user.id, (None, None))
         if not user_enrolled:
             self.validation_errors.append('User ' + user.username + ' is not enrolled in this course.')
             return False
@@ -397,9 +446,23 @@ class TeamMembershipImportManager:
         """
         try:
             team = self.existing_course_teams[(team_name, teamset_id)]
-            return user_protection_status_matches_team(user, team)
         except KeyError:
             return True
+        protection_status = self.get_protection_status(user)
+        if protection_status == OrganizationProtectionStatus.protection_exempt:
+            return True
+        return protection_status.is_protected == team.organization_protected
+
+    def get_protection_status(self, user):
+        """
+        Returns the organization protection status of a user whose enrollment is valid, as
+        user_organization_protection_status does, from the loaded enrollments and course staff.
+        """
+        if user.is_staff or user.id in self.course_staff_user_ids:
+            return OrganizationProtectionStatus.protection_exempt
+        if self.user_to_actual_enrollment_mode[user.id] in ORGANIZATION_PROTECTED_MODES:
+            return OrganizationProtectionStatus.protected
+        return OrganizationProtectionStatus.unprotected
 
     def is_FERPA_bubble_breached(self, teamset_id, team_name):
         """
@@ -448,61 +511,112 @@ class TeamMembershipImportManager:
 
         return True
 
-    def remove_user_from_team_for_reassignment(self, row):
-        """
-        Remove a user from a team if:
-        a. The user's current team is different from the team specified in csv for the same teamset (this user will
-           then be assigned to a new team in 'add_user_to_team`.
-        b. The team value in the CSV is blank - the user should be removed from the current team in teamset.
-        Also, if there is no change in user's membership, the input row's team name will be nulled out so that no
-        action will take place further in the processing chain.
-        """
-        user = row['user_model']
-        for ts_id in self.teamset_ids:
-            if row[ts_id] is None:
-                # remove this student from the teamset
-                try:
-                    self._remove_user_from_teamset_and_emit_signal(user.id, ts_id, self.course.id)
-                except CourseTeamMembership.DoesNotExist:
-                    pass
-            else:
-                # reassignment happens only if proposed team membership is different from existing team membership
-                if (user.id, ts_id) in self.existing_course_team_memberships:
-                    current_user_teams_name = self.existing_course_team_memberships[user.id, ts_id].name
-                    if current_user_teams_name != row[ts_id]:
-                        try:
-                            self._remove_user_from_teamset_and_emit_signal(user.id, ts_id, self.course.id)
-                            del self.existing_course_team_memberships[user.id, ts_id]
-                        except CourseTeamMembership.DoesNotExist:
-                            pass
-                    else:
-                        # the user will remain in the same team. In order to avoid validation/attempting
-                        # to readd the user, null out the team name
-                        row[ts_id] = None
-
-    def _remove_user_from_teamset_and_emit_signal(self, user_id, ts_id, course_id):
-        """
-        If a team membership exists for the specified user, in the specified course and teamset, delete it.
-        This removes the user from the team.
-        Then, emit an event.
-
-        If the membership doesn't exist, don't emit the event and instead raise CourseTeamMembership.DoesNotExist
-        """
-        membership = CourseTeamMembership.objects.select_related('team').get(
-            user_id=user_id,
-            team__topic_id=ts_id,
-            team__course_id=course_id
-        )
-        membership.delete()
-        emit_team_event(
-            'edx.team.learner_removed',
-            course_id,
-            {
-                'team_id': membership.team.team_id,
-                'user_id': membership.user_id,
-                'remove_method': 'team_csv_import'
-            }
-        )
+    def apply_team_memberships(self, rows):
+        """
+        Applies the team memberships of validated rows in bulk.
+
+        The memberships which change are deleted, the missing teams are created and the new
+        memberships are inserted. Then the size of each affected team is updated and they are
+        reindexed together, the cached assignments and progress of the affected learners are
+        invalidated, and the events of the learners removed from and added to teams are emitted.
+        """
+        removals = []
+        additions = []
+        new_teams = {}
+        for row in rows:
+            user = row['user_model']
+            for teamset_id in self.teamset_ids:
+                team_name = row[teamset_id]
+                current_team = self.existing_course_team_memberships.get((user.id, teamset_id))
+                if current_team is not None:
+                    if current_team.name == team_name:
+                        continue
+                    membership_id = self.existing_course_team_membership_ids[(user.id, teamset_id)]
+                    removals.append((membership_id, current_team, user.id))
+                if not team_name:
+                    continue
+                additions.append((user, team_name, teamset_id))
+                if (team_name, teamset_id) in self.existing_course_teams:
+                    continue
+                if (team_name, teamset_id) not in new_teams:
+                    new_teams[(team_name, teamset_id)] = CourseTeam.create(
+                        name=team_name,
+                        course_id=self.course.id,
+                        description='Import from csv',
+                        topic_id=teamset_id,
+                    )
+                if self.get_protection_status(user) == OrganizationProtectionStatus.protected:
+                    new_teams[(team_name, teamset_id)].organization_protected = True
+
+        now = utc_now()
+        with transaction.atomic():
+            for membership_ids in _batches([membership_id for membership_id, __, __ in removals]):
+                CourseTeamMembership.objects.filter(id__in=membership_ids).delete()
+
+            # bulk_create doesn't set the ids of the new teams on every database, so they are read back.
+            CourseTeam.objects.bulk_create(new_teams.values(), batch_size=IMPORT_BATCH_SIZE)
+            for team_ids in _batches([team.team_id for team in new_teams.values()]):
+                for team in CourseTeam.objects.filter(team_id__in=team_ids):
+                    self.existing_course_teams[(team.name, team.topic_id)] = team
+            # bulk_create doesn't send post_save either, so the new teams are counted here.
+            new_team_counts = Counter((team.topic_id, team.organization_protected) for team in new_teams.values())
+            for (teamset_id, organization_protected), team_count in sorted(new_team_counts.items()):
+                TopicTeamCount.add(self.course.id, teamset_id, organization_protected, team_count)
+
+            memberships = [
+                CourseTeamMembership(
+                    user=user, team=self.existing_course_teams[(team_name, teamset_id)], last_activity_at=now,
+                )
+                for user, team_name, teamset_id in additions
+            ]
+            CourseTeamMembership.objects.bulk_create(memberships, batch_size=IMPORT_BATCH_SIZE)
+
+            affected_teams = {team.id: team for __, team, __ in removals}
+            affected_teams.update((membership.team.id, membership.team) for membership in memberships)
+            for team_ids in _batches(list(affected_teams)):
+                team_sizes = CourseTeamMembership.objects.filter(
+                    team_id__in=team_ids,
+                ).values('team_id').annotate(size=Count('id')).values_list('team_id', 'size')
+                for team_id in team_ids:
+                    affected_teams[team_id].team_size = 0
+                for team_id, team_size in team_sizes:
+                    affected_teams[team_id].team_size = team_size
+            CourseTeam.objects.bulk_update(affected_teams.values(), ['team_size'], batch_size=IMPORT_BATCH_SIZE)
+
+        # bulk_create doesn't send post_save, so the data cached from the team partition groups of
+        # the learners is invalidated here.
+        affected_user_ids = {user_id for __, __, user_id in removals}
+        affected_user_ids.update(membership.user.id for membership in memberships)
+        for user_id in affected_user_ids:
+            invalidate_course_assignments(user_id, self.course.id)
+        for user_ids in _batches(list(affected_user_ids)):
+            ProgressSnapshot.invalidate_many(user_ids, self.course.id)
+
+        try:
+            CourseTeamIndexer.index_many(list(affected_teams.values()))
+        except ElasticSearchConnectionError:
+            pass
+
+        for __, team, user_id in removals:
+            emit_team_event(
+                'edx.team.learner_removed',
+                self.course.id,
+                {
+                    'team_id': team.team_id,
+                    'user_id': user_id,
+                    'remove_method': 'team_csv_import'
+                }
+            )
+        for membership in memberships:
+            emit_team_event(
+                'edx.team.learner_added',
+                self.course.id,
+                {
+                    'team_id': membership.team.team_id,
+                    'user_id': membership.user.id,
+                    'add_method': 'team_csv_import'
+                }
+            )
 
     def add_error_and_check_if_max_exceeded(self, error_message):
         """
@@ -514,50 +628,12 @@ class TeamMembershipImportManager:
         self.validation_errors.append(error_message)
         return len(self.validation_errors) >= self.max_errors
 
-    def add_user_to_team(self, user_row):
-        """
-        Creates a CourseTeamMembership entry - i.e: a relationship between a user and a team.
-        user_row is a dictionary where key is column name and value is the row value.
-        {'mode': ' masters','topic_0': '','topic_1': 'team 2','topic_2': None,'user_model': <user_obj>}
-         andrew,masters,team1,,team3
-        joe,masters,,team2,team3
-        """
-        user = user_row['user_model']
-        for teamset_id in self.teamset_ids:
-            team_name = user_row[teamset_id]
-            if not team_name:
-                continue
-            if (team_name, teamset_id) not in self.existing_course_teams:
-                protection_status = user_organization_protection_status(user, self.course.id)
-                team = CourseTeam.create(
-                    name=team_name,
-                    course_id=self.course.id,
-                    description='Import from csv',
-                    topic_id=teamset_id,
-                    organization_protected=protection_status == OrganizationProtectionStatus.protected
-                )
-                team.save()
-                self.existing_course_teams[(team_name, teamset_id)] = team
-            else:
-                team = self.existing_course_teams[(team_name, teamset_id)]
-            team.add_user(user)
-            emit_team_event(
-                'edx.team.learner_added',
-                team.course_id,
-                {
-                    'team_id': team.team_id,
-                    'user_id': user.id,
-                    'add_method': 'team_csv_import'
-                }
-            )
-
     def get_user(self, username):
         """
-        Gets the user object from user_name/email/locator
+        Gets the user object from the users loaded by `load_users`
         user_name: the user_name/email/user locator
         """
-        try:
-            return User.objects.get(username=username)
-        except User.DoesNotExist:
+        user = self.users_by_username.get(username.lower())
+        if user is None:
             self.validation_errors.append('User ' + username + ' does not exist.')
-            return None
+        return user
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.16 on 2026-10-19 12:00
+
+from django.db import migrations, models
+from django.db.models import Count
+import opaque_keys.edx.django.models
+
+
+def count_topic_teams(apps, schema_editor):
+    CourseTeam = apps.get_model('teams', 'CourseTeam')
+    TopicTeamCount = apps.get_model('teams', 'TopicTeamCount')
+    db_alias = schema_editor.connection.alias
+    team_counts = CourseTeam.objects.using(db_alias).values(
+        'course_id', 'topic_id', 'organization_protected'
+    ).annotate(team_count=Count('id')).order_by()
+    TopicTeamCount.objects.using(db_alias).bulk_create(
+        (TopicTeamCount(**team_count) for team_count in team_counts.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0004_alter_defaults'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopicTeamCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255)),
+                ('topic_id', models.CharField(max_length=255)),
+                ('organization_protected', models.BooleanField()),
+                ('team_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('course_id', 'topic_id', 'organization_protected')},
+            },
+        ),
+        migrations.RunPython(count_topic_teams, migrations.RunPython.noop),
+    ]
@@ -3,13 +3,16 @@ Django models related to teams functionality.
 """
 
 
+from collections import defaultdict
 from datetime import datetime
 from uuid import uuid4
 
 import pytz
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from django.utils.text import slugify
@@ -362,3 +365,101 @@ class CourseTeamMembership(models.Model):
         except ObjectDoesNotExist:
             return False
         return True
+
+
+class TopicTeamCount(models.Model):
+    """
+    The number of teams of a topic in a course, with or without organization protection.
+
+    The counts are kept up to date when teams are saved or deleted, so that topic listings
+    read them instead of counting the teams of each topic.
+
+    .. no_pii:
+    """
+
+    class Meta:
+        app_label = "teams"
+        unique_together = (('course_id', 'topic_id', 'organization_protected'),)
+
+    course_id = CourseKeyField(max_length=255)
+    topic_id = models.CharField(max_length=255)
+    organization_protected = models.BooleanField()
+    team_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.team_count} teams in topic {self.topic_id} of {self.course_id}"
+
+    @classmethod
+    def add(cls, course_id, topic_id, organization_protected, delta):
+        """
+        Add `delta` to the number of teams of a topic of a course with the given organization protection.
+
+        Args:
+            course_id (CourseKey): The course of the topic.
+            topic_id (str): The id of the topic.
+            organization_protected (bool): The organization protection of the teams.
+            delta (int): The number of teams added, or removed when negative.
+        """
+        team_counts = cls.objects.filter(
+            course_id=course_id, topic_id=topic_id, organization_protected=organization_protected,
+        )
+        if team_counts.update(team_count=F('team_count') + delta) or delta <= 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    course_id=course_id,
+                    topic_id=topic_id,
+                    organization_protected=organization_protected,
+                    team_count=delta,
+                )
+        except IntegrityError:
+            # Another transaction created the count first.
+            team_counts.update(team_count=F('team_count') + delta)
+
+    @classmethod
+    def get_team_counts(cls, course_id, topic_ids, organization_protected=None):
+        """
+        Get the number of teams of the given topics of a course, keyed by topic id.
+
+        Args:
+            course_id (CourseKey): The course of the topics.
+            topic_ids (list of str): The ids of the topics.
+            organization_protected (bool, optional): Only count the teams with this
+              organization protection. All teams are counted when None.
+        """
+        queryset = cls.objects.filter(course_id=course_id, topic_id__in=topic_ids)
+        if organization_protected is not None:
+            queryset = queryset.filter(organization_protected=organization_protected)
+        team_counts = defaultdict(int)
+        for topic_id, team_count in queryset.values_list('topic_id', 'team_count'):
+            team_counts[topic_id] += team_count
+        return team_counts
+
+
+@receiver(post_save, sender=CourseTeam, dispatch_uid='teams.models.course_team_post_save_topic_team_count')
+def update_topic_team_count_on_save(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Count a team in the topic it was added to, or move it between topics.
+
+    Saving a team for another reason, such as a new team size, keeps the counts.
+    """
+    tracker = instance.field_tracker
+    if not created:
+        if not any(tracker.has_changed(field) for field in ('course_id', 'topic_id', 'organization_protected')):
+            return
+        TopicTeamCount.add(
+            tracker.previous('course_id'),
+            tracker.previous('topic_id'),
+            tracker.previous('organization_protected'),
+            -1,
+        )
+    TopicTeamCount.add(instance.course_id, instance.topic_id, instance.organization_protected, 1)
+
+
+@receiver(post_delete, sender=CourseTeam, dispatch_uid='teams.models.course_team_post_delete_topic_team_count')
+def update_topic_team_count_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Stop counting a deleted team in its topic.
+    """
+    TopicTeamCount.add(instance.course_id, instance.topic_id, instance.organization_protected, -1)
@@ -106,6 +106,15 @@ class CourseTeamIndexer:
         serialized_course_team = CourseTeamIndexer(course_team).data()
         search_engine.index([serialized_course_team])
 
+    @classmethod
+    @if_search_enabled
+    def index_many(cls, course_teams):
+        """
+        Update index with course_team objects at once (if feature is enabled).
+        """
+        if course_teams:
+            cls.engine().index([CourseTeamIndexer(course_team).data() for course_team in course_teams])
+
     @classmethod
     @if_search_enabled
     def remove(cls, course_team):
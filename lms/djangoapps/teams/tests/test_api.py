@@ -257,6 +257,23 @@ class PythonAPITests(SharedModuleStoreTestCase):
         assert len(result) == 1
         assert self.team3 in result
 
+    @ddt.data(('user1', 1), ('user3', 0))
+    @ddt.unpack
+    def test_add_team_count_private_teamset(self, username, expected_team_count):
+        """ Learners only count the teams of private teamsets they are on """
+        topic = {'id': TOPIC1}
+        teams_api.add_team_count(
+            getattr(self, username), [topic], COURSE_KEY1, teams_api.OrganizationProtectionStatus.unprotected
+        )
+        assert topic['team_count'] == expected_team_count
+
+    def test_add_team_count(self):
+        topics = [{'id': TOPIC2}, {'id': TOPIC3}, {'id': TOPIC4}, {'id': 'no-teams'}]
+        teams_api.add_team_count(
+            self.user3, topics, COURSE_KEY2, teams_api.OrganizationProtectionStatus.unprotected
+        )
+        assert [topic['team_count'] for topic in topics] == [2, 1, 1, 0]
+
 
 @ddt.ddt
 class TeamAccessTests(SharedModuleStoreTestCase):
@@ -1,8 +1,14 @@
 """ Tests for the functionality in csv """
 from csv import DictReader, DictWriter
 from io import BytesIO, StringIO, TextIOWrapper
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from common.djangoapps.student.tests.factories import CourseEnrollmentFactory, UserFactory
 from common.djangoapps.util.testing import EventTestMixin
+from lms.djangoapps.course_home_api.models import ProgressSnapshot
 from lms.djangoapps.program_enrollments.tests.factories import ProgramEnrollmentFactory, ProgramCourseEnrollmentFactory
 from lms.djangoapps.teams import csv
 from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
@@ -276,13 +282,12 @@ class TeamMembershipImportManagerTests(TeamMembershipEventTestMixin, SharedModul
         """Adding a masters learner to a new team should create a team with organization protected status"""
         masters_learner = UserFactory.create(username='masters_learner')
         CourseEnrollmentFactory.create(user=masters_learner, course_id=self.course.id, mode='masters')
-        row = {
-            'mode': 'masters',
-            'teamset_1': 'new_protected_team',
-            'user_model': masters_learner
-        }
+        csv_data = self._csv_reader_from_array([
+            ['username', 'mode', 'teamset_1'],
+            [masters_learner.username, 'masters', 'new_protected_team'],
+        ])
 
-        self.import_manager.add_user_to_team(row)
+        assert self.import_manager.set_team_memberships(csv_data)
         team = CourseTeam.objects.get(team_id__startswith='new_protected_team')
         assert team.organization_protected
         self.assert_learner_added_emitted(team.team_id, masters_learner.id)
@@ -291,13 +296,12 @@ class TeamMembershipImportManagerTests(TeamMembershipEventTestMixin, SharedModul
         """Adding a non-masters learner to a new team should create a team with no organization protected status"""
         audit_learner = UserFactory.create(username='audit_learner')
         CourseEnrollmentFactory.create(user=audit_learner, course_id=self.course.id, mode='audit')
-        row = {
-            'mode': 'audit',
-            'teamset_1': 'new_unprotected_team',
-            'user_model': audit_learner
-        }
+        csv_data = self._csv_reader_from_array([
+            ['username', 'mode', 'teamset_1'],
+            [audit_learner.username, 'audit', 'new_unprotected_team'],
+        ])
 
-        self.import_manager.add_user_to_team(row)
+        assert self.import_manager.set_team_memberships(csv_data)
         team = CourseTeam.objects.get(team_id__startswith='new_unprotected_team')
         assert not team.organization_protected
         self.assert_learner_added_emitted(team.team_id, audit_learner.id)
@@ -322,15 +326,15 @@ class TeamMembershipImportManagerTests(TeamMembershipEventTestMixin, SharedModul
         assert CourseTeamMembership.is_user_on_team(audit_learner, course_1_team)
 
         # When I try to remove them from the team
-        row = {
-            'mode': 'audit',
-            'teamset_1': None,
-            'user_model': audit_learner
-        }
-        self.import_manager.remove_user_from_team_for_reassignment(row)
+        csv_data = self._csv_reader_from_array([
+            ['username', 'mode', 'teamset_1'],
+            [audit_learner.username, 'audit', ''],
+        ])
+        assert self.import_manager.set_team_memberships(csv_data)
 
-        # They are successfully removed from the team
+        # They are successfully removed from the team, and only from the team of this course
         assert not CourseTeamMembership.is_user_on_team(audit_learner, course_1_team)
+        assert CourseTeamMembership.is_user_on_team(audit_learner, course_2_team)
         self.assert_learner_removed_emitted(course_1_team.team_id, audit_learner.id)
 
     def test_user_moved_to_another_team(self):
@@ -420,10 +424,7 @@ class TeamMembershipImportManagerTests(TeamMembershipEventTestMixin, SharedModul
             users.append(user)
 
         # When a team is already at/near capaciy
-        for i in range(3):
-            user = users[i]
-            row = {'user_model': user, 'teamset_1': 'team_1', 'mode': 'audit'}
-            self.import_manager.add_user_to_team(row)
+        csv_import(self.course, [_csv_dict_row(users[i].username, '', 'audit', teamset_1='team_1') for i in range(3)])
 
         # ... and I try to switch membership (add/remove)
         csv_data = self._csv_reader_from_array([
@@ -468,6 +469,80 @@ class TeamMembershipImportManagerTests(TeamMembershipEventTestMixin, SharedModul
         assert CourseTeamMembership.is_user_on_team(user, new_team)
         self.assert_learner_added_emitted(new_team.team_id, user.id)
 
+    def test_import_updates_team_sizes(self):
+        # Given learners on a team
+        learners = [self._create_and_enroll_test_user(f'learner_{i}') for i in range(3)]
+        masters_learner = self._create_and_enroll_test_user('masters_learner', mode='masters')
+        team = CourseTeamFactory(course_id=self.course.id, name='team_1', topic_id='teamset_1')
+        team.add_user(learners[0])
+        team.add_user(learners[1])
+
+        # When I remove, move and add learners
+        csv_data = self._csv_reader_from_array([
+            ['username', 'mode', 'teamset_1'],
+            [learners[0].username, 'audit', ''],
+            [learners[1].username, 'audit', 'team_2'],
+            [learners[2].username, 'audit', 'team_1'],
+            [masters_learner.username, 'masters', 'team_3'],
+        ])
+        assert self.import_manager.set_team_memberships(csv_data)
+
+        # Then the sizes of the teams reflect their new memberships
+        team.refresh_from_db()
+        assert team.team_size == 1
+        assert CourseTeamMembership.is_user_on_team(learners[2], team)
+        team_2 = CourseTeam.objects.get(course_id=self.course.id, topic_id='teamset_1', name='team_2')
+        assert team_2.team_size == 1
+        assert not team_2.organization_protected
+        team_3 = CourseTeam.objects.get(course_id=self.course.id, topic_id='teamset_1', name='team_3')
+        assert team_3.team_size == 1
+        assert team_3.organization_protected
+        self.assert_learner_removed_emitted(team.team_id, learners[0].id)
+        self.assert_learner_removed_emitted(team.team_id, learners[1].id)
+        self.assert_learner_added_emitted(team_2.team_id, learners[1].id)
+        self.assert_learner_added_emitted(team.team_id, learners[2].id)
+        self.assert_learner_added_emitted(team_3.team_id, masters_learner.id)
+
+    def test_import_invalidates_cached_learner_data(self):
+        # Given learners on a team, with progress snapshots
+        learners = [self._create_and_enroll_test_user(f'learner_{i}') for i in range(3)]
+        team = CourseTeamFactory(course_id=self.course.id, name='team_1', topic_id='teamset_1')
+        team.add_user(learners[0])
+        for learner in learners:
+            ProgressSnapshot.objects.create(user=learner, course_id=self.course.id, document={})
+
+        # When I remove one learner and add another
+        csv_data = self._csv_reader_from_array([
+            ['username', 'mode', 'teamset_1'],
+            [learners[0].username, 'audit', ''],
+            [learners[1].username, 'audit', 'team_1'],
+        ])
+        with patch('lms.djangoapps.teams.csv.invalidate_course_assignments') as mock_invalidate_assignments:
+            assert self.import_manager.set_team_memberships(csv_data)
+
+        # Then the cached assignments and progress of both are invalidated, which post_save doesn't do for bulk_create
+        assert sorted(call.args for call in mock_invalidate_assignments.call_args_list) == [
+            (learners[0].id, self.course.id), (learners[1].id, self.course.id),
+        ]
+        assert {
+            snapshot.user_id for snapshot in ProgressSnapshot.objects.filter(course_id=self.course.id, is_stale=True)
+        } == {learners[0].id, learners[1].id}
+
+    def test_import_queries_do_not_grow_with_learners(self):
+        learners = [self._create_and_enroll_test_user(f'learner_{i}') for i in range(4)]
+
+        def count_import_queries(users, team_name):
+            """ Returns the number of queries of the import of the users to a new team """
+            import_manager = csv.TeamMembershipImportManager(self.course)
+            csv_data = self._csv_reader_from_array(
+                [['username', 'mode', 'teamset_1']] + [[user.username, 'audit', team_name] for user in users]
+            )
+            with CaptureQueriesContext(connection) as queries:
+                assert import_manager.set_team_memberships(csv_data)
+            return len(queries)
+
+        assert count_import_queries(learners[:1], 'team_1') == count_import_queries(learners[1:], 'team_2')
+
     # Team protection status tests
     def test_create_new_mixed_enrollment_team_fails(self):
         # Given users of different tracks
@@ -18,7 +18,7 @@ from common.djangoapps.student.tests.factories import CourseEnrollmentFactory, U
 from common.djangoapps.util.testing import EventTestMixin
 from lms.djangoapps.teams import TEAM_DISCUSSION_CONTEXT
 from lms.djangoapps.teams.errors import AddToIncompatibleTeamError
-from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership, TopicTeamCount
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory, CourseTeamMembershipFactory
 from openedx.core.djangoapps.django_comment_common.signals import (
     comment_created,
@@ -145,6 +145,57 @@ class CourseTeamTest(SharedModuleStoreTestCase):
             self.masters_team.add_user(self.audit_learner)
 
 
+class TopicTeamCountTest(SharedModuleStoreTestCase):
+    """Tests for the TopicTeamCount model."""
+
+    def setUp(self):
+        super().setUp()
+        self.course_key = CourseKey.from_string("edx/the-course/1")
+        self.team = CourseTeamFactory(course_id=self.course_key, topic_id=TEAMSET_1_ID)
+
+    def assert_team_counts(self, expected_counts, organization_protected=None):
+        """Verify the team counts of both teamsets of the course."""
+        team_counts = TopicTeamCount.get_team_counts(
+            self.course_key, [TEAMSET_1_ID, TEAMSET_2_ID], organization_protected
+        )
+        assert [team_counts[TEAMSET_1_ID], team_counts[TEAMSET_2_ID]] == expected_counts
+
+    def test_team_created(self):
+        CourseTeamFactory(course_id=self.course_key, topic_id=TEAMSET_1_ID, organization_protected=True)
+        self.assert_team_counts([2, 0])
+        self.assert_team_counts([1, 0], organization_protected=True)
+        self.assert_team_counts([1, 0], organization_protected=False)
+
+    def test_team_changed(self):
+        self.team.organization_protected = True
+        self.team.save()
+        self.assert_team_counts([1, 0], organization_protected=True)
+        self.assert_team_counts([0, 0], organization_protected=False)
+
+        self.team.topic_id = TEAMSET_2_ID
+        self.team.save()
+        self.assert_team_counts([0, 1])
+
+    def test_team_deleted(self):
+        self.team.delete()
+        self.assert_team_counts([0, 0])
+
+    def test_team_size_changed(self):
+        with self.assertNumQueries(2):  # 1 to count the members, 1 to save the team
+            self.team.reset_team_size()
+        self.assert_team_counts([1, 0])
+
+    def test_count_created_concurrently(self):
+        TopicTeamCount.objects.create(
+            course_id=self.course_key, topic_id=TEAMSET_2_ID, organization_protected=False, team_count=1
+        )
+        with patch.object(TopicTeamCount.objects, 'filter') as mock_filter:
+            # The count is created by another transaction between the update and the create.
+            mock_filter.return_value.update.side_effect = [0, 1]
+            TopicTeamCount.add(self.course_key, TEAMSET_2_ID, False, 1)
+        assert mock_filter.return_value.update.call_count == 2
+
+
 @ddt.ddt
 class TeamMembershipTest(SharedModuleStoreTestCase):
     """Tests for the TeamMembership model."""
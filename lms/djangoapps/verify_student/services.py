@@ -103,6 +103,33 @@ class IDVerificationService:
             ManualVerification.objects.filter(**filter_kwargs).values_list('user_id', flat=True)
         )
 
+    @classmethod
+    def get_unexpired_verified_user_ids(cls, users):
+        """
+        Given a list of users, returns a set of the ids of the users that `user_is_verified` considers verified: the
+        users whose most recent approved verification of any type has an expiration datetime that has not passed.
+        """
+        filter_kwargs = {
+            'user__in': users,
+            'status': 'approved',
+        }
+        most_recent_verifications = {}
+        # In the order `get_expiration_datetime` passes them to `most_recent_verification`, which keeps the first of
+        # verifications updated at the same time
+        for verification in chain(SoftwareSecurePhotoVerification.objects.filter(**filter_kwargs),
+                                  SSOVerification.objects.filter(**filter_kwargs),
+                                  ManualVerification.objects.filter(**filter_kwargs),
+                                  VerificationAttempt.objects.filter(**filter_kwargs)):
+            most_recent = most_recent_verifications.get(verification.user_id)
+            if not most_recent or verification.updated_at > most_recent.updated_at:
+                most_recent_verifications[verification.user_id] = verification
+
+        current_datetime = now()
+        return {
+            user_id for user_id, verification in most_recent_verifications.items()
+            if verification.expiration_datetime and verification.expiration_datetime >= current_datetime
+        }
+
     @classmethod
     def get_expiration_datetime(cls, user, statuses):
         """
@@ -152,6 +152,41 @@ class TestIDVerificationService(ModuleStoreTestCase):
 
         assert expected_user_ids == verified_user_ids
 
+    def test_get_unexpired_verified_user_ids(self):
+        """
+        Tests for getting the users that `user_is_verified` considers verified, from their most recent verification.
+        """
+        user_a = UserFactory.create()
+        user_b = UserFactory.create()
+        user_expired = UserFactory.create()
+        user_no_expiration = UserFactory.create()
+        user_superseded = UserFactory.create()
+        user_unverified = UserFactory.create()
+        user_denied = UserFactory.create()
+
+        SoftwareSecurePhotoVerification.objects.create(user=user_a, status='approved')
+        VerificationAttempt.objects.create(
+            user=user_b, status='approved', expiration_datetime=now() + timedelta(days=1)
+        )
+        ManualVerification.objects.create(
+            user=user_expired, status='approved', expiration_date=now() - timedelta(days=1)
+        )
+        VerificationAttempt.objects.create(user=user_no_expiration, status='approved')
+        with freeze_time(now() - timedelta(days=1)):
+            SSOVerification.objects.create(user=user_superseded, status='approved')
+        VerificationAttempt.objects.create(
+            user=user_superseded, status='approved', expiration_datetime=now() - timedelta(days=1)
+        )
+        SSOVerification.objects.create(user=user_denied, status='denied')
+
+        users = [
+            user_a, user_b, user_expired, user_no_expiration, user_superseded, user_unverified, user_denied
+        ]
+        verified_user_ids = IDVerificationService.get_unexpired_verified_user_ids(users)
+
+        assert verified_user_ids == {user_a.id, user_b.id}
+        assert verified_user_ids == {user.id for user in users if IDVerificationService.user_is_verified(user)}
+
     def test_get_verify_location_no_course_key(self):
         """
         Test for the path to the IDV flow with no course key given
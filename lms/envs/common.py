@@ -1571,8 +1571,7 @@ EVENT_TRACKING_BACKENDS = {
                 }
             },
             'processors': [
-                {'ENGINE': 'common.djangoapps.track.shim.LegacyFieldMappingProcessor'},
-                {'ENGINE': 'common.djangoapps.track.shim.PrefixedEventProcessor'}
+                {'ENGINE': 'common.djangoapps.track.shim.LegacyEventProcessor'}
             ]
         }
     },
@@ -3107,7 +3106,7 @@ INSTALLED_APPS = [
     'openedx.core.djangoapps.video_pipeline',
 
     # Our courseware
-    'lms.djangoapps.courseware',
+    'lms.djangoapps.courseware.apps.CoursewareConfig',
     'lms.djangoapps.coursewarehistoryextended',
     'common.djangoapps.student.apps.StudentConfig',
     'common.djangoapps.split_modulestore_django.apps.SplitModulestoreDjangoBackendAppConfig',
@@ -3124,7 +3123,7 @@ INSTALLED_APPS = [
     'lms.djangoapps.branding',
 
     # Course home api
-    'lms.djangoapps.course_home_api',
+    'lms.djangoapps.course_home_api.apps.CourseHomeApiConfig',
 
     # User tours
     'lms.djangoapps.user_tours',
@@ -3266,6 +3265,7 @@ INSTALLED_APPS = [
 
     # Learner's dashboard
     'lms.djangoapps.learner_dashboard',
+    'lms.djangoapps.learner_home.apps.LearnerHomeConfig',
 
     # Needed whether or not enabled, due to migrations
     'lms.djangoapps.badges.apps.BadgesConfig',
@@ -5174,10 +5174,61 @@ FERNET_KEYS = [
     'DUMMY KEY CHANGE BEFORE GOING TO PRODUCTION',
 ]
 
+############### Settings for learner home ##################
+# Number of threads the learner home collectors run on, shared by all requests of a
+# process. Each thread uses its own database connection. 0 runs them in sequence.
+LEARNER_HOME_COLLECTOR_WORKERS = 0
+# Seconds the per-user results of expensive learner home collectors (program UUIDs and
+# resume URLs) are cached for. They are also invalidated by signals when they change.
+LEARNER_HOME_CACHE_TIMEOUT = 15 * 60
+
+############### Settings for instructor enrollment ##################
+# Enrollment requests of at least this many learners which do not notify them are written
+# in bulk, and the signals and events of the enrollments are sent by a background task.
+INSTRUCTOR_BULK_ENROLLMENT_THRESHOLD = 500
+
+############### Settings for bulk certificate generation ##################
+# Certificate generation tasks for at least this many learners evaluate and write the
+# certificates in chunks of CERTIFICATES_BULK_GENERATION_CHUNK_SIZE learners, instead of
+# queueing a certificate generation task for each learner.
+CERTIFICATES_BULK_GENERATION_THRESHOLD = 1000
+CERTIFICATES_BULK_GENERATION_CHUNK_SIZE = 500
+# Maximum rate at which the signals and events of certificates generated in bulk are sent,
+# as some of their receivers queue tasks. 0 sends them without pause.
+CERTIFICATES_BULK_GENERATION_EVENTS_PER_SECOND = 100
+
+############### Settings for course assignments ##################
+# Seconds the assignments of a learner in a course, from which the course dates are built, are
+# cached for. They are also invalidated when the course is published, and by signals when the
+# schedule, personal due dates, enrollment mode or completions of the learner change. 0 disables
+# the cache.
+COURSE_ASSIGNMENTS_CACHE_TIMEOUT = 60 * 60
+
+############### Settings for progress snapshots ##################
+# Maximum seconds a progress snapshot is served for, when the course_home.progress_snapshots
+# course waffle flag is enabled. Snapshots are also marked stale by signals when the grades,
+# completions, dates or enrollment of the learner change.
+COURSE_HOME_PROGRESS_SNAPSHOT_MAX_AGE = 24 * 60 * 60
+
+############### Settings for cohorts ##################
+# Seconds the index of the cohort memberships of a course, kept in shards of user ids, and its
+# cohorts are cached for. Shards are also invalidated when memberships of their users change,
+# once the change is committed. 0 disables the cache.
+COHORT_MEMBERSHIP_INDEX_CACHE_TIMEOUT = 60 * 60
+
 ############### Settings for user-state-client ##################
 # Maximum number of rows to fetch in XBlockUserStateClient calls. Adjust for performance
 USER_STATE_BATCH_SIZE = 5000
 
+# Block types whose Scope.user_state writes are deferred, coalesced per (user, block)
+# and flushed in bulk at the end of the request (write-behind). Block types which save
+# StudentModule history (i.e. graded problems) are never deferred. Empty disables it.
+USER_STATE_WRITE_BEHIND_BLOCK_TYPES = ()
+# Flush deferred writes early once this many (user, block) pairs are pending, or once
+# the oldest pending write is older than this many seconds.
+USER_STATE_WRITE_BEHIND_MAX_PENDING = 200
+USER_STATE_WRITE_BEHIND_WINDOW = 2
+
 ############### Settings for edx-rbac  ###############
 SYSTEM_WIDE_ROLE_CLASSES = []
 
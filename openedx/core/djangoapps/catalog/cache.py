@@ -29,3 +29,9 @@ PROGRAMS_BY_TYPE_SLUG_CACHE_KEY_TPL = 'programs-by-type-slug-{site_id}-{program_
 
 # Template used to create cache keys for organization to program uuids.
 PROGRAMS_BY_ORGANIZATION_CACHE_KEY_TPL = 'organization-programs-{org_key}'
+
+# Cache key of the version of the program catalog snapshot, and the number of chunks it is stored in.
+PROGRAM_CATALOG_VERSION_CACHE_KEY = 'program-catalog-version'
+
+# Template used to create cache keys for the chunks of a version of the program catalog snapshot.
+PROGRAM_CATALOG_CHUNK_CACHE_KEY_TPL = 'program-catalog-{version}-{index}'
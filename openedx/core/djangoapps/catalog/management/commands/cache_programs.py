@@ -30,6 +30,7 @@ from openedx.core.djangoapps.catalog.utils import (
     get_catalog_api_client,
     normalize_program_type
 )
+from openedx.core.djangoapps.catalog.program_catalog import store_program_catalog
 
 logger = logging.getLogger(__name__)
 User = get_user_model()  # pylint: disable=invalid-name
@@ -39,7 +40,8 @@ class Command(BaseCommand):
     """Management command used to cache program data.
 
     This command requests every available program from the discovery
-    service, writing each to its own cache entry with an indefinite expiration.
+    service, writing each to its own cache entry with an indefinite expiration,
+    and stores a new version of the program catalog snapshot read by the LMS.
     It is meant to be run on a scheduled basis and should be the only code
     updating these cache entries.
     """
@@ -77,6 +79,7 @@ class Command(BaseCommand):
         programs_by_type = {}
         programs_by_type_slug = {}
         organizations = {}
+        catalog_sites = {}
 
         sites = Site.objects.filter(domain=domain) if domain else Site.objects.all()
         for site in sites:
@@ -85,6 +88,7 @@ class Command(BaseCommand):
                 logger.info(f'Skipping site {site.domain}. No configuration.')
                 cache.set(SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=site.domain), [], None)
                 cache.set(SITE_PATHWAY_IDS_CACHE_KEY_TPL.format(domain=site.domain), [], None)
+                catalog_sites[site.domain] = {'id': site.id, 'program_uuids': []}
                 continue
 
             client = get_catalog_api_client(user)
@@ -116,6 +120,7 @@ class Command(BaseCommand):
                 site_name=site.domain,
             ))
             cache.set(SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=site.domain), uuids, None)
+            catalog_sites[site.domain] = {'id': site.id, 'program_uuids': uuids}
 
             pathway_ids = list(new_pathways.keys())
             logger.info('Caching ids for {total} pathways for site {site_name}.'.format(
@@ -145,6 +150,13 @@ class Command(BaseCommand):
         logger.info(f'Caching programs uuids for {len(organizations)} organizations')
         cache.set_many(organizations, None)
 
+        logger.info(f'Storing the program catalog snapshot of {len(catalog_sites)} sites.')
+        store_program_catalog(
+            {program['uuid']: program for program in programs.values()},
+            catalog_sites,
+            partial=bool(domain),
+        )
+
         if failure:
             sys.exit(1)
 
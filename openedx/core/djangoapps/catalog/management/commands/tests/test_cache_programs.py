@@ -18,6 +18,7 @@ from openedx.core.djangoapps.catalog.cache import (
     SITE_PATHWAY_IDS_CACHE_KEY_TPL,
     SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
 )
+from openedx.core.djangoapps.catalog.program_catalog import get_program_catalog
 from openedx.core.djangoapps.catalog.utils import normalize_program_type
 from openedx.core.djangoapps.catalog.tests.factories import OrganizationFactory, PathwayFactory, ProgramFactory
 from openedx.core.djangoapps.catalog.tests.mixins import CatalogIntegrationMixin
@@ -184,6 +185,10 @@ class TestCachePrograms(CatalogIntegrationMixin, CacheIsolationTestCase, SiteMix
         cached_uuids = cache.get(SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=self.site_domain2))
         assert set(cached_uuids) == set(self.uuids[self.site_domain2])
 
+        catalog = get_program_catalog()
+        assert catalog.site_program_uuids(self.site_domain2) == self.uuids[self.site_domain2]
+        assert not catalog.has_site(self.site_domain)
+
     def test_handle_programs(self):
         """
         Verify that the command requests and caches program UUIDs and details.
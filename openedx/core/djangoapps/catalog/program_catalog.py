@@ -0,0 +1,247 @@
+"""
+Versioned, in-process snapshot of the program data cached by the cache_programs command.
+
+cache_programs stores the details of every program along with the program UUIDs of each
+site as one compressed snapshot, split across a few cache entries. Each process loads a
+version of the snapshot once, indexes it, and swaps it for the new version when the
+command stores one. Readers get fresh copies of the programs, as they did from the cache.
+"""
+
+import logging
+import pickle
+import threading
+import uuid
+import zlib
+from collections import defaultdict
+
+from django.core.cache import cache
+from edx_django_utils.cache import RequestCache
+
+from openedx.core.djangoapps.catalog.cache import (
+    PROGRAM_CATALOG_CHUNK_CACHE_KEY_TPL,
+    PROGRAM_CATALOG_VERSION_CACHE_KEY,
+)
+
+logger = logging.getLogger(__name__)
+
+# Size in bytes of the cache entries the compressed snapshot is split into, under the
+# default 1MB item size limit of memcached.
+CHUNK_SIZE = 512 * 1024
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+class ProgramCatalog:
+    """
+    The programs of a snapshot, indexed by the lookups of the catalog utils.
+
+    Arguments:
+        version (str): The version of the snapshot.
+        programs (dict): Maps program UUIDs to program dicts.
+        sites (dict): Maps site domains to dicts with the `id` of the site and
+            the ordered `program_uuids` of the site.
+    """
+
+    def __init__(self, version, programs, sites):
+        # pylint: disable=import-outside-toplevel
+        from openedx.core.djangoapps.catalog.utils import (
+            course_run_keys_for_program,
+            course_uuids_for_program,
+            normalize_program_type,
+        )
+
+        self.version = version
+        # Programs are pickled so that each reader gets its own copy to modify.
+        self._pickled_programs = {
+            program_uuid: pickle.dumps(program, pickle.HIGHEST_PROTOCOL)
+            for program_uuid, program in programs.items()
+        }
+        self._site_program_uuids = {domain: site['program_uuids'] for domain, site in sites.items()}
+
+        self._by_course_run = defaultdict(list)
+        self._by_catalog_course = defaultdict(list)
+        self._by_organization = defaultdict(list)
+        self._by_listed_course_run = defaultdict(list)
+        self._by_listed_course = defaultdict(list)
+        for program_uuid, program in programs.items():
+            for course_run_key in course_run_keys_for_program(program):
+                self._by_course_run[course_run_key].append(program_uuid)
+            for course_uuid in course_uuids_for_program(program):
+                self._by_catalog_course[course_uuid].append(program_uuid)
+            for org in program.get('authoring_organizations', []):
+                self._by_organization[org['key']].append(program_uuid)
+            # A program may list a course run in several of its courses
+            for course_uuid in dict.fromkeys(course['uuid'] for course in program.get('courses', [])):
+                self._by_listed_course[course_uuid].append(program_uuid)
+            for course_run_key in dict.fromkeys(
+                course_run['key'] for course in program.get('courses', []) for course_run in course['course_runs']
+            ):
+                self._by_listed_course_run[course_run_key].append(program_uuid)
+
+        self._by_type = defaultdict(list)
+        self._by_type_slug = defaultdict(list)
+        for site in sites.values():
+            for program_uuid in site['program_uuids']:
+                program = programs.get(program_uuid)
+                if program is None:
+                    continue
+                program_type = normalize_program_type(program.get('type'))
+                self._by_type[(site['id'], program_type)].append(program_uuid)
+                program_slug = program.get('type_attrs', {}).get('slug')
+                self._by_type_slug[(site['id'], program_slug)].append(program_uuid)
+
+    def get_program(self, program_uuid):
+        """
+        Returns a copy of the program with the given UUID, or None.
+        """
+        pickled_program = self._pickled_programs.get(str(program_uuid))
+        return pickle.loads(pickled_program) if pickled_program else None
+
+    def get_programs(self, program_uuids):
+        """
+        Returns copies of the programs with the given UUIDs, skipping unknown ones.
+        """
+        programs = (self.get_program(program_uuid) for program_uuid in program_uuids)
+        return [program for program in programs if program]
+
+    def has_site(self, domain):
+        """
+        Whether the snapshot lists the programs of the site with the given domain.
+        """
+        return domain in self._site_program_uuids
+
+    def site_program_uuids(self, domain):
+        """
+        UUIDs of the programs of the site with the given domain.
+        """
+        return list(self._site_program_uuids.get(domain, []))
+
+    def course_run_program_uuids(self, course_run_key):
+        """
+        UUIDs of the programs a course run is part of, including through curricula and child programs.
+        """
+        return list(self._by_course_run.get(str(course_run_key), []))
+
+    def catalog_course_program_uuids(self, course_uuid):
+        """
+        UUIDs of the programs a catalog course is part of, including through curricula and child programs.
+        """
+        return list(self._by_catalog_course.get(str(course_uuid), []))
+
+    def listed_course_run_program_uuids(self, course_run_key):
+        """
+        UUIDs of the programs whose `courses` list the course run.
+        """
+        return list(self._by_listed_course_run.get(str(course_run_key), []))
+
+    def listed_course_program_uuids(self, course_uuid):
+        """
+        UUIDs of the programs whose `courses` list the catalog course.
+        """
+        return list(self._by_listed_course.get(str(course_uuid), []))
+
+    def organization_program_uuids(self, org_key):
+        """
+        UUIDs of the programs authored by the organization.
+        """
+        return list(self._by_organization.get(org_key, []))
+
+    def type_program_uuids(self, site_id, program_type):
+        """
+        UUIDs of the programs of the site with the given normalized program type.
+        """
+        return list(self._by_type.get((site_id, program_type), []))
+
+    def type_slug_program_uuids(self, site_id, program_slug):
+        """
+        UUIDs of the programs of the site with the given program type slug.
+        """
+        return list(self._by_type_slug.get((site_id, program_slug), []))
+
+
+def _read_snapshot_data(version_info):
+    """
+    Returns the programs and sites of the snapshot described by `version_info`, or None if
+    some of its chunks are missing from the cache.
+    """
+    chunk_keys = [
+        PROGRAM_CATALOG_CHUNK_CACHE_KEY_TPL.format(version=version_info['version'], index=index)
+        for index in range(version_info['chunks'])
+    ]
+    chunks = cache.get_many(chunk_keys)
+    if len(chunks) != len(chunk_keys):
+        logger.warning(f"Failed to get program catalog snapshot {version_info['version']} from the cache.")
+        return None
+    return pickle.loads(zlib.decompress(b''.join(chunks[key] for key in chunk_keys)))
+
+
+def store_program_catalog(programs, sites, partial=False):
+    """
+    Store a new version of the program catalog snapshot in the cache.
+
+    Arguments:
+        programs (dict): Maps program UUIDs to the program dicts of `sites`.
+        sites (dict): Maps site domains to dicts with the `id` of the site and
+            the ordered `program_uuids` of the site.
+        partial (bool): Whether `sites` are only some of the sites, in which case
+            the other sites and their programs are kept from the current snapshot.
+    """
+    previous_version_info = cache.get(PROGRAM_CATALOG_VERSION_CACHE_KEY)
+    if partial and previous_version_info:
+        previous_data = _read_snapshot_data(previous_version_info) or {'programs': {}, 'sites': {}}
+        sites = {**previous_data['sites'], **sites}
+        programs = {**previous_data['programs'], **programs}
+    # Drop programs no site lists anymore
+    listed_uuids = {program_uuid for site in sites.values() for program_uuid in site['program_uuids']}
+    programs = {program_uuid: program for program_uuid, program in programs.items() if program_uuid in listed_uuids}
+
+    data = zlib.compress(pickle.dumps({'programs': programs, 'sites': sites}, pickle.HIGHEST_PROTOCOL))
+    version = uuid.uuid4().hex
+    chunks = [data[index:index + CHUNK_SIZE] for index in range(0, len(data), CHUNK_SIZE)]
+    cache.set_many(
+        {
+            PROGRAM_CATALOG_CHUNK_CACHE_KEY_TPL.format(version=version, index=index): chunk
+            for index, chunk in enumerate(chunks)
+        },
+        None,
+    )
+    cache.set(PROGRAM_CATALOG_VERSION_CACHE_KEY, {'version': version, 'chunks': len(chunks)}, None)
+    logger.info(f'Stored version {version} of the program catalog snapshot in {len(chunks)} chunks.')
+
+    if previous_version_info:
+        # Processes which loaded the previous version keep it in memory.
+        cache.delete_many([
+            PROGRAM_CATALOG_CHUNK_CACHE_KEY_TPL.format(version=previous_version_info['version'], index=index)
+            for index in range(previous_version_info['chunks'])
+        ])
+    return version
+
+
+def get_program_catalog():
+    """
+    Returns the current ProgramCatalog, or None if cache_programs has not stored one.
+
+    The version of the snapshot is checked once per request, and a new version is loaded
+    at most once per process.
+    """
+    global _catalog  # pylint: disable=global-statement
+    request_cache = RequestCache('program_catalog')
+    cached_response = request_cache.get_cached_response('catalog')
+    if cached_response.is_found:
+        return cached_response.value
+
+    catalog = None
+    version_info = cache.get(PROGRAM_CATALOG_VERSION_CACHE_KEY)
+    if version_info:
+        catalog = _catalog
+        if catalog is None or catalog.version != version_info['version']:
+            with _catalog_lock:
+                catalog = _catalog
+                if catalog is None or catalog.version != version_info['version']:
+                    data = _read_snapshot_data(version_info)
+                    if data is not None:
+                        catalog = ProgramCatalog(version_info['version'], data['programs'], data['sites'])
+                        _catalog = catalog
+    request_cache.set('catalog', catalog)
+    return catalog
@@ -0,0 +1,77 @@
+"""Tests covering the program catalog snapshot."""
+
+from unittest import mock
+
+from edx_django_utils.cache import RequestCache
+
+from openedx.core.djangoapps.catalog.program_catalog import get_program_catalog, store_program_catalog
+from openedx.core.djangoapps.catalog.tests.factories import ProgramFactory
+from openedx.core.djangoapps.catalog.utils import get_programs, get_programs_by_type
+from openedx.core.djangoapps.site_configuration.tests.factories import SiteFactory
+from openedx.core.djangoapps.site_configuration.tests.mixins import SiteMixin
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
+
+
+@skip_unless_lms
+class TestProgramCatalog(CacheIsolationTestCase, SiteMixin):
+    """
+    Tests for storing, loading and reading the program catalog snapshot.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super().setUp()
+        self.site = self.set_up_site('testsite.com', {'COURSE_CATALOG_API_URL': 'https://catalog.example.com/api/v1'})
+        self.programs = ProgramFactory.create_batch(3)
+        self._store(self.programs)
+
+    def _store(self, programs, site=None, partial=False):
+        """
+        Store a snapshot with the given programs for the site, and start a new request.
+        """
+        site = site or self.site
+        store_program_catalog(
+            {program['uuid']: program for program in programs},
+            {site.domain: {'id': site.id, 'program_uuids': [program['uuid'] for program in programs]}},
+            partial=partial,
+        )
+        RequestCache.clear_all_namespaces()
+
+    def test_get_programs(self):
+        assert get_programs(site=self.site) == self.programs
+        assert get_programs(uuid=self.programs[1]['uuid']) == self.programs[1]
+
+        course_run_key = self.programs[2]['courses'][0]['course_runs'][0]['key']
+        assert get_programs(course=course_run_key) == [self.programs[2]]
+        course_uuid = self.programs[2]['courses'][0]['uuid']
+        assert get_programs(catalog_course_uuid=course_uuid) == [self.programs[2]]
+
+        program_type = self.programs[0]['type']
+        expected = [program for program in self.programs if program['type'] == program_type]
+        assert get_programs_by_type(self.site, program_type) == expected
+
+    def test_programs_are_copies(self):
+        get_programs(site=self.site)[0]['title'] = 'changed'
+        assert get_programs(site=self.site) == self.programs
+
+    @mock.patch('openedx.core.djangoapps.catalog.program_catalog.CHUNK_SIZE', 1024)
+    def test_new_version(self):
+        catalog = get_program_catalog()
+        new_programs = ProgramFactory.create_batch(2)
+
+        # The snapshot is loaded once per version
+        RequestCache.clear_all_namespaces()
+        assert get_program_catalog() is catalog
+
+        self._store(new_programs)
+        assert get_program_catalog() is not catalog
+        assert get_programs(site=self.site) == new_programs
+
+    def test_partial(self):
+        other_site = SiteFactory()
+        other_programs = ProgramFactory.create_batch(2)
+        self._store(other_programs, site=other_site, partial=True)
+
+        catalog = get_program_catalog()
+        assert catalog.site_program_uuids(self.site.domain) == [program['uuid'] for program in self.programs]
+        assert catalog.site_program_uuids(other_site.domain) == [program['uuid'] for program in other_programs]
@@ -129,6 +129,10 @@ def get_programs(
     if len([arg for arg in (site, uuid, uuids, course, catalog_course_uuid, organization) if arg is not None]) != 1:
         raise TypeError("get_programs takes exactly one argument")
 
+    catalog = _get_program_catalog()
+    if catalog is not None and (site is None or catalog.has_site(site.domain)):
+        return _get_programs_from_catalog(catalog, site, uuid, uuids, course, catalog_course_uuid, organization)
+
     if uuid:
         program = cache.get(PROGRAM_CACHE_KEY_TPL.format(uuid=uuid))
         if not program:
@@ -164,6 +168,53 @@ def get_programs(
     return get_programs_by_uuids(uuids)
 
 
+def _get_program_catalog():
+    """
+    Returns the in-process program catalog snapshot, or None if there is none yet.
+    """
+    # The snapshot indexes programs with the helpers of this module.
+    # pylint: disable=import-outside-toplevel
+    from openedx.core.djangoapps.catalog.program_catalog import get_program_catalog
+
+    return get_program_catalog()
+
+
+def _get_programs_from_catalog(catalog, site, uuid, uuids, course, catalog_course_uuid, organization):
+    """
+    Implementation of get_programs reading the program catalog snapshot instead of the
+    individual cache entries.
+    """
+    if uuid:
+        program = catalog.get_program(uuid)
+        if not program:
+            logger.warning(missing_details_msg_tpl.format(uuid=uuid))
+        return program
+    elif course:
+        uuids = catalog.course_run_program_uuids(course)
+    elif catalog_course_uuid:
+        uuids = catalog.catalog_course_program_uuids(catalog_course_uuid)
+    elif site:
+        site_config = getattr(site, "configuration", None)
+        catalog_url = site_config.get_value("COURSE_CATALOG_API_URL") if site_config else None
+        uuids = catalog.site_program_uuids(site.domain) if site_config and catalog_url else []
+    elif organization:
+        uuids = catalog.organization_program_uuids(organization)
+
+    return _get_programs_by_uuids_from_catalog(catalog, uuids)
+
+
+def _get_programs_by_uuids_from_catalog(catalog, uuids):
+    """
+    Gets a list of programs for the provided uuids from the program catalog snapshot
+    """
+    uuid_strings = [str(handle) for handle in uuids]
+    programs = catalog.get_programs(uuid_strings)
+    if len(programs) != len(uuid_strings):
+        for missing_uuid in set(uuid_strings) - {program["uuid"] for program in programs}:
+            logger.warning(missing_details_msg_tpl.format(uuid=missing_uuid))
+    return programs
+
+
 def get_programs_by_type(site, program_type):
     """
     Keyword Arguments:
@@ -173,6 +224,11 @@ def get_programs_by_type(site, program_type):
     Returns:
         A list of programs for the given site with the given program_type.
     """
+    catalog = _get_program_catalog()
+    if catalog is not None and catalog.has_site(site.domain):
+        uuids = catalog.type_program_uuids(site.id, normalize_program_type(program_type))
+        return _get_programs_by_uuids_from_catalog(catalog, uuids)
+
     program_type_cache_key = PROGRAMS_BY_TYPE_CACHE_KEY_TPL.format(
         site_id=site.id, program_type=normalize_program_type(program_type)
     )
@@ -194,6 +250,11 @@ def get_programs_by_type_slug(site, program_type_slug):
     Slugs are a consistent identifier whereas type (used in `get_programs_by_type`)
     may be translated.
     """
+    catalog = _get_program_catalog()
+    if catalog is not None and catalog.has_site(site.domain):
+        uuids = catalog.type_slug_program_uuids(site.id, program_type_slug)
+        return _get_programs_by_uuids_from_catalog(catalog, uuids)
+
     program_type_slug_cache_key = PROGRAMS_BY_TYPE_SLUG_CACHE_KEY_TPL.format(
         site_id=site.id, program_slug=program_type_slug
     )
@@ -209,6 +270,10 @@ def get_programs_by_uuids(uuids: List[Any]) -> List[str]:
     """
     Gets a list of programs for the provided uuids
     """
+    catalog = _get_program_catalog()
+    if catalog is not None:
+        return _get_programs_by_uuids_from_catalog(catalog, uuids)
+
     # a list of UUID objects would be a perfectly reasonable parameter to provide
     uuid_strings = [str(handle) for handle in uuids]
 
@@ -753,6 +818,9 @@ def get_programs_for_organization(organization):
     """
     Retrieve list of program uuids authored by a given organization
     """
+    catalog = _get_program_catalog()
+    if catalog is not None:
+        return catalog.organization_program_uuids(organization)
     return cache.get(PROGRAMS_BY_ORGANIZATION_CACHE_KEY_TPL.format(org_key=organization))
 
 
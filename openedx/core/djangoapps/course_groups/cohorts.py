@@ -6,12 +6,16 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+import uuid
+from collections import defaultdict
 
+from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.core.cache import cache as django_cache
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from django.db import IntegrityError
-from django.db.models.signals import m2m_changed, post_save
+from django.db import IntegrityError, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.http import Http404
 from django.utils.translation import gettext as _
@@ -171,6 +175,155 @@ def _cohort_cache_key(user_id, course_key):
     return f"{user_id}.{course_key}"
 
 
+# The cohort memberships of a course are indexed in shards of consecutive user ids, each mapping
+# the ids of the users of the shard who are in a cohort to their cohort ids. The shards and the
+# cohorts of the course are cached under version tokens, which are reset when they change.
+COHORT_MEMBERSHIP_INDEX_SHARD_SIZE = 10000
+_INDEX_SHARD_VERSION_CACHE_KEY_TPL = 'cohorts.index.version.{course_id}.{shard}'
+_INDEX_SHARD_CACHE_KEY_TPL = 'cohorts.index.{course_id}.{shard}.{version}'
+_INDEX_COHORTS_VERSION_CACHE_KEY_TPL = 'cohorts.index.cohorts_version.{course_id}'
+_INDEX_COHORTS_CACHE_KEY_TPL = 'cohorts.index.cohorts.{course_id}.{version}'
+
+# Version keys of the index entries changed by transactions of the current thread which are not
+# committed yet. These entries are read from the database until the changes are committed.
+_INDEX_PENDING_CHANGES_NAMESPACE = 'cohorts.index.pending_changes'
+
+
+def _index_shard_version_key(course_key, user_id):
+    """
+    Returns the key of the version token of the index shard of the user in the course.
+    """
+    return _INDEX_SHARD_VERSION_CACHE_KEY_TPL.format(
+        course_id=course_key, shard=user_id // COHORT_MEMBERSHIP_INDEX_SHARD_SIZE
+    )
+
+
+def _get_index_versions(version_keys):
+    """
+    Returns a dict of the version tokens stored under the given keys, creating the missing ones.
+    """
+    versions = django_cache.get_many(version_keys)
+    new_versions = {key: uuid.uuid4().hex for key in version_keys if key not in versions}
+    if new_versions:
+        django_cache.set_many(new_versions, settings.COHORT_MEMBERSHIP_INDEX_CACHE_TIMEOUT)
+        versions.update(new_versions)
+    return versions
+
+
+def _invalidate_index(version_keys):
+    """
+    Invalidates the index entries with the given version keys, and again once the current
+    transaction is committed as other processes may cache them meanwhile. Until then, the
+    current thread reads them from the database.
+    """
+    django_cache.delete_many(version_keys)
+    pending_changes = RequestCache(_INDEX_PENDING_CHANGES_NAMESPACE)
+    for version_key in version_keys:
+        pending_changes.set(version_key, True)
+
+    def invalidate():
+        django_cache.delete_many(version_keys)
+        for version_key in version_keys:
+            pending_changes.delete(version_key)
+
+    transaction.on_commit(invalidate)
+
+
+def _get_cohort_ids(course_key, user_ids):
+    """
+    Returns a dict of the cohort ids of the users with the given ids who are in a cohort of the course.
+
+    They are read from the cached shards of the cohort membership index of the course, which are
+    built from the database on a cache miss, except for the users whose shard has uncommitted changes.
+    """
+    timeout = settings.COHORT_MEMBERSHIP_INDEX_CACHE_TIMEOUT
+    pending_changes = RequestCache(_INDEX_PENDING_CHANGES_NAMESPACE).data
+    user_ids_by_version_key = defaultdict(list)
+    uncached_user_ids = []
+    for user_id in user_ids:
+        version_key = _index_shard_version_key(course_key, user_id)
+        if timeout and version_key not in pending_changes:
+            user_ids_by_version_key[version_key].append(user_id)
+        else:
+            uncached_user_ids.append(user_id)
+
+    cohort_ids = {}
+    if uncached_user_ids:
+        cohort_ids.update(
+            CohortMembership.objects.filter(
+                course_id=course_key, user_id__in=uncached_user_ids,
+            ).values_list('user_id', 'course_user_group_id')
+        )
+    if not user_ids_by_version_key:
+        return cohort_ids
+
+    versions = _get_index_versions(list(user_ids_by_version_key))
+    shard_keys = {}
+    for version_key, shard_user_ids in user_ids_by_version_key.items():
+        shard = shard_user_ids[0] // COHORT_MEMBERSHIP_INDEX_SHARD_SIZE
+        shard_key = _INDEX_SHARD_CACHE_KEY_TPL.format(course_id=course_key, shard=shard, version=versions[version_key])
+        shard_keys[shard_key] = (shard, shard_user_ids)
+    shards = django_cache.get_many(list(shard_keys))
+    new_shards = {}
+    for shard_key, (shard, shard_user_ids) in shard_keys.items():
+        if shard_key not in shards:
+            shards[shard_key] = new_shards[shard_key] = dict(
+                CohortMembership.objects.filter(
+                    course_id=course_key,
+                    user_id__gte=shard * COHORT_MEMBERSHIP_INDEX_SHARD_SIZE,
+                    user_id__lt=(shard + 1) * COHORT_MEMBERSHIP_INDEX_SHARD_SIZE,
+                ).values_list('user_id', 'course_user_group_id')
+            )
+        index = shards[shard_key]
+        cohort_ids.update((user_id, index[user_id]) for user_id in shard_user_ids if user_id in index)
+    if new_shards:
+        django_cache.set_many(new_shards, timeout)
+    return cohort_ids
+
+
+def _get_cohorts_by_id(course_key, cohort_ids):
+    """
+    Returns a dict of the cohorts of the course with the given ids.
+
+    The cohorts of the course are cached, unless they have uncommitted changes, and the cohorts
+    created since they were cached are read from the database.
+    """
+    timeout = settings.COHORT_MEMBERSHIP_INDEX_CACHE_TIMEOUT
+    version_key = _INDEX_COHORTS_VERSION_CACHE_KEY_TPL.format(course_id=course_key)
+    cohorts_by_id = {}
+    if timeout and version_key not in RequestCache(_INDEX_PENDING_CHANGES_NAMESPACE).data:
+        version = _get_index_versions([version_key])[version_key]
+        cache_key = _INDEX_COHORTS_CACHE_KEY_TPL.format(course_id=course_key, version=version)
+        cohorts_by_id = django_cache.get(cache_key)
+        if cohorts_by_id is None:
+            cohorts_by_id = {
+                cohort.id: cohort
+                for cohort in CourseUserGroup.objects.filter(course_id=course_key, group_type=CourseUserGroup.COHORT)
+            }
+            django_cache.set(cache_key, cohorts_by_id, timeout)
+
+    missing_ids = set(cohort_ids) - set(cohorts_by_id)
+    if missing_ids:
+        cohorts_by_id = dict(cohorts_by_id)
+        cohorts_by_id.update((cohort.id, cohort) for cohort in CourseUserGroup.objects.filter(id__in=missing_ids))
+    return cohorts_by_id
+
+
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+def _invalidate_index_shard(sender, instance, **kwargs):  # lint-amnesty, pylint: disable=unused-argument
+    """Invalidates the cohort membership index shard of the user"""
+    _invalidate_index([_index_shard_version_key(instance.course_id, instance.user_id)])
+
+
+@receiver(post_save, sender=CourseUserGroup)
+@receiver(post_delete, sender=CourseUserGroup)
+def _invalidate_index_cohorts(sender, instance, **kwargs):  # lint-amnesty, pylint: disable=unused-argument
+    """Invalidates the cached cohorts of the course"""
+    if instance.group_type == CourseUserGroup.COHORT:
+        _invalidate_index([_INDEX_COHORTS_VERSION_CACHE_KEY_TPL.format(course_id=instance.course_id)])
+
+
 def bulk_cache_cohorts(course_key, users):
     """
     Pre-fetches and caches the cohort assignments for the
@@ -181,20 +334,16 @@ def bulk_cache_cohorts(course_key, users):
     RequestCache(COHORT_CACHE_NAMESPACE).clear()
     cache = RequestCache(COHORT_CACHE_NAMESPACE).data
 
+    cohort_ids = {}
+    cohorts_by_id = {}
     if is_course_cohorted(course_key):
-        cohorts_by_user = {
-            membership.user: membership
-            for membership in
-            CohortMembership.objects.filter(user__in=users, course_id=course_key).select_related('user')
-        }
-        for user, membership in cohorts_by_user.items():
-            cache[_cohort_cache_key(user.id, course_key)] = membership.course_user_group
-        uncohorted_users = [u for u in users if u not in cohorts_by_user]
-    else:
-        uncohorted_users = users
+        cohort_ids = _get_cohort_ids(course_key, [user.id for user in users])
+        if cohort_ids:
+            cohorts_by_id = _get_cohorts_by_id(course_key, cohort_ids.values())
 
-    for user in uncohorted_users:
-        cache[_cohort_cache_key(user.id, course_key)] = None
+    for user in users:
+        cohort_id = cohort_ids.get(user.id)
+        cache[_cohort_cache_key(user.id, course_key)] = None if cohort_id is None else cohorts_by_id[cohort_id]
 
 
 def get_cohort(user, course_key, assign=True, use_cached=False):
@@ -234,34 +383,19 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
         return cache.setdefault(cache_key, None)
 
     # If course is cohorted, check if the user already has a cohort.
-    try:
-        membership = CohortMembership.objects.get(
-            course_id=course_key,
-            user_id=user.id,
-        )
-        return cache.setdefault(cache_key, membership.course_user_group)
-    except CohortMembership.DoesNotExist:
-        # Didn't find the group. If we do not want to assign, return here.
-        if not assign:
-            # Do not cache the cohort here, because in the next call assign
-            # may be True, and we will have to assign the user a cohort.
-            return None
+    cohort_id = _get_cohort_ids(course_key, [user.id]).get(user.id)
+    if cohort_id is not None:
+        return cache.setdefault(cache_key, _get_cohorts_by_id(course_key, [cohort_id])[cohort_id])
+
+    # Didn't find the group. If we do not want to assign, return here.
+    if not assign:
+        # Do not cache the cohort here, because in the next call assign
+        # may be True, and we will have to assign the user a cohort.
+        return None
 
     # Otherwise assign the user a cohort.
     try:
-        # If learner has been pre-registered in a cohort, get that cohort. Otherwise assign to a random cohort.
-        course_user_group = None
-        for assignment in UnregisteredLearnerCohortAssignments.objects.filter(email=user.email, course_id=course_key):
-            course_user_group = assignment.course_user_group
-            assignment.delete()
-            break
-        else:
-            course_user_group = get_random_cohort(course_key)
-        add_user_to_cohort(course_user_group, user)
-        return course_user_group
-    except ValueError:
-        # user already in cohort
-        return course_user_group
+        return cache.setdefault(cache_key, assign_cohorts(course_key, [user], skip_prevented=False).get(user.id))
     except IntegrityError as integrity_error:
         # An IntegrityError is raised when multiple workers attempt to
         # create the same row in one of the cohort model entries:
@@ -273,6 +407,92 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
         return get_cohort(user, course_key, assign, use_cached)
 
 
+def assign_cohorts(course_key, users, skip_prevented=True):
+    """
+    Assigns users who are in no cohort of the course to a cohort, and returns a dict of their
+    cohorts by user id.
+
+    Users who have been pre-registered in a cohort with their email address are assigned to
+    that cohort, and the others to a random cohort. The memberships of all the users are
+    inserted at once, without locking rows, so that users assigned a cohort concurrently keep
+    that cohort.
+
+    Arguments:
+        course_key: CourseKey
+        users: list of Django User objects
+        skip_prevented (bool): whether users whose assignment is prevented by the
+            CohortAssignmentRequested filter are left out, instead of raising
+            CohortAssignmentNotAllowed
+    """
+    # The emails are matched as the database collation matches them, which is case insensitive
+    # in MySQL, so they are looked up case insensitively here too.
+    users_by_email = {user.email.lower(): user for user in users}
+    preassigned_cohorts = {}
+    preassignments = UnregisteredLearnerCohortAssignments.objects.filter(
+        email__in=[user.email for user in users], course_id=course_key
+    ).select_related('course_user_group')
+    for assignment in preassignments:
+        user = users_by_email.get(assignment.email.lower())
+        if user is None:
+            # Matched by the collation in some other way, such as ignoring accents
+            continue
+        preassigned_cohorts.setdefault(user.id, assignment)
+    if preassigned_cohorts:
+        UnregisteredLearnerCohortAssignments.objects.filter(
+            id__in=[assignment.id for assignment in preassigned_cohorts.values()]
+        ).delete()
+
+    random_cohorts = None
+    assignments = []
+    for user in users:
+        if user.id in preassigned_cohorts:
+            cohort = preassigned_cohorts[user.id].course_user_group
+        else:
+            if random_cohorts is None:
+                random_cohorts = _get_random_cohorts(course_key)
+            cohort = local_random().choice(random_cohorts)
+        assignments.append((cohort, user))
+
+    memberships = CohortMembership.bulk_assign_new(assignments, skip_prevented=skip_prevented)
+    if memberships:
+        # The memberships are inserted in bulk, without post_save signals.
+        _invalidate_index(list({
+            _index_shard_version_key(course_key, membership.user_id) for membership in memberships
+        }))
+    cohorts = {}
+    for membership in memberships:
+        _user_added_to_cohort(membership.user, membership, previous_cohort=None)
+        cohorts[membership.user_id] = membership.course_user_group
+
+    # Users assigned a cohort concurrently
+    unassigned_user_ids = [user.id for user in users if user.id not in cohorts]
+    if unassigned_user_ids:
+        cohorts.update(
+            (membership.user_id, membership.course_user_group)
+            for membership in CohortMembership.objects.filter(
+                course_id=course_key, user_id__in=unassigned_user_ids,
+            ).select_related('course_user_group')
+        )
+    return cohorts
+
+
+def _get_random_cohorts(course_key):
+    """
+    Returns the cohorts of type RANDOM of the course, creating the default cohort if there is none.
+    """
+    course = courses.get_course(course_key)
+    cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM)
+    if not cohorts:
+        cohorts = [
+            CourseCohort.create(
+                cohort_name=DEFAULT_COHORT_NAME,
+                course_id=course_key,
+                assignment_type=CourseCohort.RANDOM
+            ).course_user_group
+        ]
+    return cohorts
+
+
 def get_random_cohort(course_key):
     """
     Helper method to get a cohort for random assignment.
@@ -280,17 +500,7 @@ def get_random_cohort(course_key):
     If there are multiple cohorts of type RANDOM in the course, one of them will be randomly selected.
     If there are no existing cohorts of type RANDOM in the course, one will be created.
     """
-    course = courses.get_course(course_key)
-    cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM)
-    if cohorts:
-        cohort = local_random().choice(cohorts)
-    else:
-        cohort = CourseCohort.create(
-            cohort_name=DEFAULT_COHORT_NAME,
-            course_id=course_key,
-            assignment_type=CourseCohort.RANDOM
-        ).course_user_group
-    return cohort
+    return local_random().choice(_get_random_cohorts(course_key))
 
 
 def migrate_cohort_settings(course):
@@ -462,20 +672,7 @@ def add_user_to_cohort(cohort, username_or_email_or_user):
             user = get_user_by_username_or_email(username_or_email_or_user)
 
         membership, previous_cohort = CohortMembership.assign(cohort, user)
-        tracker.emit(
-            "edx.cohort.user_add_requested",
-            {
-                "user_id": user.id,
-                "cohort_id": cohort.id,
-                "cohort_name": cohort.name,
-                "previous_cohort_id": getattr(previous_cohort, 'id', None),
-                "previous_cohort_name": getattr(previous_cohort, 'name', None),
-            }
-        )
-        cache = RequestCache(COHORT_CACHE_NAMESPACE).data
-        cache_key = _cohort_cache_key(user.id, membership.course_id)
-        cache[cache_key] = membership.course_user_group
-        COHORT_MEMBERSHIP_UPDATED.send(sender=None, user=user, course_key=membership.course_id)
+        _user_added_to_cohort(user, membership, previous_cohort)
         return user, getattr(previous_cohort, 'name', None), False
     except User.DoesNotExist as ex:
         # If username_or_email is an email address, store in database.
@@ -510,6 +707,27 @@ def add_user_to_cohort(cohort, username_or_email_or_user):
                 raise ex  # lint-amnesty, pylint: disable=raise-missing-from
 
 
+def _user_added_to_cohort(user, membership, previous_cohort):
+    """
+    Emits the tracking log event and signal of a user added to a cohort, and caches their cohort.
+    """
+    cohort = membership.course_user_group
+    tracker.emit(
+        "edx.cohort.user_add_requested",
+        {
+            "user_id": user.id,
+            "cohort_id": cohort.id,
+            "cohort_name": cohort.name,
+            "previous_cohort_id": getattr(previous_cohort, 'id', None),
+            "previous_cohort_name": getattr(previous_cohort, 'name', None),
+        }
+    )
+    cache = RequestCache(COHORT_CACHE_NAMESPACE).data
+    cache_key = _cohort_cache_key(user.id, membership.course_id)
+    cache[cache_key] = cohort
+    COHORT_MEMBERSHIP_UPDATED.send(sender=None, user=user, course_key=membership.course_id)
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
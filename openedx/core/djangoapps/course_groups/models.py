@@ -159,9 +159,68 @@ class CohortMembership(models.Model):
                 membership.save()
         return membership, previous_cohort
 
-    def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
-        self.full_clean(validate_unique=False)
+    @classmethod
+    def bulk_assign_new(cls, assignments, skip_prevented=False):
+        """
+        Assign users who are in no cohort of the course to cohorts, inserting the memberships of all
+        of them at once and without locking rows.
+
+        Arguments:
+            assignments: list of (cohort, user) pairs in a single course
+            skip_prevented (bool): whether users whose assignment is prevented by the
+                CohortAssignmentRequested filter are left out, instead of raising
+                CohortAssignmentNotAllowed
+
+        Returns the CohortMemberships inserted. Users who were assigned a cohort meanwhile keep it,
+        and have no membership returned unless they were assigned the same cohort.
+        """
+        memberships = []
+        for cohort, user in assignments:
+            try:
+                # .. filter_implemented_name: CohortAssignmentRequested
+                # .. filter_type: org.openedx.learning.cohort.assignment.requested.v1
+                user, cohort = CohortAssignmentRequested.run_filter(user=user, target_cohort=cohort)
+            except CohortAssignmentRequested.PreventCohortAssignment as exc:
+                if not skip_prevented:
+                    raise CohortAssignmentNotAllowed(str(exc)) from exc
+                log.info("Assignment of user '%s' to cohort '%s' was prevented: %s", user.id, cohort.id, exc)
+                continue
+            membership = cls(course_user_group=cohort, user=user, course_id=cohort.course_id)
+            membership.clean()
+            memberships.append(membership)
+        if not memberships:
+            return []
 
+        with transaction.atomic():
+            cls.objects.bulk_create(memberships, ignore_conflicts=True)
+            stored_cohort_ids = dict(
+                cls.objects.filter(
+                    course_id=memberships[0].course_id,
+                    user_id__in=[membership.user_id for membership in memberships],
+                ).values_list('user_id', 'course_user_group_id')
+            )
+            memberships = [
+                membership for membership in memberships
+                if stored_cohort_ids.get(membership.user_id) == membership.course_user_group_id
+            ]
+            new_members = {}
+            for membership in memberships:
+                __, users = new_members.setdefault(
+                    membership.course_user_group_id, (membership.course_user_group, [])
+                )
+                users.append(membership.user)
+            for cohort, users in new_members.values():
+                cohort.users.add(*users)
+
+        for membership in memberships:
+            membership._send_changed_event()
+            log.info("Saved CohortMembership for user '%s' in '%s'", membership.user_id, membership.course_id)
+        return memberships
+
+    def _send_changed_event(self):
+        """
+        Send the COHORT_MEMBERSHIP_CHANGED event of this membership.
+        """
         # .. event_implemented_name: COHORT_MEMBERSHIP_CHANGED
         COHORT_MEMBERSHIP_CHANGED.send_event(
             cohort=CohortData(
@@ -181,6 +240,10 @@ class CohortMembership(models.Model):
             )
         )
 
+    def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
+        self.full_clean(validate_unique=False)
+        self._send_changed_event()
+
         log.info("Saving CohortMembership for user '%s' in '%s'", self.user.id, self.course_id)
         return super().save(
             force_insert=force_insert,
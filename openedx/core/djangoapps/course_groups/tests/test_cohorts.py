@@ -3,6 +3,7 @@ Tests for cohorts
 """
 # pylint: disable=no-member
 
+import re
 from unittest.mock import call, patch
 import pytest
 import ddt
@@ -319,6 +320,91 @@ class TestCohorts(ModuleStoreTestCase):
             for __ in range(3):
                 cohorts.get_cohort(user, course.id, use_cached=use_cached)
 
+    def test_get_cohort_from_membership_index(self):
+        """
+        Test that cohorts.get_cohort() reads committed memberships from the cached membership
+        index, until they change.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        user = UserFactory(username="test", email="a@b.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            first_cohort = CohortFactory(course_id=course.id, name="FirstCohort", users=[user])
+            second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+
+        assert cohorts.get_cohort(user, course.id) == first_cohort
+        with self.assertNumQueries(0):
+            assert cohorts.get_cohort(user, course.id) == first_cohort
+
+        # Uncommitted changes are read from the database
+        cohorts.add_user_to_cohort(second_cohort, user)
+        with self.assertNumQueries(1):
+            assert cohorts.get_cohort(user, course.id) == second_cohort
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cohorts.remove_user_from_cohort(second_cohort, user.username)
+            cohorts.add_user_to_cohort(first_cohort, user)
+        assert cohorts.get_cohort(user, course.id) == first_cohort
+        with self.assertNumQueries(0):
+            assert cohorts.get_cohort(user, course.id) == first_cohort
+
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_assign_cohorts(self, mock_tracker):
+        """
+        Test that cohorts.assign_cohorts() assigns users to the cohort they were pre-registered in, or
+        to a random cohort, and that users who already have a cohort keep it.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=["AutoGroup"])
+        manual_cohort = self._create_cohort(course.id, "ManualCohort", CourseCohort.MANUAL)
+        cohorts.add_user_to_cohort(manual_cohort, "preassigned@example.com")
+        assigned_user = UserFactory(username="assigned", email="assigned@example.com")
+        cohorts.add_user_to_cohort(manual_cohort, assigned_user)
+        preassigned_user = UserFactory(username="preassigned", email="preassigned@example.com")
+        random_users = [UserFactory(username=f"random_{i}", email=f"random_{i}@example.com") for i in range(3)]
+        mock_tracker.reset_mock()
+
+        assigned_cohorts = cohorts.assign_cohorts(course.id, [assigned_user, preassigned_user] + random_users)
+
+        auto_cohort = cohorts.get_cohort_by_name(course.id, "AutoGroup")
+        expected_cohorts = {user.id: auto_cohort for user in random_users}
+        expected_cohorts.update({assigned_user.id: manual_cohort, preassigned_user.id: manual_cohort})
+        assert assigned_cohorts == expected_cohorts
+        assert set(manual_cohort.users.all()) == {assigned_user, preassigned_user}
+        assert set(auto_cohort.users.all()) == set(random_users)
+        assert not UnregisteredLearnerCohortAssignments.objects.filter(course_id=course.id).exists()
+        assert sorted(
+            event_call[0][1]["user_id"] for event_call in mock_tracker.emit.call_args_list
+            if event_call[0][0] == "edx.cohort.user_add_requested"
+        ) == sorted(user.id for user in [preassigned_user] + random_users)
+        for user in [assigned_user, preassigned_user] + random_users:
+            assert cohorts.get_cohort(user, course.id, assign=False) == assigned_cohorts[user.id]
+
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_assign_cohorts_preassigned_email_case(self, mock_tracker):  # pylint: disable=unused-argument
+        """
+        Test that cohorts.assign_cohorts() matches the emails users were pre-registered with case
+        insensitively, as the MySQL collation does.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=["AutoGroup"])
+        manual_cohort = self._create_cohort(course.id, "ManualCohort", CourseCohort.MANUAL)
+        cohorts.add_user_to_cohort(manual_cohort, "Preassigned@Example.com")
+        preassigned_user = UserFactory(username="preassigned", email="preassigned@example.com")
+        filter_preassignments = UnregisteredLearnerCohortAssignments.objects.filter
+
+        def filter_as_mysql(*args, email__in=None, **kwargs):
+            # SQLite compares the emails case sensitively
+            if email__in is not None:
+                kwargs['email__iregex'] = '^({})$'.format('|'.join(re.escape(email) for email in email__in))
+            return filter_preassignments(*args, **kwargs)
+
+        with patch.object(UnregisteredLearnerCohortAssignments.objects, 'filter', side_effect=filter_as_mysql):
+            assigned_cohorts = cohorts.assign_cohorts(course.id, [preassigned_user])
+
+        assert assigned_cohorts == {preassigned_user.id: manual_cohort}
+        assert not UnregisteredLearnerCohortAssignments.objects.filter(course_id=course.id).exists()
+
     def test_get_cohort_with_assign(self):
         """
         Make sure cohorts.get_cohort() returns None if no group is already
@@ -109,6 +109,18 @@ class Command(BaseCommand):
             default=100,
             help="Number of items to query at once.",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=0,
+            help="Number of grades to post to Credentials at once from the task, rather than queueing a task for "
+            "each grade.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="Name to save the progress of the run under, so that running again with the same name resumes it.",
+        )
         parser.add_argument(
             "--auto",
             action="store_true",
@@ -165,6 +177,7 @@ class Command(BaseCommand):
         log.info(
             f"notify_credentials starting, dry-run={options['dry_run']}, site={options['site']}, "
             f"delay={options['delay']} seconds, page_size={options['page_size']}, "
+            f"concurrency={options.get('concurrency')}, checkpoint={options.get('checkpoint')}, "
             f"from={options['start_date'] if options['start_date'] else 'NA'}, "
             f"to={options['end_date'] if options['end_date'] else 'NA'}, notify_programs={options['notify_programs']}, "
             f"user_ids={options['user_ids']}, execution={'auto' if options['auto'] else 'manual'}, "
@@ -42,6 +42,8 @@ class TestNotifyCredentials(TestCase):
             'no_color': False,
             'notify_programs': False,
             'page_size': 100,
+            'concurrency': 0,
+            'checkpoint': None,
             'program_uuids': None,
             'pythonpath': None,
             'settings': None,
@@ -258,6 +260,14 @@ class TestNotifyCredentials(TestCase):
         assert mock_task.called
         assert mock_task.call_args[0][0] == self.expected_options
 
+    def test_concurrency_and_checkpoint(self, mock_task):
+        self.expected_options['start_date'] = datetime(2017, 2, 1, 0, 0, tzinfo=timezone.utc)
+        self.expected_options['concurrency'] = 8
+        self.expected_options['checkpoint'] = 'backfill'
+        call_command(Command(), '--start-date', '2017-02-01', '--concurrency=8', '--checkpoint=backfill')
+        assert mock_task.called
+        assert mock_task.call_args[0][0] == self.expected_options
+
     def test_site(self, mock_task):
         site_config = SiteConfigurationFactory.create(
             site_values={'course_org_filter': ['testX']}
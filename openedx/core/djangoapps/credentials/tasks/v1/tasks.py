@@ -1,8 +1,10 @@
 """
 This file contains Celery tasks and utility functions supporting the Credentials IDA.
 """
-import math
+import threading
 import time
+from time import monotonic
+from concurrent.futures import ThreadPoolExecutor, wait
 from urllib.parse import urljoin
 
 from celery import shared_task
@@ -11,9 +13,11 @@ from celery_utils.logged_task import LoggedTask
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from edx_django_utils.monitoring import set_code_owner_attribute
 from MySQLdb import OperationalError
 from opaque_keys.edx.keys import CourseKey
+from requests.adapters import HTTPAdapter
 
 from common.djangoapps.course_modes.models import CourseMode
 from lms.djangoapps.certificates.api import get_recently_modified_certificates
@@ -43,6 +47,10 @@ INTERESTING_STATUSES = [
     CertificateStatuses.downloadable,
 ]
 
+# Progress of a notify_credentials run started with --checkpoint, as the primary keys of the last certificate and grade
+# it handled
+NOTIFY_CREDENTIALS_CHECKPOINT_CACHE_KEY_TPL = 'notify_credentials.checkpoint.{name}'
+
 
 @shared_task(
     bind=True,
@@ -100,6 +108,106 @@ def send_grade_to_credentials(
     logger.info(f"Sent grade for user {username} in course {course_run_key} to Credentials")
 
 
+class ConcurrentGradeSender:
+    """
+    Posts grades to the Credentials IDA from a bounded pool of threads sharing one pooled API client, rather than
+    through a `send_grade_to_credentials` task for each grade. Used by notify_credentials backfills.
+
+    An instance is called with the arguments of `send_grade_to_credentials`. At most `concurrency` grades are posted at
+    once, and calls block while `concurrency` more are waiting. Grades which fail to post are handed to a
+    `send_grade_to_credentials` task, which retries.
+
+    The threads only make HTTP requests: the API URL of each org, which may be read from the database, is resolved on
+    the calling thread, so the threads never open database connections that nothing would close.
+
+    Args:
+        concurrency (int): The number of grades to post at once
+    """
+
+    def __init__(self, concurrency):
+        self.client = get_credentials_api_client(User.objects.get(username=settings.CREDENTIALS_SERVICE_USERNAME))
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.client.mount('https://', adapter)
+        self.client.mount('http://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='notify-credentials')
+        self.slots = threading.BoundedSemaphore(concurrency * 2)
+        self.futures = set()
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.started = monotonic()
+        self.api_urls = {}
+
+    def __call__(self, username, course_run_key, verified, letter_grade, percent_grade, grade_last_updated):
+        org = CourseKey.from_string(course_run_key).org
+        if org not in self.api_urls:
+            self.api_urls[org] = urljoin(f"{get_credentials_api_base_url(org=org)}/", "grades/")
+        self.slots.acquire()
+        future = self.executor.submit(
+            self._post, self.api_urls[org], username, course_run_key, verified, letter_grade, percent_grade,
+            grade_last_updated
+        )
+        with self.lock:
+            self.futures.add(future)
+        future.add_done_callback(self._done)
+
+    def _done(self, future):
+        with self.lock:
+            self.futures.discard(future)
+        self.slots.release()
+
+    def _post(self, api_url, username, course_run_key, verified, letter_grade, percent_grade, grade_last_updated):
+        """
+        Post a grade to the given grades API URL as `send_grade_to_credentials` does, falling back to the task if that
+        fails.
+        """
+        if hasattr(grade_last_updated, 'isoformat'):
+            # As the task receives it
+            grade_last_updated = grade_last_updated.isoformat()
+        data = {
+            'username': username,
+            'course_run': course_run_key,
+            'letter_grade': letter_grade,
+            'percent_grade': percent_grade,
+            'verified': verified,
+            'lms_last_updated_at': grade_last_updated
+        }
+        try:
+            response = self.client.post(api_url, data=data)
+            response.raise_for_status()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(f"Failed to send grade for user {username} in course {course_run_key} to Credentials, "
+                             f"queueing a task to retry")
+            send_grade_to_credentials.delay(
+                username, course_run_key, verified, letter_grade, percent_grade, grade_last_updated
+            )
+            with self.lock:
+                self.failed += 1
+        else:
+            with self.lock:
+                self.sent += 1
+
+    def wait(self):
+        """
+        Wait until the grades passed so far are posted.
+        """
+        with self.lock:
+            futures = list(self.futures)
+        wait(futures)
+
+    def close(self):
+        """
+        Wait until all grades are posted, and log the throughput.
+        """
+        self.executor.shutdown(wait=True)
+        self.client.close()
+        elapsed = monotonic() - self.started
+        logger.info(
+            f"[notify_credentials] Posted {self.sent} grades to Credentials in {elapsed:.1f} seconds "
+            f"({self.sent / elapsed if elapsed else 0:.1f} per second), {self.failed} were queued for retry"
+        )
+
+
 @shared_task(base=LoggedTask, ignore_result=True)
 @set_code_owner_attribute
 def handle_notify_credentials(options, course_keys):
@@ -151,7 +259,9 @@ def handle_notify_credentials(options, course_keys):
             page_size=options['page_size'],
             verbose=options['verbose'],
             notify_programs=options['notify_programs'],
-            revoke_program_certs=options['revoke_program_certs']
+            revoke_program_certs=options['revoke_program_certs'],
+            concurrency=options.get('concurrency', 0),
+            checkpoint=options.get('checkpoint'),
         )
 
 
@@ -163,7 +273,9 @@ def send_notifications(
     page_size=100,
     verbose=False,
     notify_programs=False,
-    revoke_program_certs=False
+    revoke_program_certs=False,
+    concurrency=0,
+    checkpoint=None,
 ):
     """
     Utility function responsible for bootstrapping certificate and grade updates to the Credentials IDA. We do this by
@@ -185,10 +297,22 @@ def send_notifications(
         notify_programs (bool): Used to determine if an update should be sent to Credentials
         revoke_program_certs (bool): Used to determine if the system should attempt revoking program certificates during
          this run of the `notify_credentials` management command
+        concurrency (int): If set, grades are posted to Credentials from this many threads by a ConcurrentGradeSender,
+         rather than through a task for each grade
+        checkpoint (str): If set, the name the progress of this run is saved under after each page, so that running
+         again with the same checkpoint resumes after the last page handled. Cleared once the run is done.
     """
+    progress = _get_checkpoint(checkpoint)
+    started = monotonic()
     course_cert_info = {}
     # First, do certs
-    for i, cert in paged_query(certs, delay, page_size):
+    for i, cert in paged_query(
+        certs.select_related('user'),
+        delay,
+        page_size,
+        start_after=progress.get('certificates'),
+        on_page_done=lambda last_cert: _save_checkpoint(checkpoint, progress, 'certificates', last_cert.pk),
+    ):
         if site_config and not site_config.has_org(cert.course_id.org):
             logger.info("Skipping credential changes %d for certificate %s", i, certstr(cert))
             continue
@@ -217,65 +341,144 @@ def send_notifications(
         if revoke_program_certs and notify_programs and not CertificateStatuses.is_passing_status(cert.status):
             handle_course_cert_revoked(**signal_args)
 
+    cert_count = len(course_cert_info)
+    logger.info(f"[notify_credentials] Handled {cert_count} certificates in {monotonic() - started:.1f} seconds")
+
+    grade_sender = ConcurrentGradeSender(concurrency) if concurrency else None
+    send_kwargs = {'sender': grade_sender} if grade_sender else {}
+
+    def grades_page_done(last_grade):
+        if grade_sender:
+            # Only checkpoint the grades once they are posted
+            grade_sender.wait()
+        _save_checkpoint(checkpoint, progress, 'grades', last_grade.pk)
+
     # Then do grades
-    for i, grade in paged_query(grades, delay, page_size):
-        if site_config and not site_config.has_org(grade.course_id.org):
-            logger.info(f"Skipping grade change {i} for grade in {gradestr(grade)}")
-            continue
+    started = monotonic()
+    users = {}
+    grade_count = 0
 
-        logger.info(f"Handling grade change {i} for grade in {gradestr(grade)}")
-        user = User.objects.get(id=grade.user_id)
-
-        # Grab mode/status from cert call
-        key = (user.id, str(grade.course_id))
-        cert_info = course_cert_info.get(key, {})
-        mode = cert_info.get('mode', None)
-        status = cert_info.get('status', None)
-
-        send_grade_if_interesting(
-            user,
-            grade.course_id,
-            mode,
-            status,
-            grade.letter_grade,
-            grade.percent_grade,
-            grade_last_updated=grade.modified,
-            verbose=verbose
-        )
+    def read_page_users(page):
+        users.clear()
+        users.update(User.objects.in_bulk({grade.user_id for grade in page}))
+
+    try:
+        for i, grade in paged_query(
+            grades,
+            delay,
+            page_size,
+            start_after=progress.get('grades'),
+            on_page=read_page_users,
+            on_page_done=grades_page_done,
+        ):
+            if site_config and not site_config.has_org(grade.course_id.org):
+                logger.info(f"Skipping grade change {i} for grade in {gradestr(grade)}")
+                continue
+
+            logger.info(f"Handling grade change {i} for grade in {gradestr(grade)}")
+            grade_count += 1
+            user = users[grade.user_id]
+
+            # Grab mode/status from cert call
+            key = (user.id, str(grade.course_id))
+            cert_info = course_cert_info.get(key, {})
+            mode = cert_info.get('mode', None)
+            status = cert_info.get('status', None)
+
+            send_grade_if_interesting(
+                user,
+                grade.course_id,
+                mode,
+                status,
+                grade.letter_grade,
+                grade.percent_grade,
+                grade_last_updated=grade.modified,
+                verbose=verbose,
+                **send_kwargs
+            )
+    finally:
+        if grade_sender:
+            grade_sender.close()
+
+    logger.info(f"[notify_credentials] Handled {grade_count} grades in {monotonic() - started:.1f} seconds")
+    if checkpoint:
+        cache.delete(NOTIFY_CREDENTIALS_CHECKPOINT_CACHE_KEY_TPL.format(name=checkpoint))
+
+
+def _get_checkpoint(checkpoint):
+    """
+    Returns the progress saved under the checkpoint name, as a dict with the primary key of the last certificate and
+    grade handled, if any.
+    """
+    if not checkpoint:
+        return {}
+    progress = cache.get(NOTIFY_CREDENTIALS_CHECKPOINT_CACHE_KEY_TPL.format(name=checkpoint)) or {}
+    if progress:
+        logger.info(f"[notify_credentials] Resuming from checkpoint {checkpoint}: {progress}")
+    return progress
+
+
+def _save_checkpoint(checkpoint, progress, kind, last_pk):
+    """
+    Save that the run handled the certificates or grades (`kind`) up to `last_pk`, if it has a checkpoint name.
+    """
+    if not checkpoint:
+        return
+    progress[kind] = last_pk
+    cache.set(NOTIFY_CREDENTIALS_CHECKPOINT_CACHE_KEY_TPL.format(name=checkpoint), progress, None)
 
 
-def paged_query(queryset, delay, page_size):
+def paged_query(queryset, delay, page_size, start_after=None, on_page=None, on_page_done=None):
     """
     A generator that iterates through a queryset but only resolves chunks of it at once, to avoid overwhelming memory
     with a giant query. Also adds an optional delay between yields, to help with load.
-    """
-    count = queryset.count()
-    pages = int(math.ceil(count / page_size))
 
-    for page in range(pages):
-        page_start = page * page_size
-        page_end = page_start + page_size
-        subquery = queryset[page_start:page_end]
+    Pages are read in primary key order, each one starting after the last item of the previous one, so that reading a
+    page costs the same however deep into the queryset it is.
 
-        if delay and page:
+    Args:
+        queryset (QuerySet): The items to iterate through
+        delay (float): Delay (in seconds) to wait between pages
+        page_size (int): Number of items to read at once
+        start_after: Optional primary key to start after, to resume an earlier iteration
+        on_page (callable): Optional, called with the list of items of each page before they are yielded
+        on_page_done (callable): Optional, called with the last item of each page once all its items were handled
+    """
+    queryset = queryset.order_by('pk')
+    index = 0
+    page_number = 0
+    while True:
+        page_queryset = queryset if start_after is None else queryset.filter(pk__gt=start_after)
+        if delay and page_number:
             time.sleep(delay)
-        index = 0
         try:
-            for item in subquery.iterator():
-                index += 1
-                yield page_start + index, item
+            # Read one more item than the page holds, to know whether there is a next page
+            page = list(page_queryset[:page_size + 1])
         except OperationalError:
             # When running the notify_credentials command locally there is an
             # OperationalError thrown by MySQL when there are no more results
-            # available for the queryset iterator. This change catches that exception,
-            # checks state, and then logs according to that state. This code runs in
-            # production without issue. This changes allows for the code to be run
-            # locally without a separate code path.
-            if index == count:
-                logger.info('OperationalError Exception caught, all known results processed in paged_query')
-            else:
-                logger.warning('OperationalError Exception caught, it is possible some results were missed')
-            continue
+            # available. This change catches that exception and logs it. This
+            # code runs in production without issue. This changes allows for the
+            # code to be run locally without a separate code path.
+            logger.warning('OperationalError Exception caught, it is possible some results were missed')
+            return
+        has_next_page = len(page) > page_size
+        page = page[:page_size]
+        if not page:
+            return
+
+        if on_page:
+            on_page(page)
+        for item in page:
+            index += 1
+            yield index, item
+        if on_page_done:
+            on_page_done(page[-1])
+
+        if not has_next_page:
+            return
+        start_after = page[-1].pk
+        page_number += 1
 
 
 def log_dry_run(certs, grades):
@@ -312,7 +515,8 @@ def send_grade_if_interesting(
     letter_grade,
     percent_grade,
     grade_last_updated=None,
-    verbose=False
+    verbose=False,
+    sender=None,
 ):
     """
     Checks if a grade is interesting to Credentials and schedules a Celery task if so. This is Credentials business
@@ -329,6 +533,8 @@ def send_grade_if_interesting(
         grade_last_updated (DateTime): DateTime object representing the last time the (percent) grade was updated in the
          LMS.
         verbose (bool): A value determining the logging level desired for this grade update
+        sender (callable): Optional, called with the arguments of `send_grade_to_credentials` to send the grade instead
+         of scheduling the task, e.g. a ConcurrentGradeSender
     """
     warning_base = f"Skipping send grade for user {user} in course run {course_run_key}:"
 
@@ -393,7 +599,7 @@ def send_grade_if_interesting(
         percent_grade = grade.percent
         grade_last_updated = grade.last_updated
 
-    send_grade_to_credentials.delay(
+    (sender or send_grade_to_credentials.delay)(
         user.username,
         str(course_run_key),
         True,
@@ -3,6 +3,7 @@ Test credentials tasks
 """
 
 import logging
+import threading
 from unittest import mock
 from datetime import datetime, timezone, timedelta
 
@@ -10,6 +11,7 @@ import ddt
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import connection, reset_queries
 from django.test import TestCase, override_settings
 from freezegun import freeze_time
@@ -398,15 +400,15 @@ class TestHandleNotifyCredentialsTask(TestCase):
         self.options['page_size'] = 1
         reset_queries()
         tasks.handle_notify_credentials(options=self.options, course_keys=[])
-        assert len(connection.queries) == (baseline + 6)
-        # two extra page queries each for certs & grades
+        assert len(connection.queries) == (baseline + 9)
+        # three extra page queries each for certs & grades, and for the users of the grades
 
         self.options['start_date'] = datetime(2017, 1, 1, 0, 0, tzinfo=timezone.utc)
         self.options['page_size'] = 2
         reset_queries()
         tasks.handle_notify_credentials(options=self.options, course_keys=[])
-        assert len(connection.queries) == (baseline + 2)
-        # one extra page query each for certs & grades
+        assert len(connection.queries) == (baseline + 3)
+        # one extra page query each for certs & grades, and for the users of the grades
 
     @mock.patch(TASKS_MODULE + '.send_grade_if_interesting')
     def test_site(self, mock_grade_interesting):
@@ -446,6 +448,103 @@ class TestHandleNotifyCredentialsTask(TestCase):
         mock_call_args = mock_send_notifications.call_args_list[0]
         assert mock_call_args.kwargs['revoke_program_certs'] == revoke_program_certs
 
+    def test_paged_query_start_after(self):
+        grades = PersistentCourseGrade.objects.all()
+        assert [grade for __, grade in tasks.paged_query(grades, 0, 2)] == [
+            self.grade1, self.grade2, self.grade3, self.grade4
+        ]
+        assert [grade for __, grade in tasks.paged_query(grades, 0, 2, start_after=self.grade2.pk)] == [
+            self.grade3, self.grade4
+        ]
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    @mock.patch(TASKS_MODULE + '.send_grade_if_interesting')
+    def test_checkpoint(self, mock_grade_interesting):
+        self.options['start_date'] = datetime(2017, 1, 1, 0, 0, tzinfo=timezone.utc)
+        self.options['page_size'] = 1
+        self.options['checkpoint'] = 'backfill'
+        cache_key = tasks.NOTIFY_CREDENTIALS_CHECKPOINT_CACHE_KEY_TPL.format(name='backfill')
+
+        # The run stops while handling the third grade, after checkpointing the first two
+        mock_grade_interesting.side_effect = [None, None, Exception('boom')]
+        with pytest.raises(Exception):
+            tasks.handle_notify_credentials(options=self.options, course_keys=[])
+        assert cache.get(cache_key) == {'certificates': self.cert4.pk, 'grades': self.grade2.pk}
+
+        # Running it again resumes after the second grade, and clears the checkpoint once done
+        mock_grade_interesting.reset_mock()
+        mock_grade_interesting.side_effect = None
+        with mock.patch(TASKS_MODULE + '.handle_course_cert_changed') as mock_cert_changed:
+            tasks.handle_notify_credentials(options=self.options, course_keys=[])
+        assert not mock_cert_changed.called
+        assert [call.args[1] for call in mock_grade_interesting.call_args_list] == [
+            self.grade3.course_id, self.grade4.course_id
+        ]
+        assert cache.get(cache_key) is None
+
+
+@skip_unless_lms
+@mock.patch(TASKS_MODULE + '.get_credentials_api_base_url', mock.Mock(return_value='https://credentials.example.com'))
+@mock.patch(TASKS_MODULE + '.send_grade_to_credentials')
+@mock.patch(TASKS_MODULE + '.get_credentials_api_client')
+@override_settings(CREDENTIALS_SERVICE_USERNAME='test-service-username')
+class TestConcurrentGradeSender(TestCase):
+    """
+    Tests for the ConcurrentGradeSender used by notify_credentials.
+    """
+    def setUp(self):
+        super().setUp()
+        UserFactory.create(username=settings.CREDENTIALS_SERVICE_USERNAME)
+        self.last_updated = datetime(2017, 1, 1, tzinfo=timezone.utc)
+
+    def test_post_grades(self, mock_get_api_client, mock_send_grade_to_credentials):
+        sender = tasks.ConcurrentGradeSender(concurrency=2)
+        for index in range(5):
+            sender(f'user{index}', 'course-v1:org+course+run', True, 'A', 1.0, self.last_updated)
+        sender.close()
+
+        client = mock_get_api_client.return_value
+        assert client.post.call_count == 5
+        assert {call.kwargs['data']['username'] for call in client.post.call_args_list} == {
+            f'user{index}' for index in range(5)
+        }
+        assert client.post.call_args.args[0] == 'https://credentials.example.com/grades/'
+        assert client.post.call_args.kwargs['data']['lms_last_updated_at'] == self.last_updated.isoformat()
+        assert not mock_send_grade_to_credentials.delay.called
+        assert (sender.sent, sender.failed) == (5, 0)
+
+    def test_api_url_resolved_once_per_org_on_calling_thread(self, mock_get_api_client, mock_send_grade_to_credentials):
+        calling_thread = threading.current_thread()
+        resolving_threads = []
+
+        def get_base_url(org):
+            resolving_threads.append(threading.current_thread())
+            return f'https://{org}.credentials.example.com'
+
+        sender = tasks.ConcurrentGradeSender(concurrency=2)
+        with mock.patch(TASKS_MODULE + '.get_credentials_api_base_url', side_effect=get_base_url):
+            for org in ('org1', 'org1', 'org2'):
+                sender('user', f'course-v1:{org}+course+run', True, 'A', 1.0, self.last_updated)
+            sender.close()
+
+        assert resolving_threads == [calling_thread, calling_thread]
+        assert {call.args[0] for call in mock_get_api_client.return_value.post.call_args_list} == {
+            'https://org1.credentials.example.com/grades/', 'https://org2.credentials.example.com/grades/'
+        }
+        assert not mock_send_grade_to_credentials.delay.called
+
+    def test_failure_queues_task(self, mock_get_api_client, mock_send_grade_to_credentials):
+        mock_get_api_client.return_value.post.return_value.raise_for_status.side_effect = boom
+
+        sender = tasks.ConcurrentGradeSender(concurrency=2)
+        sender('user', 'course-v1:org+course+run', True, 'A', 1.0, self.last_updated)
+        sender.close()
+
+        mock_send_grade_to_credentials.delay.assert_called_once_with(
+            'user', 'course-v1:org+course+run', True, 'A', 1.0, self.last_updated.isoformat()
+        )
+        assert (sender.sent, sender.failed) == (0, 1)
+
 
 @ddt.ddt
 @skip_unless_lms
@@ -40,6 +40,7 @@ from openedx.core.djangoapps.programs import ALWAYS_CALCULATE_PROGRAM_PRICE_AS_A
 from openedx.core.djangoapps.programs.tests.factories import ProgressFactory
 from openedx.core.djangoapps.programs.utils import (
     DEFAULT_ENROLLMENT_START_DATE,
+    BatchProgramProgressMeter,
     ProgramDataExtender,
     ProgramMarketingDataExtender,
     ProgramProgressMeter,
@@ -851,6 +852,82 @@ class TestProgramProgressMeter(ModuleStoreTestCase):
         assert program_data['detail_url'] == expected_url
 
 
+@skip_unless_lms
+@mock.patch("lms.djangoapps.certificates.api.auto_certificate_generation_enabled", mock.Mock(return_value=True))
+@mock.patch(UTILS_MODULE + '.get_programs')
+class TestBatchProgramProgressMeter(ModuleStoreTestCase):
+    """Tests of the batch program progress utility class."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.site = SiteFactory()
+        self.users = UserFactory.create_batch(3)
+
+        self.completed_run = CourseRunFactory(key=str(ModuleStoreCourseFactory.create(self_paced=True).id))
+        self.enrolled_run = CourseRunFactory()
+        self.entitled_course = CourseFactory()
+        self.programs = [
+            ProgramFactory(courses=[CourseFactory(course_runs=[self.completed_run])]),
+            ProgramFactory(courses=[
+                CourseFactory(course_runs=[self.enrolled_run]),
+                CourseFactory(course_runs=[self.completed_run]),
+            ]),
+            ProgramFactory(courses=[self.entitled_course]),
+        ]
+
+        # The first user completed a course, the second is enrolled in another, the third is entitled to a third.
+        for user in self.users[:2]:
+            CourseEnrollmentFactory(user=user, course_id=self.completed_run['key'], mode=CourseMode.VERIFIED)
+        GeneratedCertificateFactory(
+            user=self.users[0], course_id=self.completed_run['key'], mode=MODES.verified, status='downloadable'
+        )
+        CourseEnrollmentFactory(user=self.users[1], course_id=self.enrolled_run['key'], mode=CourseMode.VERIFIED)
+        CourseEntitlementFactory(user=self.users[2], course_uuid=self.entitled_course['uuid'])
+
+    def test_matches_program_progress_meter(self, mock_get_programs):
+        """Verify the batch results are those of a ProgramProgressMeter for each user."""
+        mock_get_programs.return_value = self.programs
+
+        batch_meter = BatchProgramProgressMeter(self.site, self.users)
+        progress = batch_meter.progress(count_only=False)
+        completed_programs = batch_meter.completed_programs_with_available_dates
+
+        for user in self.users:
+            meter = ProgramProgressMeter(self.site, user)
+            assert progress[user.id] == meter.progress(count_only=False)
+            assert completed_programs[user.id] == meter.completed_programs_with_available_dates
+        assert list(completed_programs[self.users[0].id].keys()) == [self.programs[0]['uuid']]
+
+    def test_program_states(self, mock_get_programs):
+        mock_get_programs.return_value = self.programs
+
+        states = BatchProgramProgressMeter(self.site, self.users).program_states(programs=self.programs[:2])
+
+        assert states[self.users[0].id] == {
+            'completed': {self.programs[0]['uuid']},
+            'in_progress': {self.programs[1]['uuid']},
+            'not_started': set(),
+        }
+        assert states[self.users[1].id] == {
+            'completed': set(),
+            'in_progress': {self.programs[0]['uuid'], self.programs[1]['uuid']},
+            'not_started': set(),
+        }
+        assert states[self.users[2].id] == {
+            'completed': set(),
+            'in_progress': set(),
+            'not_started': {self.programs[0]['uuid'], self.programs[1]['uuid']},
+        }
+
+    def test_programs_read_once(self, mock_get_programs):
+        mock_get_programs.return_value = self.programs
+
+        BatchProgramProgressMeter(self.site, self.users).progress()
+
+        mock_get_programs.assert_called_once_with(self.site)
+
+
 def _create_course(self, course_price, course_run_count=1, make_entitlement=False):
     """
     Creates the course in mongo and update it with the instructor data.
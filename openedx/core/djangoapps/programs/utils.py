@@ -2,7 +2,7 @@
 
 import datetime
 import logging
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from copy import deepcopy
 from itertools import chain
 from urllib.parse import urljoin, urlparse, urlunparse
@@ -30,6 +30,7 @@ from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.commerce.utils import EcommerceService
 from openedx.core.djangoapps.catalog.api import get_programs_by_type
 from openedx.core.djangoapps.catalog.constants import PathwayType
+from openedx.core.djangoapps.catalog.program_catalog import get_program_catalog
 from openedx.core.djangoapps.catalog.utils import (
     get_fulfillable_course_runs_for_entitlement,
     get_pathways,
@@ -137,6 +138,14 @@ def attach_program_detail_url(programs, mobile_only=False):
     return programs
 
 
+# The data about a user the ProgramProgressMeter needs, when prefetched for many users at once:
+#   enrollments (list): The user's active CourseEnrollments.
+#   active_entitlements (list): The user's CourseEntitlements which are unexpired or have an enrolled session.
+#   certificates (list): The user's eligible GeneratedCertificates.
+#   course_overviews (dict): Maps the course keys of the certificates to their CourseOverview, or None.
+UserProgramData = namedtuple("UserProgramData", "enrollments active_entitlements certificates course_overviews")
+
+
 class ProgramProgressMeter:
     """Utility for gauging a user's progress towards program completion.
 
@@ -148,14 +157,32 @@ class ProgramProgressMeter:
         uuid (str): UUID identifying a specific program. If provided, the meter
             will only inspect this one program, not all programs the user may be
             engaged with.
+        programs (list): The programs of the site, with their detail URLs attached,
+            when already read for other users.
+        user_data (UserProgramData): The user's data, when prefetched along with
+            other users'. See BatchProgramProgressMeter.
     """
 
-    def __init__(self, site, user, enrollments=None, uuid=None, mobile_only=False, include_course_entitlements=True):
+    def __init__(
+        self,
+        site,
+        user,
+        enrollments=None,
+        uuid=None,
+        mobile_only=False,
+        include_course_entitlements=True,
+        programs=None,
+        user_data=None,
+    ):
         self.site = site
         self.user = user
         self.mobile_only = mobile_only
+        self.user_data = user_data
 
-        self.enrollments = enrollments or list(CourseEnrollment.enrollments_for_user(self.user))
+        if user_data is not None:
+            self.enrollments = list(user_data.enrollments)
+        else:
+            self.enrollments = enrollments or list(CourseEnrollment.enrollments_for_user(self.user))
         self.enrollments.sort(key=lambda e: e.created, reverse=True)
 
         self.enrolled_run_modes = {}
@@ -172,14 +199,41 @@ class ProgramProgressMeter:
 
         self.course_uuids = []
         if include_course_entitlements:
-            self.entitlements = list(CourseEntitlement.unexpired_entitlements_for_user(self.user))
+            if user_data is not None:
+                self.entitlements = [
+                    entitlement for entitlement in user_data.active_entitlements if entitlement.expired_at is None
+                ]
+            else:
+                self.entitlements = list(CourseEntitlement.unexpired_entitlements_for_user(self.user))
             self.course_uuids = [str(entitlement.course_uuid) for entitlement in self.entitlements]
 
         if uuid:
             self.programs = [get_programs(uuid=uuid)]
+        elif programs is not None:
+            self.programs = programs
         else:
             self.programs = attach_program_detail_url(get_programs(self.site), self.mobile_only)
 
+    def _get_active_entitlement(self, course_uuid):
+        """Returns the user's most recently created active entitlement for the course, or None."""
+        if self.user_data is None:
+            return CourseEntitlement.get_entitlement_if_active(user=self.user, course_uuid=course_uuid)
+        entitlements = [
+            entitlement
+            for entitlement in self.user_data.active_entitlements
+            if str(entitlement.course_uuid) == str(course_uuid)
+        ]
+        return max(entitlements, key=lambda entitlement: entitlement.created, default=None)
+
+    def _get_course_overview(self, course_key):
+        """Returns the CourseOverview of a course, raising CourseOverview.DoesNotExist if there is none."""
+        if self.user_data is None:
+            return CourseOverview.get_from_id(course_key)
+        course_overview = self.user_data.course_overviews.get(course_key)
+        if course_overview is None:
+            raise CourseOverview.DoesNotExist
+        return course_overview
+
     def invert_programs(self):
         """Intersect programs and enrollments.
 
@@ -190,6 +244,12 @@ class ProgramProgressMeter:
         Returns:
             defaultdict, programs keyed by course run ID
         """
+        catalog = get_program_catalog()
+        if catalog is not None and self.site is not None and catalog.has_site(self.site.domain):
+            # The programs came from the catalog snapshot, whose indexes give the programs
+            # listing each course and course run without going through every program.
+            return self._invert_programs_with_catalog(catalog)
+
         inverted_programs = defaultdict(list)
 
         for program in self.programs:
@@ -212,6 +272,23 @@ class ProgramProgressMeter:
 
         return inverted_programs
 
+    def _invert_programs_with_catalog(self, catalog):
+        """Intersect programs and enrollments using the indexes of the program catalog snapshot."""
+        programs_by_uuid = {program["uuid"]: program for program in self.programs if program}
+        inverted_programs = defaultdict(list)
+        lookups = [(course_uuid, catalog.listed_course_program_uuids) for course_uuid in self.course_uuids] + [
+            (course_run_id, catalog.listed_course_run_program_uuids) for course_run_id in self.course_run_ids
+        ]
+        for key, get_program_uuids in lookups:
+            programs = [
+                programs_by_uuid[program_uuid]
+                for program_uuid in get_program_uuids(key)
+                if program_uuid in programs_by_uuid
+            ]
+            if programs:
+                inverted_programs[key] = sorted(programs, key=lambda p: p["title"])
+        return inverted_programs
+
     @cached_property
     def engaged_programs(self):
         """Derive a list of programs in which the given user is engaged.
@@ -297,9 +374,7 @@ class ProgramProgressMeter:
             completed, in_progress, not_started = [], [], []
 
             for course in program_copy["courses"]:
-                active_entitlement = CourseEntitlement.get_entitlement_if_active(
-                    user=self.user, course_uuid=course["uuid"]
-                )
+                active_entitlement = self._get_active_entitlement(course["uuid"])
                 if self._is_course_complete(course):
                     completed.append(course)
                 elif self._is_course_enrolled(course) or active_entitlement:
@@ -343,7 +418,12 @@ class ProgramProgressMeter:
         Returns a dict of {uuid_string: available_datetime}
         """
         # Query for all user certs up front, for performance reasons (rather than querying per course run).
-        user_certificates = GeneratedCertificate.eligible_available_certificates.filter(user=self.user)
+        if self.user_data is None:
+            user_certificates = GeneratedCertificate.eligible_available_certificates.filter(user=self.user)
+        else:
+            user_certificates = [
+                cert for cert in self.user_data.certificates if self.user_data.course_overviews.get(cert.course_id)
+            ]
         certificates_by_run = {cert.course_id: cert for cert in user_certificates}
 
         completed = {}
@@ -382,7 +462,7 @@ class ProgramProgressMeter:
 
                 # Grab the available date and keep it if it's the earliest one for this catalog course.
                 if modes_match and CertificateStatuses.is_passing_status(certificate.status):
-                    course_overview = CourseOverview.get_from_id(key)
+                    course_overview = self._get_course_overview(key)
                     available_date = certificate_api.available_date_for_certificate(course_overview, certificate)
                     earliest_course_run_date = min(date for date in [available_date, earliest_course_run_date] if date)
 
@@ -483,7 +563,15 @@ class ProgramProgressMeter:
         Returns:
             dict with a list of completed and failed runs
         """
-        course_run_certificates = certificate_api.get_certificates_for_user(self.user.username)
+        if self.user_data is None:
+            course_run_certificates = certificate_api.get_certificates_for_user(self.user.username)
+        else:
+            # Like get_certificates_for_user, skip the certificates of deleted courses without a PDF
+            course_run_certificates = [
+                {"course_key": cert.course_id, "type": cert.mode, "status": cert.status}
+                for cert in sorted(self.user_data.certificates, key=lambda cert: str(cert.course_id))
+                if cert.download_url or self.user_data.course_overviews.get(cert.course_id)
+            ]
 
         completed_runs, failed_runs = [], []
         for certificate in course_run_certificates:
@@ -494,7 +582,7 @@ class ProgramProgressMeter:
             }
 
             try:
-                course_overview = CourseOverview.get_from_id(course_key)
+                course_overview = self._get_course_overview(course_key)
             except CourseOverview.DoesNotExist:
                 may_certify = True
             else:
@@ -522,6 +610,111 @@ class ProgramProgressMeter:
         return any(course_run["key"] in self.course_run_ids for course_run in course["course_runs"])
 
 
+class BatchProgramProgressMeter:
+    """Utility for gauging the progress of many users towards program completion.
+
+    The enrollments, entitlements and certificates of all the users are read with a few
+    queries, and the programs of the site once, instead of for each user.
+
+    Arguments:
+        site (Site): The site whose programs to gauge progress towards.
+        users (list): The users whose progress to gauge.
+
+    Keyword Arguments:
+        mobile_only (bool): As for ProgramProgressMeter.
+        include_course_entitlements (bool): As for ProgramProgressMeter.
+    """
+
+    def __init__(self, site, users, mobile_only=False, include_course_entitlements=True):
+        self.site = site
+        self.users = list(users)
+        user_ids = [user.id for user in self.users]
+
+        enrollments = defaultdict(list)
+        for enrollment in CourseEnrollment.objects.filter(user_id__in=user_ids, is_active=True):
+            enrollments[enrollment.user_id].append(enrollment)
+
+        active_entitlements = defaultdict(list)
+        if include_course_entitlements:
+            # Active entitlements, as in CourseEntitlement.get_entitlement_if_active
+            for entitlement in (
+                CourseEntitlement.objects.filter(user_id__in=user_ids)
+                .exclude(expired_at__isnull=False, enrollment_course_run=None)
+                .select_related("_policy", "enrollment_course_run")
+            ):
+                active_entitlements[entitlement.user_id].append(entitlement)
+
+        certificates = defaultdict(list)
+        for certificate in GeneratedCertificate.eligible_certificates.filter(user_id__in=user_ids):
+            certificates[certificate.user_id].append(certificate)
+        course_overviews = CourseOverview.get_from_ids(
+            {certificate.course_id for user_certificates in certificates.values() for certificate in user_certificates}
+        )
+
+        programs = attach_program_detail_url(get_programs(site), mobile_only)
+        self.meters = {
+            user.id: ProgramProgressMeter(
+                site,
+                user,
+                mobile_only=mobile_only,
+                include_course_entitlements=include_course_entitlements,
+                programs=programs,
+                user_data=UserProgramData(
+                    enrollments[user.id], active_entitlements[user.id], certificates[user.id], course_overviews
+                ),
+            )
+            for user in self.users
+        }
+
+    def progress(self, programs=None, count_only=True):
+        """Gauge the users' progress towards program completion.
+
+        Returns:
+            dict mapping user IDs to the result of ProgramProgressMeter.progress for the user.
+        """
+        return {
+            user_id: meter.progress(programs=programs, count_only=count_only) for user_id, meter in self.meters.items()
+        }
+
+    def program_states(self, programs=None):
+        """Sort programs into those the users completed, are in progress of, or have not started.
+
+        A program is completed when all its courses are, in progress when some of its
+        courses are completed or in progress, and not started otherwise.
+
+        Keyword Arguments:
+            programs (list): Specific list of programs to check. If left unspecified,
+                the programs each user is engaged in are used.
+
+        Returns:
+            dict mapping user IDs to dicts of "completed", "in_progress" and "not_started"
+            sets of program UUIDs.
+        """
+        states = {}
+        for user_id, user_progress in self.progress(programs=programs).items():
+            user_states = {"completed": set(), "in_progress": set(), "not_started": set()}
+            for program_progress in user_progress:
+                remaining = program_progress["in_progress"] + program_progress["not_started"]
+                if program_progress["completed"] and not remaining:
+                    state = "completed"
+                elif program_progress["completed"] or program_progress["in_progress"]:
+                    state = "in_progress"
+                else:
+                    state = "not_started"
+                user_states[state].add(program_progress["uuid"])
+            states[user_id] = user_states
+        return states
+
+    @property
+    def completed_programs_with_available_dates(self):
+        """
+        Calculate the available date of the programs each user completed.
+
+        Returns a dict mapping user IDs to dicts of {uuid_string: available_datetime}
+        """
+        return {user_id: meter.completed_programs_with_available_dates for user_id, meter in self.meters.items()}
+
+
 # pylint: disable=missing-docstring
 class ProgramDataExtender:
     """
@@ -64,17 +64,32 @@ def get_template_path_with_theme(relative_path):
     if not theme:
         return relative_path
 
+    if settings.DEBUG:
+        # pick up templates added to the theme while the server runs
+        return _get_template_path_in_theme(theme.path, theme.template_path, relative_path)
+    return _get_cached_template_path_in_theme(theme.path, theme.template_path, relative_path)
+
+
+def _get_template_path_in_theme(theme_path, theme_template_path, relative_path):
+    """
+    Returns the template path in the theme at `theme_path` if the theme overrides the template,
+    otherwise returns the same path.
+    """
     # strip `/` if present at the start of relative_path
     template_name = re.sub(r'^/+', '', relative_path)
 
-    template_path = theme.template_path / template_name
-    absolute_path = theme.path / "templates" / template_name
+    template_path = theme_template_path / template_name
+    absolute_path = theme_path / "templates" / template_name
     if absolute_path.exists():
         return str(template_path)
     else:
         return relative_path
 
 
+# Themes only change on deployment, so the template paths they resolve are cached for the process.
+_get_cached_template_path_in_theme = lru_cache(maxsize=8192)(_get_template_path_in_theme)
+
+
 def get_all_theme_template_dirs():
     """
     Returns template directories for all the themes.
@@ -4,15 +4,19 @@ See https://docs.djangoproject.com/en/1.8/ref/contrib/staticfiles/
 """
 
 
+import json
 import os.path
 import posixpath
 import re
+from collections import defaultdict
 
 from urllib.parse import unquote, urldefrag, urlsplit  # pylint: disable=import-error
 from django.conf import settings
 from django.contrib.staticfiles.finders import find
 from django.contrib.staticfiles.storage import ManifestFilesMixin, StaticFilesStorage
+from django.core.files.base import ContentFile
 from django.utils._os import safe_join
+from edx_django_utils.cache import RequestCache
 from pipeline.storage import PipelineMixin
 
 from openedx.core.djangoapps.theming.helpers import (
@@ -34,9 +38,16 @@ class ThemeMixin:
     # instead of "images/logo.png"
     prefix = None
 
+    # name of the index of the assets overridden by each theme, saved by collectstatic next to the collected assets
+    themed_assets_index_name = 'themed-assets.json'
+    themed_assets_index_version = '1.0'
+
     def __init__(self, **kwargs):
 
         self.prefix = kwargs.pop('prefix', None)
+        # names of the collected themed assets, prefixed with their theme dir, loaded on first use
+        self._themed_assets = None
+        self._themed_assets_loaded = False
         super().__init__(**kwargs)
 
     def url(self, name):
@@ -96,10 +107,88 @@ class ThemeMixin:
             ])
             name = name[1:] if name.startswith("/") else name
             path = safe_join(themed_path, name)
-            return os.path.exists(path)
+            # theme files may change at any time, so their existence is only cached for the request
+            return _request_cached_exists(path, os.path.exists)
         # in live mode check static asset in the static files dir defined by "STATIC_ROOT" setting
         else:
-            return self.exists(os.path.join(theme, name))
+            return self.themed_asset_collected(os.path.join(theme, name))
+
+    def themed_asset_collected(self, name):
+        """
+        Returns True if the given themed asset was collected in the static files storage.
+
+        The asset is looked up in the index of themed assets saved by collectstatic, and in the
+        storage itself if there is no index.
+
+        Args:
+            name: asset name prefixed with its theme dir e.g. 'red-theme/images/logo.png'
+        """
+        if not self._themed_assets_loaded:
+            self._themed_assets = self.load_themed_assets_index()
+            self._themed_assets_loaded = True
+        if self._themed_assets is not None:
+            return name in self._themed_assets
+        return _request_cached_exists(name, self.exists)
+
+    def load_themed_assets_index(self):
+        """
+        Returns the set of the themed asset names, prefixed with their theme dir, listed in the
+        index of themed assets, or None if there is no index.
+        """
+        try:
+            with self.open(self.themed_assets_index_name) as index_file:
+                index = json.loads(index_file.read().decode())
+        except FileNotFoundError:
+            return None
+        if index.get('version') != self.themed_assets_index_version:
+            return None
+        return {
+            "/".join([theme_dir_name, name])
+            for theme_dir_name, names in index['themes'].items()
+            for name in names
+        }
+
+    def save_themed_assets_index(self, names):
+        """
+        Saves the index of the assets overridden by each theme.
+
+        Args:
+            names: names of all the collected assets, themed assets being prefixed with their theme dir
+        """
+        theme_dir_names = {theme.theme_dir_name for theme in get_themes()}
+        themes = defaultdict(list)
+        for name in names:
+            theme_dir_name, separator, asset_name = name.partition("/")
+            if separator and theme_dir_name in theme_dir_names:
+                themes[theme_dir_name].append(asset_name)
+
+        contents = json.dumps({
+            'version': self.themed_assets_index_version,
+            'themes': {theme_dir_name: sorted(asset_names) for theme_dir_name, asset_names in themes.items()},
+        })
+        if self.exists(self.themed_assets_index_name):
+            self.delete(self.themed_assets_index_name)
+        self._save(self.themed_assets_index_name, ContentFile(contents.encode()))
+
+        self._themed_assets = {
+            "/".join([theme_dir_name, asset_name])
+            for theme_dir_name, asset_names in themes.items()
+            for asset_name in asset_names
+        }
+        self._themed_assets_loaded = True
+
+
+def _request_cached_exists(path, exists):
+    """
+    Returns whether the given path exists according to the `exists` function, cached for the current request.
+    """
+    request_cache = RequestCache('theming.storage.exists')
+    cached_response = request_cache.get_cached_response(path)
+    if cached_response.is_found:
+        return cached_response.value
+    path_exists = exists(path)
+    request_cache.set(path, path_exists)
+    return path_exists
 
 
 class ThemeStorage(ThemeMixin, StaticFilesStorage):
@@ -157,11 +246,11 @@ class ThemeManifestFilesMixin(ManifestFilesMixin):
         parsed_name = urlsplit(unquote(name))
         clean_name = parsed_name.path.strip()
         asset_name = name
-        if not self.exists(clean_name):
-            # if themed asset does not exists then use default asset
-            theme = name.split("/", 1)[0]
-            # verify that themed asset was accessed
-            if theme in [theme.theme_dir_name for theme in get_themes()]:
+        theme = name.split("/", 1)[0]
+        # verify that themed asset was accessed
+        if theme in [theme.theme_dir_name for theme in get_themes()]:
+            if not self.themed_asset_collected(clean_name):
+                # if themed asset does not exists then use default asset
                 asset_name = "/".join(name.split("/")[1:])
 
         return asset_name
@@ -280,6 +369,9 @@ class ThemePipelineMixin(PipelineMixin):
         """
         if dry_run:
             return
+        # an index saved by a previous collectstatic run may not match the assets being collected
+        self._themed_assets = None
+        self._themed_assets_loaded = True
         themes = get_themes()
 
         for theme in themes:
@@ -295,6 +387,9 @@ class ThemePipelineMixin(PipelineMixin):
                 paths[output_file] = (self, output_file)
                 yield output_file, output_file, True
 
+        # index the collected themed assets, including the themed packages, before their urls are hashed
+        self.save_themed_assets_index(paths)
+
         super_class = super()
         if hasattr(super_class, 'post_process'):
             yield from super_class.post_process(paths.copy(), dry_run, **options)
@@ -4,11 +4,14 @@ Tests for comprehensive theme static files storage classes.
 
 
 import re
+import shutil
+import tempfile
 from unittest.mock import patch
 
 import ddt
 from django.conf import settings
 from django.test import TestCase, override_settings
+from edx_django_utils.cache import RequestCache
 
 from openedx.core.djangoapps.theming.helpers import Theme, get_theme_base_dir, get_theme_base_dirs
 from openedx.core.djangoapps.theming.storage import ThemeStorage
@@ -81,3 +84,39 @@ class TestStorageLMS(TestCase):
             expected_path = self.themes_dir / self.enabled_theme / "lms/static/" / asset
 
             assert expected_path == returned_path
+
+
+@skip_unless_lms
+@override_settings(DEBUG=False)
+class TestThemedAssetsIndex(TestCase):
+    """
+    Test the index of themed assets saved by collectstatic.
+    """
+
+    def setUp(self):
+        super().setUp()
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = ThemeStorage(location=location)
+        RequestCache.clear_all_namespaces()
+
+    def test_themed_from_index(self):
+        self.storage.save_themed_assets_index([
+            "images/logo.png",
+            "red-theme/images/logo.png",
+            "not-a-theme/images/favicon.ico",
+        ])
+
+        # A new storage loads the index saved in the static files storage
+        storage = ThemeStorage(location=self.storage.location)
+        with patch.object(storage, "exists") as mock_exists:
+            assert storage.themed("images/logo.png", "red-theme")
+            assert not storage.themed("images/favicon.ico", "red-theme")
+            assert not storage.themed("images/logo.png", "dark-theme")
+            assert not storage.themed("images/favicon.ico", "not-a-theme")
+        assert not mock_exists.called
+
+    def test_themed_without_index(self):
+        with patch.object(self.storage, "exists", return_value=True) as mock_exists:
+            assert self.storage.themed("images/logo.png", "red-theme")
+        mock_exists.assert_called_once_with("red-theme/images/logo.png")
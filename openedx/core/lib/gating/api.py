@@ -288,6 +288,42 @@ def get_required_content(course_key, gated_content_key):
         return None, None, None
 
 
+def get_prerequisite_content_keys(course_key):
+    """
+    Returns the usage keys of all of the course content which fulfills a gating milestone,
+    i.e. the content for which `is_prerequisite` returns True.
+
+    Arguments:
+        course_key (str|CourseKey): The course key
+
+    Returns:
+        set: The prerequisite content usage keys, as strings
+    """
+    return {m['content_id'] for m in find_gating_milestones(course_key, relationship='fulfills')}
+
+
+def get_required_content_by_gated_content(course_key):
+    """
+    Returns the prerequisite information of all of the gated content of a course, in a
+    single query, as returned by `get_required_content` for each gated content.
+
+    Arguments:
+        course_key (str|CourseKey): The course key
+
+    Returns:
+        dict: Maps each gated content usage key, as a string, to a tuple of the prerequisite
+        content usage key, minimum score and minimum completion percentage
+    """
+    required_content = {}
+    for milestone in find_gating_milestones(course_key, relationship='requires'):
+        required_content.setdefault(milestone['content_id'], (
+            _get_gating_block_id(milestone),
+            milestone.get('requirements', {}).get('min_score', None),
+            milestone.get('requirements', {}).get('min_completion', None),
+        ))
+    return required_content
+
+
 @gating_enabled(default=[])
 def get_gated_content(course, user):
     """
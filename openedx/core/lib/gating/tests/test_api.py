@@ -172,6 +172,20 @@ class TestGatingApi(ModuleStoreTestCase, MilestonesTestCaseMixin):
         assert min_score is None
         assert min_completion is None
 
+    def test_course_wide_required_content(self):
+        """ Test the course wide lookups match the per content ones """
+
+        assert gating_api.get_prerequisite_content_keys(self.course.id) == set()
+        assert gating_api.get_required_content_by_gated_content(self.course.id) == {}
+
+        gating_api.add_prerequisite(self.course.id, self.seq1.location)
+        gating_api.set_required_content(self.course.id, self.seq2.location, self.seq1.location, 80, 90)
+
+        assert gating_api.get_prerequisite_content_keys(self.course.id) == {str(self.seq1.location)}
+        assert gating_api.get_required_content_by_gated_content(self.course.id) == {
+            str(self.seq2.location): gating_api.get_required_content(self.course.id, self.seq2.location),
+        }
+
     def test_get_gated_content(self):
         """
         Verify staff bypasses gated content and student gets list of unfulfilled prerequisites.
@@ -83,7 +83,7 @@ class ModuleStoreDraftAndPublished(BranchSettingMixin, BulkOperationsMixin, meta
         raise NotImplementedError
 
     @abstractmethod
-    def has_changes(self, xblock):
+    def has_changes(self, xblock, include_children=True):
         raise NotImplementedError
 
     @abstractmethod
@@ -1019,14 +1019,15 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(location.course_key, 'convert_to_draft')
         return store.convert_to_draft(location, user_id)
 
-    def has_changes(self, xblock):
+    def has_changes(self, xblock, include_children=True):
         """
         Checks if the given block has unpublished changes
         :param xblock: the block to check
+        :param include_children: whether the changes of the descendants of the block are checked as well
         :return: True if the draft and published versions differ
         """
         store = self._verify_modulestore_support(xblock.location.course_key, 'has_changes')
-        return store.has_changes(xblock)
+        return store.has_changes(xblock, include_children=include_children)
 
     def check_supports(self, course_key, method):
         """
@@ -1545,7 +1545,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
     def delete_item(self, location, user_id, **kwargs):  # lint-amnesty, pylint: disable=arguments-differ
         raise NotImplementedError()
 
-    def has_changes(self, xblock):
+    def has_changes(self, xblock, include_children=True):
         raise NotImplementedError()
 
     def has_published_version(self, xblock):
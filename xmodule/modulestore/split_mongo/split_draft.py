@@ -330,10 +330,11 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
                 user_id
             )
 
-    def has_changes(self, xblock):
+    def has_changes(self, xblock, include_children=True):
         """
         Checks if the given block has unpublished changes
         :param xblock: the block to check
+        :param include_children: whether the changes of the descendants of the block are checked as well
         :return: True if the draft and published versions differ
         """
         def get_course(branch_name):
@@ -358,7 +359,7 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
                 return True
 
             # check the children in the draft
-            if 'children' in draft_block.fields:
+            if include_children and 'children' in draft_block.fields:
                 return any(
                     has_changes_subtree(child_block_id) for child_block_id in draft_block.fields['children']
                 )
@@ -979,6 +979,20 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
         for key in locations:
             assert not self._has_changes(locations[key])
 
+    @ddt.data(ModuleStoreEnum.Type.split)
+    def test_has_changes_without_children(self, default_ms):
+        """
+        Tests that has_changes() ignores the changes of the descendants when asked to
+        """
+        locations = self.setup_has_changes(default_ms)
+
+        child = self.store.get_item(locations['child'])
+        child.display_name = 'Changed Display Name'
+        self.store.update_item(child, self.user_id)
+
+        assert not self.store.has_changes(self.store.get_item(locations['parent']), include_children=False)
+        assert self.store.has_changes(self.store.get_item(locations['child']), include_children=False)
+
     @ddt.data(ModuleStoreEnum.Type.split)
     def test_has_changes_publish_ancestors(self, default_ms):
         """
@@ -5,20 +5,23 @@ Utility functions for transcripts.
 
 
 import copy
+import hashlib
 import html
 import logging
 import os
 import pathlib
 import re
 from functools import wraps
+from itertools import chain
 
 import requests
 import simplejson as json
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from lxml import etree
 from opaque_keys.edx.keys import UsageKeyV2
-from pysrt import SubRipFile, SubRipItem, SubRipTime
+from pysrt import SubRipFile
 from pysrt.srtexc import Error
 from opaque_keys.edx.locator import LibraryLocatorV2
 
@@ -31,14 +34,25 @@ from .bumper_utils import get_bumper_settings
 
 try:
     from edxval import api as edxval_api
+    from edxval.models import VideoTranscript
 except ImportError:
     edxval_api = None
+    VideoTranscript = None
 
 
 log = logging.getLogger(__name__)
 
 NON_EXISTENT_TRANSCRIPT = 'non_existent_dummy_file_name'
 
+# Seconds converted transcripts are cached for. They are keyed by the hash of the transcript they
+# were converted from, so a new transcript is converted again.
+CONVERTED_TRANSCRIPT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# The timestamps line of a subtitle in SRT content, without a position
+SRT_TIMESTAMPS_PATTERN = re.compile(
+    r'\s*(\d+):(\d\d):(\d\d)[,.](\d\d\d)\s*-->\s*(\d+):(\d\d):(\d\d)[,.](\d\d\d)'
+)
+
 
 class TranscriptException(Exception):
     pass
@@ -342,32 +356,78 @@ def generate_subs_from_source(speed_subs, subs_type, subs_filedata, block, langu
     return subs
 
 
+def _format_srt_time(milliseconds):
+    """
+    Format a number of milliseconds as a SubRip time, with negative times represented as zero.
+    """
+    if milliseconds < 0:
+        milliseconds = 0
+    return '%02d:%02d:%02d,%03d' % (
+        milliseconds // 3600000,
+        milliseconds % 3600000 // 60000,
+        milliseconds % 60000 // 1000,
+        milliseconds % 1000,
+    )
+
+
 def generate_srt_from_sjson(sjson_subs, speed):
     """Generate transcripts with speed = 1.0 from sjson to SubRip (*.srt).
 
+    The subtitles are written like pysrt writes a SubRipItem.
+
     :param sjson_subs: "sjson" subs.
     :param speed: speed of `sjson_subs`.
     :returns: "srt" subs.
     """
-
-    output = ''
-
     equal_len = len(sjson_subs['start']) == len(sjson_subs['end']) == len(sjson_subs['text'])
     if not equal_len:
-        return output
+        return ''
 
     sjson_speed_1 = generate_subs(speed, 1, sjson_subs)
 
-    for i in range(len(sjson_speed_1['start'])):
-        item = SubRipItem(
-            index=i,
-            start=SubRipTime(milliseconds=sjson_speed_1['start'][i]),
-            end=SubRipTime(milliseconds=sjson_speed_1['end'][i]),
-            text=sjson_speed_1['text'][i]
+    return ''.join(
+        f'{index}\n{_format_srt_time(start)} --> {_format_srt_time(end)}\n{text}\n\n'
+        for index, (start, end, text) in enumerate(
+            zip(sjson_speed_1['start'], sjson_speed_1['end'], sjson_speed_1['text'])
         )
-        output += (str(item))
-        output += '\n'
-    return output
+    )
+
+
+def parse_srt(content):
+    """
+    Parse SubRip (*.srt) content the way pysrt does, without building its objects.
+
+    Arguments:
+        content(str): "SRT" subs
+
+    Returns:
+        A list of (start, end, text) tuples with the times in milliseconds and the
+        lines of the text joined by newlines, or None if some subtitle has a position
+        or isn't well formed, in which case pysrt decides how to parse the content.
+    """
+    subs = []
+    lines = []
+    for line in chain(content.splitlines(), ['']):
+        if line.strip():
+            lines.append(line.rstrip())
+            continue
+        if not lines:
+            continue
+        if len(lines) < 2:
+            return None
+        if '-->' not in lines[0]:
+            # Skip the index of the subtitle
+            del lines[0]
+        match = SRT_TIMESTAMPS_PATTERN.fullmatch(lines[0])
+        if match is None:
+            return None
+        hours, minutes, seconds, milliseconds, *end = (int(group) for group in match.groups())
+        start = ((hours * 60 + minutes) * 60 + seconds) * 1000 + milliseconds
+        hours, minutes, seconds, milliseconds = end
+        end = ((hours * 60 + minutes) * 60 + seconds) * 1000 + milliseconds
+        subs.append((start, end, '\n'.join(lines[1:])))
+        lines = []
+    return subs
 
 
 def generate_sjson_from_srt(srt_subs):
@@ -375,23 +435,18 @@ def generate_sjson_from_srt(srt_subs):
     Generate transcripts from sjson to SubRip (*.srt).
 
     Arguments:
-        srt_subs(SubRip): "SRT" subs object
+        srt_subs(SubRip or list): "SRT" subs object, or (start, end, text) tuples returned by `parse_srt`
 
     Returns:
         Subs converted to "SJSON" format.
     """
-    sub_starts = []
-    sub_ends = []
-    sub_texts = []
-    for sub in srt_subs:
-        sub_starts.append(sub.start.ordinal)
-        sub_ends.append(sub.end.ordinal)
-        sub_texts.append(sub.text.replace('\n', ' '))
+    if isinstance(srt_subs, SubRipFile):
+        srt_subs = [(sub.start.ordinal, sub.end.ordinal, sub.text) for sub in srt_subs]
 
     sjson_subs = {
-        'start': sub_starts,
-        'end': sub_ends,
-        'text': sub_texts
+        'start': [start for start, __, __ in srt_subs],
+        'end': [end for __, end, __ in srt_subs],
+        'text': [text.replace('\n', ' ') for __, __, text in srt_subs],
     }
     return sjson_subs
 
@@ -666,6 +721,27 @@ def get_available_transcript_languages(edx_video_id):
     return available_languages
 
 
+def get_available_transcript_languages_for_videos(edx_video_ids):
+    """
+    Gets available transcript languages for several videos at once, with a single query.
+
+    Arguments:
+        edx_video_ids(list): edx-val's video identifiers
+
+    Returns:
+        A dict of the list of transcript language codes of each of the video ids.
+    """
+    available_languages = {edx_video_id: [] for edx_video_id in edx_video_ids}
+    if VideoTranscript and available_languages:
+        video_languages = VideoTranscript.objects.filter(
+            video__edx_video_id__in=list(available_languages)
+        ).values_list('video__edx_video_id', 'language_code')
+        for edx_video_id, language_code in video_languages:
+            available_languages[edx_video_id].append(language_code)
+
+    return available_languages
+
+
 def convert_video_transcript(file_name, content, output_format):
     """
     Convert video transcript into desired format
@@ -686,6 +762,35 @@ def convert_video_transcript(file_name, content, output_format):
     return dict(filename=filename, content=converted_transcript)
 
 
+def get_cached_transcript_conversion(video_id, language, input_format, output_format, content, convert):
+    """
+    Get a converted transcript of a video from the cache, or convert and cache it.
+
+    Arguments:
+        video_id: identifier of the video, such as its edx_video_id or usage key
+        language (unicode): transcript language
+        input_format (unicode): format of `content`
+        output_format (unicode): format the transcript is converted to, which may be
+          followed by the speed of a youtube video
+        content (unicode or bytes): transcript content the conversion is computed from
+        convert (callable): function computing the converted transcript
+
+    Returns:
+        The converted transcript
+    """
+    if input_format == output_format:
+        return convert()
+    content_hash = hashlib.blake2b(
+        content.encode('utf-8') if isinstance(content, str) else content, digest_size=16
+    ).hexdigest()
+    cache_key = f'video_transcripts.converted.{video_id}.{language}.{input_format}.{output_format}.{content_hash}'
+    converted_transcript = cache.get(cache_key)
+    if converted_transcript is None:
+        converted_transcript = convert()
+        cache.set(cache_key, converted_transcript, CONVERTED_TRANSCRIPT_CACHE_TIMEOUT)
+    return converted_transcript
+
+
 def clear_transcripts(block):
     """
     Deletes all transcripts of a video block from VAL
@@ -734,18 +839,23 @@ class Transcript:
                 content = content.encode('utf-8')
 
             if output_format == 'txt':
-                text = SubRipFile.from_string(content.decode('utf-8')).text
+                content = content.decode('utf-8')
+                srt_subs = parse_srt(content)
+                if srt_subs is None:
+                    text = SubRipFile.from_string(content).text
+                else:
+                    text = '\n'.join(text for __, __, text in srt_subs)
                 return html.unescape(text)
 
             elif output_format == 'sjson':
-                try:
-                    srt_subs = SubRipFile.from_string(
-                        # Skip byte order mark(BOM) character
-                        content.decode('utf-8-sig'),
-                        error_handling=SubRipFile.ERROR_RAISE
-                    )
-                except Error as ex:   # Base exception from pysrt
-                    raise TranscriptsGenerationException(str(ex)) from ex
+                # Skip byte order mark(BOM) character
+                content = content.decode('utf-8-sig')
+                srt_subs = parse_srt(content)
+                if srt_subs is None:
+                    try:
+                        srt_subs = SubRipFile.from_string(content, error_handling=SubRipFile.ERROR_RAISE)
+                    except Error as ex:   # Base exception from pysrt
+                        raise TranscriptsGenerationException(str(ex)) from ex
 
                 return json.dumps(generate_sjson_from_srt(srt_subs))
 
@@ -826,7 +936,7 @@ class VideoTranscriptsMixin:
     This is necessary for VideoBlock.
     """
 
-    def available_translations(self, transcripts, verify_assets=None, is_bumper=False):
+    def available_translations(self, transcripts, verify_assets=None, is_bumper=False, val_transcript_languages=()):
         """
         Return a list of language codes for which we have transcripts.
 
@@ -841,6 +951,8 @@ class VideoTranscriptsMixin:
 
             transcripts (dict): A dict with all transcripts and a sub.
             include_val_transcripts(boolean): If True, adds the edx-val transcript languages as well.
+            val_transcript_languages (list): Languages of the edx-val transcripts of the video, which
+                are not verified again.
         """
         translations = []
         if verify_assets is None:
@@ -854,6 +966,9 @@ class VideoTranscriptsMixin:
                 all_langs.update({'en': sub})
 
             for language, filename in all_langs.items():
+                if language in val_transcript_languages:
+                    translations.append(language)
+                    continue
                 try:
                     # for bumper videos, transcripts are stored in content store only
                     if is_bumper:
@@ -899,13 +1014,15 @@ class VideoTranscriptsMixin:
             transcript_language = 'en'
         return transcript_language
 
-    def get_transcripts_info(self, is_bumper=False):
+    def get_transcripts_info(self, is_bumper=False, val_transcript_languages=None):
         """
         Returns a transcript dictionary for the video.
 
         Arguments:
             is_bumper(bool): If True, the request is for the bumper transcripts
             include_val_transcripts(bool): If True, include edx-val transcripts as well
+            val_transcript_languages(list): Languages of the edx-val transcripts of the video, when
+                already known. They are read from edx-val otherwise.
         """
         if is_bumper:
             transcripts = copy.deepcopy(get_bumper_settings(self).get('transcripts', {}))
@@ -922,7 +1039,9 @@ class VideoTranscriptsMixin:
 
         # bumper transcripts are stored in content store so we don't need to include val transcripts
         if not is_bumper:
-            transcript_languages = get_available_transcript_languages(edx_video_id=self.edx_video_id)
+            transcript_languages = val_transcript_languages
+            if transcript_languages is None:
+                transcript_languages = get_available_transcript_languages(edx_video_id=self.edx_video_id)
             # HACK Warning! this is temporary and will be removed once edx-val take over the
             # transcript module and contentstore will only function as fallback until all the
             # data is migrated to edx-val.
@@ -954,9 +1073,16 @@ def get_transcript_from_val(edx_video_id, lang=None, output_format=Transcript.SR
         raise NotFoundError(f'Transcript not found for {edx_video_id}, lang: {lang}')
 
     transcript_conversion_props = dict(transcript, output_format=output_format)
-    transcript = convert_video_transcript(**transcript_conversion_props)
-    filename = transcript['filename']
-    content = transcript['content']
+    basename, input_format = os.path.splitext(transcript['file_name'])
+    content = get_cached_transcript_conversion(
+        edx_video_id,
+        lang,
+        input_format[1:],
+        output_format,
+        transcript['content'],
+        lambda: convert_video_transcript(**transcript_conversion_props)['content'],
+    )
+    filename = f'{basename}.{output_format}'
     mimetype = Transcript.mime_types[output_format]
 
     return content, filename, mimetype
@@ -1041,14 +1167,27 @@ def get_transcript_from_contentstore(video, language, output_format, transcripts
     # add language prefix to transcript file only if language is not None
     language_prefix = f'{language}_' if language else ''
     transcript_name = f'{language_prefix}{base_name}.{output_format}'
-    transcript_content = Transcript.convert(transcript_content, input_format=input_format, output_format=output_format)
+    transcript_content = get_cached_transcript_conversion(
+        video.location,
+        language,
+        input_format,
+        output_format,
+        transcript_content,
+        lambda: Transcript.convert(transcript_content, input_format=input_format, output_format=output_format),
+    )
     if not transcript_content.strip():
         raise NotFoundError('No transcript content')
 
     if youtube_id:
-        youtube_ids = youtube_speed_dict(video)
-        transcript_content = json.dumps(
-            generate_subs(youtube_ids.get(youtube_id, 1), 1, json.loads(transcript_content))
+        speed = youtube_speed_dict(video).get(youtube_id, 1)
+        subs_content = transcript_content
+        transcript_content = get_cached_transcript_conversion(
+            video.location,
+            language,
+            output_format,
+            f'{output_format}.{speed}',
+            subs_content,
+            lambda: json.dumps(generate_subs(speed, 1, json.loads(subs_content))),
         )
 
     return transcript_content, transcript_name, Transcript.mime_types[output_format]
@@ -1150,10 +1289,13 @@ def get_transcript_from_learning_core(video_block, language, output_format, tran
 
     # Now convert the transcript data to the requested format:
     output_filename = f'{file_path.stem}.{output_format}'
-    output_transcript = Transcript.convert(
-        data.decode('utf-8'),
-        input_format=Transcript.SRT,
-        output_format=output_format,
+    output_transcript = get_cached_transcript_conversion(
+        usage_key,
+        language,
+        Transcript.SRT,
+        output_format,
+        data,
+        lambda: Transcript.convert(data.decode('utf-8'), input_format=Transcript.SRT, output_format=output_format),
     )
     if not output_transcript.strip():
         raise NotFoundError(
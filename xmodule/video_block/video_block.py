@@ -20,6 +20,7 @@ from collections import OrderedDict, defaultdict
 from operator import itemgetter
 
 from django.conf import settings
+from django.core.cache import cache
 from edx_django_utils.cache import RequestCache
 from lxml import etree
 from opaque_keys.edx.locator import AssetLocator
@@ -31,6 +32,7 @@ from xblock.fields import ScopeIds
 from xblock.runtime import KvsFieldData
 from xblocks_contrib.video import VideoBlock as _ExtractedVideoBlock
 
+from common.djangoapps.util.memcache import safe_key
 from common.djangoapps.xblock_django.constants import ATTR_KEY_REQUEST_COUNTRY_CODE, ATTR_KEY_USER_ID
 from openedx.core.djangoapps.video_config.models import HLSPlaybackEnabledFlag, CourseYoutubeBlockedFlag
 from openedx.core.djangoapps.video_config.toggles import PUBLIC_VIDEO_SHARE, TRANSCRIPT_FEEDBACK
@@ -63,6 +65,7 @@ from .transcripts_utils import (
     Transcript,
     VideoTranscriptsMixin,
     clean_video_id,
+    get_available_transcript_languages_for_videos,
     get_html5_ids,
     get_transcript,
     subs_filename
@@ -113,6 +116,10 @@ log = logging.getLogger(__name__)
 #  `django.utils.translation.ugettext_noop` because Django cannot be imported in this file
 _ = lambda text: text
 
+# Seconds the edx-val data of the videos of a version of a course is cached for. Encodings and
+# transcripts may be added to edx-val without a new version of the course.
+VAL_COURSE_DATA_CACHE_TIMEOUT = 60 * 15
+
 EXPORT_IMPORT_COURSE_DIR = 'course'
 EXPORT_IMPORT_STATIC_DIR = 'static'
 
@@ -1169,11 +1176,33 @@ class _BuiltInVideoBlock(
     @request_cached(
         request_cache_getter=lambda args, kwargs: args[1],
     )
-    def get_cached_val_data_for_course(cls, request_cache, video_profile_names, course_id):  # lint-amnesty, pylint: disable=unused-argument
+    def get_cached_val_data_for_course(  # lint-amnesty, pylint: disable=unused-argument
+        cls, request_cache, video_profile_names, course_id, course_version=None
+    ):
         """
-        Returns the VAL data for the requested video profiles for the given course.
+        Returns the VAL data for the requested video profiles for the given course, with the
+        languages of the edx-val transcripts of each video under 'transcript_languages'.
+
+        The data of all the videos of the course is read with two queries, and cached for the
+        version of the course when it is given.
         """
-        return edxval_api.get_video_info_for_course_and_profiles(str(course_id), video_profile_names)
+        cache_key = None
+        if course_version:
+            cache_key = safe_key(
+                f'{course_id}.{course_version}.{",".join(sorted(video_profile_names))}', 'video_block.val_data', ''
+            )
+            val_course_data = cache.get(cache_key)
+            if val_course_data is not None:
+                return val_course_data
+
+        val_course_data = edxval_api.get_video_info_for_course_and_profiles(str(course_id), video_profile_names)
+        transcript_languages = get_available_transcript_languages_for_videos(list(val_course_data))
+        for edx_video_id, val_video_data in val_course_data.items():
+            val_video_data['transcript_languages'] = transcript_languages[edx_video_id]
+
+        if cache_key:
+            cache.set(cache_key, val_course_data, VAL_COURSE_DATA_CACHE_TIMEOUT)
+        return val_course_data
 
     def student_view_data(self, context=None):
         """
@@ -1189,6 +1218,7 @@ class _BuiltInVideoBlock(
 
         encoded_videos = {}
         val_video_data = {}
+        val_transcript_languages = None
         all_sources = self.html5_sources or []
 
         # Check in VAL data first if edx_video_id exists
@@ -1202,12 +1232,14 @@ class _BuiltInVideoBlock(
                 self.request_cache,
                 video_profile_names,
                 self.location.course_key,
+                getattr(self, 'course_version', None),
             )
             val_video_data = val_course_data.get(self.edx_video_id, {})
 
             # Get the encoded videos if data from VAL is found
             if val_video_data:
                 encoded_videos = val_video_data.get('profiles', {})
+                val_transcript_languages = val_video_data.get('transcript_languages')
 
             # If information for this edx_video_id is not found in the bulk course data, make a
             # separate request for this individual edx_video_id, unless cache misses are disabled.
@@ -1241,7 +1273,10 @@ class _BuiltInVideoBlock(
                     "file_size": 0,  # File size is not relevant for external link
                 }
 
-        available_translations = self.available_translations(self.get_transcripts_info())
+        available_translations = self.available_translations(
+            self.get_transcripts_info(val_transcript_languages=val_transcript_languages),
+            val_transcript_languages=val_transcript_languages or (),
+        )
         transcripts = {
             lang: self.runtime.handler_url(self, 'transcript', 'download', query="lang=" + lang, thirdparty=True)
             for lang in available_translations